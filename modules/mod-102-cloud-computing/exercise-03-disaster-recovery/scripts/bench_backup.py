@@ -0,0 +1,110 @@
+"""
+Benchmark: backup + restore throughput and peak memory.
+
+    python scripts/bench_backup.py
+    python scripts/bench_backup.py --size-mb 512 --workers 1 4 --skip-legacy
+
+Writes a `--size-mb` file of random bytes, then for each mode backs it
+up and restores it to a second file (encrypted, LocalStorageBackend):
+
+- legacy:     the previous path: whole file in memory, per-byte
+              generator XOR
+- streaming:  `backup_file` / `restore_file` with 4 MiB chunks and
+              `--workers` cipher threads
+
+Each mode runs in its own subprocess so the reported peak RSS
+(ru_maxrss) belongs to that mode alone. The legacy cipher runs at a
+few MB/s; keep `--size-mb` modest or pass --skip-legacy.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.backup_manager import (  # noqa: E402
+    _DEMO_ENCRYPTION_KEY,
+    BackupManager,
+    BackupSource,
+    LocalStorageBackend,
+)
+
+
+class LegacyCipher:
+    """Previous cipher: one Python generator step per byte."""
+
+    def apply(self, chunk: bytes, offset: int = 0) -> bytes:
+        key = _DEMO_ENCRYPTION_KEY
+        return bytes(b ^ key[(offset + i) % len(key)] for i, b in enumerate(chunk))
+
+
+def run_mode(mode: str, workers: int, data: Path, workdir: Path) -> dict:
+    storage = LocalStorageBackend(workdir / "store")
+    manager = BackupManager(storage, workers=workers)
+    if mode == "legacy":
+        # One chunk the size of the file == the old read-all / encrypt-all path.
+        manager._cipher = LegacyCipher()
+        manager.chunk_size = data.stat().st_size + 1
+    begin = time.perf_counter()
+    metadata = manager.backup_file(BackupSource.DATABASE, data)
+    backup_s = time.perf_counter() - begin
+    out = workdir / "restored.bin"
+    begin = time.perf_counter()
+    manager.restore_file(metadata.backup_id, out)
+    restore_s = time.perf_counter() - begin
+    ok = out.stat().st_size == data.stat().st_size
+    return {
+        "backup_s": backup_s,
+        "restore_s": restore_s,
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "ok": ok,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=int, default=64)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2])
+    parser.add_argument("--skip-legacy", action="store_true")
+    parser.add_argument("--_child", nargs=4, metavar=("MODE", "WORKERS", "DATA", "DIR"),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args._child:
+        mode, workers, data, workdir = args._child
+        print(json.dumps(run_mode(mode, int(workers), Path(data), Path(workdir))))
+        return
+
+    modes = [] if args.skip_legacy else [("legacy", 1)]
+    modes += [("streaming", w) for w in args.workers]
+    with tempfile.TemporaryDirectory() as tmp:
+        data = Path(tmp) / "payload.bin"
+        with open(data, "wb") as fh:
+            for _ in range(args.size_mb):
+                fh.write(os.urandom(1024 * 1024))
+        print(f"{args.size_mb} MiB payload, cpu_count={os.cpu_count()}")
+        for mode, workers in modes:
+            workdir = Path(tmp) / f"{mode}-{workers}"
+            workdir.mkdir()
+            out = subprocess.run(
+                [sys.executable, __file__, "--_child", mode, str(workers), str(data), str(workdir)],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            r = json.loads(out)
+            label = mode if mode == "legacy" else f"{mode} workers={workers}"
+            print(f"  {label:<22} backup {args.size_mb / r['backup_s']:>8.1f} MiB/s   "
+                  f"restore {args.size_mb / r['restore_s']:>8.1f} MiB/s   "
+                  f"peak RSS {r['max_rss_mb']:>7.1f} MiB   ok={r['ok']}")
+
+
+if __name__ == "__main__":
+    main()
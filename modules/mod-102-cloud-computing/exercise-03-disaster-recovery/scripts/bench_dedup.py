@@ -0,0 +1,136 @@
+"""
+Benchmark: deduplicated vs. full backups of a mutating artifact.
+
+    python scripts/bench_dedup.py
+    python scripts/bench_dedup.py --size-mb 256 --versions 10 --storage-mbps 100
+
+Generates `--versions` successive versions of a `--size-mb` file, the
+way checkpoints and datasets evolve: each version overwrites a few
+random regions (`--mutate-pct` of the bytes in total) and inserts a
+small block, shifting everything after it. Every version is backed up
+and replicated, then all are restored and compared byte for byte:
+
+- full:   BackupManager streaming backups (every version stored whole)
+- dedup:  BackupManager(dedup=True) (only new chunks stored / copied)
+
+`--storage-mbps` throttles writes to both storage backends to model a
+network object store; 0 means local disk speed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src import chunking  # noqa: E402
+from src.backup_manager import BackupManager, BackupSource, LocalStorageBackend  # noqa: E402
+
+
+class ThrottledStorage(LocalStorageBackend):
+    """LocalStorageBackend whose writes are capped at `mbps` MB/s."""
+
+    def __init__(self, root: Path, region: str, mbps: float):
+        super().__init__(root, region)
+        self.mbps = mbps
+        self.bytes_written = 0
+
+    def _account(self, size: int) -> None:
+        self.bytes_written += size
+        if self.mbps:
+            time.sleep(size / (self.mbps * 1e6))
+
+    def write(self, key: str, data: bytes) -> int:
+        self._account(len(data))
+        return super().write(key, data)
+
+    def write_stream(self, key, chunks):
+        def counted():
+            for chunk in chunks:
+                self._account(len(chunk))
+                yield chunk
+        return super().write_stream(key, counted())
+
+
+def make_versions(size: int, versions: int, mutate_pct: float, seed: int = 0):
+    rng = random.Random(seed)
+    data = bytearray(rng.randbytes(size))
+    for v in range(versions):
+        if v:
+            budget = int(len(data) * mutate_pct / 100)
+            for _ in range(8):
+                length = budget // 8
+                at = rng.randrange(len(data) - length)
+                data[at:at + length] = rng.randbytes(length)
+            at = rng.randrange(len(data))
+            data[at:at] = rng.randbytes(4096)
+        yield bytes(data)
+
+
+def run(name: str, dedup: bool, files, tmp: Path, mbps: float) -> dict:
+    primary = ThrottledStorage(tmp / name / "primary", "us-east-1", mbps)
+    replica = ThrottledStorage(tmp / name / "replica", "us-west-2", mbps)
+    manager = BackupManager(primary, replica_storage=replica, dedup=dedup)
+    ids = []
+    begin = time.perf_counter()
+    for path in files:
+        metadata = manager.backup_file(BackupSource.PERSISTENT_VOLUME, path)
+        manager.replicate(metadata.backup_id)
+        ids.append(metadata.backup_id)
+    backup_s = time.perf_counter() - begin
+    begin = time.perf_counter()
+    out = tmp / name / "restored.bin"
+    identical = True
+    for path, backup_id in zip(files, ids):
+        manager.restore_file(backup_id, out)
+        identical &= out.read_bytes() == path.read_bytes()
+    restore_s = time.perf_counter() - begin
+    return {
+        "backup_s": backup_s,
+        "restore_s": restore_s,
+        "primary_mb": primary.bytes_written / 1e6,
+        "replica_mb": replica.bytes_written / 1e6,
+        "identical": identical,
+        "stats": manager.dedup_stats() if dedup else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=int, default=64)
+    parser.add_argument("--versions", type=int, default=8)
+    parser.add_argument("--mutate-pct", type=float, default=2.0, help="bytes rewritten per version")
+    parser.add_argument("--storage-mbps", type=float, nargs="+", default=[0, 100])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        files = []
+        for i, data in enumerate(make_versions(args.size_mb << 20, args.versions, args.mutate_pct)):
+            path = tmp / f"v{i}.bin"
+            path.write_bytes(data)
+            files.append(path)
+        logical = sum(p.stat().st_size for p in files) / 1e6
+        print(f"{args.versions} versions x {args.size_mb} MiB ({logical:,.0f} MB logical), "
+              f"{args.mutate_pct}% rewritten + 4 KiB inserted per version, "
+              f"numpy={'yes' if chunking.np is not None else 'no'}, cpu_count={os.cpu_count()}")
+        for mbps in args.storage_mbps:
+            print(f"storage {'local disk' if not mbps else f'{mbps:g} MB/s'}")
+            for name, dedup in (("full", False), ("dedup", True)):
+                r = run(f"{name}-{mbps}", dedup, files, tmp, mbps)
+                extra = ""
+                if r["stats"]:
+                    extra = f"   dedup ratio {r['stats']['dedup_ratio']:.2f}x"
+                print(f"  {name:<6} backup+replicate {r['backup_s']:>6.2f}s   restore {r['restore_s']:>6.2f}s   "
+                      f"written primary {r['primary_mb']:>7.1f} MB  replica {r['replica_mb']:>7.1f} MB"
+                      f"{extra}   identical={r['identical']}")
+
+
+if __name__ == "__main__":
+    main()
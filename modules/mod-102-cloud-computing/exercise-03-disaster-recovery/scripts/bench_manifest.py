@@ -0,0 +1,110 @@
+"""
+Benchmark: manifest cost per backup as history grows.
+
+    python scripts/bench_manifest.py
+    python scripts/bench_manifest.py --entries 200000 --probe 500
+
+Fills a manifest with `--entries` backups (metadata only: a null storage
+backend discards payloads), then times `--probe` further backups, a
+reload, and a prune that expires 1% of the entries:
+
+- legacy:   the previous `_persist_manifest`, which re-serialized the
+            whole index on every backup / replication / prune and
+            scanned every record in prune_expired (its fill runs in
+            memory and is not comparable with the journal's)
+- journal:  ManifestJournal appends + the expiry heap
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.backup_manager import BackupManager, BackupSource, RetentionTier  # noqa: E402
+
+
+class NullStorage:
+    region = "null"
+
+    def write_stream(self, key, chunks):
+        return sum(len(c) for c in chunks)
+
+    def delete(self, key):
+        pass
+
+
+class LegacyManifestManager(BackupManager):
+    """Previous implementation: full manifest rewrite, full prune scan."""
+
+    def __init__(self, storage, manifest_path: Path):
+        super().__init__(storage, encrypt=False)
+        self.manifest_path = manifest_path
+        self.persist = False  # off while pre-filling: that part is quadratic
+
+    def _index(self, metadata):
+        self._metadata[metadata.backup_id] = metadata
+        if self.persist:
+            self.manifest_path.write_text(self.to_json())
+
+    def prune_expired(self, now=None):
+        now = now or datetime.now(timezone.utc)
+        removed = [i for i, m in list(self._metadata.items()) if m.is_expired(now)]
+        for backup_id in removed:
+            self._metadata.pop(backup_id)
+        if removed:
+            self.manifest_path.write_text(self.to_json())
+        return removed
+
+
+def fill(manager: BackupManager, count: int, now: datetime) -> None:
+    for i in range(count):
+        tier = RetentionTier.DAILY if i % 100 == 0 else RetentionTier.YEARLY
+        manager.backup(BackupSource.DATABASE, b"x", retention_tier=tier, now=now)
+
+
+def run(name: str, make, entries: int, probe: int, tmp: Path) -> None:
+    path = tmp / f"{name}.json"
+    base = datetime.now(timezone.utc) - timedelta(days=30)
+    manager = make(path)
+    begin = time.perf_counter()
+    fill(manager, entries, base)
+    fill_s = time.perf_counter() - begin
+    if isinstance(manager, LegacyManifestManager):
+        manager.persist = True
+    begin = time.perf_counter()
+    fill(manager, probe, datetime.now(timezone.utc))
+    per_backup = (time.perf_counter() - begin) / probe
+    begin = time.perf_counter()
+    pruned = len(manager.prune_expired())
+    prune_s = time.perf_counter() - begin
+    begin = time.perf_counter()
+    reloaded = BackupManager(NullStorage(), encrypt=False, manifest_path=path)
+    load_s = time.perf_counter() - begin
+    print(f"  {name:<8} fill {fill_s:>6.2f}s   backup @{entries:,}: {per_backup * 1e3:>8.3f} ms   "
+          f"prune {pruned:,}: {prune_s * 1e3:>8.1f} ms   reload: {load_s:>5.2f}s   "
+          f"entries={len(reloaded.list_backups()):,}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--probe", type=int, default=200, help="backups timed at full size")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        print(f"{args.entries:,} entries, cpu_count={os.cpu_count()}")
+        run("journal", lambda p: BackupManager(NullStorage(), encrypt=False, manifest_path=p),
+            args.entries, args.probe, tmp)
+        run("legacy", lambda p: LegacyManifestManager(NullStorage(), p),
+            args.entries, min(args.probe, 20), tmp)
+
+
+if __name__ == "__main__":
+    main()
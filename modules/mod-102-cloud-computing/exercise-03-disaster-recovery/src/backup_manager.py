@@ -10,19 +10,43 @@ The storage backend is a Protocol so callers can wire in S3, GCS, Azure
 Blob, or a local filesystem (used by tests). The default LocalStorage
 backend is suitable for development and CI; cloud-specific subclasses
 can replace it without touching the BackupManager itself.
+
+Payloads stream through backup and restore in fixed-size chunks
+(`chunk_size`, default 4 MiB): read → checksum → encrypt → write, so
+memory stays bounded by a few chunks regardless of artifact size.
+`backup_file` / `restore_file` / `restore_stream` are the streaming
+entry points; `backup` / `restore` keep the in-memory bytes API.
+
+With `dedup=True` payloads are split at content-defined boundaries
+(see chunking.py) and each distinct chunk is stored once under a
+content-addressed key; the backup object becomes a recipe listing its
+chunks. A ChunkIndex (reference counts, rebuilt lazily from recipes)
+decides which chunks are new, which ones the replica still needs, and
+which ones a prune may delete.
+
+The manifest is an append-only JSON-lines journal (`ManifestJournal`):
+each backup, replication and prune appends a few records instead of
+rewriting the whole index, and the journal is compacted into a fresh
+snapshot once most of its records are superseded.
 """
 
 from __future__ import annotations
 
 import hashlib
+import heapq
+import io
 import json
 import logging
 import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from enum import Enum
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Protocol
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Protocol, Set, Tuple
+
+from .chunking import ContentDefinedChunker
 
 logger = logging.getLogger(__name__)
 
@@ -63,7 +87,7 @@ class BackupMetadata:
     source: BackupSource
     backup_type: BackupType
     retention_tier: RetentionTier
-    size_bytes: int
+    size_bytes: int  # payload (plaintext) bytes
     checksum_sha256: str
     encrypted: bool
     created_at: datetime
@@ -71,6 +95,8 @@ class BackupMetadata:
     replicated_regions: List[str] = field(default_factory=list)
     parent_backup_id: Optional[str] = None
     tags: Dict[str, str] = field(default_factory=dict)
+    chunked: bool = False  # stored as a recipe of deduplicated chunks
+    stored_bytes: int = 0  # bytes written: header + ciphertext, or new chunks + recipe
 
     def expires_at(self) -> datetime:
         return self.created_at + timedelta(days=RETENTION_DAYS[self.retention_tier])
@@ -95,6 +121,16 @@ class StorageBackend(Protocol):
 
     def copy_to(self, key: str, destination: "StorageBackend") -> int: ...
 
+    # Optional streaming methods; BackupManager falls back to write/read
+    # (whole object in memory) for backends that lack them.
+
+    def write_stream(self, key: str, chunks: Iterable[bytes]) -> int: ...
+
+    def read_stream(self, key: str, chunk_size: int = ...) -> Iterator[bytes]: ...
+
+
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+
 
 class LocalStorageBackend:
     """Filesystem-backed storage implementation used in tests + dev."""
@@ -130,8 +166,31 @@ class LocalStorageBackend:
                     yield rel
 
     def copy_to(self, key: str, destination: "StorageBackend") -> int:
+        if hasattr(destination, "write_stream"):
+            return destination.write_stream(key, self.read_stream(key))
         return destination.write(key, self.read(key))
 
+    def write_stream(self, key: str, chunks: Iterable[bytes]) -> int:
+        """Write chunks to a temp file and rename into place: no partial objects."""
+        path = self._path(key)
+        tmp = path.with_name(path.name + ".partial")
+        written = 0
+        try:
+            with open(tmp, "wb") as fh:
+                for chunk in chunks:
+                    fh.write(chunk)
+                    written += len(chunk)
+            os.replace(tmp, path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        return written
+
+    def read_stream(self, key: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        with open(self._path(key), "rb") as fh:
+            while chunk := fh.read(chunk_size):
+                yield chunk
+
 
 # Marker prepended to encrypted payloads in the demo cipher. A real
 # implementation would call KMS/Key Vault and AES-GCM. The demo cipher
@@ -141,16 +200,270 @@ _DEMO_ENCRYPTION_KEY = b"ml-infra-demo-key"
 _DEMO_HEADER = b"DEMO-ENC:v1\n"
 
 
+class _DemoCipher:
+    """Repeating-key XOR applied chunk-wise at an absolute stream offset.
+
+    The chunk and a keystream of the same length are XORed as two big
+    integers, which runs in C instead of one Python step per byte. The
+    keystream depends only on offset % len(key), so encrypting a stream
+    chunk by chunk gives exactly the bytes of a one-shot encryption.
+    """
+
+    _CACHE_LIMIT = 16 * 1024 * 1024  # don't pin one-shot keystreams for huge payloads
+
+    def __init__(self, key: bytes = _DEMO_ENCRYPTION_KEY):
+        self.key = key
+        # Streams reuse one (phase, length) for every full chunk.
+        self._cached: tuple = (None, 0)
+
+    def aligned(self, chunk_size: int) -> int:
+        """Largest multiple of the key length ≤ chunk_size (at least one key)."""
+        return max(len(self.key), chunk_size - chunk_size % len(self.key))
+
+    def _keystream(self, phase: int, length: int) -> int:
+        signature, keystream = self._cached
+        if signature == (phase, length):
+            return keystream
+        key = self.key[phase:] + self.key[:phase]
+        keystream = int.from_bytes((key * (length // len(key) + 1))[:length], "little")
+        if length <= self._CACHE_LIMIT:
+            self._cached = ((phase, length), keystream)
+        return keystream
+
+    def apply(self, chunk: bytes, offset: int = 0) -> bytes:
+        if not chunk:
+            return b""
+        keystream = self._keystream(offset % len(self.key), len(chunk))
+        return (int.from_bytes(chunk, "little") ^ keystream).to_bytes(len(chunk), "little")
+
+
+_DEMO_CIPHER = _DemoCipher()
+
+
 def _demo_encrypt(payload: bytes, key: bytes = _DEMO_ENCRYPTION_KEY) -> bytes:
-    body = bytes(b ^ key[i % len(key)] for i, b in enumerate(payload))
-    return _DEMO_HEADER + body
+    cipher = _DEMO_CIPHER if key == _DEMO_ENCRYPTION_KEY else _DemoCipher(key)
+    return _DEMO_HEADER + cipher.apply(payload)
 
 
 def _demo_decrypt(payload: bytes, key: bytes = _DEMO_ENCRYPTION_KEY) -> bytes:
     if not payload.startswith(_DEMO_HEADER):
         raise ValueError("Payload is not encrypted with the demo cipher")
-    body = payload[len(_DEMO_HEADER):]
-    return bytes(b ^ key[i % len(key)] for i, b in enumerate(body))
+    cipher = _DEMO_CIPHER if key == _DEMO_ENCRYPTION_KEY else _DemoCipher(key)
+    return cipher.apply(payload[len(_DEMO_HEADER):])
+
+
+def _read_chunks(stream: BinaryIO, chunk_size: int) -> Iterator[bytes]:
+    while chunk := stream.read(chunk_size):
+        yield chunk
+
+
+def _map_ordered(
+    fn: Callable[[bytes, int], bytes],
+    chunks: Iterable[bytes],
+    workers: int,
+) -> Iterator[bytes]:
+    """fn(chunk, offset) over a chunk stream, in order, with ≤ 2×workers chunks in flight."""
+    if workers <= 1:
+        offset = 0
+        for chunk in chunks:
+            yield fn(chunk, offset)
+            offset += len(chunk)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending: deque = deque()
+        offset = 0
+        for chunk in chunks:
+            pending.append(pool.submit(fn, chunk, offset))
+            offset += len(chunk)
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _metadata_to_dict(metadata: BackupMetadata) -> Dict[str, object]:
+    return {
+        "backup_id": metadata.backup_id,
+        "source": metadata.source.value,
+        "backup_type": metadata.backup_type.value,
+        "retention_tier": metadata.retention_tier.value,
+        "size_bytes": metadata.size_bytes,
+        "checksum_sha256": metadata.checksum_sha256,
+        "encrypted": metadata.encrypted,
+        "created_at": metadata.created_at.isoformat(),
+        "region": metadata.region,
+        "replicated_regions": list(metadata.replicated_regions),
+        "parent_backup_id": metadata.parent_backup_id,
+        "tags": dict(metadata.tags),
+        "chunked": metadata.chunked,
+        "stored_bytes": metadata.stored_bytes,
+    }
+
+
+def _metadata_from_dict(item: Dict) -> BackupMetadata:
+    return BackupMetadata(
+        backup_id=item["backup_id"],
+        source=BackupSource(item["source"]),
+        backup_type=BackupType(item["backup_type"]),
+        retention_tier=RetentionTier(item["retention_tier"]),
+        size_bytes=item["size_bytes"],
+        checksum_sha256=item["checksum_sha256"],
+        encrypted=item["encrypted"],
+        created_at=datetime.fromisoformat(item["created_at"]),
+        region=item["region"],
+        replicated_regions=list(item.get("replicated_regions", [])),
+        parent_backup_id=item.get("parent_backup_id"),
+        tags=dict(item.get("tags", {})),
+        chunked=item.get("chunked", False),
+        stored_bytes=item.get("stored_bytes", item["size_bytes"]),
+    )
+
+
+class ManifestJournal:
+    """Append-only JSON-lines manifest.
+
+    One record per line: `{"op": "put", "backup": {...}}` (last put for
+    an ID wins) or `{"op": "delete", "backup_id": ...}`. Every mutation
+    is a single append, so its cost doesn't depend on history size.
+
+    A crash can only leave a torn final line (records are appended, never
+    rewritten in place); `load` drops it and truncates the file back to
+    the last complete record. Compaction writes a snapshot to a temp file
+    and renames it over the journal, so it is atomic as well. A manifest
+    in the previous single-document format (`{"backups": [...]}`) is
+    read and converted on load.
+    """
+
+    # Compact once the journal holds this many times more records than
+    # there are live backups (and at least COMPACT_MIN_RECORDS records).
+    COMPACT_RATIO = 2
+    COMPACT_MIN_RECORDS = 1000
+
+    def __init__(self, path: Path, *, fsync: bool = False):
+        self.path = Path(path)
+        self.fsync = fsync
+        self.records = 0
+
+    def load(self) -> Dict[str, BackupMetadata]:
+        """Replay the journal; returns live metadata keyed by backup ID."""
+        metadata: Dict[str, BackupMetadata] = {}
+        if not self.path.exists():
+            return metadata
+        with open(self.path, "rb") as fh:
+            first = fh.readline()
+            if first.strip() == b"{" or first.startswith(b'{"backups"'):
+                fh.seek(0)
+                for item in json.load(fh).get("backups", []):
+                    entry = _metadata_from_dict(item)
+                    metadata[entry.backup_id] = entry
+                self.compact(metadata.values())
+                return metadata
+            fh.seek(0)
+            good = 0
+            for lineno, line in enumerate(fh, 1):
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("incomplete record")
+                    record = json.loads(line)
+                except ValueError:
+                    if fh.read(1):
+                        raise ValueError(f"Corrupt manifest record at {self.path}:{lineno}") from None
+                    logger.warning("Dropping torn final manifest record in %s", self.path)
+                    break
+                if record["op"] == "put":
+                    entry = _metadata_from_dict(record["backup"])
+                    metadata[entry.backup_id] = entry
+                else:
+                    metadata.pop(record["backup_id"], None)
+                good += len(line)
+                self.records += 1
+        if good != self.path.stat().st_size:
+            os.truncate(self.path, good)
+        return metadata
+
+    def put(self, metadata: BackupMetadata) -> None:
+        self._append([{"op": "put", "backup": _metadata_to_dict(metadata)}])
+
+    def delete_many(self, backup_ids: Iterable[str]) -> None:
+        self._append([{"op": "delete", "backup_id": backup_id} for backup_id in backup_ids])
+
+    def maybe_compact(self, live: Dict[str, BackupMetadata]) -> bool:
+        if self.records < max(self.COMPACT_MIN_RECORDS, self.COMPACT_RATIO * len(live)):
+            return False
+        self.compact(live.values())
+        return True
+
+    def compact(self, live: Iterable[BackupMetadata]) -> None:
+        """Rewrite the journal as one put per live backup (atomic rename)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".compact")
+        records = 0
+        with open(tmp, "w", encoding="utf-8") as fh:
+            for metadata in live:
+                fh.write(json.dumps({"op": "put", "backup": _metadata_to_dict(metadata)}) + "\n")
+                records += 1
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, self.path)
+        self.records = records
+
+    def _append(self, records: List[Dict[str, object]]) -> None:
+        if not records:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = "".join(json.dumps(record) + "\n" for record in records)
+        # One write per mutation: a crash tears at most the trailing records.
+        with open(self.path, "a", encoding="utf-8") as fh:
+            fh.write(data)
+            if self.fsync:
+                fh.flush()
+                os.fsync(fh.fileno())
+        self.records += len(records)
+
+
+Recipe = List[Tuple[str, int]]  # (chunk key, plaintext size) in payload order
+
+
+class ChunkIndex:
+    """Reference counts for deduplicated chunks in primary storage.
+
+    Not persisted: the recipes are the source of truth, and the index is
+    rebuilt from them the first time dedup needs it. A chunk written by
+    a backup that then failed is referenced by no recipe; it is simply
+    rewritten when needed again, or removed by collect_garbage.
+    """
+
+    def __init__(self) -> None:
+        self.refs: Dict[str, int] = {}
+        self.sizes: Dict[str, int] = {}
+        self.replicated: Set[str] = set()  # chunk keys known present on the replica
+        self.logical_bytes = 0
+
+    def add(self, recipe: Recipe, replicated: bool = False) -> None:
+        for key, size in recipe:
+            self.refs[key] = self.refs.get(key, 0) + 1
+            self.sizes[key] = size
+            self.logical_bytes += size
+            if replicated:
+                self.replicated.add(key)
+
+    def release(self, recipe: Recipe) -> List[str]:
+        """Drop one reference per recipe entry; returns keys left unreferenced."""
+        dead = []
+        for key, size in recipe:
+            self.logical_bytes -= size
+            remaining = self.refs.get(key, 0) - 1
+            if remaining > 0:
+                self.refs[key] = remaining
+            elif key in self.refs:
+                del self.refs[key]
+                del self.sizes[key]
+                dead.append(key)
+        return dead
+
+    @property
+    def stored_bytes(self) -> int:
+        return sum(self.sizes.values())
 
 
 class BackupManager:
@@ -163,14 +476,36 @@ class BackupManager:
         *,
         encrypt: bool = True,
         manifest_path: Optional[Path] = None,
+        manifest_fsync: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        workers: int = 1,
+        dedup: bool = False,
+        chunker: Optional[ContentDefinedChunker] = None,
     ):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
         self.primary = primary_storage
         self.replica = replica_storage
         self.encrypt = encrypt
         self.manifest_path = manifest_path
+        self._cipher = _DEMO_CIPHER
+        # Aligned to the key length so every full chunk shares one keystream.
+        self.chunk_size = self._cipher.aligned(chunk_size)
+        # >1 runs the cipher stage for several chunks concurrently.
+        self.workers = workers
+        self.dedup = dedup
+        self.chunker = chunker or ContentDefinedChunker()
+        self._chunks: Optional[ChunkIndex] = None
         self._metadata: Dict[str, BackupMetadata] = {}
-        if manifest_path is not None and manifest_path.exists():
-            self._load_manifest()
+        # Min-heap of (expires_at timestamp, backup_id); entries for IDs
+        # that were already removed are skipped when popped.
+        self._expiry: List[tuple] = []
+        self._manifest: Optional[ManifestJournal] = None
+        if manifest_path is not None:
+            self._manifest = ManifestJournal(manifest_path, fsync=manifest_fsync)
+            self._metadata = self._manifest.load()
+            self._expiry = [(m.expires_at().timestamp(), m.backup_id) for m in self._metadata.values()]
+            heapq.heapify(self._expiry)
 
     def backup(
         self,
@@ -184,6 +519,33 @@ class BackupManager:
         now: Optional[datetime] = None,
     ) -> BackupMetadata:
         """Create a backup artifact and persist it to primary storage."""
+        return self.backup_stream(
+            source,
+            io.BytesIO(payload),
+            backup_type=backup_type,
+            retention_tier=retention_tier,
+            parent_backup_id=parent_backup_id,
+            tags=tags,
+            now=now,
+        )
+
+    def backup_file(self, source: BackupSource, path: Path, **kwargs) -> BackupMetadata:
+        """Back up a file without loading it into memory."""
+        with open(path, "rb") as fh:
+            return self.backup_stream(source, fh, **kwargs)
+
+    def backup_stream(
+        self,
+        source: BackupSource,
+        stream: BinaryIO,
+        *,
+        backup_type: BackupType = BackupType.FULL,
+        retention_tier: RetentionTier = RetentionTier.DAILY,
+        parent_backup_id: Optional[str] = None,
+        tags: Optional[Dict[str, str]] = None,
+        now: Optional[datetime] = None,
+    ) -> BackupMetadata:
+        """Back up a binary stream chunk by chunk (read → checksum → encrypt → write)."""
         if backup_type is BackupType.INCREMENTAL and parent_backup_id is None:
             raise ValueError("Incremental backups require a parent_backup_id")
         if parent_backup_id and parent_backup_id not in self._metadata:
@@ -191,9 +553,26 @@ class BackupManager:
 
         now = now or datetime.now(timezone.utc)
         backup_id = self._generate_id(source, now)
-        body = _demo_encrypt(payload) if self.encrypt else payload
-        checksum = hashlib.sha256(payload).hexdigest()
-        size = self.primary.write(self._key(backup_id, source), body)
+        while backup_id in self._metadata:  # same-second nonce collision
+            backup_id = self._generate_id(source, now)
+        digest = hashlib.sha256()
+        size = 0
+
+        def hashed() -> Iterator[bytes]:
+            nonlocal size
+            for chunk in _read_chunks(stream, self.chunk_size):
+                digest.update(chunk)
+                size += len(chunk)
+                yield chunk
+
+        if self.dedup:
+            stored = self._write_chunked(self._key(backup_id, source), hashed())
+        else:
+            body: Iterator[bytes] = hashed()
+            if self.encrypt:
+                body = self._with_header(_map_ordered(self._cipher.apply, body, self.workers))
+            stored = self._write_stream(self.primary, self._key(backup_id, source), body)
+        checksum = digest.hexdigest()
 
         metadata = BackupMetadata(
             backup_id=backup_id,
@@ -207,26 +586,64 @@ class BackupManager:
             region=self.primary.region,
             parent_backup_id=parent_backup_id,
             tags=tags or {},
+            chunked=self.dedup,
+            stored_bytes=stored,
         )
-        self._metadata[backup_id] = metadata
-        self._persist_manifest()
-        logger.info("Backup %s created (%s, %d bytes)", backup_id, source.value, size)
+        self._index(metadata)
+        logger.info("Backup %s created (%s, %d bytes, %d stored)", backup_id, source.value, size, stored)
         return metadata
 
     def restore(self, backup_id: str) -> bytes:
         """Read + decrypt + verify a backup, returning the original payload."""
+        return b"".join(self.restore_stream(backup_id))
+
+    def restore_stream(self, backup_id: str) -> Iterator[bytes]:
+        """Yield the decrypted payload chunk by chunk.
+
+        The checksum can only be verified once the last chunk has been
+        read, so a mismatch raises RuntimeError at the end of iteration;
+        consumers writing to a final destination should stage the output
+        (see restore_file).
+        """
         metadata = self._metadata.get(backup_id)
         if metadata is None:
             raise KeyError(f"Unknown backup: {backup_id}")
-        body = self.primary.read(self._key(backup_id, metadata.source))
-        payload = _demo_decrypt(body) if metadata.encrypted else body
-        actual_checksum = hashlib.sha256(payload).hexdigest()
+        if metadata.chunked:
+            body = self._read_chunked(metadata)
+        else:
+            body = self._read_stream(self.primary, self._key(backup_id, metadata.source))
+            if metadata.encrypted:
+                body = _map_ordered(self._cipher.apply, self._strip_header(body), self.workers)
+        digest = hashlib.sha256()
+        for chunk in body:
+            digest.update(chunk)
+            yield chunk
+        actual_checksum = digest.hexdigest()
         if actual_checksum != metadata.checksum_sha256:
             raise RuntimeError(
                 f"Checksum mismatch for {backup_id}: "
                 f"expected {metadata.checksum_sha256}, got {actual_checksum}"
             )
-        return payload
+
+    def restore_file(self, backup_id: str, path: Path) -> int:
+        """Restore to `path` via a temp file; `path` is only replaced once verified."""
+        path = Path(path)
+        tmp = path.with_name(path.name + ".partial")
+        written = 0
+        try:
+            with open(tmp, "wb") as fh:
+                for chunk in self.restore_stream(backup_id):
+                    fh.write(chunk)
+                    written += len(chunk)
+            os.replace(tmp, path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        return written
+
+    def verify(self, backup_id: str) -> int:
+        """Read, decrypt and checksum a backup without keeping it; returns payload bytes."""
+        return sum(len(chunk) for chunk in self.restore_stream(backup_id))
 
     def replicate(self, backup_id: str) -> None:
         """Copy a backup to the configured replica storage."""
@@ -236,10 +653,20 @@ class BackupManager:
         if metadata is None:
             raise KeyError(f"Unknown backup: {backup_id}")
         key = self._key(backup_id, metadata.source)
+        if metadata.chunked:
+            # Only chunks the replica doesn't hold yet; the recipe goes last
+            # so a replica recipe never points at missing chunks.
+            index = self._chunk_index()
+            for chunk_key, _ in self._read_recipe(metadata):
+                if chunk_key not in index.replicated:
+                    self.primary.copy_to(chunk_key, self.replica)
+                    index.replicated.add(chunk_key)
         self.primary.copy_to(key, self.replica)
         if self.replica.region not in metadata.replicated_regions:
             metadata.replicated_regions.append(self.replica.region)
-        self._persist_manifest()
+            if self._manifest is not None:
+                self._manifest.put(metadata)
+                self._manifest.maybe_compact(self._metadata)
         logger.info("Backup %s replicated to %s", backup_id, self.replica.region)
 
     def list_backups(
@@ -260,71 +687,168 @@ class BackupManager:
         return self._metadata[backup_id]
 
     def prune_expired(self, now: Optional[datetime] = None) -> List[str]:
-        """Delete backups past their retention horizon. Returns removed IDs."""
+        """Delete backups past their retention horizon. Returns removed IDs.
+
+        Only the expired prefix of the expiry heap is visited, so the cost
+        is proportional to what gets pruned, not to the manifest size.
+        """
         now = now or datetime.now(timezone.utc)
+        cutoff = now.timestamp()
         removed: List[str] = []
-        for backup_id, metadata in list(self._metadata.items()):
-            if metadata.is_expired(now):
-                self.primary.delete(self._key(backup_id, metadata.source))
-                if self.replica is not None:
-                    try:
-                        self.replica.delete(self._key(backup_id, metadata.source))
-                    except Exception:  # pragma: no cover - best effort
-                        logger.warning("Failed to prune replica copy of %s", backup_id)
-                self._metadata.pop(backup_id)
-                removed.append(backup_id)
+        while self._expiry and self._expiry[0][0] <= cutoff:
+            _, backup_id = heapq.heappop(self._expiry)
+            metadata = self._metadata.get(backup_id)
+            if metadata is None:
+                continue
+            recipe: Recipe = []
+            if metadata.chunked:
+                index = self._chunk_index()  # built while this recipe still exists
+                recipe = self._read_recipe(metadata, missing_ok=True)
+            # The recipe is deleted before its chunks: a crash in between
+            # leaks unreferenced chunks (see collect_garbage) rather than
+            # leaving a recipe that points at deleted ones.
+            self._delete_object(self._key(backup_id, metadata.source), backup_id)
+            if recipe:
+                for chunk_key in index.release(recipe):
+                    self._delete_object(chunk_key, backup_id, replica=chunk_key in index.replicated)
+                    index.replicated.discard(chunk_key)
+            self._metadata.pop(backup_id)
+            removed.append(backup_id)
         if removed:
-            self._persist_manifest()
+            # Objects go first: a crash before this append leaves entries
+            # that the next prune removes again (deletes are idempotent).
+            if self._manifest is not None:
+                self._manifest.delete_many(removed)
+                self._manifest.maybe_compact(self._metadata)
             logger.info("Pruned %d expired backups", len(removed))
         return removed
 
+    def collect_garbage(self) -> List[str]:
+        """Delete chunks in primary storage that no recipe references."""
+        index = self._chunk_index()
+        orphans = [key for key in self.primary.list(self._CHUNK_PREFIX) if key not in index.refs]
+        for key in orphans:
+            self.primary.delete(key)
+        if orphans:
+            logger.info("Removed %d unreferenced chunks", len(orphans))
+        return orphans
+
+    def dedup_stats(self) -> Dict[str, float]:
+        """Payload bytes referenced by chunked backups vs. unique chunk bytes stored."""
+        index = self._chunk_index()
+        stored = index.stored_bytes
+        return {
+            "logical_bytes": index.logical_bytes,
+            "stored_bytes": stored,
+            "unique_chunks": len(index.refs),
+            "dedup_ratio": index.logical_bytes / stored if stored else 1.0,
+        }
+
     def to_json(self) -> str:
         """Serialize the metadata index (suitable for a manifest file)."""
-        items = []
-        for metadata in self._metadata.values():
-            items.append({
-                "backup_id": metadata.backup_id,
-                "source": metadata.source.value,
-                "backup_type": metadata.backup_type.value,
-                "retention_tier": metadata.retention_tier.value,
-                "size_bytes": metadata.size_bytes,
-                "checksum_sha256": metadata.checksum_sha256,
-                "encrypted": metadata.encrypted,
-                "created_at": metadata.created_at.isoformat(),
-                "region": metadata.region,
-                "replicated_regions": list(metadata.replicated_regions),
-                "parent_backup_id": metadata.parent_backup_id,
-                "tags": dict(metadata.tags),
-            })
+        items = [_metadata_to_dict(metadata) for metadata in self._metadata.values()]
         return json.dumps({"backups": items}, indent=2)
 
     # -- internals -----------------------------------------------------
 
-    def _persist_manifest(self) -> None:
-        if self.manifest_path is None:
-            return
-        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
-        self.manifest_path.write_text(self.to_json())
-
-    def _load_manifest(self) -> None:
-        assert self.manifest_path is not None
-        data = json.loads(self.manifest_path.read_text())
-        for item in data.get("backups", []):
-            metadata = BackupMetadata(
-                backup_id=item["backup_id"],
-                source=BackupSource(item["source"]),
-                backup_type=BackupType(item["backup_type"]),
-                retention_tier=RetentionTier(item["retention_tier"]),
-                size_bytes=item["size_bytes"],
-                checksum_sha256=item["checksum_sha256"],
-                encrypted=item["encrypted"],
-                created_at=datetime.fromisoformat(item["created_at"]),
-                region=item["region"],
-                replicated_regions=list(item.get("replicated_regions", [])),
-                parent_backup_id=item.get("parent_backup_id"),
-                tags=dict(item.get("tags", {})),
-            )
-            self._metadata[metadata.backup_id] = metadata
+    @staticmethod
+    def _with_header(chunks: Iterable[bytes]) -> Iterator[bytes]:
+        yield _DEMO_HEADER
+        yield from chunks
+
+    @staticmethod
+    def _strip_header(chunks: Iterable[bytes]) -> Iterator[bytes]:
+        stream = iter(chunks)
+        head = b""
+        for chunk in stream:
+            head += chunk
+            if len(head) >= len(_DEMO_HEADER):
+                break
+        if not head.startswith(_DEMO_HEADER):
+            raise ValueError("Payload is not encrypted with the demo cipher")
+        if len(head) > len(_DEMO_HEADER):
+            yield head[len(_DEMO_HEADER):]
+        yield from stream
+
+    _CHUNK_PREFIX = "chunks/"
+
+    def _chunk_key(self, chunk: bytes) -> str:
+        # Encrypted and plain copies of the same content are separate objects.
+        digest = hashlib.sha256(chunk).hexdigest()
+        mode = "enc" if self.encrypt else "raw"
+        return f"{self._CHUNK_PREFIX}{mode}/{digest[:2]}/{digest}"
+
+    def _chunk_index(self) -> ChunkIndex:
+        if self._chunks is None:
+            index = ChunkIndex()
+            region = self.replica.region if self.replica is not None else None
+            for metadata in self._metadata.values():
+                if metadata.chunked:
+                    index.add(self._read_recipe(metadata, missing_ok=True), replicated=region in metadata.replicated_regions)
+            self._chunks = index
+        return self._chunks
+
+    def _write_chunked(self, key: str, blocks: Iterable[bytes]) -> int:
+        """Store new chunks, then the recipe; returns bytes actually written."""
+        index = self._chunk_index()
+        recipe: Recipe = []
+        written = 0
+        fresh: Set[str] = set()
+        for chunk in self.chunker.split(blocks):
+            chunk_key = self._chunk_key(chunk)
+            if chunk_key not in index.refs and chunk_key not in fresh:
+                body = _DEMO_HEADER + self._cipher.apply(chunk) if self.encrypt else chunk
+                written += self.primary.write(chunk_key, body)
+                fresh.add(chunk_key)
+            recipe.append((chunk_key, len(chunk)))
+        written += self.primary.write(key, json.dumps({"chunks": recipe}).encode("utf-8"))
+        index.add(recipe)
+        return written
+
+    def _read_recipe(self, metadata: BackupMetadata, *, missing_ok: bool = False) -> Recipe:
+        try:
+            data = self.primary.read(self._key(metadata.backup_id, metadata.source))
+        except (FileNotFoundError, KeyError):
+            if not missing_ok:
+                raise
+            # Recipe already deleted by an interrupted prune.
+            logger.warning("Recipe for %s is missing", metadata.backup_id)
+            return []
+        return [(key, size) for key, size in json.loads(data)["chunks"]]
+
+    def _read_chunked(self, metadata: BackupMetadata) -> Iterator[bytes]:
+        for chunk_key, _ in self._read_recipe(metadata):
+            blob = self.primary.read(chunk_key)
+            if metadata.encrypted:
+                if not blob.startswith(_DEMO_HEADER):
+                    raise ValueError("Payload is not encrypted with the demo cipher")
+                blob = self._cipher.apply(blob[len(_DEMO_HEADER):])
+            yield blob
+
+    def _delete_object(self, key: str, backup_id: str, *, replica: bool = True) -> None:
+        self.primary.delete(key)
+        if self.replica is not None and replica:
+            try:
+                self.replica.delete(key)
+            except Exception:  # pragma: no cover - best effort
+                logger.warning("Failed to prune replica copy of %s", backup_id)
+
+    def _write_stream(self, storage: StorageBackend, key: str, chunks: Iterable[bytes]) -> int:
+        if hasattr(storage, "write_stream"):
+            return storage.write_stream(key, chunks)
+        return storage.write(key, b"".join(chunks))
+
+    def _read_stream(self, storage: StorageBackend, key: str) -> Iterator[bytes]:
+        if hasattr(storage, "read_stream"):
+            return storage.read_stream(key, self.chunk_size)
+        return iter((storage.read(key),))
+
+    def _index(self, metadata: BackupMetadata) -> None:
+        self._metadata[metadata.backup_id] = metadata
+        heapq.heappush(self._expiry, (metadata.expires_at().timestamp(), metadata.backup_id))
+        if self._manifest is not None:
+            self._manifest.put(metadata)
+            self._manifest.maybe_compact(self._metadata)
 
     @staticmethod
     def _generate_id(source: BackupSource, now: datetime) -> str:
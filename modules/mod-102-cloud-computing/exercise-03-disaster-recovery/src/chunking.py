@@ -0,0 +1,145 @@
+"""
+Content-Defined Chunking
+
+Splits a byte stream into variable-size chunks whose boundaries depend
+on the content, not on offsets, so an insertion or edit only changes
+the chunks around it and everything after re-synchronizes. Used by
+BackupManager's dedup mode to store each distinct chunk once.
+
+Boundaries come from a 32-bit gear rolling hash over the last 32 bytes
+(`h = (h << 1) + GEAR[byte]`): position p ends a chunk when the top
+bits of the hash at p are zero, subject to min/max chunk sizes.
+
+numpy, when installed, computes the hash for a whole read block at
+once (log2(32) shift-and-add passes); otherwise a pure-Python loop is
+used. Both produce identical boundaries, so chunk indexes stay valid
+whichever one wrote them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from bisect import bisect_left
+from typing import Iterable, Iterator, List
+
+try:
+    import numpy as np
+except ImportError:  # pure-Python hashing: same boundaries, ~30x slower
+    np = None
+
+
+_WINDOW = 32
+_MASK32 = 0xFFFFFFFF
+
+# Fixed table: boundaries must not change between runs or releases.
+GEAR: List[int] = [
+    int.from_bytes(hashlib.sha256(b"gear" + bytes([i])).digest()[:4], "little") for i in range(256)
+]
+
+
+class ContentDefinedChunker:
+    """Gear-hash chunker with min / average / max chunk sizes.
+
+    `avg_size` must be a power of two; chunks average roughly
+    `min_size + avg_size` bytes on random data.
+    """
+
+    def __init__(
+        self,
+        min_size: int = 16 * 1024,
+        avg_size: int = 64 * 1024,
+        max_size: int = 256 * 1024,
+    ):
+        if avg_size & (avg_size - 1) or not _WINDOW <= min_size < max_size:
+            raise ValueError(
+                f"need avg_size a power of two and {_WINDOW} <= min_size < max_size"
+            )
+        self.min_size = min_size
+        self.avg_size = avg_size
+        self.max_size = max_size
+        # Boundary when the top log2(avg_size) bits of the hash are zero
+        # (the top bits are the ones that depend on the whole window).
+        self._limit = 1 << (33 - avg_size.bit_length())
+
+    def split(self, blocks: Iterable[bytes]) -> Iterator[bytes]:
+        """Re-chunk a stream of arbitrary read blocks at content boundaries."""
+        buf = b""
+        blocks = iter(blocks)
+        eof = False
+        while not eof:
+            block = next(blocks, None)
+            if block is None:
+                eof = True
+            elif not block:
+                continue
+            else:
+                buf = buf + block if buf else block
+                if len(buf) < self.max_size:
+                    continue
+            # buf always starts at a chunk start, and candidates closer
+            # than min_size (>= the window) to it are never used, so the
+            # hash is never needed for bytes from before the buffer.
+            candidates = self._candidates(buf)
+            start = 0
+            while start < len(buf):
+                hi = start + self.max_size
+                i = bisect_left(candidates, start + self.min_size - 1)
+                if i < len(candidates) and candidates[i] < hi:
+                    end = candidates[i] + 1
+                elif len(buf) >= hi:
+                    end = hi
+                elif eof:
+                    end = len(buf)
+                else:
+                    break
+                yield buf[start:end]
+                start = end
+            buf = buf[start:]
+
+    def chunks(self, data: bytes) -> List[bytes]:
+        return list(self.split((data,)))
+
+    def _candidates(self, buf: bytes) -> List[int]:
+        """Positions p whose gear hash (window ending at p) is below the boundary limit."""
+        if np is not None:
+            return self._candidates_numpy(buf)
+        limit = self._limit
+        gear = GEAR
+        h = 0
+        found = []
+        for p, byte in enumerate(buf):
+            h = ((h << 1) + gear[byte]) & _MASK32
+            if h < limit:
+                found.append(p)
+        return found
+
+    def _candidates_numpy(self, buf: bytes) -> List[int]:
+        gear = _gear_array()
+        found: List[int] = []
+        # Small segments keep the temporaries in cache (~2x faster than
+        # 1 MiB ones); each segment carries a window of context.
+        segment = 1 << 16
+        limit = np.uint32(self._limit)
+        for lo in range(0, len(buf), segment):
+            ctx = max(0, lo - _WINDOW + 1)
+            data = np.frombuffer(buf, dtype=np.uint8, count=min(len(buf), lo + segment) - ctx, offset=ctx)
+            h = gear[data]
+            shift = 1
+            while shift < _WINDOW:
+                # h[i] += h[i - shift] << shift: after log2(window) passes
+                # h[i] = sum_k GEAR[b[i-k]] << k over the window, as the
+                # sequential recurrence gives mod 2**32.
+                h[shift:] += h[:-shift] << np.uint32(shift)
+                shift <<= 1
+            found.extend((np.flatnonzero(h[lo - ctx:] < limit) + lo).tolist())
+        return found
+
+
+_GEAR_ARRAY = None
+
+
+def _gear_array():
+    global _GEAR_ARRAY
+    if _GEAR_ARRAY is None:
+        _GEAR_ARRAY = np.array(GEAR, dtype=np.uint32)
+    return _GEAR_ARRAY
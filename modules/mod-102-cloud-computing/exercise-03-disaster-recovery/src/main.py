@@ -48,21 +48,22 @@ class _AlwaysHealthy:
         return HealthCheckResult(service=service, healthy=True, response_time_ms=12.0)
 
 
-def _make_manager(base: Path, replica_region: str = "us-west-2") -> BackupManager:
+def _make_manager(base: Path, replica_region: str = "us-west-2", dedup: bool = False) -> BackupManager:
     primary = LocalStorageBackend(root=base / "primary", region="us-east-1")
     replica = LocalStorageBackend(root=base / "replica", region=replica_region)
     manifest = base / "manifest.json"
-    return BackupManager(primary, replica_storage=replica, manifest_path=manifest)
+    return BackupManager(primary, replica_storage=replica, manifest_path=manifest, dedup=dedup)
 
 
 @click.group()
 @click.option("--store", "store", default=".dr-store", type=click.Path(file_okay=False))
+@click.option("--dedup/--no-dedup", default=False, help="Store new backups as deduplicated chunks.")
 @click.pass_context
-def cli(ctx: click.Context, store: str) -> None:
+def cli(ctx: click.Context, store: str, dedup: bool) -> None:
     """Disaster Recovery System CLI."""
     ctx.ensure_object(dict)
     ctx.obj["store_path"] = Path(store)
-    ctx.obj["manager"] = _make_manager(Path(store))
+    ctx.obj["manager"] = _make_manager(Path(store), dedup=dedup)
 
 
 @cli.command()
@@ -82,22 +83,22 @@ def backup(
 ) -> None:
     """Back up a file as the given source type."""
     manager: BackupManager = ctx.obj["manager"]
-    payload = Path(input_path).read_bytes()
     tag_dict: Dict[str, str] = {}
     for entry in tags:
         if "=" not in entry:
             raise click.UsageError(f"Tag entries must be key=value, got {entry!r}")
         k, v = entry.split("=", 1)
         tag_dict[k] = v
-    metadata = manager.backup(
+    metadata = manager.backup_file(
         BackupSource(source),
-        payload,
+        Path(input_path),
         retention_tier=RetentionTier(retention),
         tags=tag_dict,
     )
     if replicate:
         manager.replicate(metadata.backup_id)
-    click.echo(f"Backup {metadata.backup_id} created ({metadata.size_bytes} bytes)")
+    stored = f", {metadata.stored_bytes} new bytes written" if metadata.chunked else ""
+    click.echo(f"Backup {metadata.backup_id} created ({metadata.size_bytes} bytes{stored})")
     click.echo(f"Checksum: {metadata.checksum_sha256[:16]}...")
     click.echo(f"Replicated regions: {metadata.replicated_regions or '[]'}")
 
@@ -112,9 +113,8 @@ def restore(ctx: click.Context, source: str, output: str, target_time: str | Non
     manager: BackupManager = ctx.obj["manager"]
     recovery = RecoveryManager(manager, _AlwaysHealthy())
     when = datetime.fromisoformat(target_time) if target_time else None
-    payload = recovery.restore(BackupSource(source), target_time=when)
-    Path(output).write_bytes(payload)
-    click.echo(f"Restored {len(payload)} bytes to {output}")
+    recovery.restore_file(BackupSource(source), Path(output), target_time=when)
+    click.echo(f"Restored {Path(output).stat().st_size} bytes to {output}")
 
 
 @cli.command()
@@ -10,7 +10,7 @@ Coordinates the disaster-recovery side of the system:
 - A notification hook callers wire into PagerDuty / Slack / email.
 
 The recovery manager talks to the backup manager via its public API
-(get / restore / list_backups). It does not write to backup storage
+(get / restore / verify / list_backups). It does not write to backup storage
 directly.
 """
 
@@ -21,6 +21,7 @@ import time
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from enum import Enum
+from pathlib import Path
 from typing import Callable, Dict, List, Optional, Protocol
 
 from .backup_manager import (
@@ -181,6 +182,28 @@ class RecoveryManager:
         target_time: Optional[datetime] = None,
     ) -> bytes:
         """Point-in-time restore: pick the most recent backup not after target_time."""
+        chosen = self.select_backup(source, target_time)
+        logger.info("Restoring %s from backup %s", source.value, chosen.backup_id)
+        return self.backups.restore(chosen.backup_id)
+
+    def restore_file(
+        self,
+        source: BackupSource,
+        path: Path,
+        target_time: Optional[datetime] = None,
+    ) -> BackupMetadata:
+        """Point-in-time restore streamed to `path` (bounded memory)."""
+        chosen = self.select_backup(source, target_time)
+        logger.info("Restoring %s from backup %s to %s", source.value, chosen.backup_id, path)
+        self.backups.restore_file(chosen.backup_id, path)
+        return chosen
+
+    def select_backup(
+        self,
+        source: BackupSource,
+        target_time: Optional[datetime] = None,
+    ) -> BackupMetadata:
+        """Most recent backup for `source` not after target_time."""
         candidates = sorted(
             self.backups.list_backups(source=source),
             key=lambda m: m.created_at,
@@ -194,9 +217,7 @@ class RecoveryManager:
                 raise LookupError(
                     f"No backups for source {source.value} at or before {target_time.isoformat()}"
                 )
-        chosen = candidates[0]
-        logger.info("Restoring %s from backup %s", source.value, chosen.backup_id)
-        return self.backups.restore(chosen.backup_id)
+        return candidates[0]
 
     def run_drill(
         self,
@@ -219,9 +240,9 @@ class RecoveryManager:
             raise LookupError(f"No backups for source {source.value}")
         backup = backups_for_source[0]
 
-        # Measure restore duration as the achieved RTO.
+        # Measure restore duration (read + decrypt + verify) as the achieved RTO.
         rto_start = time.perf_counter()
-        self.backups.restore(backup.backup_id)
+        self.backups.verify(backup.backup_id)
         achieved_rto = timedelta(seconds=time.perf_counter() - rto_start)
         # RPO = gap between "now" and the backup's creation time.
         achieved_rpo = max(now - backup.created_at, timedelta(0))
@@ -10,10 +10,13 @@ from src.backup_manager import (
     BackupSource,
     BackupType,
     LocalStorageBackend,
+    ManifestJournal,
     RetentionTier,
+    _DemoCipher,
     _demo_decrypt,
     _demo_encrypt,
 )
+from src.chunking import ContentDefinedChunker
 
 
 @pytest.fixture
@@ -70,13 +73,20 @@ class TestDemoEncryption:
         with pytest.raises(ValueError):
             _demo_decrypt(b"plain text")
 
+    def test_chunked_apply_matches_one_shot(self):
+        cipher = _DemoCipher()
+        data = bytes(range(256)) * 7
+        chunks = [cipher.apply(data[i:i + 40], i) for i in range(0, len(data), 40)]
+        assert b"".join(chunks) == cipher.apply(data)
+
 
 class TestBackupManager:
     def test_full_backup_round_trip(self, manager: BackupManager):
         metadata = manager.backup(BackupSource.DATABASE, PAYLOAD)
         assert metadata.backup_type is BackupType.FULL
         assert metadata.encrypted is True
-        assert metadata.size_bytes > len(PAYLOAD)  # encrypted header + body
+        assert metadata.size_bytes == len(PAYLOAD)
+        assert metadata.stored_bytes > len(PAYLOAD)  # encrypted header + body
         restored = manager.restore(metadata.backup_id)
         assert restored == PAYLOAD
 
@@ -127,6 +137,14 @@ class TestBackupManager:
         with pytest.raises(RuntimeError, match="Checksum mismatch"):
             manager.restore(metadata.backup_id)
 
+    def test_backup_id_collision_is_retried(self, manager: BackupManager, monkeypatch):
+        first = manager.backup(BackupSource.DATABASE, b"a")
+        ids = iter([first.backup_id, "database-unique"])
+        monkeypatch.setattr(BackupManager, "_generate_id", staticmethod(lambda source, now: next(ids)))
+        second = manager.backup(BackupSource.DATABASE, b"b")
+        assert second.backup_id == "database-unique"
+        assert manager.restore(first.backup_id) == b"a"
+
     def test_list_filters_by_source_and_tier(self, manager: BackupManager):
         manager.backup(BackupSource.DATABASE, b"a", retention_tier=RetentionTier.DAILY)
         manager.backup(BackupSource.DATABASE, b"b", retention_tier=RetentionTier.WEEKLY)
@@ -154,3 +172,265 @@ class TestBackupManager:
         import json
         manifest = json.loads(manager.to_json())
         assert len(manifest["backups"]) == 2
+
+
+class _BytesOnlyBackend:
+    """Storage without write_stream/read_stream (e.g. a thin cloud client)."""
+
+    region = "bytes-only"
+
+    def __init__(self):
+        self.objects = {}
+
+    def write(self, key, data):
+        self.objects[key] = data
+        return len(data)
+
+    def read(self, key):
+        return self.objects[key]
+
+    def delete(self, key):
+        self.objects.pop(key, None)
+
+    def list(self, prefix=""):
+        return [k for k in self.objects if k.startswith(prefix)]
+
+    def copy_to(self, key, destination):
+        return destination.write(key, self.objects[key])
+
+
+class TestStreaming:
+    BIG = bytes(range(251)) * 400  # ~100 KB, not a multiple of the chunk size
+
+    @pytest.mark.parametrize("workers", [1, 3])
+    def test_small_chunks_round_trip(self, primary, workers):
+        manager = BackupManager(primary, chunk_size=1000, workers=workers)
+        metadata = manager.backup(BackupSource.DATABASE, self.BIG)
+        assert metadata.size_bytes == len(self.BIG)
+        assert metadata.stored_bytes == len(_demo_encrypt(self.BIG))
+        assert manager.restore(metadata.backup_id) == self.BIG
+
+    def test_stored_object_matches_one_shot_encryption(self, primary):
+        manager = BackupManager(primary, chunk_size=1000, workers=2)
+        metadata = manager.backup(BackupSource.DATABASE, self.BIG)
+        stored = primary.read(BackupManager._key(metadata.backup_id, metadata.source))
+        assert stored == _demo_encrypt(self.BIG)
+
+    def test_backup_file_and_restore_file(self, primary, tmp_path):
+        source = tmp_path / "dump.bin"
+        source.write_bytes(self.BIG)
+        manager = BackupManager(primary, chunk_size=4096)
+        metadata = manager.backup_file(BackupSource.PERSISTENT_VOLUME, source)
+        target = tmp_path / "restored.bin"
+        assert manager.restore_file(metadata.backup_id, target) == len(self.BIG)
+        assert target.read_bytes() == self.BIG
+        assert not (tmp_path / "restored.bin.partial").exists()
+
+    def test_restore_file_keeps_destination_on_checksum_mismatch(self, manager, tmp_path):
+        metadata = manager.backup(BackupSource.DATABASE, PAYLOAD)
+        key = BackupManager._key(metadata.backup_id, metadata.source)
+        manager.primary.write(key, b"DEMO-ENC:v1\nGARBAGE")
+        target = tmp_path / "restored.bin"
+        target.write_bytes(b"previous")
+        with pytest.raises(RuntimeError, match="Checksum mismatch"):
+            manager.restore_file(metadata.backup_id, target)
+        assert target.read_bytes() == b"previous"
+        assert not (tmp_path / "restored.bin.partial").exists()
+
+    def test_verify_returns_payload_size(self, manager):
+        metadata = manager.backup(BackupSource.DATABASE, self.BIG)
+        assert manager.verify(metadata.backup_id) == len(self.BIG)
+
+    def test_backend_without_stream_methods(self):
+        storage = _BytesOnlyBackend()
+        manager = BackupManager(storage, chunk_size=1000)
+        metadata = manager.backup(BackupSource.ETCD, self.BIG)
+        assert storage.objects[BackupManager._key(metadata.backup_id, metadata.source)] == _demo_encrypt(self.BIG)
+        assert manager.restore(metadata.backup_id) == self.BIG
+
+    def test_copy_to_streams_between_local_backends(self, primary, replica):
+        primary.write("a/b.bin", self.BIG)
+        assert primary.copy_to("a/b.bin", replica) == len(self.BIG)
+        assert replica.read("a/b.bin") == self.BIG
+
+
+class TestManifestJournal:
+    @pytest.fixture
+    def manifest_path(self, tmp_path: Path) -> Path:
+        return tmp_path / "manifest.json"
+
+    def test_backups_survive_reload(self, primary, replica, manifest_path):
+        manager = BackupManager(primary, replica_storage=replica, manifest_path=manifest_path)
+        first = manager.backup(BackupSource.DATABASE, b"a")
+        manager.backup(BackupSource.ETCD, b"b", tags={"env": "prod"})
+        manager.replicate(first.backup_id)
+        reloaded = BackupManager(primary, manifest_path=manifest_path)
+        assert reloaded.to_json() == manager.to_json()
+        assert reloaded.get(first.backup_id).replicated_regions == ["us-west-2"]
+        assert reloaded.restore(first.backup_id) == b"a"
+
+    def test_each_backup_appends_one_record(self, primary, manifest_path):
+        manager = BackupManager(primary, manifest_path=manifest_path)
+        for i in range(5):
+            manager.backup(BackupSource.DATABASE, bytes([i]))
+        assert len(manifest_path.read_text().splitlines()) == 5
+
+    def test_prune_is_persisted(self, primary, manifest_path):
+        manager = BackupManager(primary, manifest_path=manifest_path)
+        old = manager.backup(BackupSource.DATABASE, b"old",
+                             now=datetime.now(timezone.utc) - timedelta(days=30))
+        new = manager.backup(BackupSource.DATABASE, b"new")
+        assert manager.prune_expired() == [old.backup_id]
+        assert manager.prune_expired() == []
+        reloaded = BackupManager(primary, manifest_path=manifest_path)
+        assert [m.backup_id for m in reloaded.list_backups()] == [new.backup_id]
+
+    def test_prune_visits_backups_in_expiry_order(self, primary):
+        manager = BackupManager(primary)
+        base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        yearly = manager.backup(BackupSource.ETCD, b"y", retention_tier=RetentionTier.YEARLY, now=base)
+        daily = manager.backup(BackupSource.ETCD, b"d", retention_tier=RetentionTier.DAILY, now=base)
+        assert manager.prune_expired(now=base + timedelta(days=8)) == [daily.backup_id]
+        assert manager.prune_expired(now=base + timedelta(days=400)) == [yearly.backup_id]
+
+    def test_torn_final_record_is_dropped(self, primary, manifest_path):
+        manager = BackupManager(primary, manifest_path=manifest_path)
+        kept = manager.backup(BackupSource.DATABASE, b"a")
+        intact = manifest_path.read_bytes()
+        with open(manifest_path, "ab") as fh:
+            fh.write(b'{"op": "put", "backup": {"backup_id": "database-2')
+        reloaded = BackupManager(primary, manifest_path=manifest_path)
+        assert [m.backup_id for m in reloaded.list_backups()] == [kept.backup_id]
+        assert manifest_path.read_bytes() == intact
+        reloaded.backup(BackupSource.DATABASE, b"b")
+        assert len(BackupManager(primary, manifest_path=manifest_path).list_backups()) == 2
+
+    def test_corrupt_record_before_the_end_raises(self, primary, manifest_path):
+        manager = BackupManager(primary, manifest_path=manifest_path)
+        manager.backup(BackupSource.DATABASE, b"a")
+        with open(manifest_path, "ab") as fh:
+            fh.write(b"not json\n")
+        manager.backup(BackupSource.DATABASE, b"b")
+        with pytest.raises(ValueError, match="Corrupt manifest record"):
+            BackupManager(primary, manifest_path=manifest_path)
+
+    def test_legacy_document_is_converted(self, primary, manifest_path):
+        manager = BackupManager(primary)
+        manager.backup(BackupSource.DATABASE, b"a")
+        manager.backup(BackupSource.ETCD, b"b")
+        manifest_path.write_text(manager.to_json())
+        reloaded = BackupManager(primary, manifest_path=manifest_path)
+        assert reloaded.to_json() == manager.to_json()
+        assert all(line.startswith('{"op": "put"') for line in manifest_path.read_text().splitlines())
+
+    def test_compaction_drops_superseded_records(self, primary, manifest_path, monkeypatch):
+        monkeypatch.setattr(ManifestJournal, "COMPACT_MIN_RECORDS", 4)
+        manager = BackupManager(primary, manifest_path=manifest_path)
+        base = datetime.now(timezone.utc) - timedelta(days=10)
+        for i in range(3):
+            manager.backup(BackupSource.DATABASE, bytes([i]), now=base)
+        keep = manager.backup(BackupSource.DATABASE, b"keep", retention_tier=RetentionTier.YEARLY)
+        manager.prune_expired()
+        lines = manifest_path.read_text().splitlines()
+        assert len(lines) == 1 and keep.backup_id in lines[0]
+        assert [m.backup_id for m in BackupManager(primary, manifest_path=manifest_path).list_backups()] == [
+            keep.backup_id
+        ]
+        assert not manifest_path.with_name("manifest.json.compact").exists()
+
+
+class TestDedup:
+    @staticmethod
+    def _manager(storage, replica=None, **kwargs) -> BackupManager:
+        chunker = ContentDefinedChunker(min_size=256, avg_size=1024, max_size=4096)
+        return BackupManager(storage, replica_storage=replica, dedup=True, chunker=chunker, **kwargs)
+
+    @staticmethod
+    def _payload(seed: int = 0, size: int = 60_000) -> bytes:
+        import random
+        return random.Random(seed).randbytes(size)
+
+    @staticmethod
+    def _chunk_files(storage: LocalStorageBackend) -> list:
+        return sorted(storage.list("chunks/"))
+
+    @pytest.mark.parametrize("encrypt", [True, False])
+    def test_round_trip(self, primary, encrypt):
+        manager = self._manager(primary, encrypt=encrypt)
+        payload = self._payload()
+        metadata = manager.backup(BackupSource.DATABASE, payload)
+        assert metadata.chunked
+        assert manager.restore(metadata.backup_id) == payload
+
+    @pytest.mark.parametrize("encrypt", [True, False])
+    def test_size_bytes_is_the_payload_in_both_modes(self, primary, encrypt):
+        payload = self._payload()
+        plain = BackupManager(primary, encrypt=encrypt).backup(BackupSource.DATABASE, payload)
+        chunked = self._manager(primary, encrypt=encrypt).backup(BackupSource.DATABASE, payload)
+        assert plain.size_bytes == chunked.size_bytes == len(payload)
+        assert plain.stored_bytes >= len(payload)
+        assert chunked.stored_bytes > 0
+
+    def test_mutated_backup_writes_only_new_chunks(self, primary):
+        manager = self._manager(primary)
+        payload = self._payload()
+        first = manager.backup(BackupSource.DATABASE, payload)
+        edited = payload[:30_000] + b"patched" + payload[30_100:]
+        second = manager.backup(BackupSource.DATABASE, edited)
+        assert second.size_bytes == len(edited)
+        assert second.stored_bytes < first.stored_bytes / 4
+        assert manager.restore(second.backup_id) == edited
+        assert manager.restore(first.backup_id) == payload
+        assert manager.dedup_stats()["dedup_ratio"] > 1.5
+
+    def test_index_rebuilt_after_reload(self, primary, tmp_path):
+        manifest = tmp_path / "manifest.json"
+        payload = self._payload()
+        self._manager(primary, manifest_path=manifest).backup(BackupSource.DATABASE, payload)
+        chunks = self._chunk_files(primary)
+        reloaded = self._manager(primary, manifest_path=manifest)
+        again = reloaded.backup(BackupSource.DATABASE, payload)
+        assert self._chunk_files(primary) == chunks
+        assert again.size_bytes == len(payload)
+        assert again.stored_bytes < 10_000  # recipe only
+        # Reading chunked backups doesn't require dedup on the reader.
+        plain_reader = BackupManager(primary, manifest_path=manifest)
+        assert plain_reader.restore(again.backup_id) == payload
+        assert plain_reader.get(again.backup_id).stored_bytes == again.stored_bytes
+
+    def test_prune_keeps_shared_chunks(self, primary, tmp_path):
+        manifest = tmp_path / "manifest.json"
+        manager = self._manager(primary, manifest_path=manifest)
+        payload = self._payload()
+        old = manager.backup(BackupSource.DATABASE, payload,
+                             now=datetime.now(timezone.utc) - timedelta(days=30))
+        new = manager.backup(BackupSource.DATABASE, payload[:40_000] + self._payload(1, 20_000))
+        # Fresh process: the chunk index is rebuilt during the prune.
+        manager = self._manager(primary, manifest_path=manifest)
+        assert manager.prune_expired() == [old.backup_id]
+        assert manager.restore(new.backup_id) == payload[:40_000] + self._payload(1, 20_000)
+        manager.prune_expired(now=datetime.now(timezone.utc) + timedelta(days=30))
+        assert self._chunk_files(primary) == []
+
+    def test_replication_copies_only_missing_chunks(self, primary, replica):
+        manager = self._manager(primary, replica)
+        payload = self._payload()
+        first = manager.backup(BackupSource.DATABASE, payload)
+        manager.replicate(first.backup_id)
+        assert self._chunk_files(replica) == self._chunk_files(primary)
+        copied = []
+        original = primary.copy_to
+        primary.copy_to = lambda key, dest: copied.append(key) or original(key, dest)
+        second = manager.backup(BackupSource.DATABASE, payload + b"tail")
+        manager.replicate(second.backup_id)
+        assert 1 <= len(copied) <= 4  # changed tail chunk(s) + recipe
+        restored = BackupManager(replica)
+        restored._metadata[second.backup_id] = manager.get(second.backup_id)
+        assert restored.restore(second.backup_id) == payload + b"tail"
+
+    def test_collect_garbage_removes_orphans(self, primary):
+        manager = self._manager(primary)
+        kept = manager.backup(BackupSource.DATABASE, self._payload())
+        primary.write("chunks/enc/ff/orphan", b"left by a failed backup")
+        assert manager.collect_garbage() == ["chunks/enc/ff/orphan"]
+        assert manager.restore(kept.backup_id) == self._payload()
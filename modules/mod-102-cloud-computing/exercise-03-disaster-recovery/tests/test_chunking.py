@@ -0,0 +1,56 @@
+"""Tests for content-defined chunking."""
+
+import random
+
+import pytest
+
+from src import chunking
+from src.chunking import ContentDefinedChunker
+
+
+def _data(size: int, seed: int = 0) -> bytes:
+    return random.Random(seed).randbytes(size)
+
+
+@pytest.fixture
+def chunker() -> ContentDefinedChunker:
+    return ContentDefinedChunker(min_size=256, avg_size=1024, max_size=4096)
+
+
+class TestContentDefinedChunker:
+    def test_chunks_reassemble_within_bounds(self, chunker):
+        data = _data(200_000)
+        chunks = chunker.chunks(data)
+        assert b"".join(chunks) == data
+        assert all(256 <= len(c) <= 4096 for c in chunks[:-1])
+        assert len(chunks) > 50
+
+    def test_boundaries_independent_of_read_size(self, chunker):
+        data = _data(100_000)
+        for block in (1, 333, 4096, 65536):
+            blocks = (data[i:i + block] for i in range(0, len(data), block))
+            assert list(chunker.split(blocks)) == chunker.chunks(data)
+
+    def test_insertion_only_changes_nearby_chunks(self, chunker):
+        data = _data(200_000)
+        edited = data[:50_000] + b"inserted bytes" + data[50_000:]
+        before, after = chunker.chunks(data), chunker.chunks(edited)
+        assert len(set(before) & set(after)) >= len(before) - 3
+
+    def test_uniform_data_falls_back_to_max_size(self, chunker):
+        assert [len(c) for c in chunker.chunks(bytes(10_000))] == [4096, 4096, 1808]
+
+    def test_empty_stream(self, chunker):
+        assert chunker.chunks(b"") == []
+
+    def test_numpy_and_pure_python_agree(self, chunker, monkeypatch):
+        pytest.importorskip("numpy")
+        data = _data(3_000_000)  # spans several numpy segments
+        vectorized = chunker.chunks(data)
+        monkeypatch.setattr(chunking, "np", None)
+        assert chunker.chunks(data) == vectorized
+
+    @pytest.mark.parametrize("sizes", [(16, 1024, 4096), (256, 1000, 4096), (4096, 1024, 4096)])
+    def test_invalid_sizes_rejected(self, sizes):
+        with pytest.raises(ValueError):
+            ContentDefinedChunker(*sizes)
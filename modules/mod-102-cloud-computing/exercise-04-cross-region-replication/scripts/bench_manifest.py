@@ -0,0 +1,120 @@
+"""
+Benchmark: replication planning (diff) and manifest writes.
+
+    python scripts/bench_manifest.py
+    python scripts/bench_manifest.py --keys 1000000 --changed 0.05
+
+Builds a manifest of `--keys` objects and a source listing where a
+`--changed` fraction has a new ETag and as many again are new, then
+times:
+
+- diff:    per-key `get` over a connection-per-call manifest (previous)
+           vs `Manifest.diff` (temp table + join, one connection)
+- upserts: one connection + commit per record (previous) vs
+           `upsert_many` in batches of `--batch`
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.backends import ObjectMeta  # noqa: E402
+from src.manifest import Manifest, ObjectRecord  # noqa: E402
+
+
+class LegacyManifest(Manifest):
+    """Previous behaviour: a fresh connection (and commit) per call."""
+
+    def __init__(self, path: str | Path) -> None:
+        self._path = Path(path)
+
+    @contextmanager
+    def _conn(self):
+        conn = sqlite3.connect(self._path)
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def upsert(self, rec: ObjectRecord) -> None:
+        with self._conn() as c:
+            c.execute("INSERT OR REPLACE INTO objects VALUES (?,?,?,?,?,?)",
+                      (rec.key, rec.src_etag, rec.src_size, rec.dst_etag, rec.sha256, rec.last_synced_at))
+
+    def close(self) -> None:
+        pass
+
+
+def legacy_diff(manifest: Manifest, listing: list[ObjectMeta]) -> dict[str, list[str]]:
+    new, updated, unchanged = [], [], []
+    for obj in listing:
+        rec = manifest.get(obj.key)
+        if rec is None:
+            new.append(obj.key)
+        elif rec.src_etag != obj.etag:
+            updated.append(obj.key)
+        else:
+            unchanged.append(obj.key)
+    return {"new": new, "updated": updated, "unchanged": unchanged}
+
+
+def record(i: int, etag: str = "e0") -> ObjectRecord:
+    return ObjectRecord(f"data/{i:09d}.parquet", etag, 1024, etag, "0" * 64, 0.0)
+
+
+def timed(label: str, fn):
+    t0 = time.perf_counter()
+    out = fn()
+    print(f"  {label:<44} {time.perf_counter() - t0:>8.2f}s")
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--keys", type=int, default=200_000)
+    parser.add_argument("--changed", type=float, default=0.01)
+    parser.add_argument("--writes", type=int, default=5_000, help="records for the upsert comparison")
+    parser.add_argument("--batch", type=int, default=500)
+    args = parser.parse_args()
+
+    step = max(1, round(1 / args.changed)) if args.changed else 0
+    listing = [ObjectMeta(f"data/{i:09d}.parquet", 1024, "e1" if step and i % step == 0 else "e0")
+               for i in range(args.keys)]
+    extra = args.keys // step if step else 0
+    listing += [ObjectMeta(f"data/{i:09d}.parquet", 1024, "e0") for i in range(args.keys, args.keys + extra)]
+    print(f"{args.keys:,} manifest rows, {len(listing):,} listed ({extra:,} updated, {extra:,} new)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "manifest.db"
+        with Manifest(path) as m:
+            m.upsert_many(record(i) for i in range(args.keys))
+
+        print("diff")
+        legacy = timed("per-key get, connection per call (previous)",
+                       lambda: legacy_diff(LegacyManifest(path), listing))
+        with Manifest(path) as m:
+            timed("per-key get, shared connection", lambda: legacy_diff(m, listing))
+            joined = timed("Manifest.diff (temp table + join)", lambda: m.diff(listing))
+        assert {k: sorted(v) for k, v in legacy.items()} == joined
+
+        print(f"upserts ({args.writes:,} records)")
+        recs = [record(i, "e2") for i in range(args.writes)]
+        legacy_m = LegacyManifest(path)
+        timed("upsert, connection + commit each (previous)", lambda: [legacy_m.upsert(r) for r in recs])
+        with Manifest(path) as m:
+            timed("upsert, shared connection, commit each", lambda: [m.upsert(r) for r in recs])
+            timed(f"upsert_many, {args.batch}/transaction",
+                  lambda: [m.upsert_many(recs[i:i + args.batch]) for i in range(0, len(recs), args.batch)])
+
+
+if __name__ == "__main__":
+    main()
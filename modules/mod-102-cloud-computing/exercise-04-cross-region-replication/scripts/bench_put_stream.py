@@ -0,0 +1,95 @@
+"""
+Benchmark: S3Backend.put_stream, single PUT vs multipart.
+
+    python scripts/bench_put_stream.py
+    python scripts/bench_put_stream.py --size-mb 1024 --conn-mbps 400 --concurrency 1 4 8 16
+
+No network: a simulated client charges every request `--rtt-ms` plus
+its body size at `--conn-mbps` (one cross-region TCP stream), and
+sleeps that long, so parallel part uploads overlap the way separate
+connections do. Peak memory is the tracemalloc high-water mark while
+streaming a `--size-mb` object in 1 MiB chunks.
+
+- single:       the previous path (b"".join(stream) + one put_object)
+- multipart:    part_size `--part-mb`, N concurrent part uploads
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.backends import MiB, S3Backend  # noqa: E402
+
+
+class SimulatedS3:
+    def __init__(self, rtt_s: float, conn_bytes_per_s: float) -> None:
+        self.rtt_s = rtt_s
+        self.rate = conn_bytes_per_s
+
+    def _send(self, body) -> int:
+        size = len(body.getbuffer()) if hasattr(body, "getbuffer") else len(body)
+        time.sleep(self.rtt_s + size / self.rate)
+        return size
+
+    def put_object(self, Bucket, Key, Body):
+        self._send(Body)
+        return {"ETag": '"single"'}
+
+    def create_multipart_upload(self, Bucket, Key):
+        time.sleep(self.rtt_s)
+        return {"UploadId": "u"}
+
+    def list_multipart_uploads(self, Bucket, Prefix):
+        time.sleep(self.rtt_s)
+        return {"Uploads": []}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        self._send(Body)
+        return {"ETag": f'"{PartNumber}"'}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        time.sleep(self.rtt_s)
+        return {"ETag": '"multipart"'}
+
+
+def stream(size: int):
+    block = os.urandom(MiB)
+    for _ in range(size // MiB):
+        yield block
+
+
+def run(label: str, backend: S3Backend, size: int) -> None:
+    tracemalloc.start()
+    begin = time.perf_counter()
+    backend.put_stream("obj", stream(size), size)
+    elapsed = time.perf_counter() - begin
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<22} {elapsed:>7.2f}s  {size / MiB / elapsed:>8.1f} MiB/s   peak {peak / MiB:>7.1f} MiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=int, default=512)
+    parser.add_argument("--part-mb", type=int, default=16)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--conn-mbps", type=float, default=200, help="megabits/s per connection")
+    parser.add_argument("--rtt-ms", type=float, default=80)
+    args = parser.parse_args()
+    size = args.size_mb * MiB
+    client = SimulatedS3(args.rtt_ms / 1000, args.conn_mbps * 1e6 / 8)
+    print(f"{args.size_mb} MiB object, {args.conn_mbps:g} Mbit/s per connection, "
+          f"{args.rtt_ms:g} ms RTT, cpu_count={os.cpu_count()}")
+    run("single PUT", S3Backend("b", client=client, multipart_threshold=size + 1), size)
+    for n in args.concurrency:
+        backend = S3Backend("b", client=client, part_size=args.part_mb * MiB, max_concurrency=n)
+        run(f"multipart x{n}", backend, size)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,21 @@
 """Storage backend abstraction. Only S3 implemented; structure ready for GCS/Azure."""
 from __future__ import annotations
 
+import hashlib
 import io
+import logging
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Iterator, Protocol
+from typing import Any, Callable, Iterator, Protocol
+
+
+log = logging.getLogger(__name__)
+
+MiB = 1 << 20
+MAX_PARTS = 10_000        # S3 limit per multipart upload
+MIN_PART_SIZE = 5 * MiB   # S3 limit for every part but the last
 
 
 @dataclass(frozen=True)
@@ -14,21 +26,53 @@ class ObjectMeta:
 
 
 class StorageBackend(Protocol):
+    multipart_threshold: int    # objects at least this big may leave open uploads behind
+
     def list(self, prefix: str = "") -> Iterator[ObjectMeta]: ...
     def head(self, key: str) -> ObjectMeta | None: ...
     def get_stream(self, key: str, chunk_size: int = 1 << 20) -> Iterator[bytes]: ...
     def put_stream(self, key: str, stream: Iterator[bytes], size: int) -> str: ...
     def rename(self, src: str, dst: str) -> None: ...
     def delete(self, key: str) -> None: ...
+    def abort_uploads(self, prefix: str, where: Callable[[str], bool]) -> int: ...
 
 
 class S3Backend:
+    """S3 (or S3-compatible) bucket/prefix.
+
+    put_stream uploads objects of at least `multipart_threshold` bytes as
+    a multipart upload: the stream is cut into `part_size` parts and at
+    most `max_concurrency` parts are in flight, so memory stays around
+    (max_concurrency + 2) * part_size whatever the object size. Each part
+    is retried up to `max_attempts` times with exponential backoff. A
+    failed upload is left open, and the next put_stream of the same key
+    and size resumes it: parts already on S3 whose MD5 matches the
+    stream are skipped instead of re-sent. abort_uploads cleans up open
+    uploads that will never be resumed (see transfer.replicate_one).
+
+    `client` accepts any object with the boto3 S3 client methods used
+    here (tests pass an in-memory fake).
+    """
+
     def __init__(self, bucket: str, prefix: str = "", *, endpoint_url: str | None = None,
-                 region: str = "us-east-1") -> None:
-        import boto3
-        self.client = boto3.client("s3", endpoint_url=endpoint_url, region_name=region)
+                 region: str = "us-east-1", client: Any = None,
+                 part_size: int = 16 * MiB, multipart_threshold: int | None = None,
+                 max_concurrency: int = 4, max_attempts: int = 4,
+                 retry_backoff_s: float = 0.5, min_part_size: int = MIN_PART_SIZE) -> None:
+        # min_part_size is S3's limit; lower it only for stores without one (test fakes).
+        if part_size < min_part_size:
+            raise ValueError(f"part_size must be at least {min_part_size} bytes, got {part_size}")
+        if client is None:
+            import boto3
+            client = boto3.client("s3", endpoint_url=endpoint_url, region_name=region)
+        self.client = client
         self.bucket = bucket
         self.prefix = prefix.rstrip("/") + "/" if prefix else ""
+        self.part_size = part_size
+        self.multipart_threshold = part_size if multipart_threshold is None else multipart_threshold
+        self.max_concurrency = max_concurrency
+        self.max_attempts = max_attempts
+        self.retry_backoff_s = retry_backoff_s
 
     def _key(self, k: str) -> str:
         return self.prefix + k
@@ -56,10 +100,90 @@ class S3Backend:
             yield chunk
 
     def put_stream(self, key: str, stream: Iterator[bytes], size: int) -> str:
+        if size >= self.multipart_threshold:
+            return self._put_multipart(self._key(key), stream, size)
         buf = io.BytesIO(b"".join(stream))
         r = self.client.put_object(Bucket=self.bucket, Key=self._key(key), Body=buf)
         return r["ETag"].strip('"')
 
+    def _part_size_for(self, size: int) -> int:
+        # Depends only on the size, so a resumed upload cuts the same parts.
+        return max(self.part_size, -(-size // MAX_PARTS))
+
+    def _put_multipart(self, s3_key: str, stream: Iterator[bytes], size: int) -> str:
+        part_size = self._part_size_for(size)
+        upload_id, existing = self._resumable_upload(s3_key, part_size)
+        if upload_id is None:
+            upload_id = self.client.create_multipart_upload(Bucket=self.bucket, Key=s3_key)["UploadId"]
+        elif existing:
+            log.info("resuming upload of %s: %d parts already uploaded", s3_key, len(existing))
+        etags: dict[int, str] = {}
+        inflight: deque[tuple[int, Future]] = deque()
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            try:
+                for number, part in enumerate(_parts(stream, part_size), start=1):
+                    done = existing.get(number)
+                    if done is not None and done[1] == len(part) and done[0] == hashlib.md5(part).hexdigest():
+                        etags[number] = done[0]
+                        continue
+                    inflight.append((number, pool.submit(self._upload_part, s3_key, upload_id, number, part)))
+                    # Bounded read-ahead: never hold more than max_concurrency parts.
+                    while len(inflight) >= self.max_concurrency:
+                        n, fut = inflight.popleft()
+                        etags[n] = fut.result()
+                while inflight:
+                    n, fut = inflight.popleft()
+                    etags[n] = fut.result()
+            except BaseException:
+                for _, fut in inflight:
+                    fut.cancel()
+                log.warning("multipart upload of %s incomplete; %d parts uploaded, resumable",
+                            s3_key, len(etags))
+                raise
+        r = self.client.complete_multipart_upload(
+            Bucket=self.bucket, Key=s3_key, UploadId=upload_id,
+            MultipartUpload={"Parts": [{"PartNumber": n, "ETag": etags[n]} for n in sorted(etags)]},
+        )
+        return r["ETag"].strip('"')
+
+    def _upload_part(self, s3_key: str, upload_id: str, number: int, data: bytes) -> str:
+        attempt = 1
+        while True:
+            try:
+                r = self.client.upload_part(Bucket=self.bucket, Key=s3_key, UploadId=upload_id,
+                                            PartNumber=number, Body=data)
+                return r["ETag"].strip('"')
+            except Exception as exc:
+                if attempt >= self.max_attempts:
+                    raise
+                delay = self.retry_backoff_s * 2 ** (attempt - 1)
+                log.warning("part %d of %s failed (%s); retry %d/%d in %.1fs",
+                            number, s3_key, exc, attempt, self.max_attempts - 1, delay)
+                time.sleep(delay)
+                attempt += 1
+
+    def _resumable_upload(self, s3_key: str, part_size: int) -> tuple[str | None, dict[int, tuple[str, int]]]:
+        """Latest open upload for the key and its parts as {number: (etag, size)}."""
+        r = self.client.list_multipart_uploads(Bucket=self.bucket, Prefix=s3_key)
+        uploads = [u for u in r.get("Uploads", []) if u["Key"] == s3_key]
+        if not uploads:
+            return None, {}
+        upload_id = max(uploads, key=lambda u: u["Initiated"])["UploadId"]
+        parts: dict[int, tuple[str, int]] = {}
+        marker = 0
+        while True:
+            r = self.client.list_parts(Bucket=self.bucket, Key=s3_key, UploadId=upload_id,
+                                       PartNumberMarker=marker)
+            for p in r.get("Parts", []):
+                parts[p["PartNumber"]] = (p["ETag"].strip('"'), p["Size"])
+            if not r.get("IsTruncated"):
+                break
+            marker = r["NextPartNumberMarker"]
+        # A different part size means a different cut; only whole-part matches count.
+        if any(sz != part_size for n, (_, sz) in parts.items() if n != max(parts)):
+            return upload_id, {}
+        return upload_id, parts
+
     def rename(self, src: str, dst: str) -> None:
         self.client.copy_object(
             Bucket=self.bucket, Key=self._key(dst),
@@ -70,6 +194,42 @@ class S3Backend:
     def delete(self, key: str) -> None:
         self.client.delete_object(Bucket=self.bucket, Key=self._key(key))
 
+    def abort_uploads(self, prefix: str, where: Callable[[str], bool]) -> int:
+        """Abort open multipart uploads under `prefix` whose key satisfies `where`.
+
+        Keys are passed to `where` relative to the backend prefix. Returns
+        the number of uploads aborted.
+        """
+        stale: list[tuple[str, str]] = []
+        markers: dict[str, str] = {}
+        while True:
+            r = self.client.list_multipart_uploads(Bucket=self.bucket, Prefix=self._key(prefix), **markers)
+            for u in r.get("Uploads", []):
+                key = u["Key"][len(self.prefix):]
+                if where(key):
+                    stale.append((u["Key"], u["UploadId"]))
+            if not r.get("IsTruncated"):
+                break
+            markers = {"KeyMarker": r["NextKeyMarker"], "UploadIdMarker": r["NextUploadIdMarker"]}
+        for s3_key, upload_id in stale:
+            log.info("aborting stale multipart upload of %s", s3_key)
+            self.client.abort_multipart_upload(Bucket=self.bucket, Key=s3_key, UploadId=upload_id)
+        return len(stale)
+
+
+def _parts(stream: Iterator[bytes], part_size: int) -> Iterator[bytes]:
+    """Re-cut a chunk stream into part_size pieces (the last may be short)."""
+    buf = bytearray()
+    for chunk in stream:
+        buf += chunk
+        while len(buf) >= part_size:
+            with memoryview(buf) as view:   # one copy, no intermediate slice
+                part = bytes(view[:part_size])
+            del buf[:part_size]
+            yield part
+    if buf:
+        yield bytes(buf)
+
 
 def parse_uri(uri: str) -> tuple[str, str, str]:
     """s3://bucket/some/prefix → (s3, bucket, some/prefix)."""
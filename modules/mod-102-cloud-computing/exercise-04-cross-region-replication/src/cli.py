@@ -7,7 +7,7 @@ import time
 
 import click
 
-from .backends import S3Backend, parse_uri
+from .backends import MiB, S3Backend, parse_uri
 from .manifest import Manifest
 from .transfer import diff, replicate_many, verify_all
 
@@ -15,11 +15,11 @@ from .transfer import diff, replicate_many, verify_all
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
 
 
-def _backend_from_uri(uri: str, endpoint_url: str | None) -> S3Backend:
+def _backend_from_uri(uri: str, endpoint_url: str | None, **options) -> S3Backend:
     scheme, bucket, prefix = parse_uri(uri)
     if scheme != "s3":
         raise click.BadParameter(f"only s3:// URIs supported, got {scheme}://")
-    return S3Backend(bucket=bucket, prefix=prefix, endpoint_url=endpoint_url)
+    return S3Backend(bucket=bucket, prefix=prefix, endpoint_url=endpoint_url, **options)
 
 
 @click.group()
@@ -46,11 +46,16 @@ def status(src: str, dst: str, manifest_path: str, aws_endpoint: str | None) ->
 @click.option("--manifest-path", default="manifest.db")
 @click.option("--rate-mbps", default=None, type=float, help="bandwidth cap, megabits/sec")
 @click.option("--concurrency", default=4)
+@click.option("--part-size-mb", default=16, type=click.IntRange(min=5),
+              help="multipart part size (S3 minimum 5)")
+@click.option("--part-concurrency", default=4, help="parallel part uploads per object")
 @click.option("--aws-endpoint", default=None)
 def sync(src: str, dst: str, manifest_path: str, rate_mbps: float | None,
-          concurrency: int, aws_endpoint: str | None) -> None:
+          concurrency: int, part_size_mb: int, part_concurrency: int,
+          aws_endpoint: str | None) -> None:
     src_b = _backend_from_uri(src, aws_endpoint)
-    dst_b = _backend_from_uri(dst, aws_endpoint)
+    dst_b = _backend_from_uri(dst, aws_endpoint, part_size=part_size_mb * MiB,
+                              max_concurrency=part_concurrency)
     m = Manifest(manifest_path)
     report = diff(src_b, dst_b, m)
     pending = report["new"] + report["updated"]
@@ -68,13 +73,17 @@ def sync(src: str, dst: str, manifest_path: str, rate_mbps: float | None,
 @click.option("--poll-seconds", default=60)
 @click.option("--rate-mbps", default=None, type=float)
 @click.option("--concurrency", default=4)
+@click.option("--part-size-mb", default=16, type=click.IntRange(min=5))
+@click.option("--part-concurrency", default=4)
 @click.option("--aws-endpoint", default=None)
 def watch(src: str, dst: str, manifest_path: str, poll_seconds: int,
-           rate_mbps: float | None, concurrency: int, aws_endpoint: str | None) -> None:
+           rate_mbps: float | None, concurrency: int, part_size_mb: int,
+           part_concurrency: int, aws_endpoint: str | None) -> None:
     while True:
         ctx = click.get_current_context()
         ctx.invoke(sync, src=src, dst=dst, manifest_path=manifest_path,
-                    rate_mbps=rate_mbps, concurrency=concurrency, aws_endpoint=aws_endpoint)
+                    rate_mbps=rate_mbps, concurrency=concurrency, part_size_mb=part_size_mb,
+                    part_concurrency=part_concurrency, aws_endpoint=aws_endpoint)
         time.sleep(poll_seconds)
 
 
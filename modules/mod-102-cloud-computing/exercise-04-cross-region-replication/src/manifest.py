@@ -1,11 +1,20 @@
-"""SQLite-backed manifest of replicated objects."""
+"""SQLite-backed manifest of replicated objects.
+
+One connection per Manifest (WAL mode, shared across threads under a
+lock) instead of one per call. Writes can be batched with upsert_many,
+and `diff` classifies a whole bucket listing with a join against the
+manifest instead of one lookup per key.
+"""
 from __future__ import annotations
 
 import sqlite3
+import threading
 from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterator
+from typing import Iterable, Iterator
+
+from .backends import ObjectMeta
 
 
 @dataclass(frozen=True)
@@ -18,12 +27,20 @@ class ObjectRecord:
     last_synced_at: float
 
 
+_COLUMNS = "key, src_etag, src_size, dst_etag, sha256, last_synced_at"
+
+
 class Manifest:
     def __init__(self, path: str | Path) -> None:
         self._path = Path(path)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self._path, check_same_thread=False)
         self._init()
 
     def _init(self) -> None:
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # WAL + NORMAL: a crash can lose the last commits, never corrupt the file.
+        self._db.execute("PRAGMA synchronous=NORMAL")
         with self._conn() as c:
             c.execute(
                 """
@@ -40,28 +57,40 @@ class Manifest:
 
     @contextmanager
     def _conn(self) -> Iterator[sqlite3.Connection]:
-        conn = sqlite3.connect(self._path)
-        try:
-            yield conn
-            conn.commit()
-        finally:
-            conn.close()
+        """The shared connection, in a transaction (commit, or rollback on error)."""
+        with self._lock, self._db:
+            yield self._db
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self) -> Manifest:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
 
     def upsert(self, rec: ObjectRecord) -> None:
+        self.upsert_many([rec])
+
+    def upsert_many(self, recs: Iterable[ObjectRecord]) -> None:
+        """Insert or replace records in a single transaction."""
         with self._conn() as c:
-            c.execute(
+            c.executemany(
                 "INSERT OR REPLACE INTO objects VALUES (?,?,?,?,?,?)",
-                (rec.key, rec.src_etag, rec.src_size, rec.dst_etag, rec.sha256, rec.last_synced_at),
+                ((r.key, r.src_etag, r.src_size, r.dst_etag, r.sha256, r.last_synced_at) for r in recs),
             )
 
     def get(self, key: str) -> ObjectRecord | None:
         with self._conn() as c:
-            row = c.execute(
-                "SELECT key, src_etag, src_size, dst_etag, sha256, last_synced_at FROM objects WHERE key = ?",
-                (key,),
-            ).fetchone()
+            row = c.execute(f"SELECT {_COLUMNS} FROM objects WHERE key = ?", (key,)).fetchone()
             return ObjectRecord(*row) if row else None
 
+    def records(self) -> list[ObjectRecord]:
+        with self._conn() as c:
+            return [ObjectRecord(*row) for row in c.execute(f"SELECT {_COLUMNS} FROM objects")]
+
     def all_keys(self) -> set[str]:
         with self._conn() as c:
             return {r[0] for r in c.execute("SELECT key FROM objects")}
@@ -69,3 +98,30 @@ class Manifest:
     def delete(self, key: str) -> None:
         with self._conn() as c:
             c.execute("DELETE FROM objects WHERE key = ?", (key,))
+
+    def diff(self, listing: Iterable[ObjectMeta]) -> dict[str, list[str]]:
+        """Classify a source listing as new / updated / unchanged in one pass.
+
+        The listing is loaded into a temp table and joined against
+        `objects`, so the per-key work happens inside SQLite rather than
+        as one query per key.
+        """
+        with self._conn() as c:
+            c.execute("CREATE TEMP TABLE IF NOT EXISTS listing (key TEXT PRIMARY KEY, etag TEXT NOT NULL)")
+            c.execute("DELETE FROM listing")
+            c.executemany("INSERT OR REPLACE INTO listing VALUES (?, ?)", ((o.key, o.etag) for o in listing))
+            report: dict[str, list[str]] = {"new": [], "updated": [], "unchanged": []}
+            rows = c.execute(
+                """
+                SELECT l.key,
+                       CASE WHEN o.key IS NULL THEN 'new'
+                            WHEN o.src_etag != l.etag THEN 'updated'
+                            ELSE 'unchanged' END
+                FROM listing l LEFT JOIN objects o ON o.key = l.key
+                ORDER BY l.key
+                """,
+            )
+            for key, state in rows:
+                report[state].append(key)
+            c.execute("DELETE FROM listing")
+        return report
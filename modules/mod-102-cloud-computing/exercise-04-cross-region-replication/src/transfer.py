@@ -4,7 +4,6 @@ from __future__ import annotations
 import hashlib
 import logging
 import time
-import uuid
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 
@@ -15,6 +14,8 @@ from .manifest import Manifest, ObjectRecord
 
 log = logging.getLogger(__name__)
 
+TMP_PREFIX = ".tmp-replication/"
+
 
 @dataclass
 class TransferResult:
@@ -22,6 +23,8 @@ class TransferResult:
     bytes: int
     sha256: str
     dst_etag: str
+    src_etag: str     # of the version that was copied (from the pre-transfer head)
+    src_size: int
 
 
 def replicate_one(src: StorageBackend, dst: StorageBackend, key: str,
@@ -30,7 +33,16 @@ def replicate_one(src: StorageBackend, dst: StorageBackend, key: str,
     if meta is None:
         raise FileNotFoundError(f"source object missing: {key}")
 
-    tmp = f".tmp-replication/{uuid.uuid4().hex}/{key}"
+    # Keyed by source ETag, not a random ID, so a retried run finds (and
+    # resumes) the multipart upload an interrupted one left behind.
+    versions = f"{TMP_PREFIX}{key}/"
+    tmp = f"{versions}{meta.etag}"
+    if meta.size >= dst.multipart_threshold:
+        # An upload left open for an older version of the object can never be
+        # resumed; abort it rather than let its parts be billed indefinitely.
+        # The prefix scopes the listing to this key's versions (a key "a/b"
+        # shares "a/"'s prefix, hence the no-slash check).
+        dst.abort_uploads(versions, lambda k: k != tmp and "/" not in k[len(versions):])
     sha = hashlib.sha256()
     bytes_transferred = 0
 
@@ -46,48 +58,54 @@ def replicate_one(src: StorageBackend, dst: StorageBackend, key: str,
     dst.put_stream(tmp, throttled_stream(), meta.size)
     dst.rename(tmp, key)
     dst_etag = dst.head(key).etag    # type: ignore[union-attr]
-    return TransferResult(key=key, bytes=bytes_transferred, sha256=sha.hexdigest(), dst_etag=dst_etag)
+    return TransferResult(key=key, bytes=bytes_transferred, sha256=sha.hexdigest(), dst_etag=dst_etag,
+                          src_etag=meta.etag, src_size=meta.size)
 
 
 def diff(src: StorageBackend, dst: StorageBackend, manifest: Manifest) -> dict[str, list[str]]:
     """Return {'new':[...], 'updated':[...], 'unchanged':[...]} for keys in src."""
-    new, updated, unchanged = [], [], []
-    for obj in src.list():
-        rec = manifest.get(obj.key)
-        if rec is None:
-            new.append(obj.key)
-        elif rec.src_etag != obj.etag:
-            updated.append(obj.key)
-        else:
-            unchanged.append(obj.key)
-    return {"new": new, "updated": updated, "unchanged": unchanged}
+    return manifest.diff(src.list())
 
 
 def replicate_many(src: StorageBackend, dst: StorageBackend, keys: list[str],
                     manifest: Manifest, *, concurrency: int = 4,
-                    rate_mbps: float | None = None) -> dict[str, int]:
+                    rate_mbps: float | None = None,
+                    manifest_batch: int = 500) -> dict[str, int]:
+    """Replicate `keys`; manifest records are written `manifest_batch` at a time.
+
+    A crash loses at most the unflushed batch, and those objects are
+    simply copied again on the next sync.
+    """
     bucket = TokenBucket(rate_mbps * 1_000_000 / 8) if rate_mbps else None
+    pending: list[ObjectRecord] = []
 
     def task(k: str) -> TransferResult:
         return replicate_one(src, dst, k, bucket)
 
     total_bytes, errors = 0, []
-    with ThreadPoolExecutor(max_workers=concurrency) as ex:
-        futures = {ex.submit(task, k): k for k in keys}
-        for fut in as_completed(futures):
-            k = futures[fut]
-            try:
-                r = fut.result()
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as ex:
+            futures = {ex.submit(task, k): k for k in keys}
+            for fut in as_completed(futures):
+                k = futures[fut]
+                try:
+                    r = fut.result()
+                except Exception:
+                    log.exception("failed %s", k)
+                    errors.append(k)
+                    continue
                 total_bytes += r.bytes
-                src_meta = src.head(k)
-                manifest.upsert(ObjectRecord(
-                    key=k, src_etag=src_meta.etag, src_size=src_meta.size,
+                pending.append(ObjectRecord(
+                    key=k, src_etag=r.src_etag, src_size=r.src_size,
                     dst_etag=r.dst_etag, sha256=r.sha256, last_synced_at=time.time(),
                 ))
                 log.info("replicated %s (%s bytes)", k, r.bytes)
-            except Exception as exc:
-                log.exception("failed %s", k)
-                errors.append(k)
+                if len(pending) >= manifest_batch:
+                    manifest.upsert_many(pending)
+                    pending.clear()
+    finally:
+        # Also on interrupt: keep the records of transfers that finished.
+        manifest.upsert_many(pending)
 
     return {"transferred": len(keys) - len(errors), "failed": len(errors), "bytes": total_bytes}
 
@@ -95,13 +113,11 @@ def replicate_many(src: StorageBackend, dst: StorageBackend, keys: list[str],
 def verify_all(dst: StorageBackend, manifest: Manifest) -> list[str]:
     """Re-stream every destination object; report keys with checksum mismatch."""
     bad = []
-    for key in manifest.all_keys():
-        rec = manifest.get(key)
-        if rec is None: continue
+    for rec in manifest.records():
         sha = hashlib.sha256()
-        for chunk in dst.get_stream(key):
+        for chunk in dst.get_stream(rec.key):
             sha.update(chunk)
         if sha.hexdigest() != rec.sha256:
-            log.error("checksum mismatch %s", key)
-            bad.append(key)
+            log.error("checksum mismatch %s", rec.key)
+            bad.append(rec.key)
     return bad
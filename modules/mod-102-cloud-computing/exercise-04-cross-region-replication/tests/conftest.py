@@ -3,7 +3,6 @@ import os
 import sys
 import time
 
-import boto3
 import pytest
 
 
@@ -18,6 +17,7 @@ def minio_endpoint():
 
 @pytest.fixture
 def s3_client(minio_endpoint):
+    import boto3  # only the Minio tests need it; fake-client tests run without
     return boto3.client(
         "s3", endpoint_url=minio_endpoint,
         aws_access_key_id="minioadmin", aws_secret_access_key="minioadmin",
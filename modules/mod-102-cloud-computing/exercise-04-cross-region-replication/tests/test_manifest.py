@@ -0,0 +1,111 @@
+"""Manifest + replication planning against an in-memory backend (no Minio)."""
+import hashlib
+import sqlite3
+from collections import Counter
+
+import pytest
+
+from src.backends import ObjectMeta
+from src.manifest import Manifest, ObjectRecord
+from src.transfer import diff, replicate_many, verify_all
+
+
+class MemoryBackend:
+    multipart_threshold = 1 << 20
+
+    def __init__(self) -> None:
+        self.objects: dict[str, bytes] = {}
+        self.calls: Counter = Counter()
+
+    def _meta(self, key: str) -> ObjectMeta:
+        data = self.objects[key]
+        return ObjectMeta(key=key, size=len(data), etag=hashlib.md5(data).hexdigest())
+
+    def list(self, prefix=""):
+        self.calls["list"] += 1
+        return [self._meta(k) for k in sorted(self.objects) if k.startswith(prefix)]
+
+    def head(self, key):
+        self.calls["head"] += 1
+        return self._meta(key) if key in self.objects else None
+
+    def get_stream(self, key, chunk_size=1 << 20):
+        yield self.objects[key]
+
+    def put_stream(self, key, stream, size):
+        self.objects[key] = b"".join(stream)
+        return self._meta(key).etag
+
+    def rename(self, src, dst):
+        self.objects[dst] = self.objects.pop(src)
+
+    def delete(self, key):
+        self.objects.pop(key, None)
+
+    def abort_uploads(self, prefix, where):
+        self.calls["abort_uploads"] += 1
+        return 0
+
+
+def _record(key: str, etag: str = "e1") -> ObjectRecord:
+    return ObjectRecord(key=key, src_etag=etag, src_size=1, dst_etag="d", sha256="s", last_synced_at=0.0)
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    with Manifest(tmp_path / "m.db") as m:
+        yield m
+
+
+def test_upsert_many_round_trip_and_persistence(tmp_path):
+    path = tmp_path / "m.db"
+    with Manifest(path) as m:
+        m.upsert_many([_record("a"), _record("b")])
+        m.upsert(_record("a", etag="e2"))
+    with Manifest(path) as m:
+        assert m.get("a").src_etag == "e2"
+        assert m.all_keys() == {"a", "b"}
+        assert [r.key for r in sorted(m.records(), key=lambda r: r.key)] == ["a", "b"]
+
+
+def test_uses_wal(tmp_path, manifest):
+    conn = sqlite3.connect(tmp_path / "m.db")
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    conn.close()
+
+
+def test_diff_joins_listing_against_manifest(manifest):
+    manifest.upsert_many([_record("same", "e1"), _record("changed", "old"), _record("gone")])
+    listing = [ObjectMeta("changed", 1, "new"), ObjectMeta("fresh", 1, "e1"), ObjectMeta("same", 1, "e1")]
+    assert manifest.diff(listing) == {"new": ["fresh"], "updated": ["changed"], "unchanged": ["same"]}
+    # The temp listing doesn't leak into the next diff.
+    assert manifest.diff([]) == {"new": [], "updated": [], "unchanged": []}
+
+
+def test_replicate_many_plans_and_records_without_extra_heads(manifest):
+    src, dst = MemoryBackend(), MemoryBackend()
+    for i in range(7):
+        src.objects[f"k{i}"] = f"payload {i}".encode()
+    plan = diff(src, dst, manifest)
+    assert len(plan["new"]) == 7 and src.calls["list"] == 1
+
+    result = replicate_many(src, dst, plan["new"], manifest, concurrency=2, manifest_batch=3)
+    assert result == {"transferred": 7, "failed": 0, "bytes": sum(len(v) for v in src.objects.values())}
+    assert src.calls["head"] == 7  # one per object, inside replicate_one
+    assert dst.calls["abort_uploads"] == 0  # small objects never go multipart
+    assert manifest.get("k3").src_etag == hashlib.md5(b"payload 3").hexdigest()
+    assert {k: v for k, v in dst.objects.items()} == src.objects
+    assert verify_all(dst, manifest) == []
+
+    src.objects["k3"] = b"edited"
+    assert diff(src, dst, manifest)["updated"] == ["k3"]
+
+
+def test_failed_transfers_are_not_recorded(manifest):
+    src, dst = MemoryBackend(), MemoryBackend()
+    src.objects = {"ok": b"1", "missing": b"2"}
+    keys = ["ok", "missing"]
+    del src.objects["missing"]
+    result = replicate_many(src, dst, keys, manifest, concurrency=1)
+    assert result["failed"] == 1
+    assert manifest.all_keys() == {"ok"}
@@ -0,0 +1,260 @@
+"""Multipart put_stream against an in-memory S3 client fake."""
+import hashlib
+import io
+import itertools
+import random
+import threading
+import time
+
+import pytest
+
+from src.backends import MAX_PARTS, MIN_PART_SIZE, S3Backend
+from src.transfer import replicate_one
+
+
+class FakeClientError(Exception):
+    def __init__(self, code: str) -> None:
+        super().__init__(code)
+        self.response = {"Error": {"Code": code}}
+
+
+class FakeS3:
+    """The subset of the boto3 S3 client that S3Backend uses."""
+
+    class exceptions:
+        ClientError = FakeClientError
+
+    def __init__(self, part_delay_s: float = 0.0) -> None:
+        self.objects: dict[tuple[str, str], bytes] = {}
+        self.uploads: dict[str, dict] = {}
+        self.part_calls: list[int] = []
+        self.fail_parts: dict[int, int] = {}   # part number -> failures left
+        self.part_delay_s = part_delay_s
+        self.list_prefixes: list[str] = []
+        self.peak_inflight = 0
+        self._inflight = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _body(body) -> bytes:
+        return body.read() if hasattr(body, "read") else bytes(body)
+
+    def put_object(self, Bucket, Key, Body):
+        data = self._body(Body)
+        self.objects[Bucket, Key] = data
+        return {"ETag": f'"{hashlib.md5(data).hexdigest()}"'}
+
+    def get_object(self, Bucket, Key):
+        return {"Body": io.BytesIO(self.objects[Bucket, Key])}
+
+    def head_object(self, Bucket, Key):
+        if (Bucket, Key) not in self.objects:
+            raise FakeClientError("404")
+        data = self.objects[Bucket, Key]
+        return {"ContentLength": len(data), "ETag": f'"{hashlib.md5(data).hexdigest()}"'}
+
+    def copy_object(self, Bucket, Key, CopySource):
+        self.objects[Bucket, Key] = self.objects[CopySource["Bucket"], CopySource["Key"]]
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop((Bucket, Key), None)
+
+    def create_multipart_upload(self, Bucket, Key):
+        upload_id = f"upload-{next(self._ids)}"
+        self.uploads[upload_id] = {"Bucket": Bucket, "Key": Key, "Initiated": time.time(), "parts": {}}
+        return {"UploadId": upload_id}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        with self._lock:
+            self.part_calls.append(PartNumber)
+            self._inflight += 1
+            self.peak_inflight = max(self.peak_inflight, self._inflight)
+        try:
+            time.sleep(self.part_delay_s)
+            with self._lock:
+                if self.fail_parts.get(PartNumber, 0) > 0:
+                    self.fail_parts[PartNumber] -= 1
+                    raise ConnectionError(f"reset while sending part {PartNumber}")
+            data = self._body(Body)
+            etag = hashlib.md5(data).hexdigest()
+            self.uploads[UploadId]["parts"][PartNumber] = (etag, data)
+            return {"ETag": f'"{etag}"'}
+        finally:
+            with self._lock:
+                self._inflight -= 1
+
+    def list_multipart_uploads(self, Bucket, Prefix):
+        self.list_prefixes.append(Prefix)
+        return {"Uploads": [
+            {"Key": u["Key"], "UploadId": i, "Initiated": u["Initiated"]}
+            for i, u in self.uploads.items() if u["Bucket"] == Bucket and u["Key"].startswith(Prefix)
+        ]}
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        assert self.uploads.pop(UploadId)["Key"] == Key
+
+    def list_parts(self, Bucket, Key, UploadId, PartNumberMarker=0):
+        numbers = sorted(n for n in self.uploads[UploadId]["parts"] if n > PartNumberMarker)
+        page, rest = numbers[:2], numbers[2:]   # tiny pages to exercise pagination
+        parts = self.uploads[UploadId]["parts"]
+        return {
+            "Parts": [{"PartNumber": n, "ETag": f'"{parts[n][0]}"', "Size": len(parts[n][1])} for n in page],
+            "IsTruncated": bool(rest),
+            "NextPartNumberMarker": page[-1] if page else PartNumberMarker,
+        }
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        upload = self.uploads.pop(UploadId)
+        listed = MultipartUpload["Parts"]
+        assert [p["PartNumber"] for p in listed] == list(range(1, len(listed) + 1))
+        for p in listed:
+            assert upload["parts"][p["PartNumber"]][0] == p["ETag"]
+        self.objects[Bucket, Key] = b"".join(upload["parts"][p["PartNumber"]][1] for p in listed)
+        return {"ETag": f'"multipart-{len(listed)}"'}
+
+
+PART = 64 * 1024
+
+
+def _data(size: int, seed: int = 0) -> bytes:
+    return random.Random(seed).randbytes(size)
+
+
+def _chunks(data: bytes, size: int = 10_000):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+def _backend(client: FakeS3, **kwargs) -> S3Backend:
+    options = dict(part_size=PART, min_part_size=PART, max_concurrency=3, retry_backoff_s=0.0)
+    options.update(kwargs)
+    return S3Backend("bucket", "pre", client=client, **options)
+
+
+def test_small_objects_use_a_single_put():
+    client = FakeS3()
+    _backend(client).put_stream("k", _chunks(b"x" * 100), 100)
+    assert client.objects["bucket", "pre/k"] == b"x" * 100
+    assert client.part_calls == []
+
+
+def test_multipart_round_trip():
+    client = FakeS3()
+    data = _data(20 * PART + 123)
+    etag = _backend(client).put_stream("big", _chunks(data), len(data))
+    assert client.objects["bucket", "pre/big"] == data
+    assert etag == "multipart-21"
+    assert sorted(client.part_calls) == list(range(1, 22))
+    assert client.uploads == {}
+
+
+def test_part_uploads_are_bounded():
+    client = FakeS3(part_delay_s=0.01)
+    data = _data(12 * PART)
+    _backend(client, max_concurrency=3).put_stream("big", _chunks(data), len(data))
+    assert 2 <= client.peak_inflight <= 3
+
+
+def test_failed_part_is_retried():
+    client = FakeS3()
+    client.fail_parts = {3: 2}
+    data = _data(5 * PART)
+    _backend(client, max_attempts=3).put_stream("big", _chunks(data), len(data))
+    assert client.part_calls.count(3) == 3
+    assert client.objects["bucket", "pre/big"] == data
+
+
+def test_interrupted_upload_resumes_from_uploaded_parts():
+    client = FakeS3()
+    data = _data(10 * PART + 7)
+    client.fail_parts = {6: 99}
+    with pytest.raises(ConnectionError):
+        _backend(client, max_attempts=2).put_stream("big", _chunks(data), len(data))
+    (upload,) = client.uploads.values()
+    already = set(upload["parts"])
+    assert 6 not in already and already
+
+    client.fail_parts = {}
+    client.part_calls = []
+    _backend(client).put_stream("big", _chunks(data), len(data))
+    assert client.objects["bucket", "pre/big"] == data
+    assert set(client.part_calls) == set(range(1, 12)) - already
+
+
+def test_resume_resends_parts_that_do_not_match_the_stream():
+    client = FakeS3()
+    data = _data(4 * PART)
+    client.fail_parts = {4: 99}
+    with pytest.raises(ConnectionError):
+        _backend(client, max_attempts=1, max_concurrency=1).put_stream("big", _chunks(data), len(data))
+    client.fail_parts = {}
+    client.part_calls = []
+    changed = _data(PART, seed=1) + data[PART:]
+    _backend(client, max_concurrency=1).put_stream("big", _chunks(changed), len(changed))
+    assert client.part_calls == [1, 4]
+    assert client.objects["bucket", "pre/big"] == changed
+
+
+def test_part_size_grows_to_stay_under_the_part_limit():
+    backend = _backend(FakeS3())
+    assert backend._part_size_for(10 * PART) == PART
+    big = (MAX_PARTS + 1) * PART
+    assert backend._part_size_for(big) * MAX_PARTS >= big
+
+
+def test_replicate_one_resumes_after_failure():
+    src_client, dst_client = FakeS3(), FakeS3()
+    data = _data(8 * PART)
+    src_client.put_object(Bucket="bucket", Key="pre/model.bin", Body=data)
+    src, dst = _backend(src_client), _backend(dst_client, max_attempts=1)
+    dst_client.fail_parts = {5: 1}
+    with pytest.raises(ConnectionError):
+        replicate_one(src, dst, "model.bin", None)
+    dst_client.part_calls = []
+    result = replicate_one(src, dst, "model.bin", None)
+    assert dst_client.objects["bucket", "pre/model.bin"] == data
+    assert result.sha256 == hashlib.sha256(data).hexdigest()
+    assert len(dst_client.part_calls) < 8
+    assert not [k for k in dst_client.objects if ".tmp-replication" in k[1]]
+
+
+def test_replicate_one_aborts_uploads_of_older_versions():
+    src_client, dst_client = FakeS3(), FakeS3()
+    old, new = _data(8 * PART), _data(8 * PART, seed=1)
+    src_client.put_object(Bucket="bucket", Key="pre/model.bin", Body=old)
+    src_client.put_object(Bucket="bucket", Key="pre/dir/model.bin", Body=old)
+    src, dst = _backend(src_client), _backend(dst_client, max_attempts=1)
+    dst_client.fail_parts = {5: 2}
+    for key in ("model.bin", "dir/model.bin"):
+        with pytest.raises(ConnectionError):
+            replicate_one(src, dst, key, None)
+    assert len(dst_client.uploads) == 2
+
+    src_client.put_object(Bucket="bucket", Key="pre/model.bin", Body=new)
+    replicate_one(src, dst, "model.bin", None)
+    assert dst_client.objects["bucket", "pre/model.bin"] == new
+    # Only the stale upload of model.bin went; dir/model.bin is another object.
+    (left,) = dst_client.uploads.values()
+    assert left["Key"].startswith("pre/.tmp-replication/dir/model.bin/")
+    # One listing scoped to model.bin's versions, one exact-key resume lookup.
+    assert dst_client.list_prefixes[-2:] == [
+        "pre/.tmp-replication/model.bin/",
+        f"pre/.tmp-replication/model.bin/{hashlib.md5(new).hexdigest()}",
+    ]
+
+
+def test_small_objects_skip_the_upload_listing():
+    src_client, dst_client = FakeS3(), FakeS3()
+    for i in range(5):
+        src_client.put_object(Bucket="bucket", Key=f"pre/small-{i}", Body=b"x" * 100)
+    src, dst = _backend(src_client), _backend(dst_client)
+    for i in range(5):
+        replicate_one(src, dst, f"small-{i}", None)
+    assert dst_client.list_prefixes == []
+
+
+def test_part_size_below_the_s3_minimum_is_rejected():
+    with pytest.raises(ValueError):
+        S3Backend("bucket", client=FakeS3(), part_size=MIN_PART_SIZE - 1)
+    assert S3Backend("bucket", client=FakeS3(), part_size=MIN_PART_SIZE).part_size == MIN_PART_SIZE
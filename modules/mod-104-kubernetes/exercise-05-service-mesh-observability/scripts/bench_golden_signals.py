@@ -0,0 +1,109 @@
+"""
+Benchmark: GoldenSignalsCollector under synthetic load.
+
+    python scripts/bench_golden_signals.py                      # 100k req/s, 60s window
+    python scripts/bench_golden_signals.py --rate 20000 --seconds 10
+
+Simulated time advances one second per batch of `--rate` requests, so the
+numbers show whether a single collector keeps up with the rate (record
+throughput) and how long a dashboard refresh (compute) takes once the
+window is full. `LegacyCollector` reproduces the previous deque + sort
+implementation for comparison.
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.metrics_collector import (  # noqa: E402
+    GoldenSignalsCollector,
+    RequestObservation,
+    _percentile,
+)
+
+
+class LegacyCollector:
+    """Previous implementation: raw observation deque, sorted on every compute."""
+
+    def __init__(self, *, window_seconds: int = 60):
+        self.window = timedelta(seconds=window_seconds)
+        self._observations = deque()
+
+    def record(self, observation: RequestObservation) -> None:
+        self._observations.append(observation)
+        cutoff = observation.timestamp - self.window
+        while self._observations and self._observations[0].timestamp < cutoff:
+            self._observations.popleft()
+
+    def compute(self, service: str, *, now: datetime):
+        observations = list(self._observations)
+        durations = [o.duration_ms for o in observations]
+        errors = sum(1 for o in observations if o.is_error)
+        return (
+            len(observations), errors,
+            _percentile(durations, 50), _percentile(durations, 95), _percentile(durations, 99),
+        )
+
+
+def run(name: str, collector, args) -> None:
+    rng = random.Random(0)
+    start_time = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    record_seconds = 0.0
+    for second in range(args.seconds):
+        ts = start_time + timedelta(seconds=second)
+        batch = [
+            RequestObservation(
+                service="api", route="/predict",
+                duration_ms=rng.lognormvariate(math.log(20), 0.5),
+                status_code=500 if rng.random() < 0.01 else 200,
+                timestamp=ts,
+            )
+            for _ in range(args.rate)
+        ]
+        begin = time.perf_counter()
+        for observation in batch:
+            collector.record(observation)
+        record_seconds += time.perf_counter() - begin
+
+    now = start_time + timedelta(seconds=args.seconds - 1)
+    timings = []
+    for _ in range(args.computes):
+        begin = time.perf_counter()
+        result = collector.compute("api", now=now)
+        timings.append(time.perf_counter() - begin)
+    total = args.rate * args.seconds
+    print(f"{name:<8} record {total / record_seconds:>12,.0f} obs/s "
+          f"({record_seconds / total * 1e6:.2f} us/obs)   "
+          f"compute {min(timings) * 1000:>9.2f} ms   {result}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rate", type=int, default=100_000, help="requests per simulated second")
+    parser.add_argument("--seconds", type=int, default=60, help="simulated seconds (window is 60s)")
+    parser.add_argument("--computes", type=int, default=5)
+    parser.add_argument("--skip-legacy", action="store_true")
+    args = parser.parse_args()
+
+    print(f"{args.rate:,} req/s for {args.seconds}s simulated ({args.rate * args.seconds:,} observations)")
+    collector = GoldenSignalsCollector(window_seconds=60)
+    run("buckets", collector, args)
+    signals = collector.compute("api", now=datetime(2024, 1, 1, tzinfo=timezone.utc)
+                                + timedelta(seconds=args.seconds - 1))
+    print(f"         p50 {signals.p50_latency_ms:.2f}  p95 {signals.p95_latency_ms:.2f}  "
+          f"p99 {signals.p99_latency_ms:.2f}  errors {signals.error_rate_percent:.2f}%")
+    if not args.skip_legacy:
+        run("legacy", LegacyCollector(window_seconds=60), args)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,19 +9,24 @@ canary rollout health from a stream of completed request observations
 Designed to plug into the Tracer in `tracer.py`: pass an InMemoryExporter
 to record_request() and the collector reads everything it needs from
 the recorded spans.
+
+GoldenSignalsCollector keeps per-second buckets (`rolling_window`) rather
+than raw observations, so recording is O(1) and compute() is O(window
+seconds) at any request rate. Latency percentiles come from a mergeable
+sketch and are within 1% (relative) of the exact value.
 """
 
 from __future__ import annotations
 
 import logging
 import math
-import statistics
-from collections import defaultdict, deque
+from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Deque, Dict, Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
+from .rolling_window import RollingWindow
 from .tracer import InMemoryExporter, Span, SpanStatus, TraceTree, build_trace_tree
 
 
@@ -127,41 +132,45 @@ class CanaryDecision:
 class GoldenSignalsCollector:
     """Rolling-window collector for per-service golden signals."""
 
-    def __init__(self, *, window_seconds: int = 60):
+    def __init__(self, *, window_seconds: int = 60, bucket_seconds: float = 1.0):
         self.window = timedelta(seconds=window_seconds)
-        self._observations: Dict[str, Deque[RequestObservation]] = defaultdict(deque)
+        self.bucket_seconds = bucket_seconds
+        self._requests: Dict[str, RollingWindow] = {}
         # Saturation = average concurrency. Captured by add_concurrency_sample.
-        self._concurrency: Dict[str, Deque[Tuple[datetime, float]]] = defaultdict(deque)
+        self._concurrency: Dict[str, RollingWindow] = {}
 
     def record(self, observation: RequestObservation) -> None:
-        bucket = self._observations[observation.service]
-        bucket.append(observation)
-        self._trim(observation.service, observation.timestamp)
+        window = self._requests.get(observation.service)
+        if window is None:
+            window = self._requests[observation.service] = self._new_window()
+        window.record(
+            observation.timestamp.timestamp(), observation.duration_ms,
+            error=observation.is_error,
+        )
 
     def add_concurrency_sample(self, service: str, value: float, *, now: Optional[datetime] = None) -> None:
-        bucket = self._concurrency[service]
-        bucket.append((now or datetime.now(timezone.utc), value))
-        self._trim_concurrency(service, now or datetime.now(timezone.utc))
+        window = self._concurrency.get(service)
+        if window is None:
+            window = self._concurrency[service] = self._new_window(track_quantiles=False)
+        window.record((now or datetime.now(timezone.utc)).timestamp(), value)
 
     def compute(self, service: str, *, now: Optional[datetime] = None) -> GoldenSignals:
-        now = now or datetime.now(timezone.utc)
-        self._trim(service, now)
-        self._trim_concurrency(service, now)
-        observations = list(self._observations.get(service, []))
-        durations = [o.duration_ms for o in observations]
-        errors = sum(1 for o in observations if o.is_error)
+        now_ts = (now or datetime.now(timezone.utc)).timestamp()
+        requests = self._requests.get(service)
+        stats = requests.snapshot(now_ts) if requests else None
+        count = stats.count if stats else 0
         seconds = max(self.window.total_seconds(), 1.0)
-        concurrency_samples = [v for _, v in self._concurrency.get(service, [])]
-        saturation = statistics.mean(concurrency_samples) if concurrency_samples else 0.0
+        concurrency = self._concurrency.get(service)
+        saturation = concurrency.snapshot(now_ts).mean if concurrency else 0.0
         return GoldenSignals(
             service=service,
-            request_rate_per_second=len(observations) / seconds,
-            error_rate_percent=(errors / len(observations) * 100.0) if observations else 0.0,
-            p50_latency_ms=_percentile(durations, 50),
-            p95_latency_ms=_percentile(durations, 95),
-            p99_latency_ms=_percentile(durations, 99),
+            request_rate_per_second=count / seconds,
+            error_rate_percent=stats.error_rate * 100.0 if count else 0.0,
+            p50_latency_ms=stats.percentile(50) if count else 0.0,
+            p95_latency_ms=stats.percentile(95) if count else 0.0,
+            p99_latency_ms=stats.percentile(99) if count else 0.0,
             saturation_percent=min(saturation, 100.0),
-            sample_count=len(observations),
+            sample_count=count,
         )
 
     def ingest_spans(self, spans: Iterable[Span]) -> None:
@@ -177,17 +186,11 @@ class GoldenSignalsCollector:
 
     # -- internals -----------------------------------------------------
 
-    def _trim(self, service: str, now: datetime) -> None:
-        bucket = self._observations[service]
-        cutoff = now - self.window
-        while bucket and bucket[0].timestamp < cutoff:
-            bucket.popleft()
-
-    def _trim_concurrency(self, service: str, now: datetime) -> None:
-        bucket = self._concurrency[service]
-        cutoff = now - self.window
-        while bucket and bucket[0][0] < cutoff:
-            bucket.popleft()
+    def _new_window(self, *, track_quantiles: bool = True) -> RollingWindow:
+        return RollingWindow(
+            self.window.total_seconds(), bucket_width=self.bucket_seconds,
+            track_quantiles=track_quantiles,
+        )
 
 
 # -- Service dependency graph -------------------------------------------
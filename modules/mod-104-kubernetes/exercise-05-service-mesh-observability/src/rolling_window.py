@@ -0,0 +1,184 @@
+"""
+Rolling-Window Aggregation
+
+Time-bucketed rolling window for request metrics: a ring of fixed-width
+buckets, each holding a count, an error count, a value sum and a
+mergeable latency sketch. `record` is O(1); `snapshot` merges the live
+buckets, so its cost depends on the number of buckets, not on traffic.
+
+Positions are usually unix seconds, but any monotonically increasing
+number works (e.g. a request sequence number for count-based windows).
+
+`LatencySketch` is a log-bucketed histogram (DDSketch-style): every
+quantile it returns is within `relative_accuracy` of a true sample value
+of that rank, and two sketches merge by adding bucket counts.
+
+This module is self-contained; mod-108 ex-01 and ex-02 carry verbatim
+copies so each exercise stays standalone. Keep them in sync.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+
+class LatencySketch:
+    """Mergeable quantile sketch with bounded relative error."""
+
+    __slots__ = ("relative_accuracy", "_gamma", "_log_gamma", "bins", "zeros",
+                 "count", "total", "min", "max")
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        if not 0.0 < relative_accuracy < 1.0:
+            raise ValueError("relative_accuracy must be in (0, 1)")
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.bins: Dict[int, int] = {}
+        self.zeros = 0  # values <= 0 (latencies are non-negative)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        if value > 0:
+            index = math.ceil(math.log(value) / self._log_gamma)
+            self.bins[index] = self.bins.get(index, 0) + 1
+        else:
+            self.zeros += 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "LatencySketch") -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("cannot merge sketches with different accuracy")
+        bins = self.bins
+        for index, n in other.bins.items():
+            bins[index] = bins.get(index, 0) + n
+        self.zeros += other.zeros
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        """Value at quantile q in [0, 1]; 0.0 when empty."""
+        if self.count == 0:
+            return 0.0
+        rank = q * (self.count - 1)
+        if rank < self.zeros:
+            return max(self.min, 0.0)
+        seen = self.zeros
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if seen > rank:
+                # Midpoint (in relative terms) of (gamma^(i-1), gamma^i].
+                value = 2 * self._gamma ** index / (self._gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def percentile(self, percentile: float) -> float:
+        return self.quantile(percentile / 100.0)
+
+
+@dataclass
+class WindowStats:
+    """Aggregate over the live buckets of a RollingWindow."""
+
+    count: int = 0
+    errors: int = 0
+    samples: int = 0  # events that carried a value
+    total: float = 0.0
+    sketch: Optional[LatencySketch] = None
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.count if self.count else 0.0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.samples if self.samples else 0.0
+
+    def percentile(self, percentile: float) -> float:
+        if self.sketch is None or self.sketch.count == 0:
+            return 0.0
+        return self.sketch.percentile(percentile)
+
+
+@dataclass
+class _Bucket:
+    position: int = -1
+    count: int = 0
+    errors: int = 0
+    samples: int = 0
+    total: float = 0.0
+    sketch: Optional[LatencySketch] = None
+
+
+class RollingWindow:
+    """Ring of `span / bucket_width` buckets covering the most recent `span`."""
+
+    def __init__(
+        self,
+        span: float,
+        *,
+        bucket_width: float = 1.0,
+        track_quantiles: bool = True,
+        relative_accuracy: float = 0.01,
+    ):
+        if span <= 0 or bucket_width <= 0:
+            raise ValueError("span and bucket_width must be positive")
+        self.span = span
+        self.bucket_width = bucket_width
+        self.num_buckets = max(1, math.ceil(span / bucket_width))
+        self.track_quantiles = track_quantiles
+        self.relative_accuracy = relative_accuracy
+        self._buckets: List[_Bucket] = [_Bucket() for _ in range(self.num_buckets)]
+        self.dropped = 0  # records older than the window when they arrived
+
+    def record(self, position: float, value: Optional[float] = None, *, error: bool = False) -> None:
+        """Count one event at `position`; `value` (e.g. latency) is optional."""
+        slot = int(position // self.bucket_width)
+        bucket = self._buckets[slot % self.num_buckets]
+        if bucket.position != slot:
+            if bucket.position > slot:
+                self.dropped += 1
+                return
+            bucket.position = slot
+            bucket.count = bucket.errors = bucket.samples = 0
+            bucket.total = 0.0
+            bucket.sketch = None
+        bucket.count += 1
+        if error:
+            bucket.errors += 1
+        if value is not None:
+            bucket.samples += 1
+            bucket.total += value
+            if self.track_quantiles:
+                if bucket.sketch is None:
+                    bucket.sketch = LatencySketch(self.relative_accuracy)
+                bucket.sketch.add(value)
+
+    def snapshot(self, now: float) -> WindowStats:
+        """Merge buckets in (now - span, now]."""
+        latest = int(now // self.bucket_width)
+        oldest = latest - self.num_buckets + 1
+        stats = WindowStats()
+        if self.track_quantiles:
+            stats.sketch = LatencySketch(self.relative_accuracy)
+        for bucket in self._buckets:
+            if oldest <= bucket.position <= latest and bucket.count:
+                stats.count += bucket.count
+                stats.errors += bucket.errors
+                stats.samples += bucket.samples
+                stats.total += bucket.total
+                if bucket.sketch is not None:
+                    stats.sketch.merge(bucket.sketch)
+        return stats
@@ -17,6 +17,7 @@ from src.metrics_collector import (
     SLOEvaluator,
     _percentile,
 )
+from src.rolling_window import LatencySketch, RollingWindow
 from src.tracer import (
     InMemoryExporter,
     NoopExporter,
@@ -287,3 +288,40 @@ class TestPercentileHelper:
         data = list(range(1, 101))
         assert _percentile(data, 50) == pytest.approx(50.5, rel=0.05)
         assert _percentile(data, 99) == pytest.approx(99.01, rel=0.01)
+
+
+class TestRollingWindow:
+    def test_sketch_within_relative_accuracy(self):
+        sketch = LatencySketch(relative_accuracy=0.01)
+        data = [float(v) for v in range(1, 10_001)]
+        for v in data:
+            sketch.add(v)
+        for p in (50, 95, 99):
+            assert sketch.percentile(p) == pytest.approx(_percentile(data, p), rel=0.011)
+
+    def test_merge_equals_single_sketch(self):
+        a, b, both = LatencySketch(), LatencySketch(), LatencySketch()
+        for v in range(1, 500):
+            (a if v % 2 else b).add(float(v))
+            both.add(float(v))
+        a.merge(b)
+        assert a.count == both.count
+        assert a.percentile(95) == both.percentile(95)
+
+    def test_expired_buckets_excluded_and_reused(self):
+        window = RollingWindow(10, bucket_width=1.0)
+        window.record(100.0, 5.0, error=True)
+        window.record(105.0, 7.0)
+        assert window.snapshot(109.0).count == 2
+        assert window.snapshot(110.0).count == 1  # t=100 fell out
+        window.record(110.0, 9.0)  # reuses the t=100 slot
+        stats = window.snapshot(110.0)
+        assert (stats.count, stats.errors) == (2, 0)
+        assert stats.mean == pytest.approx(8.0)
+
+    def test_late_record_for_reused_slot_is_dropped(self):
+        window = RollingWindow(10, bucket_width=1.0)
+        window.record(110.0, 1.0)
+        window.record(100.0, 1.0)  # same slot, already superseded
+        assert window.dropped == 1
+        assert window.snapshot(110.0).count == 1
@@ -0,0 +1,141 @@
+"""
+Benchmark: consumer throughput vs worker count and codec.
+
+    python scripts/bench_consumer.py
+    python scripts/bench_consumer.py --events 500000 --workers 0 1 2 4 8 --codecs json compact
+
+Publishes `--events` synthetic events (1,000 users, 10% redeliveries)
+through InMemoryProducer once per codec, then drains the topic with:
+
+Decode-only throughput is printed per codec, since on few cores the
+FeatureProcessor, not decoding, dominates end-to-end time.
+
+- legacy:      the previous EventConsumer loop (one json.loads +
+               fromisoformat per message, one store write per record)
+- workers=N:   ParallelEventConsumer with N shard processes
+               (N=0 runs the single shard in-process)
+
+Worker processes only help when the machine has spare cores; the
+header prints os.cpu_count() so results can be read in context.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.codec import get_codec  # noqa: E402
+from src.consumer import EventConsumer, InMemorySource, ParallelEventConsumer  # noqa: E402
+from src.processor import FeatureProcessor, FeatureStore  # noqa: E402
+from src.producer import Event, EventProducer, EventType, InMemoryProducer, event_stream  # noqa: E402
+
+
+class LegacyConsumer(EventConsumer):
+    """Previous implementation: per-message decode, per-record store write."""
+
+    def consume_once(self, *, max_messages: int = 1000):
+        records = []
+        payloads = self.source.poll(max_messages=max_messages)
+        self.stats.polled += len(payloads)
+        for raw in payloads:
+            try:
+                event = legacy_decode(raw)
+            except Exception:
+                self.stats.decode_errors += 1
+                continue
+            self.stats.decoded += 1
+            output = self.processor.process(event)
+            if output is not None:
+                self.store.write(output)
+                records.append(output)
+                self.stats.written_features += 1
+        self.source.commit()
+        return records
+
+
+def legacy_decode(raw: bytes) -> Event:
+    data = json.loads(raw.decode("utf-8"))
+    return Event(
+        event_id=data["event_id"],
+        event_type=EventType(data["event_type"]),
+        user_id=data["user_id"],
+        timestamp=datetime.fromisoformat(data["timestamp"]),
+        payload=dict(data.get("payload", {})),
+    )
+
+
+def decode_rate(payloads, decode_batch, batch: int) -> float:
+    begin = time.perf_counter()
+    for i in range(0, len(payloads), batch):
+        decode_batch(payloads[i:i + batch])
+    return len(payloads) / (time.perf_counter() - begin)
+
+
+def publish(events, codec) -> InMemoryProducer:
+    sink = InMemoryProducer()
+    producer = EventProducer(sink, topic="events", idempotent=False, codec=codec)
+    for event in events:
+        producer.send(event)
+    return sink
+
+
+def report(name: str, elapsed: float, count: int, store: FeatureStore) -> float:
+    rate = count / elapsed
+    print(f"  {name:<12} {rate:>10,.0f} msgs/s   ({elapsed:>6.2f}s)   users={len(store):,}")
+    return rate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 1, 2, 4])
+    parser.add_argument("--codecs", nargs="+", default=["json", "compact"])
+    parser.add_argument("--batch", type=int, default=5000, help="messages per poll")
+    args = parser.parse_args()
+
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    events = []
+    for event in event_stream(args.events, seed=1, duplicate_rate=0.1, base_time=base):
+        user = int(event.user_id[1:]) % args.users
+        events.append(Event(event.event_id, event.event_type, f"u{user:05d}",
+                            event.timestamp, event.payload))
+    print(f"{len(events):,} messages, {args.users:,} users, cpu_count={os.cpu_count()}")
+
+    for codec_name in args.codecs:
+        codec = get_codec(codec_name)
+        sink = publish(events, codec)
+        size = sum(len(r["value"]) for r in sink.messages("events")) / len(events)
+        payloads = [r["value"] for r in sink.messages("events")]
+        print(f"codec={codec_name} ({size:.0f} B/msg, "
+              f"decode only {decode_rate(payloads, codec.decode_batch, args.batch):,.0f} msgs/s)")
+
+        if codec_name == "json":
+            legacy = decode_rate(payloads, lambda b: [legacy_decode(p) for p in b], args.batch)
+            print(f"  legacy decode only {legacy:,.0f} msgs/s")
+            store = FeatureStore()
+            consumer = LegacyConsumer(InMemorySource(sink, "events"), FeatureProcessor(), store)
+            begin = time.perf_counter()
+            while consumer.consume_once(max_messages=args.batch) or consumer.stats.polled < len(events):
+                pass
+            report("legacy", time.perf_counter() - begin, len(events), store)
+
+        for workers in args.workers:
+            store = FeatureStore()
+            source = InMemorySource(sink, "events")
+            with ParallelEventConsumer(source, store, workers=workers, codec=codec,
+                                       max_messages=args.batch) as consumer:
+                begin = time.perf_counter()
+                consumer.consume_until_drained()
+                elapsed = time.perf_counter() - begin
+            report(f"workers={workers}", elapsed, len(events), store)
+
+
+if __name__ == "__main__":
+    main()
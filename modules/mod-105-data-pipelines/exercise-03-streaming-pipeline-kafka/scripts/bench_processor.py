@@ -0,0 +1,132 @@
+"""
+Benchmark: FeatureProcessor throughput for heavy users.
+
+    python scripts/bench_processor.py
+    python scripts/bench_processor.py --users 10 --rate 20 --minutes 15
+
+Each of `--users` users emits `--rate` events per second of event time
+(80% transactions, 20% clicks, with mild out-of-order jitter), so a
+5-minute window holds `rate * 300` events per user. `LegacyProcessor`
+reproduces the previous implementation, which recomputed every feature
+from the full window buffer on each event and kept every event ID.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.processor import FeatureProcessor, FeatureRecord, Watermark  # noqa: E402
+from src.producer import Event, EventType, generate_click, generate_transaction  # noqa: E402
+
+
+class LegacyProcessor(FeatureProcessor):
+    """Previous implementation: O(window) feature recompute per event."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._buffers = defaultdict(deque)
+        self._all_ids = set()
+
+    def process(self, event: Event):
+        if event.event_id in self._all_ids:
+            self.stats.skipped_duplicate += 1
+            return None
+        if self._watermark is None or event.timestamp > self._watermark.timestamp:
+            self._watermark = Watermark(event.timestamp, self.allowed_lateness)
+        if self._watermark.is_late(event.timestamp):
+            self.stats.skipped_late += 1
+            return None
+        self._all_ids.add(event.event_id)
+        buf = self._buffers[event.user_id]
+        buf.append(event)
+        cutoff = event.timestamp - self.window
+        while buf and buf[0].timestamp < cutoff:
+            buf.popleft()
+        self.stats.processed += 1
+        self.stats.features_emitted += 1
+        return FeatureRecord(event.user_id, event.timestamp, self._features(buf),
+                             len(buf), int(self.window.total_seconds()))
+
+    @staticmethod
+    def _features(buf):
+        events = list(buf)
+        txns = [e for e in events if e.event_type is EventType.TRANSACTION]
+        clicks = [e for e in events if e.event_type is EventType.CLICK]
+        amounts = [float(e.payload.get("amount_usd", 0.0)) for e in txns]
+        merchants = {str(e.payload.get("merchant", "")) for e in txns if e.payload.get("merchant")}
+        cities = {str(e.payload.get("city", "")) for e in txns if e.payload.get("city")}
+        card_present = sum(1 for e in txns if e.payload.get("is_card_present", False))
+        if amounts:
+            avg, mx, total = statistics.mean(amounts), max(amounts), sum(amounts)
+            stdev = statistics.pstdev(amounts) if len(amounts) > 1 else 0.0
+        else:
+            avg = mx = total = stdev = 0.0
+        return {
+            "txn_count_5m": float(len(txns)),
+            "txn_avg_amount_5m": round(avg, 2),
+            "txn_max_amount_5m": round(mx, 2),
+            "txn_total_amount_5m": round(total, 2),
+            "txn_amount_stdev_5m": round(stdev, 2),
+            "txn_unique_merchants_5m": float(len(merchants)),
+            "txn_unique_cities_5m": float(len(cities)),
+            "txn_card_present_ratio_5m": round(card_present / max(1, len(txns)), 3),
+            "click_count_5m": float(len(clicks)),
+            "click_to_txn_ratio_5m": round(len(clicks) / max(1, len(txns)), 3),
+        }
+
+
+def make_events(args):
+    rng = random.Random(0)
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    total = args.users * args.rate * args.minutes * 60
+    step = 1.0 / (args.users * args.rate)
+    events = []
+    for i in range(total):
+        when = base + timedelta(seconds=i * step - rng.uniform(0, 5))
+        user = f"u{rng.randrange(args.users):03d}"
+        if rng.random() < 0.2:
+            events.append(generate_click(user_id=user, now=when, rng=rng))
+        else:
+            events.append(generate_transaction(user_id=user, now=when, rng=rng))
+    return events
+
+
+def run(name: str, processor: FeatureProcessor, events) -> float:
+    begin = time.perf_counter()
+    last = None
+    for event in events:
+        last = processor.process(event) or last
+    elapsed = time.perf_counter() - begin
+    print(f"  {name:<12} {len(events) / elapsed:>10,.0f} events/s   "
+          f"({elapsed / len(events) * 1e6:>8.1f} us/event)   "
+          f"window={last.event_count} events  txn_avg={last.features['txn_avg_amount_5m']}")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--rate", type=int, default=10, help="events per second per user")
+    parser.add_argument("--minutes", type=int, default=10, help="minutes of event time")
+    parser.add_argument("--skip-legacy", action="store_true")
+    args = parser.parse_args()
+
+    events = make_events(args)
+    print(f"{len(events):,} events, {args.users} users, ~{args.rate * 300:,} events/user/window")
+    incremental = run("incremental", FeatureProcessor(), events)
+    if not args.skip_legacy:
+        legacy = run("legacy", LegacyProcessor(), events)
+        print(f"  speedup {legacy / incremental:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Event Codecs
+
+Wire formats for Events on the topic. Every codec encodes one Event per
+message and decodes a whole poll batch at once, keeping the per-message
+Python overhead of the consumer's hot loop small; each message is
+still parsed on its own, so a malformed one can't shift or inject
+events.
+
+- JsonCodec:    the original `Event.to_json()` document (default).
+- CompactCodec: positional JSON array, ~30% smaller and faster to
+                decode; no extra dependencies.
+- MsgpackCodec: positional msgpack array with integer-microsecond
+                timestamps; requires the optional `msgpack` package.
+
+Producer and consumer must agree on the codec for a topic.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Protocol, Sequence, Tuple
+
+from .producer import Event, EventType
+
+
+_EVENT_TYPES: Dict[str, EventType] = {t.value: t for t in EventType}
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+_RAW_DECODE = json.JSONDecoder().raw_decode
+
+
+def _make_event(
+    event_id: str,
+    event_type: str,
+    user_id: str,
+    timestamp: datetime,
+    payload: Dict[str, object],
+) -> Event:
+    return Event(
+        event_id=event_id,
+        event_type=_EVENT_TYPES[event_type],
+        user_id=user_id,
+        timestamp=timestamp,
+        payload=payload,
+    )
+
+
+class EventCodec(Protocol):
+    """Serializes Events for the topic; decodes poll batches."""
+
+    name: str
+
+    def encode(self, event: Event) -> bytes: ...
+
+    def decode_batch(self, payloads: Sequence[bytes]) -> Tuple[List[Event], int]:
+        """Returns (decoded events in order, number of undecodable payloads)."""
+        ...
+
+
+class _JsonBatchCodec:
+    """Shared batch path for the JSON codecs.
+
+    Each payload is parsed on its own with the C scanner (`raw_decode`
+    on the decoded text, which skips json.loads' per-call encoding
+    detection) and must be exactly one JSON value, so a malformed
+    message can only fail itself: it never merges with, or splits into,
+    its neighbours. Payloads the fast path rejects are re-checked with
+    json.loads (e.g. surrounding whitespace) before counting as errors.
+    """
+
+    name = ""
+
+    def encode(self, event: Event) -> bytes:
+        raise NotImplementedError
+
+    def _from_item(self, item) -> Event:
+        raise NotImplementedError
+
+    def decode_batch(self, payloads: Sequence[bytes]) -> Tuple[List[Event], int]:
+        events: List[Event] = []
+        errors = 0
+        raw_decode = _RAW_DECODE
+        from_item = self._from_item
+        for raw in payloads:
+            try:
+                text = raw.decode("utf-8")
+                item, end = raw_decode(text)
+                if end != len(text):
+                    raise ValueError("trailing data after JSON value")
+            except ValueError:
+                try:
+                    item = json.loads(raw)
+                except ValueError:
+                    errors += 1
+                    continue
+            try:
+                events.append(from_item(item))
+            except (KeyError, TypeError, ValueError, AttributeError):
+                errors += 1
+        return events, errors
+
+
+class JsonCodec(_JsonBatchCodec):
+    """`Event.to_json()` documents; wire-compatible with earlier producers."""
+
+    name = "json"
+
+    def encode(self, event: Event) -> bytes:
+        return event.to_json().encode("utf-8")
+
+    def _from_item(self, data) -> Event:
+        return _make_event(
+            data["event_id"],
+            data["event_type"],
+            data["user_id"],
+            datetime.fromisoformat(data["timestamp"]),
+            dict(data.get("payload", {})),
+        )
+
+
+class CompactCodec(_JsonBatchCodec):
+    """`[event_id, event_type, user_id, timestamp, payload]` without whitespace."""
+
+    name = "compact"
+
+    def encode(self, event: Event) -> bytes:
+        return json.dumps(
+            [event.event_id, event.event_type.value, event.user_id,
+             event.timestamp.isoformat(), event.payload],
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+    def _from_item(self, item) -> Event:
+        event_id, event_type, user_id, timestamp, payload = item
+        if not isinstance(payload, dict):
+            raise TypeError("payload must be an object")
+        return _make_event(event_id, event_type, user_id, datetime.fromisoformat(timestamp), payload)
+
+
+class MsgpackCodec:
+    """Positional msgpack arrays; timestamps as UTC microseconds since the epoch.
+
+    Decoded timestamps are always UTC-aware, whatever offset they were
+    produced with (the instant is preserved).
+    """
+
+    name = "msgpack"
+
+    def __init__(self) -> None:
+        try:
+            import msgpack
+        except ImportError as exc:  # pragma: no cover - depends on environment
+            raise ImportError("MsgpackCodec requires the 'msgpack' package") from exc
+        self._msgpack = msgpack
+        self._packer = msgpack.Packer()
+
+    def encode(self, event: Event) -> bytes:
+        ts = event.timestamp
+        if ts.tzinfo is None:
+            ts = ts.replace(tzinfo=timezone.utc)
+        micros = (ts - _EPOCH) // _MICROSECOND
+        return self._packer.pack(
+            [event.event_id, event.event_type.value, event.user_id, micros, event.payload]
+        )
+
+    def decode_batch(self, payloads: Sequence[bytes]) -> Tuple[List[Event], int]:
+        # Each payload is unpacked on its own: msgpack has no framing
+        # that would let one corrupt message be isolated from a joined
+        # buffer.
+        unpackb = self._msgpack.unpackb
+        events: List[Event] = []
+        errors = 0
+        for raw in payloads:
+            try:
+                event_id, event_type, user_id, micros, payload = unpackb(raw)
+                if not isinstance(payload, dict):
+                    raise TypeError("payload must be a map")
+                events.append(_make_event(
+                    event_id, event_type, user_id, _EPOCH + micros * _MICROSECOND, payload,
+                ))
+            except Exception:
+                errors += 1
+        return events, errors
+
+
+CODECS: Dict[str, Callable[[], EventCodec]] = {
+    JsonCodec.name: JsonCodec,
+    CompactCodec.name: CompactCodec,
+    MsgpackCodec.name: MsgpackCodec,
+}
+
+
+def get_codec(name: str) -> EventCodec:
+    """Codec by name: 'json', 'compact' or 'msgpack'."""
+    try:
+        factory = CODECS[name]
+    except KeyError:
+        raise ValueError(f"unknown codec {name!r}; expected one of {sorted(CODECS)}") from None
+    return factory()
@@ -10,18 +10,29 @@ duplicate FeatureRecords.
 The default InMemorySource pulls from the matching InMemoryProducer's
 record list; pass `KafkaConsumer` from confluent_kafka for live
 deployments.
+
+ParallelEventConsumer scales the same pipeline across worker processes.
+Messages are routed by key (user_id) to a fixed set of partitions, each
+partition is owned by one worker, and each worker runs its own
+FeatureProcessor shard. A user's events (and redeliveries of them)
+always land on the same shard, so windows and idempotency stay
+per-user exactly as in the single-process consumer. Each poll batch is
+decoded in bulk by the workers, the resulting records are written to
+the FeatureStore in one write_many call, and offsets are committed only
+after that write returns.
 """
 
 from __future__ import annotations
 
-import json
 import logging
+import multiprocessing
+import zlib
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Callable, Iterable, List, Optional, Protocol
+from typing import Callable, Dict, Iterator, List, Optional, Protocol, Sequence, Tuple
 
-from .processor import FeatureProcessor, FeatureRecord, FeatureStore
-from .producer import Event, EventType, InMemoryProducer
+from .codec import EventCodec, JsonCodec, get_codec
+from .processor import FeatureProcessor, FeatureRecord, FeatureStore, ProcessorStats
+from .producer import Event, InMemoryProducer
 
 
 logger = logging.getLogger(__name__)
@@ -35,23 +46,44 @@ class StreamSource(Protocol):
     def commit(self) -> None: ...
 
 
+class KeyedStreamSource(StreamSource, Protocol):
+    """Source that also exposes message keys, needed for partition routing."""
+
+    def poll_keyed(
+        self, *, max_messages: int = 1000, timeout_seconds: float = 1.0,
+    ) -> List[Tuple[str, bytes]]: ...
+
+
 class InMemorySource:
-    """Source backed by an InMemoryProducer's record list."""
+    """Source backed by an InMemoryProducer's record list.
 
-    def __init__(self, producer: InMemoryProducer, topic: str):
+    `committed` is the offset a restarted consumer would resume from; it
+    only moves when commit() is called.
+    """
+
+    def __init__(self, producer: InMemoryProducer, topic: str, *, offset: int = 0):
         self.producer = producer
         self.topic = topic
-        self._offset = 0
+        self._offset = offset
+        self.committed = offset
 
-    def poll(self, *, max_messages: int = 1000, timeout_seconds: float = 1.0) -> List[bytes]:
-        records = self.producer.messages(self.topic)
+    def _next_batch(self, max_messages: int) -> List[Dict[str, object]]:
+        records = self.producer.records.get(self.topic, [])
         end = min(len(records), self._offset + max_messages)
         batch = records[self._offset:end]
         self._offset = end
-        return [r["value"] for r in batch]
+        return batch
+
+    def poll(self, *, max_messages: int = 1000, timeout_seconds: float = 1.0) -> List[bytes]:
+        return [r["value"] for r in self._next_batch(max_messages)]
+
+    def poll_keyed(
+        self, *, max_messages: int = 1000, timeout_seconds: float = 1.0,
+    ) -> List[Tuple[str, bytes]]:
+        return [(r["key"], r["value"]) for r in self._next_batch(max_messages)]
 
     def commit(self) -> None:
-        return None
+        self.committed = self._offset
 
 
 @dataclass
@@ -62,15 +94,19 @@ class ConsumerStats:
     written_features: int = 0
 
 
-def _decode_event(payload: bytes) -> Event:
-    data = json.loads(payload.decode("utf-8"))
-    return Event(
-        event_id=data["event_id"],
-        event_type=EventType(data["event_type"]),
-        user_id=data["user_id"],
-        timestamp=datetime.fromisoformat(data["timestamp"]),
-        payload=dict(data.get("payload", {})),
-    )
+# Payloads are decoded (one message at a time) in chunks of this many
+# messages, and each chunk is processed before the next is decoded, so
+# decoded events die young instead of the whole poll's worth surviving
+# into older GC generations.
+_DECODE_CHUNK = 64
+
+
+def _decoded(codec: EventCodec, payloads: Sequence[bytes], stats: ConsumerStats) -> Iterator[Event]:
+    for start in range(0, len(payloads), _DECODE_CHUNK):
+        events, errors = codec.decode_batch(payloads[start:start + _DECODE_CHUNK])
+        stats.decoded += len(events)
+        stats.decode_errors += errors
+        yield from events
 
 
 class EventConsumer:
@@ -81,29 +117,22 @@ class EventConsumer:
         source: StreamSource,
         processor: FeatureProcessor,
         store: FeatureStore,
+        *,
+        codec: Optional[EventCodec] = None,
     ):
         self.source = source
         self.processor = processor
         self.store = store
+        self.codec = codec or JsonCodec()
         self.stats = ConsumerStats()
 
     def consume_once(self, *, max_messages: int = 1000) -> List[FeatureRecord]:
         """Pull up to N messages, process them, write to the store, return emitted records."""
-        records: List[FeatureRecord] = []
         payloads = self.source.poll(max_messages=max_messages)
         self.stats.polled += len(payloads)
-        for raw in payloads:
-            try:
-                event = _decode_event(raw)
-            except Exception:
-                self.stats.decode_errors += 1
-                continue
-            self.stats.decoded += 1
-            output = self.processor.process(event)
-            if output is not None:
-                self.store.write(output)
-                records.append(output)
-                self.stats.written_features += 1
+        process = self.processor.process
+        records = [r for r in map(process, _decoded(self.codec, payloads, self.stats)) if r is not None]
+        self.stats.written_features += self.store.write_many(records)
         self.source.commit()
         return records
 
@@ -117,3 +146,217 @@ class EventConsumer:
                 break
             out.extend(batch)
         return out
+
+
+# -- Parallel consumer -------------------------------------------------
+
+
+def partition_for(key: str, partitions: int) -> int:
+    """Stable key → partition mapping (same in every process, unlike hash())."""
+    return zlib.crc32(key.encode("utf-8")) % partitions
+
+
+@dataclass
+class _ShardResult:
+    records: List[FeatureRecord]  # latest record per user in the batch
+    decoded: int
+    decode_errors: int
+    processor_stats: ProcessorStats
+
+
+class _Shard:
+    """One worker's slice of the pipeline: decode → process → compact."""
+
+    def __init__(self, codec: EventCodec, processor: FeatureProcessor):
+        self.codec = codec
+        self.processor = processor
+
+    def handle(self, payloads: Sequence[bytes]) -> _ShardResult:
+        stats = ConsumerStats()
+        process = self.processor.process
+        latest: Dict[str, FeatureRecord] = {}
+        for event in _decoded(self.codec, payloads, stats):
+            record = process(event)
+            if record is not None:
+                latest[record.user_id] = record
+        # The store keeps one record per user, so only the newest of each
+        # user's records in this batch has to cross the process boundary.
+        return _ShardResult(
+            records=list(latest.values()),
+            decoded=stats.decoded,
+            decode_errors=stats.decode_errors,
+            processor_stats=self.processor.stats,
+        )
+
+    def flush(self) -> _ShardResult:
+        records = self.processor.flush()
+        return _ShardResult(records, 0, 0, self.processor.stats)
+
+
+def _shard_main(conn, codec_name: str, processor_factory: Callable[[], FeatureProcessor]) -> None:
+    shard = _Shard(get_codec(codec_name), processor_factory())
+    while True:
+        message = conn.recv()
+        if message is None:
+            break
+        op, payloads = message
+        try:
+            result = shard.handle(payloads) if op == "batch" else shard.flush()
+        except Exception as exc:  # reported to the parent, which skips the commit
+            conn.send(("error", f"{type(exc).__name__}: {exc}"))
+        else:
+            conn.send(("ok", result))
+    conn.close()
+
+
+class ParallelEventConsumer:
+    """Partitioned source → processor shards → store pipeline.
+
+    `workers` processes each own `partitions / workers` partitions and a
+    FeatureProcessor built by `processor_factory` (must be picklable when
+    the multiprocessing start method is not fork). `workers=0` runs a
+    single shard in the calling process, which is useful for tests and
+    as a baseline. The codec is re-created by name inside each worker.
+
+    Event-time watermarks are per shard: an event is late relative to the
+    newest event seen on its own shard, as with per-partition watermarks
+    in Kafka Streams or Flink.
+    """
+
+    def __init__(
+        self,
+        source: KeyedStreamSource,
+        store: FeatureStore,
+        *,
+        workers: int = 4,
+        partitions: int = 12,
+        codec: Optional[EventCodec] = None,
+        processor_factory: Callable[[], FeatureProcessor] = FeatureProcessor,
+        max_messages: int = 5000,
+    ):
+        if workers < 0:
+            raise ValueError("workers must be >= 0")
+        if partitions < max(workers, 1):
+            raise ValueError("partitions must be >= workers")
+        self.source = source
+        self.store = store
+        self.workers = workers
+        self.partitions = partitions
+        self.codec = codec or JsonCodec()
+        self.max_messages = max_messages
+        self.stats = ConsumerStats()
+        shards = max(workers, 1)
+        self._owner = [p % shards for p in range(partitions)]
+        self._shard_stats: List[ProcessorStats] = [ProcessorStats() for _ in range(shards)]
+        self._local: Optional[_Shard] = None
+        self._conns: list = []
+        self._procs: list = []
+        if workers == 0:
+            self._local = _Shard(self.codec, processor_factory())
+            return
+        ctx = multiprocessing.get_context()
+        for _ in range(workers):
+            parent, child = ctx.Pipe()
+            proc = ctx.Process(
+                target=_shard_main, args=(child, self.codec.name, processor_factory), daemon=True,
+            )
+            proc.start()
+            child.close()
+            self._conns.append(parent)
+            self._procs.append(proc)
+
+    @property
+    def assignment(self) -> Dict[int, List[int]]:
+        """Worker index → owned partitions."""
+        out: Dict[int, List[int]] = {}
+        for partition, owner in enumerate(self._owner):
+            out.setdefault(owner, []).append(partition)
+        return out
+
+    @property
+    def processor_stats(self) -> ProcessorStats:
+        """Processor counters summed across shards (as of the last batch)."""
+        total = ProcessorStats()
+        for stats in self._shard_stats:
+            for name, value in vars(stats).items():
+                setattr(total, name, getattr(total, name) + value)
+        return total
+
+    def _run(self, op: str, batches: List[List[bytes]]) -> List[_ShardResult]:
+        if self._local is not None:
+            shard = self._local
+            return [shard.handle(batches[0]) if op == "batch" else shard.flush()]
+        for conn, batch in zip(self._conns, batches):
+            conn.send((op, batch))
+        # Drain every reply before raising so the pipes stay in step.
+        replies = [conn.recv() for conn in self._conns]
+        failures = [detail for status, detail in replies if status != "ok"]
+        if failures:
+            raise RuntimeError(f"shard failed: {failures[0]}")
+        return [detail for _, detail in replies]
+
+    def _write(self, results: List[_ShardResult]) -> List[FeatureRecord]:
+        records: List[FeatureRecord] = []
+        for index, result in enumerate(results):
+            self.stats.decoded += result.decoded
+            self.stats.decode_errors += result.decode_errors
+            self._shard_stats[index] = result.processor_stats
+            records.extend(result.records)
+        # Shards own disjoint users, so the batch holds one record per user.
+        self.stats.written_features += self.store.write_many(records)
+        return records
+
+    def consume_once(self, *, max_messages: Optional[int] = None) -> List[FeatureRecord]:
+        """Poll one batch, fan it out, bulk-write the results, then commit.
+
+        Returns the newest record per user produced by the batch. If a
+        shard or the store write fails, the exception propagates and the
+        source offset is not committed.
+        """
+        messages = self.source.poll_keyed(max_messages=max_messages or self.max_messages)
+        if not messages:
+            return []
+        self.stats.polled += len(messages)
+        batches: List[List[bytes]] = [[] for _ in range(max(self.workers, 1))]
+        owner, partitions, crc32 = self._owner, self.partitions, zlib.crc32
+        for key, value in messages:
+            batches[owner[crc32(key.encode("utf-8")) % partitions]].append(value)
+        records = self._write(self._run("batch", batches))
+        self.source.commit()
+        return records
+
+    def consume_until_drained(self) -> List[FeatureRecord]:
+        """Repeatedly poll until the source returns no records."""
+        out: List[FeatureRecord] = []
+        while True:
+            polled = self.stats.polled
+            out.extend(self.consume_once())
+            if self.stats.polled == polled:
+                # A batch may emit nothing (all duplicates); only an empty
+                # poll means we're caught up.
+                break
+        return out
+
+    def flush(self) -> List[FeatureRecord]:
+        """Flush every shard's windows and write the final records."""
+        return self._write(self._run("flush", [[] for _ in range(max(self.workers, 1))]))
+
+    def close(self) -> None:
+        for conn in self._conns:
+            try:
+                conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for proc in self._procs:
+            proc.join(timeout=5)
+            if proc.is_alive():
+                proc.terminate()
+        for conn in self._conns:
+            conn.close()
+        self._conns, self._procs = [], []
+
+    def __enter__(self) -> "ParallelEventConsumer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
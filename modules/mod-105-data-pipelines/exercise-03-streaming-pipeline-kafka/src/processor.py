@@ -3,17 +3,24 @@ Stream Processor — feature engineering on Event streams
 
 Computes time-window aggregations + transformations + watermark-driven
 late-data handling. The processor maintains per-user state and emits
-FeatureRecords downstream as windows close. Designed to be a faithful
-Python equivalent of the Flink/SQL feature definitions the curriculum
-references; production deployments swap the in-process state for
-Flink's keyed-state APIs.
+FeatureRecords downstream as windows close.
+
+Per-user state is a `_UserWindow`: the in-window events plus running
+aggregates (counts, sum, sum of squares, a monotonic max deque and
+refcounted merchant/city multisets) updated on append and on eviction,
+so each event costs O(1) amortized regardless of window size. Event IDs
+for idempotency live in time buckets that expire with the watermark.
+
+Designed to be a faithful Python equivalent of the Flink/SQL feature
+definitions the curriculum references; production deployments swap the
+in-process state for Flink's keyed-state APIs.
 """
 
 from __future__ import annotations
 
 import logging
-import statistics
-from collections import defaultdict, deque
+import math
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple
@@ -54,6 +61,157 @@ class ProcessorStats:
     features_emitted: int = 0
 
 
+class _UserWindow:
+    """One user's in-window events with running feature aggregates.
+
+    Events are evicted in arrival order (the head is dropped while it is
+    older than the cutoff), exactly as the list-based version trimmed its
+    deque; every aggregate is decremented as its event leaves.
+    """
+
+    __slots__ = (
+        "events", "_next_seq", "txn_count", "click_count", "card_present",
+        "amount_sum", "amount_sum_sq", "_max", "merchants", "cities",
+    )
+
+    def __init__(self) -> None:
+        # (timestamp, event_type, amount, merchant, city, card_present)
+        self.events: Deque[tuple] = deque()
+        self._next_seq = 0
+        self.txn_count = 0
+        self.click_count = 0
+        self.card_present = 0
+        self.amount_sum = 0.0
+        self.amount_sum_sq = 0.0
+        self._max: Deque[Tuple[int, float]] = deque()  # (seq, amount), amounts decreasing
+        self.merchants: Dict[str, int] = {}
+        self.cities: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def append(self, event: Event) -> None:
+        seq = self._next_seq
+        self._next_seq += 1
+        if event.event_type is EventType.TRANSACTION:
+            payload = event.payload
+            amount = float(payload.get("amount_usd", 0.0))
+            merchant = str(payload["merchant"]) if payload.get("merchant") else None
+            city = str(payload["city"]) if payload.get("city") else None
+            card_present = bool(payload.get("is_card_present", False))
+            self.txn_count += 1
+            self.amount_sum += amount
+            self.amount_sum_sq += amount * amount
+            self.card_present += card_present
+            while self._max and self._max[-1][1] <= amount:
+                self._max.pop()
+            self._max.append((seq, amount))
+            if merchant is not None:
+                self.merchants[merchant] = self.merchants.get(merchant, 0) + 1
+            if city is not None:
+                self.cities[city] = self.cities.get(city, 0) + 1
+            self.events.append((event.timestamp, EventType.TRANSACTION, amount, merchant, city, card_present))
+        else:
+            if event.event_type is EventType.CLICK:
+                self.click_count += 1
+            self.events.append((event.timestamp, event.event_type, 0.0, None, None, False))
+
+    def evict_before(self, cutoff: datetime) -> None:
+        events = self.events
+        while events and events[0][0] < cutoff:
+            _, event_type, amount, merchant, city, card_present = events.popleft()
+            seq = self._next_seq - len(events) - 1
+            if event_type is EventType.TRANSACTION:
+                self.txn_count -= 1
+                self.card_present -= card_present
+                if self._max and self._max[0][0] == seq:
+                    self._max.popleft()
+                if merchant is not None:
+                    _release(self.merchants, merchant)
+                if city is not None:
+                    _release(self.cities, city)
+                if self.txn_count:
+                    self.amount_sum -= amount
+                    self.amount_sum_sq -= amount * amount
+                else:
+                    # Empty window: reset instead of subtracting so float
+                    # error cannot accumulate across windows.
+                    self.amount_sum = self.amount_sum_sq = 0.0
+            elif event_type is EventType.CLICK:
+                self.click_count -= 1
+
+    def features(self) -> Dict[str, float]:
+        n = self.txn_count
+        if n:
+            avg_amount = self.amount_sum / n
+            max_amount = self._max[0][1]
+            total_amount = self.amount_sum
+            variance = self.amount_sum_sq / n - avg_amount * avg_amount
+            stdev_amount = math.sqrt(max(variance, 0.0)) if n > 1 else 0.0
+        else:
+            avg_amount = max_amount = total_amount = stdev_amount = 0.0
+
+        return {
+            "txn_count_5m": float(n),
+            "txn_avg_amount_5m": round(avg_amount, 2),
+            "txn_max_amount_5m": round(max_amount, 2),
+            "txn_total_amount_5m": round(total_amount, 2),
+            "txn_amount_stdev_5m": round(stdev_amount, 2),
+            "txn_unique_merchants_5m": float(len(self.merchants)),
+            "txn_unique_cities_5m": float(len(self.cities)),
+            "txn_card_present_ratio_5m": round(self.card_present / max(1, n), 3),
+            "click_count_5m": float(self.click_count),
+            "click_to_txn_ratio_5m": round(self.click_count / max(1, n), 3),
+        }
+
+
+def _release(counts: Dict[str, int], key: str) -> None:
+    remaining = counts[key] - 1
+    if remaining:
+        counts[key] = remaining
+    else:
+        del counts[key]
+
+
+class _ExpiringIdSet:
+    """Event IDs bucketed by event time; whole buckets expire together.
+
+    Once every event in a bucket would be rejected as late, its IDs can
+    no longer matter for deduplication, so memory is bounded by the
+    traffic inside the allowed-lateness horizon.
+    """
+
+    def __init__(self, bucket_seconds: float):
+        self.bucket_seconds = max(bucket_seconds, 1.0)
+        self._buckets: Dict[int, set] = {}
+        self._oldest: Optional[int] = None  # smallest bucket key, if any
+
+    def __contains__(self, event_id: str) -> bool:
+        return any(event_id in ids for ids in self._buckets.values())
+
+    def __len__(self) -> int:
+        return sum(len(ids) for ids in self._buckets.values())
+
+    def add(self, event_id: str, timestamp: datetime) -> None:
+        key = int(timestamp.timestamp() // self.bucket_seconds)
+        ids = self._buckets.get(key)
+        if ids is None:
+            ids = self._buckets[key] = set()
+            if self._oldest is None or key < self._oldest:
+                self._oldest = key
+        ids.add(event_id)
+
+    def expire(self, horizon: datetime) -> None:
+        """Drop buckets whose events are all older than `horizon`."""
+        limit = horizon.timestamp()
+        # Called on every watermark advance; most calls expire nothing.
+        if self._oldest is None or (self._oldest + 1) * self.bucket_seconds > limit:
+            return
+        for key in [k for k in self._buckets if (k + 1) * self.bucket_seconds <= limit]:
+            del self._buckets[key]
+        self._oldest = min(self._buckets) if self._buckets else None
+
+
 class FeatureProcessor:
     """Per-user windowed feature computation."""
 
@@ -67,8 +225,10 @@ class FeatureProcessor:
         self.window = timedelta(seconds=window_seconds)
         self.allowed_lateness = timedelta(seconds=allowed_lateness_seconds)
         self.idempotent = idempotent
-        self._buffers: Dict[str, Deque[Event]] = defaultdict(deque)
-        self._seen_ids: set[str] = set()
+        self._windows: Dict[str, _UserWindow] = {}
+        # Duplicates of expired IDs are older than the lateness horizon, so
+        # they are still dropped (counted as late rather than duplicate).
+        self._seen_ids = _ExpiringIdSet(allowed_lateness_seconds)
         self._watermark: Optional[Watermark] = None
         self.stats = ProcessorStats()
 
@@ -89,36 +249,39 @@ class FeatureProcessor:
             self.stats.skipped_late += 1
             return None
 
-        self._seen_ids.add(event.event_id)
-        buf = self._buffers[event.user_id]
-        buf.append(event)
-        self._trim_window(buf, now=event.timestamp)
+        if self.idempotent:
+            self._seen_ids.add(event.event_id, event.timestamp)
+        window = self._windows.get(event.user_id)
+        if window is None:
+            window = self._windows[event.user_id] = _UserWindow()
+        window.append(event)
+        window.evict_before(event.timestamp - self.window)
         self.stats.processed += 1
 
-        features = self._compute_features(event.user_id, buf)
         record = FeatureRecord(
             user_id=event.user_id,
             window_end=event.timestamp,
-            features=features,
-            event_count=len(buf),
+            features=window.features(),
+            event_count=len(window),
             window_size_seconds=int(self.window.total_seconds()),
         )
         self.stats.features_emitted += 1
         return record
 
     def flush(self) -> List[FeatureRecord]:
-        """Emit a final FeatureRecord per active user."""
+        """Emit a final FeatureRecord per active user; drops idle users' state."""
         records: List[FeatureRecord] = []
         now = self._watermark.timestamp if self._watermark else datetime.now(timezone.utc)
-        for user_id, buf in self._buffers.items():
-            self._trim_window(buf, now=now)
-            if not buf:
+        for user_id, window in list(self._windows.items()):
+            window.evict_before(now - self.window)
+            if not window:
+                del self._windows[user_id]
                 continue
             records.append(FeatureRecord(
                 user_id=user_id,
                 window_end=now,
-                features=self._compute_features(user_id, buf),
-                event_count=len(buf),
+                features=window.features(),
+                event_count=len(window),
                 window_size_seconds=int(self.window.total_seconds()),
             ))
         return records
@@ -131,60 +294,8 @@ class FeatureProcessor:
                 timestamp=event.timestamp,
                 allowed_lateness=self.allowed_lateness,
             )
-
-    def _trim_window(self, buf: Deque[Event], *, now: datetime) -> None:
-        cutoff = now - self.window
-        while buf and buf[0].timestamp < cutoff:
-            buf.popleft()
-
-    def _compute_features(self, user_id: str, buf: Iterable[Event]) -> Dict[str, float]:
-        events = list(buf)
-        txn_events = [e for e in events if e.event_type is EventType.TRANSACTION]
-        click_events = [e for e in events if e.event_type is EventType.CLICK]
-
-        amounts = [
-            float(e.payload.get("amount_usd", 0.0))
-            for e in txn_events
-        ]
-        unique_merchants = {
-            str(e.payload.get("merchant", ""))
-            for e in txn_events
-            if e.payload.get("merchant")
-        }
-        unique_cities = {
-            str(e.payload.get("city", ""))
-            for e in txn_events
-            if e.payload.get("city")
-        }
-        card_present_count = sum(
-            1 for e in txn_events
-            if e.payload.get("is_card_present", False)
-        )
-
-        if amounts:
-            avg_amount = statistics.mean(amounts)
-            max_amount = max(amounts)
-            total_amount = sum(amounts)
-            stdev_amount = statistics.pstdev(amounts) if len(amounts) > 1 else 0.0
-        else:
-            avg_amount = max_amount = total_amount = stdev_amount = 0.0
-
-        return {
-            "txn_count_5m": float(len(txn_events)),
-            "txn_avg_amount_5m": round(avg_amount, 2),
-            "txn_max_amount_5m": round(max_amount, 2),
-            "txn_total_amount_5m": round(total_amount, 2),
-            "txn_amount_stdev_5m": round(stdev_amount, 2),
-            "txn_unique_merchants_5m": float(len(unique_merchants)),
-            "txn_unique_cities_5m": float(len(unique_cities)),
-            "txn_card_present_ratio_5m": round(
-                card_present_count / max(1, len(txn_events)), 3,
-            ),
-            "click_count_5m": float(len(click_events)),
-            "click_to_txn_ratio_5m": round(
-                len(click_events) / max(1, len(txn_events)), 3,
-            ),
-        }
+            if self.idempotent:
+                self._seen_ids.expire(event.timestamp - self.allowed_lateness)
 
 
 # -- Offline feature backfill ------------------------------------------
@@ -220,11 +331,10 @@ class FeatureStore:
         self.records[record.user_id] = record
 
     def write_many(self, records: Iterable[FeatureRecord]) -> int:
-        count = 0
-        for r in records:
-            self.write(r)
-            count += 1
-        return count
+        """Bulk write; later records for the same user win, as with write()."""
+        records = list(records)
+        self.records.update((r.user_id, r) for r in records)
+        return len(records)
 
     def read(self, user_id: str) -> Optional[FeatureRecord]:
         return self.records.get(user_id)
@@ -21,7 +21,10 @@ import uuid
 from dataclasses import asdict, dataclass, field
 from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Callable, Dict, Iterator, List, Optional, Protocol
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Protocol
+
+if TYPE_CHECKING:
+    from .codec import EventCodec
 
 
 logger = logging.getLogger(__name__)
@@ -90,10 +93,14 @@ class EventProducer:
         topic: str,
         *,
         idempotent: bool = True,
+        codec: Optional["EventCodec"] = None,
     ):
         self.sink = sink
         self.topic = topic
         self.idempotent = idempotent
+        # Any object with `encode(event) -> bytes` (see src/codec.py);
+        # None keeps the original `Event.to_json()` wire format.
+        self.codec = codec
         self._seen_ids: set[str] = set()
         self.sent_count = 0
         self.duplicate_count = 0
@@ -105,7 +112,7 @@ class EventProducer:
         self.sink.publish(
             topic=self.topic,
             key=event.user_id,
-            value=event.to_json().encode("utf-8"),
+            value=self.codec.encode(event) if self.codec else event.to_json().encode("utf-8"),
         )
         if self.idempotent:
             self._seen_ids.add(event.event_id)
@@ -1,11 +1,15 @@
 """Tests for the streaming feature pipeline."""
 
+import random
+import statistics
+from collections import defaultdict, deque
 from datetime import datetime, timedelta, timezone
 from typing import List
 
 import pytest
 
-from src.consumer import EventConsumer, InMemorySource
+from src.codec import CompactCodec, JsonCodec, MsgpackCodec, get_codec
+from src.consumer import EventConsumer, InMemorySource, ParallelEventConsumer, partition_for
 from src.processor import (
     FeatureBackfill,
     FeatureProcessor,
@@ -144,6 +148,72 @@ class TestFeatureProcessor:
         assert {r.user_id for r in records} == {"u1", "u2"}
 
 
+def _recompute(events: List[Event]) -> dict:
+    """Features straight from the window's events (the pre-aggregate formulas)."""
+    txns = [e for e in events if e.event_type is EventType.TRANSACTION]
+    amounts = [float(e.payload.get("amount_usd", 0.0)) for e in txns]
+    return {
+        "txn_count_5m": float(len(txns)),
+        "txn_avg_amount_5m": round(statistics.mean(amounts), 2) if amounts else 0.0,
+        "txn_max_amount_5m": round(max(amounts), 2) if amounts else 0.0,
+        "txn_total_amount_5m": round(sum(amounts), 2),
+        "txn_amount_stdev_5m": round(statistics.pstdev(amounts), 2) if len(amounts) > 1 else 0.0,
+        "txn_unique_merchants_5m": float(len({e.payload["merchant"] for e in txns})),
+        "txn_unique_cities_5m": float(len({e.payload["city"] for e in txns})),
+        "txn_card_present_ratio_5m": round(
+            sum(1 for e in txns if e.payload["is_card_present"]) / max(1, len(txns)), 3),
+        "click_count_5m": float(sum(1 for e in events if e.event_type is EventType.CLICK)),
+        "click_to_txn_ratio_5m": round(
+            sum(1 for e in events if e.event_type is EventType.CLICK) / max(1, len(txns)), 3),
+    }
+
+
+class TestIncrementalAggregates:
+    def test_matches_recompute_on_out_of_order_stream(self):
+        rng = random.Random(7)
+        base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        p = FeatureProcessor(window_seconds=60, allowed_lateness_seconds=10)
+        buffers = defaultdict(deque)
+        seen = set()
+        watermark = None
+        for i in range(1500):
+            when = base + timedelta(seconds=i * 0.1 - rng.uniform(0, 15))
+            user = rng.choice(["u1", "u2"])
+            if i and rng.random() < 0.05:
+                event = previous  # redelivery
+                when = event.timestamp
+            elif rng.random() < 0.3:
+                event = generate_click(user_id=user, now=when, rng=rng)
+            else:
+                event = _txn(user, round(rng.uniform(1, 500), 2), when=when,
+                             merchant=rng.choice("abcdefgh"), city=rng.choice("xyz"))
+            previous = event
+            user = event.user_id
+            record = p.process(event)
+            watermark = max(watermark or when, when)
+            if event.event_id in seen or when + timedelta(seconds=10) < watermark:
+                assert record is None
+                continue
+            seen.add(event.event_id)
+            buf = buffers[user]
+            buf.append(event)
+            while buf and buf[0].timestamp < when - timedelta(seconds=60):
+                buf.popleft()
+            assert record.event_count == len(buf)
+            assert record.features == pytest.approx(_recompute(list(buf)), abs=0.011)
+        assert p.stats.skipped_duplicate and p.stats.skipped_late
+
+    def test_idempotency_store_is_bounded(self):
+        p = FeatureProcessor(window_seconds=60, allowed_lateness_seconds=30)
+        base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        for i in range(5000):
+            p.process(_txn("u1", 1.0, when=base + timedelta(seconds=i)))
+        assert len(p._seen_ids) <= 61
+        late_dupe = _txn("u1", 1.0, when=base)
+        assert p.process(late_dupe) is None
+        assert p.stats.skipped_late == 1
+
+
 class TestFeatureStore:
     def test_write_and_read(self):
         store = FeatureStore()
@@ -203,6 +273,107 @@ class TestConsumer:
         assert consumer.stats.written_features == 0
 
 
+class TestCodecs:
+    @pytest.mark.parametrize("codec", [JsonCodec(), CompactCodec()])
+    def test_batch_round_trip(self, codec):
+        events = list(event_stream(50, seed=3, base_time=datetime(2024, 1, 1, tzinfo=timezone.utc)))
+        decoded, errors = codec.decode_batch([codec.encode(e) for e in events])
+        assert errors == 0
+        assert decoded == events
+
+    @pytest.mark.parametrize("codec", [JsonCodec(), CompactCodec()])
+    def test_bad_payloads_do_not_poison_batch(self, codec):
+        good = [codec.encode(generate_transaction(user_id=f"u{i}")) for i in range(3)]
+        payloads = [good[0], b"not-json", good[1], b"1,2", b'{"event_id": "x"}', good[2]]
+        decoded, errors = codec.decode_batch(payloads)
+        assert errors == 3
+        assert [e.user_id for e in decoded] == ["u0", "u1", "u2"]
+
+    def test_fragments_cannot_combine_into_events(self):
+        codec = JsonCodec()
+        a, b, c, d = (codec.encode(generate_transaction(user_id=u)).decode() for u in "abcd")
+        # Joined as one array these read as [[a, b], c, d]: two events from one bad message.
+        payloads = [("[" + a).encode(), (b + "]").encode(), (c + "," + d).encode()]
+        decoded, errors = codec.decode_batch(payloads)
+        assert decoded == [] and errors == 3
+
+    def test_json_codec_matches_legacy_wire_format(self):
+        event = generate_transaction(user_id="u1")
+        assert JsonCodec().encode(event) == event.to_json().encode("utf-8")
+
+    def test_msgpack_round_trip(self):
+        pytest.importorskip("msgpack")
+        codec = MsgpackCodec()
+        events = list(event_stream(20, seed=3, base_time=datetime(2024, 1, 1, tzinfo=timezone.utc)))
+        decoded, errors = codec.decode_batch([codec.encode(e) for e in events] + [b"\xc1"])
+        assert errors == 1
+        assert decoded == events
+
+    def test_unknown_codec(self):
+        with pytest.raises(ValueError):
+            get_codec("avro")
+
+
+class TestParallelConsumer:
+    def _publish(self, codec=None, count=3000):
+        sink = InMemoryProducer()
+        producer = EventProducer(sink, topic="events", idempotent=False, codec=codec)
+        base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        for event in event_stream(count, seed=11, duplicate_rate=0.1, base_time=base):
+            producer.send(event)
+        return sink
+
+    def _reference(self, sink):
+        store = FeatureStore()
+        consumer = EventConsumer(InMemorySource(sink, topic="events"), FeatureProcessor(), store)
+        consumer.consume_until_drained()
+        return store, consumer.processor
+
+    @pytest.mark.parametrize("workers", [0, 2])
+    def test_matches_single_process_consumer(self, workers):
+        sink = self._publish(codec=CompactCodec())
+        expected, processor = self._reference(self._publish())
+        store = FeatureStore()
+        source = InMemorySource(sink, topic="events")
+        with ParallelEventConsumer(source, store, workers=workers, partitions=6,
+                                   codec=CompactCodec(), max_messages=700) as consumer:
+            consumer.consume_until_drained()
+            stats = consumer.processor_stats
+        assert store.records == expected.records
+        assert stats.skipped_duplicate == processor.stats.skipped_duplicate > 0
+        assert consumer.stats.polled == len(sink.messages("events"))
+        assert source.committed == consumer.stats.polled
+
+    def test_partitions_are_owned_by_one_worker(self):
+        source = InMemorySource(InMemoryProducer(), "events")
+        with ParallelEventConsumer(source, FeatureStore(), workers=3, partitions=8) as consumer:
+            assert consumer.assignment == {0: [0, 3, 6], 1: [1, 4, 7], 2: [2, 5]}
+            assert consumer.consume_until_drained() == []
+        assert 0 <= partition_for("u00042", 8) < 8
+        with pytest.raises(ValueError):
+            ParallelEventConsumer(source, FeatureStore(), workers=4, partitions=2)
+
+    def test_offsets_not_committed_when_store_write_fails(self):
+        class FailingStore(FeatureStore):
+            def write_many(self, records):
+                raise IOError("store unavailable")
+
+        sink = self._publish(count=100)
+        source = InMemorySource(sink, topic="events")
+        with ParallelEventConsumer(source, FailingStore(), workers=0) as consumer:
+            with pytest.raises(IOError):
+                consumer.consume_once()
+        assert source.committed == 0
+
+    def test_flush_writes_final_records(self):
+        sink = self._publish(count=200)
+        store = FeatureStore()
+        with ParallelEventConsumer(InMemorySource(sink, topic="events"), store, workers=2) as consumer:
+            consumer.consume_until_drained()
+            flushed = consumer.flush()
+        assert {r.user_id for r in flushed} == set(store.records)
+
+
 class TestExactlyOnce:
     def test_duplicate_events_dropped_end_to_end(self):
         sink = InMemoryProducer()
@@ -1,13 +1,24 @@
-"""Backfill driver: three strategies + safety rails."""
+"""Backfill driver: four strategies + safety rails.
+
+`adaptive` is the resumable engine: units live in a persistent
+`work_queue` table (pending → running → done/failed), one long-lived
+thread or process pool runs them under an AIMD concurrency limit, and
+results are written to the queue and audit table in batched
+transactions. Re-running the same command resumes where it stopped.
+"""
 from __future__ import annotations
 
 import argparse
 import concurrent.futures
 import json
 import logging
+import os
+import queue
 import sqlite3
+import statistics
 import time
-from dataclasses import dataclass
+from collections import deque
+from dataclasses import dataclass, field
 from datetime import date, timedelta
 from typing import Callable, Iterable
 
@@ -32,8 +43,8 @@ def date_range(start: date, end: date) -> Iterable[date]:
         d += timedelta(days=1)
 
 
-def open_audit() -> sqlite3.Connection:
-    conn = sqlite3.connect("backfill_audit.db")
+def open_audit(path: str = "backfill_audit.db") -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
     conn.execute("""
         CREATE TABLE IF NOT EXISTS audit (
             ts TEXT, strategy TEXT, unit TEXT, status TEXT, duration_s REAL, error TEXT
@@ -52,24 +63,29 @@ def run_unit(unit: Unit) -> tuple[Unit, str, float, str | None]:
         return unit, "fail", time.perf_counter() - t0, str(e)
 
 
-def sequential(units: list[Unit], audit: sqlite3.Connection):
+UnitFn = Callable[[Unit], "tuple[Unit, str, float, str | None]"]
+
+
+def sequential(units: list[Unit], audit: sqlite3.Connection, fn: UnitFn = run_unit):
     for u in units:
-        unit, status, dur, err = run_unit(u)
+        unit, status, dur, err = fn(u)
         audit.execute("INSERT INTO audit VALUES(datetime('now'),?,?,?,?,?)",
                       ("sequential", unit.key(), status, dur, err))
         log.info(f"seq {unit.key()} {status} {dur:.3f}s")
     audit.commit()
 
 
-def parallel_by_date(units: list[Unit], audit: sqlite3.Connection, concurrency: int):
+def parallel_by_date(units: list[Unit], audit: sqlite3.Connection, concurrency: int,
+                     fn: UnitFn = run_unit):
     with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as ex:
-        for unit, status, dur, err in ex.map(run_unit, units):
+        for unit, status, dur, err in ex.map(fn, units):
             audit.execute("INSERT INTO audit VALUES(datetime('now'),?,?,?,?,?)",
                           ("parallel_by_date", unit.key(), status, dur, err))
     audit.commit()
 
 
-def parallel_by_shard(units: list[Unit], audit: sqlite3.Connection, concurrency: int):
+def parallel_by_shard(units: list[Unit], audit: sqlite3.Connection, concurrency: int,
+                      fn: UnitFn = run_unit):
     """Date-major, shard-minor: ensure parent day done before next day starts."""
     by_day: dict[date, list[Unit]] = {}
     for u in units:
@@ -78,21 +94,247 @@ def parallel_by_shard(units: list[Unit], audit: sqlite3.Connection, concurrency:
     for day, ushards in sorted(by_day.items()):
         log.info(f"day {day}: {len(ushards)} shards")
         with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as ex:
-            for unit, status, dur, err in ex.map(run_unit, ushards):
+            for unit, status, dur, err in ex.map(fn, ushards):
                 audit.execute("INSERT INTO audit VALUES(datetime('now'),?,?,?,?,?)",
                               ("parallel_by_shard", unit.key(), status, dur, err))
     audit.commit()
 
 
+# -- adaptive, resumable engine ---------------------------------------------
+
+class WorkQueue:
+    """Persistent per-run unit states in the audit database.
+
+    States: pending → running → done | failed. Rows left `running` by a
+    crashed process are reset to pending by recover(), so a rerun with
+    the same run_id only redoes units whose results were never recorded.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, run_id: str):
+        self.conn = conn
+        self.run_id = run_id
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")   # WAL: durable at checkpoint, safe on crash
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS work_queue (
+                run_id TEXT, unit TEXT, day TEXT, shard TEXT, state TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0, duration_s REAL, error TEXT, updated TEXT,
+                PRIMARY KEY (run_id, unit)
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS work_queue_state ON work_queue(run_id, state, day)")
+        conn.commit()
+
+    def enqueue(self, units: Iterable[Unit]) -> int:
+        """Adds units not yet known to this run; existing states are kept."""
+        before = self.conn.total_changes
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO work_queue(run_id, unit, day, shard, state, updated) "
+                "VALUES(?,?,?,?,'pending',datetime('now'))",
+                ((self.run_id, u.key(), u.day.isoformat(), u.shard) for u in units))
+        return self.conn.total_changes - before
+
+    def _reset(self, from_state: str) -> int:
+        with self.conn:
+            return self.conn.execute(
+                "UPDATE work_queue SET state='pending', updated=datetime('now') "
+                "WHERE run_id=? AND state=?", (self.run_id, from_state)).rowcount
+
+    def recover(self) -> int:
+        """Returns units orphaned mid-flight by a previous crash to pending."""
+        return self._reset("running")
+
+    def requeue_failed(self) -> int:
+        return self._reset("failed")
+
+    def next_day(self) -> date | None:
+        """Earliest day with unfinished (pending or running) units."""
+        row = self.conn.execute(
+            "SELECT min(day) FROM work_queue WHERE run_id=? AND state IN ('pending','running')",
+            (self.run_id,)).fetchone()
+        return date.fromisoformat(row[0]) if row[0] else None
+
+    def claim(self, n: int, day: date | None = None) -> list[Unit]:
+        """Marks up to n pending units running (in day, key order) and returns them."""
+        sql = "SELECT unit, day, shard FROM work_queue WHERE run_id=? AND state='pending'"
+        params: list = [self.run_id]
+        if day is not None:
+            sql += " AND day=?"
+            params.append(day.isoformat())
+        rows = self.conn.execute(sql + " ORDER BY day, unit LIMIT ?", (*params, n)).fetchall()
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE work_queue SET state='running', attempts=attempts+1, updated=datetime('now') "
+                "WHERE run_id=? AND unit=?", ((self.run_id, key) for key, _, _ in rows))
+        return [Unit(date.fromisoformat(d), shard) for _, d, shard in rows]
+
+    def record(self, strategy: str, results: list[tuple[Unit, str, float, str | None]],
+               max_attempts: int = 1) -> None:
+        """Writes a batch of results to the queue and the audit table in one transaction.
+
+        Failed units with attempts left go back to pending.
+        """
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE work_queue SET state=CASE WHEN ?='ok' THEN 'done' "
+                "WHEN attempts < ? THEN 'pending' ELSE 'failed' END, "
+                "duration_s=?, error=?, updated=datetime('now') WHERE run_id=? AND unit=?",
+                ((status, max_attempts, dur, err, self.run_id, unit.key())
+                 for unit, status, dur, err in results))
+            self.conn.executemany(
+                "INSERT INTO audit VALUES(datetime('now'),?,?,?,?,?)",
+                ((strategy, unit.key(), status, dur, err) for unit, status, dur, err in results))
+
+    def counts(self) -> dict[str, int]:
+        return dict(self.conn.execute(
+            "SELECT state, count(*) FROM work_queue WHERE run_id=? GROUP BY state", (self.run_id,)))
+
+
+@dataclass
+class AdaptiveLimiter:
+    """AIMD concurrency limit driven by failure rate and latency.
+
+    Every `window` results: back off (halve) if the failure rate exceeds
+    `max_failure_rate` or the median latency exceeds `latency_factor` ×
+    the baseline; otherwise allow one more in-flight unit. The baseline
+    drops to any faster median at once and moves `baseline_decay` of the
+    way toward a slower one each window, so a lasting latency shift
+    (bigger partitions, a slower warehouse tier) stops counting as
+    overload after a few windows instead of pinning the limit at minimum.
+    After a backoff, the results of units already in flight are ignored:
+    they reflect the old limit, and counting them would halve again.
+    """
+    limit: int = 4
+    minimum: int = 1
+    maximum: int = 32
+    window: int = 20
+    max_failure_rate: float = 0.05
+    latency_factor: float = 2.0
+    baseline_decay: float = 0.1
+    baseline: float | None = None
+    _durations: list[float] = field(default_factory=list, repr=False)
+    _failures: int = field(default=0, repr=False)
+    _skip: int = field(default=0, repr=False)
+
+    def observe(self, status: str, duration: float) -> None:
+        if self._skip:
+            self._skip -= 1
+            return
+        self._durations.append(duration)
+        self._failures += status != "ok"
+        if len(self._durations) >= self.window:
+            self._adjust()
+
+    def _adjust(self) -> None:
+        p50 = statistics.median(self._durations)
+        failure_rate = self._failures / len(self._durations)
+        self._durations.clear()
+        self._failures = 0
+        if self.baseline is None:
+            self.baseline = p50
+        overloaded = failure_rate > self.max_failure_rate or p50 > self.baseline * self.latency_factor
+        if p50 < self.baseline:
+            self.baseline = p50
+        else:
+            self.baseline += self.baseline_decay * (p50 - self.baseline)
+        if overloaded:
+            self._skip = self.limit
+            self.limit = max(self.minimum, self.limit // 2)
+        else:
+            self.limit = min(self.maximum, self.limit + 1)
+
+
+def adaptive(units: list[Unit], audit: sqlite3.Connection, *, run_id: str,
+             limiter: AdaptiveLimiter | None = None, executor: str = "thread",
+             fn: UnitFn = run_unit, day_barrier: bool = False, max_attempts: int = 1,
+             audit_batch: int = 500, audit_interval_s: float = 1.0) -> dict[str, int]:
+    """Runs (or resumes) `run_id` through a WorkQueue; returns final state counts.
+
+    executor="process" runs units in a process pool (for CPU-bound work;
+    `fn` must be picklable). day_barrier=True keeps parallel-shard's
+    ordering: no unit of day N+1 starts before every unit of day N is done.
+    """
+    limiter = limiter or AdaptiveLimiter()
+    work = WorkQueue(audit, run_id)
+    added, recovered = work.enqueue(units), work.recover()
+    log.info(f"run {run_id}: {added} new units, {recovered} recovered from a previous crash")
+
+    if executor == "process":
+        pool = concurrent.futures.ProcessPoolExecutor(max_workers=min(limiter.maximum, os.cpu_count() or 1))
+    else:
+        pool = concurrent.futures.ThreadPoolExecutor(max_workers=limiter.maximum)
+    claimed: deque[Unit] = deque()
+    inflight: dict[concurrent.futures.Future, Unit] = {}
+    # Futures land here as they finish: O(1) per completion, unlike
+    # concurrent.futures.wait(), which rescans every in-flight future.
+    completed: queue.SimpleQueue[concurrent.futures.Future] = queue.SimpleQueue()
+    results: list[tuple[Unit, str, float, str | None]] = []
+    last_flush = time.monotonic()
+
+    def flush() -> None:
+        nonlocal last_flush
+        if results:
+            work.record("adaptive", results, max_attempts)
+            results.clear()
+        last_flush = time.monotonic()
+
+    with pool:
+        try:
+            while True:
+                while len(inflight) < limiter.limit:
+                    if not claimed:
+                        if not inflight:
+                            # Requeued failures and the day barrier only see recorded results.
+                            flush()
+                        day = work.next_day() if day_barrier else None
+                        claimed.extend(work.claim(max(limiter.maximum, 64), day))
+                        if not claimed:
+                            break
+                    unit = claimed.popleft()
+                    fut = pool.submit(fn, unit)
+                    inflight[fut] = unit
+                    fut.add_done_callback(completed.put)
+                if not inflight:
+                    break
+                done = [completed.get()]
+                while not completed.empty():
+                    done.append(completed.get())
+                for fut in done:
+                    unit = inflight.pop(fut)
+                    try:
+                        result = fut.result()
+                    except Exception as e:      # worker crash, pickling error, ...
+                        result = (unit, "fail", 0.0, f"{type(e).__name__}: {e}")
+                    limiter.observe(result[1], result[2])
+                    results.append(result)
+                if len(results) >= audit_batch or time.monotonic() - last_flush >= audit_interval_s:
+                    flush()
+        finally:
+            # On interrupt, keep what finished; unrecorded units stay running → recovered next run.
+            flush()
+    counts = work.counts()
+    log.info(f"run {run_id}: {counts}, final concurrency {limiter.limit}")
+    return counts
+
+
 def main():
     p = argparse.ArgumentParser()
-    p.add_argument("--strategy", choices=["sequential", "parallel-date", "parallel-shard"], required=True)
+    p.add_argument("--strategy", choices=["sequential", "parallel-date", "parallel-shard", "adaptive"],
+                   required=True)
     p.add_argument("--start", type=date.fromisoformat, required=True)
     p.add_argument("--end", type=date.fromisoformat, required=True)
     p.add_argument("--shards", type=int, default=1, help="number of shards per day")
     p.add_argument("--concurrency", type=int, default=4)
     p.add_argument("--dry-run", action="store_true")
     p.add_argument("--retry-failed", action="store_true")
+    p.add_argument("--max-concurrency", type=int, default=32, help="adaptive: upper concurrency bound")
+    p.add_argument("--executor", choices=["thread", "process"], default="thread",
+                   help="adaptive: process pool for CPU-bound units")
+    p.add_argument("--day-barrier", action="store_true",
+                   help="adaptive: finish each day before starting the next")
+    p.add_argument("--max-attempts", type=int, default=1, help="adaptive: tries per unit per run")
+    p.add_argument("--run-id", help="adaptive: queue to create or resume (default: derived from range)")
     args = p.parse_args()
 
     units = [
@@ -101,6 +343,19 @@ def main():
         for i in range(args.shards)
     ]
 
+    if args.strategy == "adaptive" and not args.dry_run:
+        run_id = args.run_id or f"{args.start}..{args.end}x{args.shards}"
+        audit = open_audit()
+        if args.retry_failed:
+            log.info(f"requeued {WorkQueue(audit, run_id).requeue_failed()} failed units")
+        t0 = time.perf_counter()
+        limiter = AdaptiveLimiter(limit=min(args.concurrency, args.max_concurrency),
+                                  maximum=args.max_concurrency)
+        adaptive(units, audit, run_id=run_id, limiter=limiter, executor=args.executor,
+                 day_barrier=args.day_barrier, max_attempts=args.max_attempts)
+        log.info(f"done in {time.perf_counter() - t0:.1f}s")
+        return
+
     if args.retry_failed:
         conn = open_audit()
         failed = {row[0] for row in conn.execute(
@@ -0,0 +1,207 @@
+"""Benchmark: backfill strategies over 10k simulated units.
+
+    python bench_backfill.py
+    python bench_backfill.py --days 50 --shards 40 --unit-ms 10 --capacity 16
+
+The simulated warehouse serves `--capacity` concurrent units at
+`--unit-ms` each; beyond that latency grows linearly, and beyond 1.5×
+capacity a share of requests is throttled (fails fast). Sections:
+
+- wall time: parallel-date / parallel-shard (fixed concurrency) vs adaptive
+- audit overhead: per-row inserts vs WorkQueue.record batches, no work
+- crash + resume: adaptive run interrupted midway, then re-run
+- cpu-bound units: adaptive with thread vs process executor
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import logging
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+import backfill
+from backfill import AdaptiveLimiter, Unit, WorkQueue
+
+logging.getLogger("backfill").setLevel(logging.WARNING)
+
+
+class Warehouse:
+    def __init__(self, capacity: int, unit_s: float, seed: int = 0):
+        self.capacity = capacity
+        self.unit_s = unit_s
+        self.inflight = 0
+        self.calls = 0
+        self.lock = threading.Lock()
+        self.rng = random.Random(seed)
+
+    def __call__(self, unit: Unit):
+        t0 = time.perf_counter()
+        with self.lock:
+            self.inflight += 1
+            self.calls += 1
+            load = self.inflight / self.capacity
+            throttled = load > 1.5 and self.rng.random() < 0.5
+        try:
+            if throttled:
+                time.sleep(self.unit_s / 10)
+                return unit, "fail", time.perf_counter() - t0, "throttled"
+            time.sleep(self.unit_s * max(1.0, load))
+            return unit, "ok", time.perf_counter() - t0, None
+        finally:
+            with self.lock:
+                self.inflight -= 1
+
+
+def noop(unit: Unit):
+    return unit, "ok", 0.0, None
+
+
+def cpu_unit(unit: Unit):
+    t0 = time.perf_counter()
+    digest = unit.key().encode()
+    for _ in range(20_000):
+        digest = hashlib.sha256(digest).digest()
+    return unit, "ok", time.perf_counter() - t0, None
+
+
+def make_units(days: int, shards: int) -> list[Unit]:
+    start = date(2026, 1, 1)
+    return [Unit(start + timedelta(days=d), f"s{i}") for d in range(days) for i in range(shards)]
+
+
+def fresh_db(tmp: str, name: str) -> sqlite3.Connection:
+    return backfill.open_audit(os.path.join(tmp, f"{name}.db"))
+
+
+def timed(label: str, fn) -> float:
+    t0 = time.perf_counter()
+    extra = fn()
+    elapsed = time.perf_counter() - t0
+    print(f"  {label:<38} {elapsed:>7.2f}s  {extra or ''}")
+    return elapsed
+
+
+def failures(conn: sqlite3.Connection, strategy: str) -> int:
+    return conn.execute("SELECT count(*) FROM audit WHERE strategy=? AND status='fail'",
+                        (strategy,)).fetchone()[0]
+
+
+def main() -> None:
+    p = argparse.ArgumentParser()
+    p.add_argument("--days", type=int, default=100)
+    p.add_argument("--shards", type=int, default=100)
+    p.add_argument("--unit-ms", type=float, default=5.0)
+    p.add_argument("--capacity", type=int, default=32)
+    p.add_argument("--concurrency", type=int, default=8, help="fixed strategies")
+    p.add_argument("--max-concurrency", type=int, default=64, help="adaptive upper bound")
+    args = p.parse_args()
+    units = make_units(args.days, args.shards)
+    unit_s = args.unit_ms / 1000
+    print(f"{len(units):,} units ({args.days} days x {args.shards} shards), {args.unit_ms}ms/unit, "
+          f"warehouse capacity {args.capacity}, cpu_count={os.cpu_count()}")
+
+    def limiter() -> AdaptiveLimiter:
+        return AdaptiveLimiter(limit=4, maximum=args.max_concurrency)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print("wall time")
+        conn = fresh_db(tmp, "date")
+        timed(f"parallel-date (concurrency={args.concurrency})",
+              lambda: backfill.parallel_by_date(units, conn, args.concurrency, Warehouse(args.capacity, unit_s)))
+        conn = fresh_db(tmp, "shard")
+        timed(f"parallel-shard (concurrency={args.concurrency})",
+              lambda: backfill.parallel_by_shard(units, conn, args.concurrency, Warehouse(args.capacity, unit_s)))
+        for barrier in (False, True):
+            conn, lim = fresh_db(tmp, f"adaptive{barrier}"), limiter()
+            label = "adaptive" + (" + day barrier" if barrier else "")
+            timed(label, lambda: (
+                backfill.adaptive(units, conn, run_id="bench", limiter=lim, day_barrier=barrier,
+                                  fn=Warehouse(args.capacity, unit_s), max_attempts=3),
+                f"final limit={lim.limit}, throttled attempts={failures(conn, 'adaptive')}")[1])
+        conn = fresh_db(tmp, "overload")
+        timed("parallel-date (concurrency=64)", lambda: (
+            backfill.parallel_by_date(units, conn, 64, Warehouse(args.capacity, unit_s)),
+            f"failed units={failures(conn, 'parallel_by_date')}")[1])
+
+        print("audit overhead (no work per unit)")
+        results = [noop(u) for u in units]
+        conn = fresh_db(tmp, "rows")
+
+        def per_row(commit_each: bool):
+            def run():
+                for unit, status, dur, err in results:
+                    conn.execute("INSERT INTO audit VALUES(datetime('now'),?,?,?,?,?)",
+                                 ("sequential", unit.key(), status, dur, err))
+                    if commit_each:
+                        conn.commit()
+                conn.commit()
+            return run
+        rows = timed("per-row inserts, one commit at end", per_row(False))
+        conn = fresh_db(tmp, "rows-durable")
+        durable = timed("per-row inserts, commit per unit", per_row(True))
+        conn = fresh_db(tmp, "batched-audit")
+
+        def batched_audit():
+            for i in range(0, len(results), 500):
+                with conn:
+                    conn.executemany("INSERT INTO audit VALUES(datetime('now'),?,?,?,?,?)",
+                                     (("adaptive", u.key(), st, d, e) for u, st, d, e in results[i:i + 500]))
+        audit_only = timed("executemany, 500/transaction", batched_audit)
+        conn = fresh_db(tmp, "batched")
+        queue = WorkQueue(conn, "audit")
+        queue.enqueue(units)
+        queue.claim(len(units))
+
+        def batched():
+            for i in range(0, len(results), 500):
+                queue.record("adaptive", results[i:i + 500])
+        batch = timed("WorkQueue.record (+ queue state)", batched)
+        per_unit = ", ".join(f"{t / len(units) * 1e6:.1f}" for t in (rows, durable, audit_only, batch))
+        print(f"  (us/unit: {per_unit})")
+        conn = fresh_db(tmp, "seqnoop")
+        timed("sequential end-to-end (noop units)", lambda: backfill.sequential(units, conn, noop))
+        conn = fresh_db(tmp, "datenoop")
+        timed("parallel-date end-to-end (noop units)",
+              lambda: backfill.parallel_by_date(units, conn, args.concurrency, noop))
+        conn = fresh_db(tmp, "adnoop")
+        timed("adaptive end-to-end (noop units)",
+              lambda: backfill.adaptive(units, conn, run_id="noop", fn=noop, limiter=limiter()) and None)
+
+        print("crash + resume")
+        conn = fresh_db(tmp, "crash")
+        warehouse = Warehouse(args.capacity, unit_s)
+        stop_at = len(units) // 2
+
+        def crashing(unit: Unit):
+            if warehouse.calls >= stop_at:
+                raise KeyboardInterrupt
+            return warehouse(unit)
+        try:
+            backfill.adaptive(units, conn, run_id="crash", fn=crashing, limiter=limiter(), max_attempts=3)
+        except KeyboardInterrupt:
+            pass
+        before = dict(conn.execute("SELECT state, count(*) FROM work_queue GROUP BY state"))
+        print(f"  interrupted after {warehouse.calls:,} calls: {before}")
+        conn = fresh_db(tmp, "crash")
+        resumed = Warehouse(args.capacity, unit_s)
+        timed("resume", lambda: (
+            backfill.adaptive(units, conn, run_id="crash", fn=resumed, limiter=limiter(), max_attempts=3),
+            f"{resumed.calls:,} calls on resume")[1])
+
+        print("cpu-bound units (200)")
+        cpu_units = units[:200]
+        for executor in ("thread", "process"):
+            conn = fresh_db(tmp, f"cpu-{executor}")
+            timed(f"adaptive executor={executor}", lambda: backfill.adaptive(
+                cpu_units, conn, run_id="cpu", fn=cpu_unit, executor=executor,
+                limiter=AdaptiveLimiter(limit=os.cpu_count() or 1, maximum=os.cpu_count() or 1)) and None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Tests for the resumable adaptive engine: WorkQueue, AdaptiveLimiter, adaptive()."""
+import os
+import sys
+import threading
+from datetime import date
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import backfill  # noqa: E402
+from backfill import AdaptiveLimiter, Unit, WorkQueue  # noqa: E402
+
+
+def _units(days=3, shards=4):
+    return [Unit(date(2026, 1, 1 + d), f"s{i}") for d in range(days) for i in range(shards)]
+
+
+def _ok(unit):
+    return unit, "ok", 0.001, None
+
+
+@pytest.fixture
+def audit(tmp_path):
+    conn = backfill.open_audit(str(tmp_path / "audit.db"))
+    yield conn
+    conn.close()
+
+
+class TestWorkQueue:
+    def test_enqueue_is_idempotent(self, audit):
+        work = WorkQueue(audit, "r1")
+        assert work.enqueue(_units()) == 12
+        assert work.enqueue(_units(days=4)) == 4
+        assert work.counts() == {"pending": 16}
+
+    def test_claim_in_day_order_and_record(self, audit):
+        work = WorkQueue(audit, "r1")
+        work.enqueue(reversed(_units()))
+        claimed = work.claim(5)
+        assert [u.key() for u in claimed] == [u.key() for u in _units()[:5]]
+        work.record("adaptive", [(claimed[0], "ok", 0.1, None), (claimed[1], "fail", 0.1, "boom")])
+        assert work.counts() == {"done": 1, "failed": 1, "running": 3, "pending": 7}
+        assert audit.execute("SELECT count(*) FROM audit").fetchone()[0] == 2
+
+    def test_failures_retry_until_max_attempts(self, audit):
+        work = WorkQueue(audit, "r1")
+        work.enqueue(_units(days=1, shards=1))
+        for expected in ("pending", "failed"):
+            (unit,) = work.claim(1)
+            work.record("adaptive", [(unit, "fail", 0.1, "boom")], max_attempts=2)
+            assert work.counts() == {expected: 1}
+        assert work.requeue_failed() == 1
+        assert work.counts() == {"pending": 1}
+
+    def test_recover_and_next_day(self, audit):
+        work = WorkQueue(audit, "r1")
+        work.enqueue(_units())
+        work.record("adaptive", [(u, "ok", 0.1, None) for u in work.claim(4)])
+        work.claim(2)
+        assert work.next_day() == date(2026, 1, 2)
+        assert work.recover() == 2
+        assert work.counts() == {"done": 4, "pending": 8}
+        assert WorkQueue(audit, "other").counts() == {}
+
+
+class TestAdaptiveLimiter:
+    def test_grows_while_healthy(self):
+        limiter = AdaptiveLimiter(limit=4, maximum=6, window=5)
+        for _ in range(50):
+            limiter.observe("ok", 1.0)
+        assert limiter.limit == 6
+
+    def test_backs_off_on_failures_and_skips_inflight(self):
+        limiter = AdaptiveLimiter(limit=8, window=5)
+        for _ in range(5):
+            limiter.observe("fail", 1.0)
+        assert limiter.limit == 4
+        # The next 8 results came from the old limit and are ignored.
+        for _ in range(8):
+            limiter.observe("fail", 1.0)
+        assert limiter.limit == 4
+
+    def test_backs_off_on_latency_spike(self):
+        limiter = AdaptiveLimiter(limit=8, window=5)
+        for _ in range(5):
+            limiter.observe("ok", 1.0)
+        for _ in range(5):
+            limiter.observe("ok", 5.0)
+        assert limiter.limit == 4
+
+    def test_recovers_from_lasting_latency_shift(self):
+        limiter = AdaptiveLimiter(limit=16, window=5)
+        for _ in range(50):
+            limiter.observe("ok", 1.0)
+        for _ in range(1000):
+            limiter.observe("ok", 3.0)
+        assert limiter.limit == limiter.maximum
+        assert limiter.baseline == pytest.approx(3.0, rel=0.01)
+
+
+class TestAdaptive:
+    def test_runs_every_unit(self, audit):
+        counts = backfill.adaptive(_units(), audit, run_id="r1", fn=_ok)
+        assert counts == {"done": 12}
+        assert audit.execute("SELECT count(*) FROM audit WHERE strategy='adaptive'").fetchone()[0] == 12
+
+    def test_retries_failed_units(self, audit):
+        attempts = {}
+
+        def flaky(unit):
+            attempts[unit] = attempts.get(unit, 0) + 1
+            return (unit, "ok", 0.001, None) if attempts[unit] > 1 else (unit, "fail", 0.001, "x")
+
+        counts = backfill.adaptive(_units(), audit, run_id="r1", fn=flaky, max_attempts=2)
+        assert counts == {"done": 12}
+        assert set(attempts.values()) == {2}
+
+    def test_resume_after_crash_skips_recorded_units(self, audit):
+        lock = threading.Lock()
+        calls = []
+
+        def crashing(unit):
+            with lock:
+                calls.append(unit)
+                if len(calls) > 5:
+                    raise KeyboardInterrupt
+            return _ok(unit)
+
+        with pytest.raises(KeyboardInterrupt):
+            backfill.adaptive(_units(), audit, run_id="r1", fn=crashing,
+                              limiter=AdaptiveLimiter(limit=1, maximum=1))
+        done_before = WorkQueue(audit, "r1").counts().get("done", 0)
+        assert done_before == 5
+
+        resumed = []
+        counts = backfill.adaptive(_units(), audit, run_id="r1",
+                                   fn=lambda u: (resumed.append(u), _ok(u))[1])
+        assert counts == {"done": 12}
+        assert len(resumed) == 12 - done_before
+
+    def test_day_barrier_orders_days(self, audit):
+        units = _units(days=4)
+        lock = threading.Lock()
+        finished = set()
+        violations = []
+
+        def unit_fn(unit):
+            with lock:
+                earlier = {u for u in units if u.day < unit.day}
+                if not earlier <= finished:
+                    violations.append(unit)
+            with lock:
+                finished.add(unit)
+            return _ok(unit)
+
+        counts = backfill.adaptive(units, audit, run_id="r1", fn=unit_fn, day_barrier=True,
+                                   limiter=AdaptiveLimiter(limit=8, maximum=8))
+        assert counts == {"done": 16}
+        assert violations == []
@@ -0,0 +1,114 @@
+"""
+Benchmark: logging a large sweep and ranking its runs.
+
+    python scripts/bench_tracking.py                              # 10M points
+    python scripts/bench_tracking.py --runs 200 --steps 1000 --memory
+
+Logs `--runs` x `--steps` x `--metrics` points through ExperimentTracker
+into SQLiteTrackingBackend (a temporary file unless `--db` is given),
+then times `compare_runs(limit=10)` (top-10 runs) and `best_run`.
+`--memory` repeats the workload on InMemoryTrackingBackend, which holds
+every point as a MetricEntry object; keep it to a few million points.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.experiment_tracker import ExperimentTracker, InMemoryTrackingBackend  # noqa: E402
+from src.sqlite_backend import SQLiteTrackingBackend  # noqa: E402
+
+
+def fake_clock():
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    step = timedelta(milliseconds=1)
+
+    def clock():
+        nonlocal now
+        now += step
+        return now
+    return clock
+
+
+def run_sweep(tracker: ExperimentTracker, args) -> float:
+    rng = random.Random(0)
+    names = ["accuracy", "loss"] + [f"metric_{i}" for i in range(args.metrics - 2)]
+    begin = time.perf_counter()
+    for run_index in range(args.runs):
+        ceiling = rng.uniform(0.7, 0.99)
+        with tracker.auto_log("sweep", params={"run": run_index, "ceiling": ceiling}) as run:
+            for step in range(args.steps):
+                progress = (step + 1) / args.steps
+                values = {name: rng.random() for name in names}
+                values["accuracy"] = ceiling * progress
+                values["loss"] = 1.0 - ceiling * progress
+                tracker.log_metrics(run, values, step=step)
+    return time.perf_counter() - begin
+
+
+def query(tracker: ExperimentTracker, repeats: int):
+    timings = {}
+    for label, fn in [
+        ("top-10 accuracy", lambda: tracker.compare_runs("sweep", "accuracy", limit=10)),
+        ("best_run loss", lambda: tracker.best_run("sweep", "loss", higher_is_better=False)),
+        ("compare_runs (all)", lambda: tracker.compare_runs("sweep", "accuracy")),
+    ]:
+        best = float("inf")
+        for _ in range(repeats):
+            begin = time.perf_counter()
+            result = fn()
+            best = min(best, time.perf_counter() - begin)
+        timings[label] = (best, result)
+    return timings
+
+
+def report(name: str, points: int, log_seconds: float, timings, extra: str = "") -> None:
+    print(f"{name}: logged {points:,} points in {log_seconds:.1f}s "
+          f"({points / log_seconds:,.0f} points/s){extra}")
+    for label, (seconds, result) in timings.items():
+        top = result[0] if isinstance(result, list) else result
+        print(f"  {label:<20} {seconds * 1000:>9.2f} ms   "
+              f"top={top.run_id} {top.latest_metric('accuracy'):.4f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=1000)
+    parser.add_argument("--steps", type=int, default=2000)
+    parser.add_argument("--metrics", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--db", type=Path, help="keep the database at this path")
+    parser.add_argument("--memory", action="store_true", help="also run InMemoryTrackingBackend")
+    args = parser.parse_args()
+    points = args.runs * args.steps * args.metrics
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.db or Path(tmp) / "tracking.db"
+        backend = SQLiteTrackingBackend(path, batch_size=args.batch_size, clock=fake_clock())
+        tracker = ExperimentTracker(backend, clock=fake_clock())
+        log_seconds = run_sweep(tracker, args)
+        backend.flush()
+        timings = query(tracker, args.repeats)
+        size_mb = path.stat().st_size / 1e6
+        report("sqlite", points, log_seconds, timings,
+               f", {size_mb:,.0f} MB on disk ({size_mb * 1e6 / points:.0f} B/point)")
+        backend.close()
+
+    if args.memory:
+        tracker = ExperimentTracker(InMemoryTrackingBackend(clock=fake_clock()), clock=fake_clock())
+        log_seconds = run_sweep(tracker, args)
+        report("memory", points, log_seconds, query(tracker, args.repeats))
+
+
+if __name__ == "__main__":
+    main()
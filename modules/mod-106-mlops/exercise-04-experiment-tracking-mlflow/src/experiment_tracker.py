@@ -9,6 +9,11 @@ for tests + the CLI demo.
 
 The auto_log() context manager captures the typical training-loop
 pattern: log params at start, metrics each epoch, status on exit.
+
+Each run keeps a `MetricSummary` per metric (latest, min, max, count)
+updated as points are logged, so comparisons never walk metric
+history. `sqlite_backend.SQLiteTrackingBackend` is a persistent backend
+for sweeps that log millions of points.
 """
 
 from __future__ import annotations
@@ -21,7 +26,7 @@ from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
 from pathlib import Path
-from typing import Any, Callable, Dict, Iterator, List, Optional, Protocol
+from typing import Any, Callable, Dict, Iterator, List, Optional, Protocol, Tuple
 
 
 logger = logging.getLogger(__name__)
@@ -43,6 +48,28 @@ class MetricEntry:
     timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
 
 
+@dataclass
+class MetricSummary:
+    """Running aggregate of one metric's history."""
+
+    latest: float
+    latest_step: int
+    min: float
+    max: float
+    count: int = 1
+
+    @classmethod
+    def of(cls, entry: MetricEntry) -> "MetricSummary":
+        return cls(latest=entry.value, latest_step=entry.step, min=entry.value, max=entry.value)
+
+    def add(self, entry: MetricEntry) -> None:
+        self.latest = entry.value
+        self.latest_step = entry.step
+        self.min = min(self.min, entry.value)
+        self.max = max(self.max, entry.value)
+        self.count += 1
+
+
 @dataclass
 class Run:
     """Captures everything recorded under one experiment run."""
@@ -58,6 +85,7 @@ class Run:
     metrics: Dict[str, List[MetricEntry]] = field(default_factory=dict)
     artifacts: List[str] = field(default_factory=list)
     user: str = "unknown"
+    summaries: Dict[str, MetricSummary] = field(default_factory=dict)
 
     @property
     def duration_seconds(self) -> Optional[float]:
@@ -66,11 +94,31 @@ class Run:
         return (self.ended_at - self.started_at).total_seconds()
 
     def latest_metric(self, name: str) -> Optional[float]:
+        summary = self.summaries.get(name)
+        if summary is not None:
+            return summary.latest
         entries = self.metrics.get(name)
         if not entries:
             return None
         return entries[-1].value
 
+    def best_metric(self, name: str, *, higher_is_better: bool = True) -> Optional[float]:
+        summary = self.summaries.get(name)
+        if summary is not None:
+            return summary.max if higher_is_better else summary.min
+        values = [e.value for e in self.metrics.get(name, [])]
+        if not values:
+            return None
+        return max(values) if higher_is_better else min(values)
+
+    def record_metric(self, name: str, entry: MetricEntry) -> None:
+        """Fold `entry` into the metric's summary (history is the backend's job)."""
+        summary = self.summaries.get(name)
+        if summary is None:
+            self.summaries[name] = MetricSummary.of(entry)
+        else:
+            summary.add(entry)
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             "run_id": self.run_id,
@@ -119,6 +167,17 @@ class TrackingBackend(Protocol):
 
     def list_runs(self, experiment_id: str) -> List[Run]: ...
 
+    def log_metrics(self, run: Run, entries: List[Tuple[str, MetricEntry]]) -> None: ...
+
+    def rank_runs(
+        self,
+        experiment_id: str,
+        metric: str,
+        *,
+        descending: bool = True,
+        limit: Optional[int] = None,
+    ) -> List[Run]: ...
+
 
 class InMemoryTrackingBackend:
     """Reference backend used in tests + the CLI."""
@@ -127,6 +186,7 @@ class InMemoryTrackingBackend:
         self._experiments: Dict[str, Experiment] = {}
         self._experiments_by_name: Dict[str, str] = {}
         self._runs: Dict[str, Run] = {}
+        self._runs_by_experiment: Dict[str, List[str]] = {}
         self._clock = clock
         self._next_run_id = 0
 
@@ -160,6 +220,7 @@ class InMemoryTrackingBackend:
             user=user,
         )
         self._runs[run.run_id] = run
+        self._runs_by_experiment.setdefault(experiment_id, []).append(run.run_id)
         experiment.runs.append(run)
         return run
 
@@ -171,10 +232,31 @@ class InMemoryTrackingBackend:
 
     def list_runs(self, experiment_id: str) -> List[Run]:
         return sorted(
-            (r for r in self._runs.values() if r.experiment_id == experiment_id),
+            (self._runs[run_id] for run_id in self._runs_by_experiment.get(experiment_id, [])),
             key=lambda r: r.started_at,
         )
 
+    def log_metrics(self, run: Run, entries: List[Tuple[str, MetricEntry]]) -> None:
+        for name, entry in entries:
+            run.metrics.setdefault(name, []).append(entry)
+        self._runs[run.run_id] = run
+
+    def rank_runs(
+        self,
+        experiment_id: str,
+        metric: str,
+        *,
+        descending: bool = True,
+        limit: Optional[int] = None,
+    ) -> List[Run]:
+        """Finished runs that logged `metric`, ordered by its latest value."""
+        runs = [
+            r for r in self.list_runs(experiment_id)
+            if r.status is RunStatus.FINISHED and r.latest_metric(metric) is not None
+        ]
+        runs.sort(key=lambda r: r.latest_metric(metric), reverse=descending)
+        return runs if limit is None else runs[:limit]
+
 
 # -- Tracker --------------------------------------------------------------
 
@@ -218,10 +300,18 @@ class ExperimentTracker:
         self.backend.update_run(run)
 
     def log_metric(self, run: Run, key: str, value: float, *, step: int = 0) -> None:
-        run.metrics.setdefault(key, []).append(MetricEntry(
-            value=float(value), step=step, timestamp=self._clock(),
-        ))
-        self.backend.update_run(run)
+        self.log_metrics(run, {key: value}, step=step)
+
+    def log_metrics(self, run: Run, metrics: Dict[str, float], *, step: int = 0) -> None:
+        """Log several metrics at one step in a single backend write."""
+        timestamp = self._clock()
+        entries = [
+            (key, MetricEntry(value=float(value), step=step, timestamp=timestamp))
+            for key, value in metrics.items()
+        ]
+        for key, entry in entries:
+            run.record_metric(key, entry)
+        self.backend.log_metrics(run, entries)
 
     def log_tag(self, run: Run, key: str, value: str) -> None:
         run.tags[key] = value
@@ -264,14 +354,14 @@ class ExperimentTracker:
         metric: str,
         *,
         sort_descending: bool = True,
+        limit: Optional[int] = None,
     ) -> List[Run]:
         experiment = self.backend.get_experiment(experiment_name)
         if experiment is None:
             return []
-        runs = self.backend.list_runs(experiment.experiment_id)
-        runs = [r for r in runs if r.status is RunStatus.FINISHED and r.latest_metric(metric) is not None]
-        runs.sort(key=lambda r: r.latest_metric(metric), reverse=sort_descending)
-        return runs
+        return self.backend.rank_runs(
+            experiment.experiment_id, metric, descending=sort_descending, limit=limit,
+        )
 
     def best_run(
         self,
@@ -280,7 +370,9 @@ class ExperimentTracker:
         *,
         higher_is_better: bool = True,
     ) -> Optional[Run]:
-        runs = self.compare_runs(experiment_name, metric, sort_descending=higher_is_better)
+        runs = self.compare_runs(
+            experiment_name, metric, sort_descending=higher_is_better, limit=1,
+        )
         return runs[0] if runs else None
 
     def export_runs_to_json(self, experiment_name: str, path: Path) -> int:
@@ -418,10 +418,15 @@ def make_version_from_run(
     registry: ModelRegistry,
     description: str = "",
 ) -> ModelVersion:
-    """Extract metrics from an experiment Run and register a model version."""
+    """Extract metrics from an experiment Run and register a model version.
+
+    Uses each metric's latest value; summaries cover runs loaded without
+    history (e.g. from `best_run` on the SQLite backend).
+    """
     metrics: Dict[str, float] = {
         name: entries[-1].value for name, entries in run.metrics.items() if entries
     }
+    metrics.update({name: summary.latest for name, summary in run.summaries.items()})
     return registry.register(
         model_name=model_name,
         artifact_uri=artifact_uri,
@@ -0,0 +1,348 @@
+"""
+SQLite Tracking Backend
+
+Persistent `TrackingBackend` for hyperparameter sweeps that log millions
+of metric points. Metric history is an append-only table of small
+integer/real rows (metric names are interned into `metric_keys`);
+points are buffered and written with one `executemany` per batch.
+
+Alongside the history, `metric_summary` keeps one row per (run, metric)
+with the latest value, min, max and count, upserted as each batch is
+flushed. `rank_runs` (and so `compare_runs` / `best_run`) is an indexed
+query over that table and never touches history.
+
+Runs returned by `rank_runs` carry summaries but no history; `get_run`
+and `list_runs` load the full history. The backend does not keep
+history on the live `Run` objects the tracker hands it.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .experiment_tracker import (
+    Experiment,
+    MetricEntry,
+    MetricSummary,
+    Run,
+    RunStatus,
+)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS experiments (
+    id INTEGER PRIMARY KEY,
+    experiment_id TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL UNIQUE,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT UNIQUE,
+    experiment_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    user TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    ended_at REAL,
+    params TEXT NOT NULL DEFAULT '{}',
+    tags TEXT NOT NULL DEFAULT '{}',
+    artifacts TEXT NOT NULL DEFAULT '[]'
+);
+CREATE INDEX IF NOT EXISTS runs_by_experiment ON runs (experiment_id, started_at);
+CREATE TABLE IF NOT EXISTS metric_keys (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    run INTEGER NOT NULL,
+    key INTEGER NOT NULL,
+    step INTEGER NOT NULL,
+    value REAL NOT NULL,
+    timestamp REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS metrics_by_run ON metrics (run, key);
+CREATE TABLE IF NOT EXISTS metric_summary (
+    run INTEGER NOT NULL,
+    key INTEGER NOT NULL,
+    latest REAL NOT NULL,
+    latest_step INTEGER NOT NULL,
+    min_value REAL NOT NULL,
+    max_value REAL NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (run, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS summary_by_metric ON metric_summary (key, latest);
+"""
+
+_UPSERT_SUMMARY = """
+INSERT INTO metric_summary VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (run, key) DO UPDATE SET
+    latest = excluded.latest,
+    latest_step = excluded.latest_step,
+    min_value = min(min_value, excluded.min_value),
+    max_value = max(max_value, excluded.max_value),
+    count = count + excluded.count
+"""
+
+_RUN_COLUMNS = (
+    "r.id, r.run_id, r.experiment_id, e.name, r.status, r.user, "
+    "r.started_at, r.ended_at, r.params, r.tags, r.artifacts"
+)
+
+
+def _ts(value: datetime) -> float:
+    return value.timestamp()
+
+
+def _dt(value: float) -> datetime:
+    return datetime.fromtimestamp(value, tz=timezone.utc)
+
+
+class SQLiteTrackingBackend:
+    """Tracking backend persisted to one SQLite file (":memory:" for tests)."""
+
+    def __init__(
+        self,
+        path: str | Path = ":memory:",
+        *,
+        batch_size: int = 10_000,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ):
+        self.batch_size = batch_size
+        self._clock = clock
+        self._conn = sqlite3.connect(str(path))
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._key_ids: Dict[str, int] = dict(
+            self._conn.execute("SELECT name, id FROM metric_keys")
+        )
+        self._run_ids: Dict[str, int] = {}
+        self._pending: List[Tuple[int, int, int, float, float]] = []
+        # (run, key) -> [latest, latest_step, min, max, count] for the pending batch
+        self._pending_summary: Dict[Tuple[int, int], list] = {}
+
+    def close(self) -> None:
+        self.flush()
+        self._conn.close()
+
+    # -- experiments -----------------------------------------------------
+
+    def create_experiment(self, name: str) -> Experiment:
+        existing = self.get_experiment(name)
+        if existing is not None:
+            return existing
+        created_at = self._clock()
+        with self._conn:
+            cur = self._conn.execute(
+                "INSERT INTO experiments (experiment_id, name, created_at) VALUES ('', ?, ?)",
+                (name, _ts(created_at)),
+            )
+            experiment_id = f"exp-{cur.lastrowid:04d}"
+            self._conn.execute(
+                "UPDATE experiments SET experiment_id = ? WHERE id = ?",
+                (experiment_id, cur.lastrowid),
+            )
+        return Experiment(experiment_id=experiment_id, name=name, created_at=created_at)
+
+    def get_experiment(self, name: str) -> Optional[Experiment]:
+        row = self._conn.execute(
+            "SELECT experiment_id, name, created_at FROM experiments WHERE name = ?", (name,),
+        ).fetchone()
+        return Experiment(row[0], row[1], _dt(row[2])) if row else None
+
+    def list_experiments(self) -> List[Experiment]:
+        rows = self._conn.execute(
+            "SELECT experiment_id, name, created_at FROM experiments ORDER BY created_at, id"
+        )
+        return [Experiment(r[0], r[1], _dt(r[2])) for r in rows]
+
+    # -- runs ----------------------------------------------------------------
+
+    def create_run(self, experiment_id: str, *, user: str) -> Run:
+        row = self._conn.execute(
+            "SELECT name FROM experiments WHERE experiment_id = ?", (experiment_id,),
+        ).fetchone()
+        if row is None:
+            raise KeyError(f"Unknown experiment {experiment_id}")
+        started_at = self._clock()
+        with self._conn:
+            cur = self._conn.execute(
+                "INSERT INTO runs (experiment_id, status, user, started_at) VALUES (?, ?, ?, ?)",
+                (experiment_id, RunStatus.RUNNING.value, user, _ts(started_at)),
+            )
+            run_id = f"run-{cur.lastrowid:06d}"
+            self._conn.execute("UPDATE runs SET run_id = ? WHERE id = ?", (run_id, cur.lastrowid))
+        self._run_ids[run_id] = cur.lastrowid
+        return Run(
+            run_id=run_id,
+            experiment_id=experiment_id,
+            experiment_name=row[0],
+            status=RunStatus.RUNNING,
+            started_at=started_at,
+            user=user,
+        )
+
+    def update_run(self, run: Run) -> None:
+        """Persist status, params, tags and artifacts (metrics go through log_metrics).
+
+        Buffered points are flushed first once the run has ended, so a
+        finished run never has history waiting in memory.
+        """
+        if run.status is not RunStatus.RUNNING:
+            self.flush()
+        with self._conn:
+            self._conn.execute(
+                "UPDATE runs SET status = ?, ended_at = ?, params = ?, tags = ?, artifacts = ? "
+                "WHERE run_id = ?",
+                (
+                    run.status.value,
+                    _ts(run.ended_at) if run.ended_at else None,
+                    json.dumps(run.params, default=str),
+                    json.dumps(run.tags),
+                    json.dumps(run.artifacts),
+                    run.run_id,
+                ),
+            )
+
+    def get_run(self, run_id: str) -> Optional[Run]:
+        runs = self._load_runs("r.run_id = ?", (run_id,), with_history=True)
+        return runs[0] if runs else None
+
+    def list_runs(self, experiment_id: str) -> List[Run]:
+        return self._load_runs(
+            "r.experiment_id = ? ORDER BY r.started_at, r.id", (experiment_id,), with_history=True,
+        )
+
+    # -- metrics -------------------------------------------------------------
+
+    def log_metrics(self, run: Run, entries: List[Tuple[str, MetricEntry]]) -> None:
+        """Buffer points; they are written once `batch_size` accumulate or on read."""
+        run_pk = self._run_pk(run.run_id)
+        pending = self._pending
+        summary = self._pending_summary
+        for name, entry in entries:
+            key = self._key_ids.get(name)
+            if key is None:
+                key = self._intern_key(name)
+            pending.append((run_pk, key, entry.step, entry.value, _ts(entry.timestamp)))
+            agg = summary.get((run_pk, key))
+            if agg is None:
+                summary[(run_pk, key)] = [entry.value, entry.step, entry.value, entry.value, 1]
+            else:
+                agg[0] = entry.value
+                agg[1] = entry.step
+                if entry.value < agg[2]:
+                    agg[2] = entry.value
+                if entry.value > agg[3]:
+                    agg[3] = entry.value
+                agg[4] += 1
+        if len(pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        with self._conn:
+            self._conn.executemany("INSERT INTO metrics VALUES (?, ?, ?, ?, ?)", self._pending)
+            self._conn.executemany(
+                _UPSERT_SUMMARY,
+                [(run, key, *agg) for (run, key), agg in self._pending_summary.items()],
+            )
+        self._pending = []
+        self._pending_summary = {}
+
+    def rank_runs(
+        self,
+        experiment_id: str,
+        metric: str,
+        *,
+        descending: bool = True,
+        limit: Optional[int] = None,
+    ) -> List[Run]:
+        """Finished runs that logged `metric`, ordered by its latest value.
+
+        Returned runs carry metric summaries only, not history.
+        """
+        key = self._key_ids.get(metric)
+        if key is None:
+            return []
+        self.flush()
+        order = "DESC" if descending else "ASC"
+        return self._load_runs(
+            "r.experiment_id = ? AND r.status = ? "
+            f"ORDER BY s.latest {order}, r.started_at, r.id LIMIT ?",
+            (key, experiment_id, RunStatus.FINISHED.value, -1 if limit is None else limit),
+            join="JOIN metric_summary s ON s.run = r.id AND s.key = ?",
+            with_history=False,
+        )
+
+    # -- helpers -------------------------------------------------------------
+
+    def _run_pk(self, run_id: str) -> int:
+        pk = self._run_ids.get(run_id)
+        if pk is None:
+            row = self._conn.execute("SELECT id FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+            if row is None:
+                raise KeyError(f"Unknown run {run_id}")
+            pk = self._run_ids[run_id] = row[0]
+        return pk
+
+    def _intern_key(self, name: str) -> int:
+        with self._conn:
+            self._conn.execute("INSERT OR IGNORE INTO metric_keys (name) VALUES (?)", (name,))
+        key = self._conn.execute("SELECT id FROM metric_keys WHERE name = ?", (name,)).fetchone()[0]
+        self._key_ids[name] = key
+        return key
+
+    def _load_runs(
+        self, where: str, args: Sequence, *, join: str = "", with_history: bool,
+    ) -> List[Run]:
+        self.flush()
+        rows = self._conn.execute(
+            f"SELECT {_RUN_COLUMNS} FROM runs r {join} "
+            f"JOIN experiments e ON e.experiment_id = r.experiment_id WHERE {where}",
+            args,
+        ).fetchall()
+        if not rows:
+            return []
+        runs: Dict[int, Run] = {}
+        for row in rows:
+            runs[row[0]] = Run(
+                run_id=row[1],
+                experiment_id=row[2],
+                experiment_name=row[3],
+                status=RunStatus(row[4]),
+                user=row[5],
+                started_at=_dt(row[6]),
+                ended_at=_dt(row[7]) if row[7] is not None else None,
+                params=json.loads(row[8]),
+                tags=json.loads(row[9]),
+                artifacts=json.loads(row[10]),
+            )
+        names = {key: name for name, key in self._key_ids.items()}
+        for run_pk, key, latest, step, lo, hi, count in self._select_in(
+            "SELECT run, key, latest, latest_step, min_value, max_value, count "
+            "FROM metric_summary WHERE run IN ({})", runs,
+        ):
+            runs[run_pk].summaries[names[key]] = MetricSummary(latest, step, lo, hi, count)
+        if with_history:
+            for run_pk, key, step, value, timestamp in self._select_in(
+                "SELECT run, key, step, value, timestamp FROM metrics "
+                "WHERE run IN ({}) ORDER BY rowid", runs,
+            ):
+                runs[run_pk].metrics.setdefault(names[key], []).append(
+                    MetricEntry(value=value, step=step, timestamp=_dt(timestamp))
+                )
+        return list(runs.values())
+
+    def _select_in(self, sql: str, ids: Iterable[int]) -> Iterable[tuple]:
+        ids = list(ids)
+        # Stay under SQLite's bound-parameter limit.
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            yield from self._conn.execute(sql.format(",".join("?" * len(chunk))), chunk)
@@ -12,6 +12,7 @@ from src.experiment_tracker import (
     Run,
     RunStatus,
 )
+from src.sqlite_backend import SQLiteTrackingBackend
 from src.model_registry import (
     ABComparison,
     ModelRegistry,
@@ -109,6 +110,73 @@ class TestExperimentTracker:
         assert records[0]["status"] == "FINISHED"
 
 
+class TestSQLiteTrackingBackend:
+    @pytest.fixture
+    def sqlite_tracker(self, tmp_path: Path) -> ExperimentTracker:
+        backend = SQLiteTrackingBackend(tmp_path / "tracking.db", batch_size=3)
+        yield ExperimentTracker(backend, default_user="tester")
+        backend.close()
+
+    def test_compare_and_best_use_latest_value(self, sqlite_tracker):
+        for final in [0.7, 0.92, 0.85]:
+            with sqlite_tracker.auto_log("sweep", params={"final": final}) as run:
+                for step, value in enumerate([0.99, 0.5, final]):
+                    sqlite_tracker.log_metric(run, "accuracy", value, step=step)
+        ordered = sqlite_tracker.compare_runs("sweep", "accuracy")
+        assert [r.latest_metric("accuracy") for r in ordered] == [0.92, 0.85, 0.7]
+        assert sqlite_tracker.best_run("sweep", "accuracy").params == {"final": 0.92}
+        assert sqlite_tracker.compare_runs("sweep", "accuracy", limit=1)[0].run_id == ordered[0].run_id
+        # Summaries span batch boundaries.
+        assert ordered[0].best_metric("accuracy") == 0.99
+        assert ordered[0].summaries["accuracy"].count == 3
+
+    def test_unfinished_runs_excluded(self, sqlite_tracker):
+        run = sqlite_tracker.start_run("sweep")
+        sqlite_tracker.log_metric(run, "accuracy", 0.99)
+        assert sqlite_tracker.compare_runs("sweep", "accuracy") == []
+
+    def test_end_run_flushes_pending_points(self, tmp_path: Path):
+        path = tmp_path / "tracking.db"
+        backend = SQLiteTrackingBackend(path, batch_size=100)
+        tracker = ExperimentTracker(backend)
+        with tracker.auto_log("sweep") as run:
+            tracker.log_metric(run, "loss", 0.4)
+        # No close(): a second connection sees the points.
+        reopened = SQLiteTrackingBackend(path)
+        assert [e.value for e in reopened.get_run(run.run_id).metrics["loss"]] == [0.4]
+        reopened.close()
+        backend.close()
+
+    def test_register_best_run(self, sqlite_tracker, registry):
+        for final in [0.7, 0.92]:
+            with sqlite_tracker.auto_log("sweep") as run:
+                sqlite_tracker.log_metrics(run, {"accuracy": final, "loss": 1 - final})
+        best = sqlite_tracker.best_run("sweep", "accuracy")
+        version = make_version_from_run(
+            best, model_name="fraud", artifact_uri="s3://fraud/v1", registry=registry,
+        )
+        assert version.metrics == pytest.approx({"accuracy": 0.92, "loss": 0.08})
+
+    def test_history_persists_across_reopen(self, tmp_path: Path):
+        path = tmp_path / "tracking.db"
+        backend = SQLiteTrackingBackend(path)
+        tracker = ExperimentTracker(backend)
+        with tracker.auto_log("sweep", tags={"env": "dev"}) as run:
+            tracker.log_metrics(run, {"loss": 0.5, "accuracy": 0.8}, step=0)
+            tracker.log_metrics(run, {"loss": 0.3, "accuracy": 0.9}, step=1)
+        backend.close()
+
+        reopened = SQLiteTrackingBackend(path)
+        loaded = reopened.get_run(run.run_id)
+        assert loaded.status is RunStatus.FINISHED
+        assert loaded.tags == {"env": "dev"}
+        assert [e.value for e in loaded.metrics["loss"]] == [0.5, 0.3]
+        assert [e.step for e in loaded.metrics["accuracy"]] == [0, 1]
+        exp = reopened.get_experiment("sweep")
+        assert [r.run_id for r in reopened.list_runs(exp.experiment_id)] == [run.run_id]
+        reopened.close()
+
+
 class TestModelRegistry:
     def test_register_creates_first_version(self, registry):
         v = registry.register(
@@ -13,10 +13,15 @@ All tests are implemented in pure Python (no scipy) so the curriculum
 solution stays portable. The KS test uses the standard asymptotic
 two-sample formula; PSI uses the conventional 10-bin equal-width split
 with epsilon smoothing.
+
+For large batches or repeated checks against the same reference, see
+`drift_engine.DriftEngine` (NumPy, precomputed reference profile). For
+streaming / multi-replica monitoring in fixed memory, see `sketches`.
 """
 
 from __future__ import annotations
 
+import bisect
 import logging
 import math
 import statistics
@@ -180,10 +185,8 @@ def population_stability_index(
     def _bin(values: List[float]) -> List[float]:
         counts = [0.0] * bins
         for v in values:
-            for i in range(bins):
-                if edges[i] <= v < edges[i + 1]:
-                    counts[i] += 1
-                    break
+            # edges[i] <= v < edges[i + 1]; every value lies within [lo, hi].
+            counts[min(bisect.bisect_right(edges, v) - 1, bins - 1)] += 1
         total = sum(counts) or 1
         return [c / total for c in counts]
 
@@ -254,23 +257,41 @@ def chi_square_test(
             reference_size=len(reference), live_size=len(live),
             detail="empty sample",
         )
-    categories = sorted(set(reference) | set(live))
-    n_ref = len(reference)
-    n_live = len(live)
-
     def _count(values: List[str]) -> Dict[str, int]:
-        out = {c: 0 for c in categories}
+        out: Dict[str, int] = {}
         for v in values:
-            out[v] += 1
+            out[v] = out.get(v, 0) + 1
         return out
 
-    ref_counts = _count(reference)
-    live_counts = _count(live)
+    return chi_square_from_counts(
+        feature, _count(reference), _count(live), significance=significance,
+    )
+
+
+def chi_square_from_counts(
+    feature: str,
+    ref_counts: Dict[str, int],
+    live_counts: Dict[str, int],
+    *,
+    significance: float = 0.05,
+) -> DriftResult:
+    """Chi-square test over per-category counts (e.g. from a count table)."""
+    n_ref = sum(ref_counts.values())
+    n_live = sum(live_counts.values())
+    if n_ref == 0 or n_live == 0:
+        return DriftResult(
+            feature=feature, test=DriftTest.CHI_SQUARE, statistic=0.0,
+            p_value=1.0, threshold=significance, detected=False,
+            severity=DriftSeverity.NONE,
+            reference_size=n_ref, live_size=n_live,
+            detail="empty sample",
+        )
+    categories = sorted(set(ref_counts) | set(live_counts))
     total = n_ref + n_live
     chi2 = 0.0
     for cat in categories:
-        ref_observed = ref_counts[cat]
-        live_observed = live_counts[cat]
+        ref_observed = ref_counts.get(cat, 0)
+        live_observed = live_counts.get(cat, 0)
         col_total = ref_observed + live_observed
         if col_total == 0:
             continue
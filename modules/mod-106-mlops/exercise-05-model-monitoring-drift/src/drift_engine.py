@@ -0,0 +1,324 @@
+"""
+Vectorized Drift Engine
+
+NumPy counterpart to `drift_detector.DriftDetector` for large batches
+(hundreds of features x millions of rows). The reference side is reduced
+once to a `ReferenceProfile` that can be saved and reloaded, so a
+monitoring job never re-reads or re-sorts the training data:
+
+- numeric features: unique sorted reference values + cumulative counts
+  (KS), and fixed PSI bin edges + reference bin shares
+- categorical features: sorted categories + counts (chi-square)
+
+Each live column is sorted once; KS, PSI and chi-square are then
+`searchsorted` / `unique` operations on that column. Features can be
+fanned out across a process pool.
+
+Results are the same `DriftResult` objects the pure-Python detector
+returns. Two deliberate differences:
+
+- KS uses right-continuous CDFs evaluated at every distinct value, so
+  ties are handled exactly (the merge walk in `ks_statistic` can
+  overstate D on tied samples).
+- PSI bin edges come from the reference range only, with the outer
+  bins open-ended, so they can be precomputed; `population_stability_index`
+  derives edges from the combined reference + live range each call.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional
+
+import numpy as np
+
+from .drift_detector import (
+    DriftResult,
+    DriftSeverity,
+    DriftTest,
+    FeatureSpec,
+    _chi_square_p_value,
+    _ks_severity,
+    _psi_severity,
+    ks_p_value,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class NumericProfile:
+    """Reference summary for one numeric feature."""
+
+    values: np.ndarray  # distinct reference values, ascending
+    cum: np.ndarray  # reference count <= each of `values` (CDF = cum / size)
+    edges: np.ndarray  # PSI bin edges (bins + 1)
+    bin_pct: np.ndarray  # reference share per PSI bin
+    size: int
+
+
+@dataclass
+class CategoricalProfile:
+    """Reference summary for one categorical feature."""
+
+    categories: np.ndarray  # ascending
+    counts: np.ndarray
+    size: int
+
+
+class ReferenceProfile:
+    """Precomputed reference distributions, persisted as a single .npz file."""
+
+    def __init__(
+        self,
+        numeric: Dict[str, NumericProfile],
+        categorical: Dict[str, CategoricalProfile],
+        *,
+        bins: int = 10,
+    ):
+        self.numeric = numeric
+        self.categorical = categorical
+        self.bins = bins
+
+    @classmethod
+    def build(
+        cls,
+        reference: Mapping[str, Any],
+        features: List[FeatureSpec],
+        *,
+        bins: int = 10,
+    ) -> "ReferenceProfile":
+        """Summarise reference columns (lists, NumPy arrays or a pandas DataFrame)."""
+        numeric: Dict[str, NumericProfile] = {}
+        categorical: Dict[str, CategoricalProfile] = {}
+        for spec in features:
+            column = np.asarray(reference[spec.name])
+            if spec.test is DriftTest.CHI_SQUARE:
+                categories, counts = np.unique(column.astype(str), return_counts=True)
+                categorical[spec.name] = CategoricalProfile(categories, counts, len(column))
+            else:
+                numeric[spec.name] = _numeric_profile(column, bins)
+        return cls(numeric, categorical, bins=bins)
+
+    def save(self, path: str) -> None:
+        arrays: Dict[str, np.ndarray] = {}
+        meta = {"bins": self.bins, "numeric": [], "categorical": []}
+        for i, (name, p) in enumerate(self.numeric.items()):
+            meta["numeric"].append({"name": name, "size": p.size})
+            arrays[f"n{i}_values"] = p.values
+            arrays[f"n{i}_cum"] = p.cum
+            arrays[f"n{i}_edges"] = p.edges
+            arrays[f"n{i}_bin_pct"] = p.bin_pct
+        for i, (name, p) in enumerate(self.categorical.items()):
+            meta["categorical"].append({"name": name, "size": p.size})
+            arrays[f"c{i}_categories"] = p.categories
+            arrays[f"c{i}_counts"] = p.counts
+        arrays["meta"] = np.array(json.dumps(meta))
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "ReferenceProfile":
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            numeric = {
+                m["name"]: NumericProfile(
+                    values=data[f"n{i}_values"], cum=data[f"n{i}_cum"],
+                    edges=data[f"n{i}_edges"], bin_pct=data[f"n{i}_bin_pct"],
+                    size=m["size"],
+                )
+                for i, m in enumerate(meta["numeric"])
+            }
+            categorical = {
+                m["name"]: CategoricalProfile(
+                    categories=data[f"c{i}_categories"], counts=data[f"c{i}_counts"],
+                    size=m["size"],
+                )
+                for i, m in enumerate(meta["categorical"])
+            }
+        return cls(numeric, categorical, bins=meta["bins"])
+
+    def subset(self, names: List[str]) -> "ReferenceProfile":
+        return ReferenceProfile(
+            {n: self.numeric[n] for n in names if n in self.numeric},
+            {n: self.categorical[n] for n in names if n in self.categorical},
+            bins=self.bins,
+        )
+
+
+def _numeric_profile(column: np.ndarray, bins: int) -> NumericProfile:
+    ordered = np.sort(column)
+    n = len(ordered)
+    if n == 0:
+        empty = np.empty(0)
+        return NumericProfile(empty, np.empty(0, dtype=np.int64), empty, empty, 0)
+    # Last index of each run of equal values -> right-continuous CDF.
+    last = np.flatnonzero(np.r_[ordered[1:] != ordered[:-1], True])
+    lo, hi = float(ordered[0]), float(ordered[-1])
+    if lo == hi:
+        lo, hi = lo - 0.5, hi + 0.5
+    edges = np.linspace(lo, hi, bins + 1)
+    counts = np.diff(np.r_[0, np.searchsorted(ordered, edges[1:-1], side="left"), n])
+    # Integer counts instead of float64 CDFs halve profile memory at 1M+ rows.
+    return NumericProfile(
+        values=ordered[last], cum=(last + 1).astype(np.min_scalar_type(n)),
+        edges=edges, bin_pct=counts / n, size=n,
+    )
+
+
+@dataclass
+class _Thresholds:
+    ks_significance: float
+    psi_minor: float
+    psi_moderate: float
+    chi_square_significance: float
+    epsilon: float = 1e-4
+
+
+class DriftEngine:
+    """Evaluate configured drift tests against a `ReferenceProfile`."""
+
+    def __init__(
+        self,
+        features: List[FeatureSpec],
+        profile: ReferenceProfile,
+        *,
+        ks_significance: float = 0.05,
+        psi_minor: float = 0.10,
+        psi_moderate: float = 0.25,
+        chi_square_significance: float = 0.05,
+        max_workers: Optional[int] = None,
+    ):
+        missing = [
+            s.name for s in features
+            if s.name not in profile.numeric and s.name not in profile.categorical
+        ]
+        if missing:
+            raise ValueError(f"features missing from reference profile: {missing}")
+        self.features = features
+        self.profile = profile
+        self.thresholds = _Thresholds(
+            ks_significance, psi_minor, psi_moderate, chi_square_significance,
+        )
+        self.max_workers = max_workers
+
+    @classmethod
+    def from_reference(
+        cls, features: List[FeatureSpec], reference: Mapping[str, Any], **kwargs,
+    ) -> "DriftEngine":
+        bins = kwargs.pop("bins", 10)
+        return cls(features, ReferenceProfile.build(reference, features, bins=bins), **kwargs)
+
+    def detect(self, live: Mapping[str, Any]) -> List[DriftResult]:
+        """Run every configured test; `live` maps feature name to a column."""
+        if not self.max_workers or self.max_workers < 2 or len(self.features) < 2:
+            return _evaluate(self.features, self.profile, live, self.thresholds)
+
+        chunks = [self.features[i::self.max_workers] for i in range(self.max_workers)]
+        chunks = [c for c in chunks if c]
+        with ProcessPoolExecutor(max_workers=len(chunks)) as pool:
+            futures = [
+                pool.submit(
+                    _evaluate, chunk,
+                    self.profile.subset([s.name for s in chunk]),
+                    {s.name: np.asarray(live.get(s.name, [])) for s in chunk},
+                    self.thresholds,
+                )
+                for chunk in chunks
+            ]
+            by_name = {r.feature: r for f in futures for r in f.result()}
+        return [by_name[s.name] for s in self.features]
+
+
+def _evaluate(
+    features: List[FeatureSpec],
+    profile: ReferenceProfile,
+    live: Mapping[str, Any],
+    t: _Thresholds,
+) -> List[DriftResult]:
+    results: List[DriftResult] = []
+    for spec in features:
+        column = np.asarray(live.get(spec.name, []))
+        if spec.test is DriftTest.CHI_SQUARE:
+            results.append(_chi_square(spec.name, profile.categorical[spec.name], column, t))
+        elif spec.test is DriftTest.KS:
+            results.append(_ks(spec.name, profile.numeric[spec.name], np.sort(column), t))
+        elif spec.test is DriftTest.PSI:
+            results.append(_psi(spec.name, profile.numeric[spec.name], np.sort(column), t))
+    return results
+
+
+def _ks(name: str, ref: NumericProfile, live: np.ndarray, t: _Thresholds) -> DriftResult:
+    m = len(live)
+    if ref.size == 0 or m == 0:
+        return DriftResult(
+            feature=name, test=DriftTest.KS, statistic=0.0,
+            p_value=1.0, threshold=t.ks_significance, detected=False,
+            severity=DriftSeverity.NONE, reference_size=ref.size, live_size=m,
+            detail="empty sample",
+        )
+    # sup |F_ref - F_live| is attained at a distinct value of either sample.
+    cdf = ref.cum / ref.size
+    d_at_ref = np.abs(cdf - np.searchsorted(live, ref.values, side="right") / m).max()
+    last = np.flatnonzero(np.r_[live[1:] != live[:-1], True])
+    idx = np.searchsorted(ref.values, live[last], side="right")
+    ref_cdf = np.where(idx > 0, cdf[np.maximum(idx - 1, 0)], 0.0)
+    d_at_live = np.abs(ref_cdf - (last + 1) / m).max()
+    d = float(max(d_at_ref, d_at_live))
+    p = ks_p_value(d, ref.size, m)
+    detected = p < t.ks_significance
+    return DriftResult(
+        feature=name, test=DriftTest.KS, statistic=round(d, 4),
+        p_value=round(p, 6), threshold=t.ks_significance, detected=detected,
+        severity=_ks_severity(d) if detected else DriftSeverity.NONE,
+        reference_size=ref.size, live_size=m,
+    )
+
+
+def _psi(name: str, ref: NumericProfile, live: np.ndarray, t: _Thresholds) -> DriftResult:
+    m = len(live)
+    psi = 0.0
+    if ref.size and m:
+        counts = np.diff(np.r_[0, np.searchsorted(live, ref.edges[1:-1], side="left"), m])
+        r = np.maximum(ref.bin_pct, t.epsilon)
+        l = np.maximum(counts / m, t.epsilon)
+        psi = float(((l - r) * np.log(l / r)).sum())
+    severity = _psi_severity(psi, t.psi_minor, t.psi_moderate)
+    return DriftResult(
+        feature=name, test=DriftTest.PSI, statistic=round(psi, 4),
+        p_value=None, threshold=t.psi_moderate,
+        detected=severity is not DriftSeverity.NONE, severity=severity,
+        reference_size=ref.size, live_size=m,
+    )
+
+
+def _chi_square(
+    name: str, ref: CategoricalProfile, live: np.ndarray, t: _Thresholds,
+) -> DriftResult:
+    n_ref, n_live = ref.size, len(live)
+    if n_ref == 0 or n_live == 0:
+        return DriftResult(
+            feature=name, test=DriftTest.CHI_SQUARE, statistic=0.0,
+            p_value=1.0, threshold=t.chi_square_significance, detected=False,
+            severity=DriftSeverity.NONE, reference_size=n_ref, live_size=n_live,
+            detail="empty sample",
+        )
+    live_categories, live_counts = np.unique(live.astype(str), return_counts=True)
+    categories = np.union1d(ref.categories, live_categories)
+    observed = np.zeros((2, len(categories)))
+    observed[0, np.searchsorted(categories, ref.categories)] = ref.counts
+    observed[1, np.searchsorted(categories, live_categories)] = live_counts
+    shares = np.array([[n_ref], [n_live]]) / (n_ref + n_live)
+    expected = observed.sum(axis=0) * shares
+    chi2 = float(((observed - expected) ** 2 / expected).sum())
+    p = _chi_square_p_value(chi2, max(1, len(categories) - 1))
+    detected = p < t.chi_square_significance
+    return DriftResult(
+        feature=name, test=DriftTest.CHI_SQUARE, statistic=round(chi2, 4),
+        p_value=round(p, 6), threshold=t.chi_square_significance, detected=detected,
+        severity=DriftSeverity.MODERATE if detected else DriftSeverity.NONE,
+        reference_size=n_ref, live_size=n_live,
+    )
@@ -9,6 +9,11 @@ alerting layer consumes.
 The monitor keeps a sliding window of live predictions + ground truth
 so it can compute concept-drift signals; the window size and the
 retraining policy are configurable.
+
+Feature drift can run on raw columns (`evaluate(live_data)`) or in
+streaming mode: `observe_features` / `merge_window` fold live batches
+(possibly from several replicas) into fixed-memory sketches and
+`evaluate()` with no argument tests that window, then starts a new one.
 """
 
 from __future__ import annotations
@@ -19,7 +24,7 @@ from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Callable, Deque, Dict, List, Optional, Tuple
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Union
 
 from .drift_detector import (
     ConceptDriftResult,
@@ -29,6 +34,7 @@ from .drift_detector import (
     FeatureSpec,
     detect_concept_drift_from_predictions,
 )
+from .sketches import FeatureSketches, detect_drift
 
 
 logger = logging.getLogger(__name__)
@@ -72,6 +78,7 @@ class MonitorReport:
     performance: PerformanceSnapshot
     retraining_reason: RetrainingReason
     retraining_required: bool
+    drift_memory: Dict[str, Any] = field(default_factory=dict)
 
     @property
     def drifted_features(self) -> List[str]:
@@ -135,13 +142,16 @@ class ModelMonitor:
         self,
         feature_specs: List[FeatureSpec],
         *,
-        reference_data: Dict[str, List],
+        reference_data: Union[Dict[str, List], FeatureSketches],
         reference_accuracy: float = 0.95,
         performance_window: int = 1000,
         retraining_policy: Optional[RetrainingPolicy] = None,
+        sketch_k: int = 200,
     ):
         self.detector = DriftDetector(feature_specs)
-        self.reference = dict(reference_data)
+        self.sketch_k = sketch_k
+        self._set_reference(reference_data)
+        self.live_window = FeatureSketches(feature_specs, k=sketch_k)
         self.reference_accuracy = reference_accuracy
         self.tracker = PerformanceTracker(window_size=performance_window)
         self.policy = retraining_policy or RetrainingPolicy()
@@ -150,14 +160,49 @@ class ModelMonitor:
     def observe_prediction(self, record: PredictionRecord) -> None:
         self.tracker.record(record)
 
-    def update_reference(self, new_reference: Dict[str, List]) -> None:
+    def observe_features(self, batch: Dict[str, List]) -> None:
+        """Fold a batch of live feature values into the sketched window."""
+        self.live_window.update(batch)
+
+    def merge_window(self, window: FeatureSketches) -> None:
+        """Fold in a window sketched by another serving replica."""
+        self.live_window.merge(window)
+
+    def update_reference(self, new_reference: Union[Dict[str, List], FeatureSketches]) -> None:
         """Replace reference distributions after a retraining cycle."""
-        self.reference = dict(new_reference)
+        self._set_reference(new_reference)
         # Reset rolling window so post-retraining metrics aren't polluted.
         self.tracker = PerformanceTracker(window_size=self.tracker.window_size)
 
-    def evaluate(self, live_data: Dict[str, List]) -> MonitorReport:
-        drift_results = self.detector.detect(self.reference, live_data)
+    def _set_reference(self, reference: Union[Dict[str, List], FeatureSketches]) -> None:
+        if isinstance(reference, FeatureSketches):
+            self.reference: Dict[str, List] = {}
+            self._reference_sketch: Optional[FeatureSketches] = reference
+        else:
+            self.reference = dict(reference)
+            self._reference_sketch = None  # built on first streaming evaluate()
+
+    def evaluate(self, live_data: Optional[Dict[str, List]] = None) -> MonitorReport:
+        """Run one cycle on `live_data`, or on the sketched window if omitted."""
+        if live_data is None:
+            if self._reference_sketch is None:
+                self._reference_sketch = FeatureSketches.from_columns(
+                    self.detector.features, self.reference, k=self.sketch_k,
+                )
+            window = self.live_window
+            drift_results = detect_drift(self.detector, self._reference_sketch, window)
+            self.live_window = FeatureSketches(self.detector.features, k=self.sketch_k)
+            held = self._reference_sketch.memory_bytes() + window.memory_bytes()
+            raw = self._reference_sketch.raw_equivalent_bytes() + window.raw_equivalent_bytes()
+            drift_memory = {"mode": "sketch", "bytes": held, "raw_equivalent_bytes": raw}
+        else:
+            if not self.reference:
+                raise ValueError("reference is sketched; call evaluate() without live_data")
+            drift_results = self.detector.detect(self.reference, live_data)
+            raw = 8 * sum(
+                len(values) for data in (self.reference, live_data) for values in data.values()
+            )
+            drift_memory = {"mode": "list", "bytes": raw, "raw_equivalent_bytes": raw}
         performance = self.tracker.snapshot()
         concept = None
         if performance.sample_count > 0:
@@ -175,6 +220,7 @@ class ModelMonitor:
             performance=performance,
             retraining_reason=reason,
             retraining_required=reason is not RetrainingReason.NONE,
+            drift_memory=drift_memory,
         )
         self.history.append(report)
         return report
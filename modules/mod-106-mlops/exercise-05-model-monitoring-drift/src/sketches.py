@@ -0,0 +1,343 @@
+"""
+Streaming Drift Sketches
+
+Fixed-memory, mergeable summaries of a feature stream so the monitor
+does not have to keep raw reference / live samples:
+
+- `QuantileSketch`: KLL sketch for numeric features (KS, PSI). Retains
+  O(k log(n/k)) values; any CDF estimate is within `rank_error` of the
+  exact empirical CDF with high probability.
+- `CategoryCounts`: exact count table for categorical features
+  (chi-square), capped at `max_categories`.
+- `FeatureSketches`: one sketch per `FeatureSpec`. Each serving replica
+  keeps its own and ships `to_dict()`; the monitor `merge`s them.
+
+`detect_drift` runs the detector's configured tests against two
+`FeatureSketches`. KS results carry the statistic's error bound in
+`detail`; PSI uses reference-range bin edges (as `drift_engine` does);
+chi-square is exact.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Union
+
+import numpy as np
+
+from .drift_detector import (
+    DriftDetector,
+    DriftResult,
+    DriftSeverity,
+    DriftTest,
+    FeatureSpec,
+    _ks_severity,
+    _psi_severity,
+    chi_square_from_counts,
+    ks_p_value,
+)
+
+
+logger = logging.getLogger(__name__)
+
+OTHER_CATEGORY = "__other__"
+
+
+class QuantileSketch:
+    """KLL quantile sketch. Level h holds values of weight 2**h."""
+
+    MIN_WIDTH = 8
+
+    def __init__(self, k: int = 200, *, seed: Optional[int] = None):
+        if k < self.MIN_WIDTH:
+            raise ValueError(f"k must be >= {self.MIN_WIDTH}")
+        self.k = k
+        self.count = 0
+        self.min = float("inf")
+        self.max = float("-inf")
+        self.levels: List[np.ndarray] = [np.empty(0)]
+        self.compacted = False
+        self._rng = np.random.default_rng(seed)
+        self._view: Optional[tuple] = None
+
+    @property
+    def rank_error(self) -> float:
+        # Empirical all-ranks KLL bound (99% confidence); exact until compacted.
+        return 2.446 / self.k ** 0.9433 if self.compacted else 0.0
+
+    def update(self, values: Iterable[float]) -> None:
+        arr = np.asarray(values, dtype=float).ravel()
+        arr = arr[~np.isnan(arr)]
+        if len(arr) == 0:
+            return
+        self.count += len(arr)
+        self.min = min(self.min, float(arr.min()))
+        self.max = max(self.max, float(arr.max()))
+        self.levels[0] = np.concatenate([self.levels[0], arr])
+        self._compress()
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        if other.k != self.k:
+            raise ValueError(f"cannot merge k={other.k} into k={self.k}")
+        self.levels.extend(np.empty(0) for _ in range(len(other.levels) - len(self.levels)))
+        for h, level in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], level])
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.compacted |= other.compacted
+        self._compress()
+        return self
+
+    def cdf(self, points: Iterable[float]) -> np.ndarray:
+        """Estimated fraction of values <= each point."""
+        points = np.asarray(points, dtype=float)
+        if self.count == 0:
+            return np.zeros(points.shape)
+        values, cum = self._sorted()
+        idx = np.searchsorted(values, points, side="right")
+        return np.where(idx > 0, cum[np.maximum(idx - 1, 0)], 0) / self.count
+
+    def retained(self) -> np.ndarray:
+        return np.unique(self._sorted()[0]) if self.count else np.empty(0)
+
+    def memory_bytes(self) -> int:
+        return sum(level.nbytes for level in self.levels)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "k": self.k, "count": self.count, "compacted": self.compacted,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "levels": [level.tolist() for level in self.levels],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "QuantileSketch":
+        sketch = cls(data["k"])
+        sketch.count = data["count"]
+        sketch.compacted = data["compacted"]
+        if sketch.count:
+            sketch.min, sketch.max = data["min"], data["max"]
+        sketch.levels = [np.asarray(level, dtype=float) for level in data["levels"]]
+        return sketch
+
+    def _capacity(self, h: int) -> int:
+        return max(self.MIN_WIDTH, int(self.k * (2 / 3) ** (len(self.levels) - 1 - h)))
+
+    def _compress(self) -> None:
+        self._view = None
+        while True:
+            caps = [self._capacity(h) for h in range(len(self.levels))]
+            if sum(map(len, self.levels)) <= sum(caps):
+                return
+            h = next(h for h, level in enumerate(self.levels) if len(level) >= caps[h])
+            if h == len(self.levels) - 1:
+                self.levels.append(np.empty(0))
+            level = np.sort(self.levels[h])
+            odd = len(level) % 2
+            # Keep every other value (random phase) at double weight one level up.
+            self.levels[h + 1] = np.concatenate(
+                [self.levels[h + 1], level[odd + self._rng.integers(2)::2]]
+            )
+            self.levels[h] = level[:odd]
+            self.compacted = True
+
+    def _sorted(self) -> tuple:
+        if self._view is None:
+            values = np.concatenate(self.levels)
+            weights = np.concatenate([
+                np.full(len(level), 1 << h, dtype=np.int64)
+                for h, level in enumerate(self.levels)
+            ])
+            order = np.argsort(values, kind="stable")
+            self._view = (values[order], np.cumsum(weights[order]))
+        return self._view
+
+
+class CategoryCounts:
+    """Per-category counts; categories beyond the cap share OTHER_CATEGORY."""
+
+    def __init__(self, max_categories: int = 1000):
+        self.max_categories = max_categories
+        self.counts: Dict[str, int] = {}
+        self.count = 0
+
+    def update(self, values: Iterable[Any]) -> None:
+        labels = [str(v) for v in values if v is not None and v == v]
+        if labels:
+            unique, counts = np.unique(np.asarray(labels), return_counts=True)
+            self._add(zip(unique.tolist(), counts.tolist()))
+
+    def merge(self, other: "CategoryCounts") -> "CategoryCounts":
+        self._add(other.counts.items())
+        return self
+
+    def memory_bytes(self) -> int:
+        return sum(len(label) + 8 for label in self.counts)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"max_categories": self.max_categories, "counts": dict(self.counts)}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CategoryCounts":
+        table = cls(data["max_categories"])
+        table._add(data["counts"].items())
+        return table
+
+    def _add(self, items: Iterable) -> None:
+        for label, n in items:
+            if label not in self.counts and len(self.counts) >= self.max_categories:
+                label = OTHER_CATEGORY
+            self.counts[label] = self.counts.get(label, 0) + int(n)
+            self.count += int(n)
+
+
+Sketch = Union[QuantileSketch, CategoryCounts]
+
+
+class FeatureSketches:
+    """One sketch per configured feature, fed batch by batch."""
+
+    def __init__(self, features: List[FeatureSpec], *, k: int = 200, max_categories: int = 1000):
+        self.features = features
+        self.k = k
+        self.max_categories = max_categories
+        self.sketches: Dict[str, Sketch] = {
+            spec.name: (
+                CategoryCounts(max_categories) if spec.test is DriftTest.CHI_SQUARE
+                else QuantileSketch(k)
+            )
+            for spec in features
+        }
+
+    @classmethod
+    def from_columns(
+        cls, features: List[FeatureSpec], data: Mapping[str, Iterable], **kwargs,
+    ) -> "FeatureSketches":
+        sketches = cls(features, **kwargs)
+        sketches.update(data)
+        return sketches
+
+    def update(self, batch: Mapping[str, Iterable]) -> None:
+        """Add a batch of rows; features missing from the batch are skipped."""
+        for name, sketch in self.sketches.items():
+            if name in batch:
+                sketch.update(batch[name])
+
+    def merge(self, other: "FeatureSketches") -> "FeatureSketches":
+        for name, sketch in other.sketches.items():
+            if name in self.sketches:
+                self.sketches[name].merge(sketch)
+        return self
+
+    def __getitem__(self, name: str) -> Sketch:
+        return self.sketches[name]
+
+    def memory_bytes(self) -> int:
+        return sum(s.memory_bytes() for s in self.sketches.values())
+
+    def raw_equivalent_bytes(self) -> int:
+        """Size of the same samples held as 8-byte values (the list-based path)."""
+        return sum(s.count for s in self.sketches.values()) * 8
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "features": [
+                {"name": s.name, "kind": s.kind, "test": s.test.value} for s in self.features
+            ],
+            "k": self.k,
+            "max_categories": self.max_categories,
+            "sketches": {name: s.to_dict() for name, s in self.sketches.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FeatureSketches":
+        features = [
+            FeatureSpec(f["name"], f["kind"], DriftTest(f["test"])) for f in data["features"]
+        ]
+        out = cls(features, k=data["k"], max_categories=data["max_categories"])
+        for name, state in data["sketches"].items():
+            out.sketches[name] = type(out.sketches[name]).from_dict(state)
+        return out
+
+
+# -- Drift tests over sketches -------------------------------------------
+
+
+def ks_test_sketch(
+    feature: str,
+    reference: QuantileSketch,
+    live: QuantileSketch,
+    *,
+    significance: float = 0.05,
+) -> DriftResult:
+    n, m = reference.count, live.count
+    if n == 0 or m == 0:
+        return DriftResult(
+            feature=feature, test=DriftTest.KS, statistic=0.0,
+            p_value=1.0, threshold=significance, detected=False,
+            severity=DriftSeverity.NONE, reference_size=n, live_size=m,
+            detail="empty sample",
+        )
+    points = np.union1d(reference.retained(), live.retained())
+    d = float(np.abs(reference.cdf(points) - live.cdf(points)).max())
+    p = ks_p_value(d, n, m)
+    detected = p < significance
+    return DriftResult(
+        feature=feature, test=DriftTest.KS, statistic=round(d, 4),
+        p_value=round(p, 6), threshold=significance, detected=detected,
+        severity=_ks_severity(d) if detected else DriftSeverity.NONE,
+        reference_size=n, live_size=m,
+        detail=f"sketch error <= {reference.rank_error + live.rank_error:.4f}",
+    )
+
+
+def psi_test_sketch(
+    feature: str,
+    reference: QuantileSketch,
+    live: QuantileSketch,
+    *,
+    minor_threshold: float = 0.10,
+    moderate_threshold: float = 0.25,
+    bins: int = 10,
+    epsilon: float = 1e-4,
+) -> DriftResult:
+    psi = 0.0
+    if reference.count and live.count:
+        lo, hi = reference.min, reference.max
+        if lo == hi:
+            lo, hi = lo - 0.5, hi + 0.5
+        inner = np.linspace(lo, hi, bins + 1)[1:-1]
+        r = np.maximum(np.diff(np.r_[0.0, reference.cdf(inner), 1.0]), epsilon)
+        l = np.maximum(np.diff(np.r_[0.0, live.cdf(inner), 1.0]), epsilon)
+        psi = float(((l - r) * np.log(l / r)).sum())
+    severity = _psi_severity(psi, minor_threshold, moderate_threshold)
+    return DriftResult(
+        feature=feature, test=DriftTest.PSI, statistic=round(psi, 4),
+        p_value=None, threshold=moderate_threshold,
+        detected=severity is not DriftSeverity.NONE, severity=severity,
+        reference_size=reference.count, live_size=live.count,
+    )
+
+
+def detect_drift(
+    detector: DriftDetector,
+    reference: FeatureSketches,
+    live: FeatureSketches,
+) -> List[DriftResult]:
+    """Sketch counterpart of `DriftDetector.detect`, using its thresholds."""
+    results: List[DriftResult] = []
+    for spec in detector.features:
+        ref, cur = reference[spec.name], live[spec.name]
+        if spec.test is DriftTest.KS:
+            results.append(ks_test_sketch(spec.name, ref, cur,
+                                          significance=detector.ks_significance))
+        elif spec.test is DriftTest.PSI:
+            results.append(psi_test_sketch(spec.name, ref, cur,
+                                           minor_threshold=detector.psi_minor,
+                                           moderate_threshold=detector.psi_moderate))
+        elif spec.test is DriftTest.CHI_SQUARE:
+            results.append(chi_square_from_counts(spec.name, ref.counts, cur.counts,
+                                                  significance=detector.chi_square_significance))
+    return results
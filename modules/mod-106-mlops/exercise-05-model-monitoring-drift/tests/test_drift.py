@@ -126,6 +126,143 @@ class TestDriftDetectorAggregate:
         assert all(r.detected for r in results)
 
 
+class TestDriftEngine:
+    SPECS = [
+        FeatureSpec("ks", "numeric", DriftTest.KS),
+        FeatureSpec("psi", "numeric", DriftTest.PSI),
+        FeatureSpec("cat", "categorical", DriftTest.CHI_SQUARE),
+    ]
+
+    def _data(self, shift: float):
+        return (
+            {"ks": _normal(500, 0.0, 1.0, seed=1), "psi": _normal(500, 0.0, 1.0, seed=3),
+             "cat": ["a"] * 100 + ["b"] * 100},
+            {"ks": _normal(400, shift, 1.0, seed=2), "psi": _normal(400, shift, 1.0, seed=4),
+             "cat": ["a"] * 50 + ["b"] * 120 + ["c"] * 30},
+        )
+
+    def test_matches_pure_python_ks_and_chi_square(self):
+        np = pytest.importorskip("numpy")
+        from src.drift_engine import DriftEngine
+
+        ref, live = self._data(0.3)
+        engine = DriftEngine.from_reference(self.SPECS, {k: np.array(v) for k, v in ref.items()})
+        results = {r.feature: r for r in engine.detect(live)}
+
+        expected_ks = ks_test("ks", ref["ks"], live["ks"])
+        expected_chi = chi_square_test("cat", ref["cat"], live["cat"])
+        assert results["ks"].statistic == expected_ks.statistic
+        assert results["ks"].p_value == expected_ks.p_value
+        assert results["cat"].statistic == expected_chi.statistic
+        assert results["cat"].p_value == expected_chi.p_value
+
+    def test_psi_flags_shift(self):
+        pytest.importorskip("numpy")
+        from src.drift_engine import DriftEngine
+
+        ref, same = self._data(0.0)
+        _, shifted = self._data(1.0)
+        engine = DriftEngine.from_reference(self.SPECS, ref)
+        assert {r.feature: r for r in engine.detect(same)}["psi"].statistic < 0.1
+        assert {r.feature: r for r in engine.detect(shifted)}["psi"].detected
+
+    def test_ks_handles_ties_exactly(self):
+        pytest.importorskip("numpy")
+        from src.drift_engine import DriftEngine
+
+        engine = DriftEngine.from_reference(self.SPECS[:1], {"ks": [1.0] * 50 + [2.0] * 50})
+        [result] = engine.detect({"ks": [1.0] * 50 + [2.0] * 50})
+        assert result.statistic == 0.0
+
+    def test_profile_roundtrip_and_process_pool(self, tmp_path):
+        pytest.importorskip("numpy")
+        from src.drift_engine import DriftEngine, ReferenceProfile
+
+        ref, live = self._data(1.0)
+        path = str(tmp_path / "profile.npz")
+        ReferenceProfile.build(ref, self.SPECS).save(path)
+        loaded = DriftEngine(self.SPECS, ReferenceProfile.load(path), max_workers=2)
+        fresh = DriftEngine.from_reference(self.SPECS, ref)
+
+        pooled = loaded.detect(live)
+        assert [r.feature for r in pooled] == ["ks", "psi", "cat"]
+        assert [(r.statistic, r.p_value) for r in pooled] == [
+            (r.statistic, r.p_value) for r in fresh.detect(live)
+        ]
+
+    def test_unknown_feature_rejected(self):
+        pytest.importorskip("numpy")
+        from src.drift_engine import DriftEngine, ReferenceProfile
+
+        profile = ReferenceProfile.build({"ks": [1.0, 2.0]}, self.SPECS[:1])
+        with pytest.raises(ValueError):
+            DriftEngine(self.SPECS, profile)
+
+
+class TestDriftSketches:
+    SPECS = TestDriftEngine.SPECS
+
+    def test_small_streams_are_exact(self):
+        pytest.importorskip("numpy")
+        from src.sketches import FeatureSketches, detect_drift
+
+        ref, live = TestDriftEngine()._data(0.3)
+        results = {
+            r.feature: r for r in detect_drift(
+                DriftDetector(self.SPECS),
+                FeatureSketches.from_columns(self.SPECS, ref, k=1000),
+                FeatureSketches.from_columns(self.SPECS, live, k=1000),
+            )
+        }
+        expected_ks = ks_test("ks", ref["ks"], live["ks"])
+        expected_chi = chi_square_test("cat", ref["cat"], live["cat"])
+        assert results["ks"].statistic == expected_ks.statistic
+        assert results["ks"].detail == "sketch error <= 0.0000"
+        assert results["cat"].statistic == expected_chi.statistic
+
+    def test_merged_replicas_within_error_bound(self):
+        np = pytest.importorskip("numpy")
+        from src.sketches import FeatureSketches, QuantileSketch
+
+        rng = np.random.default_rng(0)
+        ref_values = rng.normal(0.0, 1.0, 100_000)
+        live_values = rng.normal(0.1, 1.0, 100_000)
+        ref = QuantileSketch(seed=1)
+        ref.update(ref_values)
+        merged = FeatureSketches(self.SPECS[:1])
+        for part in np.array_split(live_values, 4):
+            replica = FeatureSketches(self.SPECS[:1])
+            replica.update({"ks": part})
+            merged.merge(FeatureSketches.from_dict(replica.to_dict()))
+
+        live = merged["ks"]
+        points = np.sort(np.r_[ref_values, live_values])
+        exact = np.abs(
+            np.searchsorted(np.sort(ref_values), points, side="right")
+            - np.searchsorted(np.sort(live_values), points, side="right")
+        ).max() / 100_000
+        sketched = np.abs(ref.cdf(points) - live.cdf(points)).max()
+        assert live.count == 100_000
+        assert abs(sketched - exact) <= ref.rank_error + live.rank_error
+        assert merged.memory_bytes() < merged.raw_equivalent_bytes() / 50
+
+    def test_monitor_streaming_window(self):
+        pytest.importorskip("numpy")
+
+        ref = {"ks": _normal(5000, 0.0, 1.0, seed=1), "psi": _normal(5000, 0.0, 1.0, seed=2),
+               "cat": ["a", "b"] * 2500}
+        monitor = ModelMonitor(self.SPECS, reference_data=ref)
+        for seed in range(4):
+            monitor.observe_features({"ks": _normal(1000, 2.0, 1.0, seed=seed),
+                                      "psi": _normal(1000, 0.0, 1.0, seed=seed + 10),
+                                      "cat": ["a", "b"] * 500})
+        report = monitor.evaluate()
+        assert report.drifted_features == ["ks"]
+        assert report.drift_memory["mode"] == "sketch"
+        # Window starts over after each streaming evaluation.
+        assert monitor.live_window["ks"].count == 0
+
+
 class TestConceptDrift:
     def test_no_drift_when_accuracy_matches(self):
         result = concept_drift_from_accuracy(0.95, 0.95)
@@ -0,0 +1,79 @@
+"""
+Benchmark: pipeline wall-clock, sequential vs DAG, cold vs warm cache.
+
+    python scripts/bench_pipeline.py
+    python scripts/bench_pipeline.py --test 3 --train 8 --build 5 --deploy 0.5
+
+Each demo step sleeps for the given number of seconds to stand in for
+real work (pytest, training, docker build, rollout). Reported runs:
+
+- sequential: one worker, no cache (the previous runner's behaviour)
+- dag cold:   default worker pool, empty cache
+- dag warm:   same commit again, cache populated by the cold run
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.pipeline import (  # noqa: E402
+    InMemoryArtifactCache,
+    MLPipeline,
+    PipelineConfig,
+    make_demo_steps,
+)
+
+
+def slow(fn, seconds: float):
+    def step(ctx):
+        time.sleep(seconds)
+        return fn(ctx)
+    return step
+
+
+def build(args, **kwargs) -> MLPipeline:
+    steps = make_demo_steps()
+    return MLPipeline(
+        config=PipelineConfig(require_production_approval=False),
+        test_fn=slow(steps["test"], args.test),
+        train_fn=slow(steps["train"], args.train),
+        build_fn=slow(steps["build"], args.build),
+        staging_deploy_fn=slow(steps["staging"], args.deploy),
+        production_deploy_fn=slow(steps["production"], args.deploy),
+        **kwargs,
+    )
+
+
+def timed(name: str, pipeline: MLPipeline) -> float:
+    begin = time.perf_counter()
+    run = pipeline.run(commit_sha="abc123", branch="main")
+    elapsed = time.perf_counter() - begin
+    cached = [s.name for s in run.stages if s.cache_hit]
+    print(f"  {name:<12} {elapsed:>7.2f}s  passed={run.passed}  cached={cached or '-'}")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--test", type=float, default=1.5, help="seconds")
+    parser.add_argument("--train", type=float, default=3.0, help="seconds")
+    parser.add_argument("--build", type=float, default=2.0, help="seconds")
+    parser.add_argument("--deploy", type=float, default=0.3, help="seconds per deploy stage")
+    args = parser.parse_args()
+
+    print(f"stage cost: test={args.test}s train={args.train}s build={args.build}s "
+          f"deploy={args.deploy}s x2")
+    sequential = timed("sequential", build(args, max_workers=1))
+    pipeline = build(args, cache=InMemoryArtifactCache())
+    cold = timed("dag cold", pipeline)
+    warm = timed("dag warm", pipeline)
+    print(f"  cold speedup {sequential / cold:.2f}x, warm speedup {sequential / warm:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
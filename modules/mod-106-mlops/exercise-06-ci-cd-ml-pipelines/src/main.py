@@ -22,6 +22,7 @@ from typing import Optional
 import click
 
 from .pipeline import (
+    DirectoryArtifactCache,
     MLPipeline,
     PipelineConfig,
     PipelineContext,
@@ -55,7 +56,8 @@ def cli(verbose: bool) -> None:
 
 def _build_pipeline(*, accuracy: float = 0.92, image_size_mb: float = 850.0,
                     smoke_tests_passed: bool = True,
-                    require_approval: bool = True) -> MLPipeline:
+                    require_approval: bool = True,
+                    cache_dir: Optional[str] = None) -> MLPipeline:
     config = PipelineConfig(require_production_approval=require_approval)
     steps = make_demo_steps(
         accuracy=accuracy,
@@ -78,15 +80,18 @@ def _build_pipeline(*, accuracy: float = 0.92, image_size_mb: float = 850.0,
         staging_deploy_fn=steps["staging"], production_deploy_fn=steps["production"],
         production_approval_fn=_approval,
         rollback_fn=_rollback,
+        cache=DirectoryArtifactCache(Path(cache_dir)) if cache_dir else None,
     )
 
 
 @cli.command()
 @click.option("--commit-sha", default="abc123def456")
 @click.option("--branch", default="main")
-def run(commit_sha: str, branch: str) -> None:
+@click.option("--cache-dir", type=click.Path(file_okay=False),
+              help="Restore unchanged test/train/build results from this directory")
+def run(commit_sha: str, branch: str, cache_dir: Optional[str]) -> None:
     """Run the full pipeline."""
-    pipeline = _build_pipeline()
+    pipeline = _build_pipeline(cache_dir=cache_dir)
     result = pipeline.run(commit_sha=commit_sha, branch=branch)
     _render_run(result)
     if not result.passed:
@@ -181,6 +186,7 @@ def _render_run(result) -> None:
         click.echo(
             f"  {marker} {stage.name:<22s} {stage.status.value:<12s} "
             f"duration={stage.duration_seconds:.3f}s "
+            + ("(cached) " if stage.cache_hit else "")
             + (f"error={stage.error}" if stage.error else "")
         )
 
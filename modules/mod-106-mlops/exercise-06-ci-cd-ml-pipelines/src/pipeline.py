@@ -3,9 +3,12 @@ CI/CD Pipeline for ML Workflows
 
 A declarative pipeline runner that mirrors the structure of a typical
 GitHub Actions workflow for an ML project: test → train → build →
-staging-deploy → production-deploy. Each stage produces a StageResult;
-the whole pipeline ends in a PipelineRun summary with overall outcome
-+ rollback path on failure.
+staging-deploy → production-deploy. Stages are a DAG (`StageSpec.needs`),
+so independent stages such as unit tests and the image build run
+concurrently, and test/train/build reports are content-addressed in an
+optional `ArtifactCache` so an unchanged commit restores them instead of
+recomputing. Each stage produces a StageResult; the whole pipeline ends
+in a PipelineRun summary with overall outcome + rollback path on failure.
 
 The runner uses dependency-injected callables for the heavy work so
 the same code drives unit tests, the demo CLI, and a real
@@ -14,12 +17,17 @@ production-like runner that shells out to docker/kubectl.
 
 from __future__ import annotations
 
+import hashlib
 import logging
+import pickle
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, Sequence
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Protocol, Sequence, Tuple
 
 
 logger = logging.getLogger(__name__)
@@ -45,6 +53,7 @@ class StageResult:
     output: Dict[str, Any] = field(default_factory=dict)
     error: Optional[str] = None
     logs: List[str] = field(default_factory=list)
+    cache_hit: bool = False
 
     @property
     def duration_seconds(self) -> float:
@@ -160,10 +169,151 @@ class PipelineContext:
         result.logs.append(message)
 
 
-class MLPipeline:
-    """Executes the test → train → build → staging → production sequence."""
+@dataclass(frozen=True)
+class StageSpec:
+    """One node of the pipeline DAG.
+
+    `needs` are the stages that must succeed first. Cacheable stages are
+    pure functions of the commit, their step code and their upstream
+    stages, so a warm cache restores their report instead of re-running.
+    """
+
+    name: str
+    needs: Tuple[str, ...] = ()
+    cacheable: bool = False
+
+
+class ArtifactCache(Protocol):
+    """Content-addressed store of stage reports."""
+
+    def get(self, key: str) -> Optional[Any]: ...
+
+    def put(self, key: str, report: Any) -> None: ...
+
+
+class InMemoryArtifactCache:
+    """Process-local cache, used by tests and the demo CLI."""
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key: str, report: Any) -> None:
+        with self._lock:
+            self._entries[key] = report
+
+
+class DirectoryArtifactCache:
+    """Pickled reports under `root/<key[:2]>/<key>.pkl`, shareable between runners."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.pkl"
+
+    def get(self, key: str) -> Optional[Any]:
+        path = self._path(key)
+        try:
+            return pickle.loads(path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError,
+                IndexError, TypeError, ValueError) as exc:
+            # Truncated, or pickled by code that no longer exists: recompute.
+            logger.warning("Dropping unreadable cache entry %s: %s", path, exc)
+            path.unlink(missing_ok=True)
+            return None
+
+    def put(self, key: str, report: Any) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp.write_bytes(pickle.dumps(report))
+        tmp.replace(path)
+
+
+def code_fingerprint(fn: Callable, _seen: Optional[set] = None) -> Optional[str]:
+    """Hash of a step's bytecode, constants, closure values and defaults.
+
+    Returns None when `fn` has no Python code object (builtins, C
+    extensions); such stages are never cached. Globals the step reads,
+    and the state of captured objects, are not covered - pass anything
+    that changes the result to `MLPipeline.run(inputs=...)`.
+    """
+    code = getattr(fn, "__code__", None)
+    if code is None:
+        func = getattr(fn, "__func__", None) or getattr(type(fn), "__call__", None)
+        code = getattr(func, "__code__", None)
+        if code is None:
+            return None
+    seen = _seen if _seen is not None else set()
+    seen.add(id(fn))
+    digest = hashlib.sha256()
+    _hash_code(digest, code)
+    for cell in getattr(fn, "__closure__", None) or ():
+        try:
+            value = cell.cell_contents
+        except ValueError:  # empty cell
+            continue
+        digest.update(_closure_token(value, seen).encode())
+    digest.update(repr(getattr(fn, "__defaults__", None)).encode())
+    digest.update(repr(getattr(fn, "__kwdefaults__", None)).encode())
+    return digest.hexdigest()
+
+
+_PLAIN_VALUES = (int, float, complex, str, bytes, bool, type(None), Enum)
+
+
+def _closure_token(value: Any, seen: set) -> str:
+    """Captured constants and functions are hashed; other captured objects
+    (clients, loggers, mutable buffers) only by type, so their state does
+    not churn the key.
+    """
+    if isinstance(value, _PLAIN_VALUES):
+        return repr(value)
+    if isinstance(value, (tuple, frozenset)):
+        return "(" + ",".join(_closure_token(v, seen) for v in value) + ")"
+    if callable(value) and not isinstance(value, type):
+        if id(value) in seen:  # recursive closure
+            return "<recursive>"
+        return code_fingerprint(value, seen) or type(value).__qualname__
+    return type(value).__qualname__
+
+
+def _hash_code(digest, code) -> None:
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if hasattr(const, "co_code"):
+            _hash_code(digest, const)
+        else:
+            digest.update(repr(const).encode())
 
-    STAGE_ORDER = ("test", "train", "build", "deploy_staging", "deploy_production")
+
+class MLPipeline:
+    """Executes the test → train → build → staging → production DAG.
+
+    Stages whose `needs` are satisfied run concurrently on a thread pool
+    of `max_workers`; after the first failure no new stage is started
+    (already-running ones finish) and the rest are skipped. With a
+    `cache`, cacheable stages are keyed by step code + commit + extra
+    inputs + upstream keys, and a hit restores the stored report (which
+    is re-validated against the current config).
+    """
+
+    STAGES = (
+        StageSpec("test", cacheable=True),
+        StageSpec("train", needs=("test",), cacheable=True),
+        StageSpec("build", cacheable=True),
+        StageSpec("deploy_staging", needs=("train", "build")),
+        StageSpec("deploy_production", needs=("deploy_staging",)),
+    )
+    STAGE_ORDER = tuple(spec.name for spec in STAGES)
 
     def __init__(
         self,
@@ -177,6 +327,8 @@ class MLPipeline:
         production_approval_fn: Optional[Callable[[PipelineContext], bool]] = None,
         rollback_fn: Optional[Callable[[PipelineContext, str], None]] = None,
         clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+        max_workers: int = 4,
+        cache: Optional[ArtifactCache] = None,
     ):
         self.config = config
         self.test_fn = test_fn
@@ -187,6 +339,21 @@ class MLPipeline:
         self.production_approval_fn = production_approval_fn or (lambda ctx: True)
         self.rollback_fn = rollback_fn
         self.clock = clock
+        self.max_workers = max_workers
+        self.cache = cache
+        self._steps: Dict[str, Tuple[Callable, Callable]] = {
+            "test": (test_fn, self._validate_test_report),
+            "train": (train_fn, self._validate_train_report),
+            "build": (build_fn, self._validate_build_report),
+            "deploy_staging": (
+                staging_deploy_fn,
+                lambda report, ctx: self._validate_deploy(report, ctx, environment="staging"),
+            ),
+            "deploy_production": (
+                production_deploy_fn,
+                lambda report, ctx: self._validate_deploy(report, ctx, environment="production"),
+            ),
+        }
 
     def run(
         self,
@@ -194,7 +361,9 @@ class MLPipeline:
         commit_sha: str,
         branch: str,
         run_id: Optional[str] = None,
+        inputs: Optional[Dict[str, str]] = None,
     ) -> PipelineRun:
+        """Run the DAG. `inputs` (e.g. a dataset version) join every cache key."""
         run_id = run_id or f"pipeline-{self.clock().strftime('%Y%m%dT%H%M%S')}"
         run = PipelineRun(
             run_id=run_id,
@@ -203,89 +372,121 @@ class MLPipeline:
             started_at=self.clock(),
         )
         ctx = PipelineContext(run=run, config=self.config)
-
-        for stage_name in self.STAGE_ORDER:
-            stage_result = StageResult(
-                name=stage_name, status=StageStatus.RUNNING,
-                started_at=self.clock(), ended_at=self.clock(),
-            )
-            run.stages.append(stage_result)
-
-            # Decide whether to run or skip this stage.
-            should_skip, skip_reason = self._should_skip(stage_name, ctx)
-            if should_skip:
-                stage_result.status = StageStatus.SKIPPED
-                stage_result.ended_at = self.clock()
-                stage_result.logs.append(f"Skipped: {skip_reason}")
-                continue
-
-            try:
-                if stage_name == "test":
-                    report = self.test_fn(ctx)
-                    self._validate_test_report(report, ctx)
-                    ctx.artifacts["test"] = report
-                    stage_result.output = _to_dict(report)
-                elif stage_name == "train":
-                    report = self.train_fn(ctx)
-                    self._validate_train_report(report, ctx)
-                    ctx.artifacts["train"] = report
-                    stage_result.output = _to_dict(report)
-                elif stage_name == "build":
-                    report = self.build_fn(ctx)
-                    self._validate_build_report(report, ctx)
-                    ctx.artifacts["build"] = report
-                    stage_result.output = _to_dict(report)
-                elif stage_name == "deploy_staging":
-                    report = self.staging_deploy_fn(ctx)
-                    self._validate_deploy(report, ctx, environment="staging")
-                    ctx.artifacts["deploy_staging"] = report
-                    stage_result.output = _to_dict(report)
-                    run.final_environment = "staging"
-                elif stage_name == "deploy_production":
-                    if self.config.require_production_approval:
-                        approved = self.production_approval_fn(ctx)
-                        if not approved:
-                            stage_result.status = StageStatus.SKIPPED
-                            stage_result.logs.append("Production deploy not approved.")
-                            stage_result.ended_at = self.clock()
-                            continue
-                    report = self.production_deploy_fn(ctx)
-                    self._validate_deploy(report, ctx, environment="production")
-                    ctx.artifacts["deploy_production"] = report
-                    stage_result.output = _to_dict(report)
-                    run.final_environment = "production"
-
-                stage_result.status = StageStatus.SUCCESS
-            except Exception as exc:
-                stage_result.status = StageStatus.FAILED
-                stage_result.error = f"{type(exc).__name__}: {exc}"
-                logger.warning("Stage %s failed: %s", stage_name, exc)
-                if (
-                    stage_name in {"deploy_staging", "deploy_production"}
-                    and self.config.rollback_on_smoke_test_failure
-                    and self.rollback_fn is not None
-                ):
-                    self.rollback_fn(ctx, stage_name)
-                    run.rolled_back = True
-                    stage_result.status = StageStatus.ROLLED_BACK
-                break
-            finally:
-                stage_result.ended_at = self.clock()
-
+        for spec in self.STAGES:
+            now = self.clock()
+            run.stages.append(StageResult(
+                name=spec.name, status=StageStatus.PENDING, started_at=now, ended_at=now,
+            ))
+
+        keys: Dict[str, Optional[str]] = {}
+        waiting = list(self.STAGES)
+        running: Dict[Future, StageSpec] = {}
+        failed = False
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while waiting or running:
+                if not failed:
+                    for spec in [s for s in waiting if self._ready(s, run)]:
+                        waiting.remove(spec)
+                        keys[spec.name] = self._cache_key(spec, commit_sha, inputs, keys)
+                        result = run.stage(spec.name)
+                        result.status = StageStatus.RUNNING
+                        result.started_at = self.clock()
+                        running[pool.submit(self._execute, spec, keys[spec.name], ctx)] = spec
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    spec = running.pop(future)
+                    if not self._finish(spec, future, ctx):
+                        failed = True
+
+        for spec in waiting:
+            result = run.stage(spec.name)
+            result.status = StageStatus.SKIPPED
+            result.ended_at = self.clock()
+            result.logs.append("Skipped due to upstream failure")
         run.ended_at = self.clock()
         return run
 
-    # -- validation helpers --------------------------------------------
+    # -- DAG execution -------------------------------------------------
 
-    def _should_skip(self, stage_name: str, ctx: PipelineContext) -> tuple[bool, str]:
-        # Skip downstream stages if any prior stage failed.
-        prior_failed = any(
-            s.status in {StageStatus.FAILED, StageStatus.ROLLED_BACK}
-            for s in ctx.run.stages[:-1]
-        )
-        if prior_failed:
-            return True, "Skipped due to upstream failure"
-        return False, ""
+    def _ready(self, spec: StageSpec, run: PipelineRun) -> bool:
+        return all(run.stage(dep).status is StageStatus.SUCCESS for dep in spec.needs)
+
+    def _cache_key(
+        self,
+        spec: StageSpec,
+        commit_sha: str,
+        inputs: Optional[Dict[str, str]],
+        upstream: Dict[str, Optional[str]],
+    ) -> Optional[str]:
+        if self.cache is None or not spec.cacheable:
+            return None
+        fingerprint = code_fingerprint(self._steps[spec.name][0])
+        if fingerprint is None or any(upstream.get(dep) is None for dep in spec.needs):
+            return None
+        digest = hashlib.sha256()
+        for part in (spec.name, fingerprint, commit_sha, repr(sorted((inputs or {}).items()))):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        for dep in spec.needs:
+            digest.update(upstream[dep].encode())
+        return digest.hexdigest()
+
+    def _execute(self, spec: StageSpec, key: Optional[str], ctx: PipelineContext):
+        """Worker: produce + validate the stage report. Returns (report, from_cache)."""
+        fn, validate = self._steps[spec.name]
+        if spec.name == "deploy_production" and self.config.require_production_approval:
+            if not self.production_approval_fn(ctx):
+                return None, False
+        report = self.cache.get(key) if key is not None else None
+        from_cache = report is not None
+        if report is None:
+            report = fn(ctx)
+        validate(report, ctx)
+        if key is not None and not from_cache:
+            self.cache.put(key, report)
+        return report, from_cache
+
+    def _finish(self, spec: StageSpec, future: Future, ctx: PipelineContext) -> bool:
+        """Record a completed stage on the run. Returns False if it failed."""
+        run = ctx.run
+        stage_result = run.stage(spec.name)
+        try:
+            report, from_cache = future.result()
+        except Exception as exc:
+            stage_result.status = StageStatus.FAILED
+            stage_result.error = f"{type(exc).__name__}: {exc}"
+            logger.warning("Stage %s failed: %s", spec.name, exc)
+            if (
+                spec.name in {"deploy_staging", "deploy_production"}
+                and self.config.rollback_on_smoke_test_failure
+                and self.rollback_fn is not None
+            ):
+                self.rollback_fn(ctx, spec.name)
+                run.rolled_back = True
+                stage_result.status = StageStatus.ROLLED_BACK
+            return False
+        finally:
+            stage_result.ended_at = self.clock()
+
+        if report is None:
+            stage_result.status = StageStatus.SKIPPED
+            stage_result.logs.append("Production deploy not approved.")
+            return True
+        if from_cache:
+            stage_result.cache_hit = True
+            stage_result.logs.append("Restored from artifact cache.")
+        ctx.artifacts[spec.name] = report
+        stage_result.output = _to_dict(report)
+        stage_result.status = StageStatus.SUCCESS
+        if spec.name == "deploy_staging":
+            run.final_environment = "staging"
+        elif spec.name == "deploy_production":
+            run.final_environment = "production"
+        return True
+
+    # -- validation helpers --------------------------------------------
 
     def _validate_test_report(self, report: TestReport, ctx: PipelineContext) -> None:
         if report.unit_tests_failed > self.config.max_unit_test_failures:
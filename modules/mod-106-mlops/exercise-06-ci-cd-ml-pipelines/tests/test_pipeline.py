@@ -1,5 +1,6 @@
 """Tests for the CI/CD pipeline runner + validators."""
 
+import threading
 from typing import Dict, List
 
 import pytest
@@ -8,6 +9,8 @@ from src.pipeline import (
     BlueGreenState,
     BuildReport,
     DeployReport,
+    DirectoryArtifactCache,
+    InMemoryArtifactCache,
     MLPipeline,
     PipelineConfig,
     PipelineContext,
@@ -121,6 +124,77 @@ class TestPipelineRun:
         assert run.stage("deploy_production").status is StageStatus.SUCCESS
 
 
+class TestStageDAG:
+    def _pipeline(self, steps, **kwargs) -> MLPipeline:
+        return MLPipeline(
+            config=PipelineConfig(),
+            test_fn=steps["test"], train_fn=steps["train"], build_fn=steps["build"],
+            staging_deploy_fn=steps["staging"], production_deploy_fn=steps["production"],
+            production_approval_fn=_approval_yes,
+            **kwargs,
+        )
+
+    def test_independent_stages_run_concurrently(self):
+        steps = make_demo_steps()
+        # Both stages block until the other has started; sequential execution
+        # would break the barrier and fail the stage.
+        barrier = threading.Barrier(2, timeout=5)
+        test_fn, build_fn = steps["test"], steps["build"]
+        steps["test"] = lambda ctx: (barrier.wait(), test_fn(ctx))[1]
+        steps["build"] = lambda ctx: (barrier.wait(), build_fn(ctx))[1]
+        run = self._pipeline(steps).run(commit_sha="abc", branch="main")
+        assert run.passed
+        assert [s.name for s in run.stages] == list(MLPipeline.STAGE_ORDER)
+
+    def test_warm_cache_restores_unchanged_stages(self):
+        calls: List[str] = []
+        steps = make_demo_steps()
+        for name in ("test", "train", "build", "staging"):
+            steps[name] = (lambda fn, n: lambda ctx: (calls.append(n), fn(ctx))[1])(steps[name], name)
+        pipeline = self._pipeline(steps, cache=InMemoryArtifactCache())
+
+        cold = pipeline.run(commit_sha="abc", branch="main")
+        warm = pipeline.run(commit_sha="abc", branch="main")
+        assert calls.count("train") == 1 and calls.count("staging") == 2
+        assert not any(s.cache_hit for s in cold.stages)
+        assert {s.name for s in warm.stages if s.cache_hit} == {"test", "train", "build"}
+        assert warm.stage("train").output == cold.stage("train").output
+
+        pipeline.run(commit_sha="def", branch="main")
+        pipeline.run(commit_sha="def", branch="main", inputs={"dataset": "v2"})
+        assert calls.count("train") == 3
+
+    def test_step_code_change_invalidates_cache(self, tmp_path):
+        cache = DirectoryArtifactCache(tmp_path)
+        self._pipeline(make_demo_steps(accuracy=0.92), cache=cache).run(commit_sha="abc", branch="main")
+        run = self._pipeline(make_demo_steps(accuracy=0.95), cache=cache).run(
+            commit_sha="abc", branch="main")
+        assert run.stage("test").cache_hit and run.stage("build").cache_hit
+        assert not run.stage("train").cache_hit
+        assert run.stage("train").output["metrics"]["accuracy"] == 0.95
+
+    @pytest.mark.parametrize("blob", [b"", b"\x80\x04truncated", b"not a pickle"])
+    def test_unreadable_cache_entry_is_a_miss(self, tmp_path, blob):
+        cache = DirectoryArtifactCache(tmp_path)
+        cache.put("ab12", {"ok": True})
+        path = cache._path("ab12")
+        path.write_bytes(blob)
+        assert cache.get("ab12") is None
+        assert not path.exists()
+        cache.put("ab12", {"ok": True})
+        assert cache.get("ab12") == {"ok": True}
+
+    def test_failure_skips_dependents(self):
+        config = PipelineConfig(min_test_coverage_percent=99.9)
+        pipeline = _build_pipeline(config=config)
+        run = pipeline.run(commit_sha="abc", branch="main")
+        statuses = {s.name: s.status for s in run.stages}
+        assert statuses["test"] is StageStatus.FAILED
+        assert statuses["train"] is StageStatus.SKIPPED
+        assert statuses["deploy_staging"] is StageStatus.SKIPPED
+        assert not run.passed
+
+
 class TestBlueGreen:
     def test_swap_changes_live_color(self):
         state = BlueGreenState(environment="prod")
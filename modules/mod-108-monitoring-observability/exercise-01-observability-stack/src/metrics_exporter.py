@@ -12,10 +12,16 @@ the semantics implemented here match the OpenMetrics 1.0 contract.
 
 Includes:
 - Registry with concurrent-safe metric registration.
+- Low-contention hot path: counters and histograms write to per-thread
+  shards (no lock) that are merged at scrape time; histogram buckets
+  are a flat counts array indexed by bisection; label sets are interned.
+- Cached exposition: unchanged metrics and series are not re-rendered
+  between scrapes.
 - Counters / Gauges / Histograms (with configurable buckets) /
   Summaries (with rolling-window quantile observations).
 - Structured-log emission helpers compatible with Loki ingestion.
-- SLO tracker + error-budget calculator built on top.
+- SLO tracker + error-budget calculator built on top, aggregating over
+  the SLO window with hourly buckets (`rolling_window.RollingWindow`).
 """
 
 from __future__ import annotations
@@ -25,11 +31,15 @@ import logging
 import math
 import threading
 import time
+from bisect import bisect_left
 from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Deque, Dict, Iterable, List, Optional, Tuple
+from itertools import accumulate
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from .rolling_window import RollingWindow
 
 
 logger = logging.getLogger(__name__)
@@ -47,61 +57,192 @@ class MetricType(str, Enum):
 
 _LabelValues = Tuple[Tuple[str, str], ...]
 
+# Interned label keys: the same label set always maps to the same tuple
+# object, and its rendered `{k="v"}` text is computed once. The alias
+# map (kwarg ordering -> canonical key) is a cache, reset when it
+# reaches _MAX_LABEL_KEYS so unusual callers can't grow it forever.
+_MAX_LABEL_KEYS = 10_000
+_LABEL_KEYS: Dict[Tuple[Tuple[str, str], ...], _LabelValues] = {}
+_LABEL_TEXT: Dict[_LabelValues, str] = {(): ""}
+
 
 def _label_key(labels: Optional[Dict[str, str]]) -> _LabelValues:
     if not labels:
         return ()
-    return tuple(sorted(labels.items()))
+    raw = tuple(labels.items())
+    key = _LABEL_KEYS.get(raw)
+    if key is None:
+        if len(_LABEL_KEYS) >= _MAX_LABEL_KEYS:
+            _LABEL_KEYS.clear()
+        canonical = tuple(sorted(raw))
+        key = _LABEL_KEYS.setdefault(canonical, canonical)
+        _LABEL_KEYS[raw] = key
+    return key
 
 
 def _format_labels(labels: _LabelValues) -> str:
-    if not labels:
-        return ""
-    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+    text = _LABEL_TEXT.get(labels)
+    if text is None:
+        text = "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+        _LABEL_TEXT[labels] = text
+    return text
 
 
 def _escape(value: str) -> str:
     return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
 
 
+class _ThreadShards:
+    """Per-thread series maps for one metric.
+
+    Each thread writes only to its own dict, so the hot path takes no
+    lock; readers copy every shard (a single C-level dict copy under the
+    GIL) and merge. The lock is only taken when a thread first touches
+    the metric, and on reads.
+
+    Shards of threads that have exited are folded into a base map with
+    `merge(base_value, shard_value)` when the metric is next read, so
+    thread-per-request servers don't accumulate one shard per thread
+    ever seen.
+    """
+
+    def __init__(self, merge: Callable[[object, object], object]) -> None:
+        self._merge = merge
+        self._local = threading.local()
+        self._shards: List[Tuple[threading.Thread, dict]] = []
+        self._base: dict = {}
+        self._lock = threading.Lock()
+
+    def mine(self) -> dict:
+        try:
+            return self._local.series
+        except AttributeError:
+            series: dict = {}
+            with self._lock:
+                self._shards.append((threading.current_thread(), series))
+            self._local.series = series
+            return series
+
+    def copies(self) -> List[dict]:
+        with self._lock:
+            if any(not thread.is_alive() for thread, _ in self._shards):
+                self._reap()
+            shards = [self._base] + [series for _, series in self._shards]
+            # Copy under the lock: _reap replaces base values, never mutates them.
+            return [shard.copy() for shard in shards]
+
+    def __len__(self) -> int:
+        return len(self._shards)
+
+    def _reap(self) -> None:
+        live = []
+        base = self._base
+        for thread, series in self._shards:
+            if thread.is_alive():
+                live.append((thread, series))
+                continue
+            # The owner has exited, so nothing writes to `series` any more.
+            for key, value in series.items():
+                current = base.get(key)
+                base[key] = value if current is None else self._merge(current, value)
+        self._shards = live
+
+
+class _CachedExposition:
+    """Per-metric exposition cache.
+
+    Writers set `_dirty`; render() reuses the whole block when nothing
+    changed since the last scrape, and otherwise re-renders only series
+    whose value differs from the cached one.
+    """
+
+    name: str
+    help_text: str
+    metric_type: MetricType
+
+    def _init_cache(self) -> None:
+        self._dirty = True
+        self._block: Optional[str] = None
+        self._series_text: Dict[_LabelValues, Tuple[object, str]] = {}
+
+    def render(self) -> str:
+        if not self._dirty and self._block is not None:
+            return self._block
+        # Clear before reading so a concurrent write re-dirties the cache.
+        self._dirty = False
+        parts = [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} {self.metric_type.value}",
+        ]
+        cache = self._series_text
+        for key, value in self._series_values():
+            cached = cache.get(key)
+            if cached is None or cached[0] != value:
+                cached = (value, self._render_series(key, value))
+                cache[key] = cached
+            parts.append(cached[1])
+        self._block = "\n".join(parts)
+        return self._block
+
+    def emit(self) -> Iterable[str]:
+        return iter(self.render().split("\n"))
+
+    def _series_values(self) -> Iterable[Tuple[_LabelValues, object]]:
+        raise NotImplementedError
+
+    def _render_series(self, key: _LabelValues, value) -> str:
+        raise NotImplementedError
+
+
 # -- Counter ------------------------------------------------------------
 
 
-class Counter:
+class Counter(_CachedExposition):
     """Monotonically-increasing counter."""
 
+    metric_type = MetricType.COUNTER
+
     def __init__(self, name: str, help_text: str, *, label_names: Optional[List[str]] = None):
         self.name = name
         self.help_text = help_text
         self.label_names = list(label_names or [])
-        self._values: Dict[_LabelValues, float] = {}
-        self._lock = threading.Lock()
+        self._shards = _ThreadShards(lambda a, b: a + b)
+        self._init_cache()
 
     def inc(self, amount: float = 1.0, *, labels: Optional[Dict[str, str]] = None) -> None:
         if amount < 0:
             raise ValueError("Counter increment must be non-negative")
-        with self._lock:
-            key = _label_key(labels)
-            self._values[key] = self._values.get(key, 0.0) + amount
+        series = self._shards.mine()
+        key = _label_key(labels)
+        series[key] = series.get(key, 0.0) + amount
+        self._dirty = True
 
     def get(self, labels: Optional[Dict[str, str]] = None) -> float:
-        with self._lock:
-            return self._values.get(_label_key(labels), 0.0)
+        key = _label_key(labels)
+        return sum(shard.get(key, 0.0) for shard in self._shards.copies())
 
-    def emit(self) -> Iterable[str]:
-        yield f"# HELP {self.name} {self.help_text}"
-        yield f"# TYPE {self.name} counter"
-        with self._lock:
-            items = list(self._values.items())
-        for key, value in items:
-            yield f"{self.name}{_format_labels(key)} {value}"
+    def _series_values(self) -> Iterable[Tuple[_LabelValues, float]]:
+        merged: Dict[_LabelValues, float] = {}
+        for shard in self._shards.copies():
+            for key, value in shard.items():
+                merged[key] = merged.get(key, 0.0) + value
+        return merged.items()
+
+    def _render_series(self, key: _LabelValues, value: float) -> str:
+        return f"{self.name}{_format_labels(key)} {value}"
 
 
 # -- Gauge --------------------------------------------------------------
 
 
-class Gauge:
-    """A value that can go up or down."""
+class Gauge(_CachedExposition):
+    """A value that can go up or down.
+
+    set() is last-writer-wins, which per-thread shards can't merge, so
+    gauges keep a single locked map (they are rarely on a hot path).
+    """
+
+    metric_type = MetricType.GAUGE
 
     def __init__(self, name: str, help_text: str, *, label_names: Optional[List[str]] = None):
         self.name = name
@@ -109,15 +250,18 @@ class Gauge:
         self.label_names = list(label_names or [])
         self._values: Dict[_LabelValues, float] = {}
         self._lock = threading.Lock()
+        self._init_cache()
 
     def set(self, value: float, *, labels: Optional[Dict[str, str]] = None) -> None:
         with self._lock:
             self._values[_label_key(labels)] = float(value)
+        self._dirty = True
 
     def inc(self, amount: float = 1.0, *, labels: Optional[Dict[str, str]] = None) -> None:
         with self._lock:
             key = _label_key(labels)
             self._values[key] = self._values.get(key, 0.0) + amount
+        self._dirty = True
 
     def dec(self, amount: float = 1.0, *, labels: Optional[Dict[str, str]] = None) -> None:
         self.inc(-amount, labels=labels)
@@ -126,13 +270,12 @@ class Gauge:
         with self._lock:
             return self._values.get(_label_key(labels), 0.0)
 
-    def emit(self) -> Iterable[str]:
-        yield f"# HELP {self.name} {self.help_text}"
-        yield f"# TYPE {self.name} gauge"
+    def _series_values(self) -> Iterable[Tuple[_LabelValues, float]]:
         with self._lock:
-            items = list(self._values.items())
-        for key, value in items:
-            yield f"{self.name}{_format_labels(key)} {value}"
+            return list(self._values.items())
+
+    def _render_series(self, key: _LabelValues, value: float) -> str:
+        return f"{self.name}{_format_labels(key)} {value}"
 
 
 # -- Histogram ----------------------------------------------------------
@@ -143,15 +286,15 @@ DEFAULT_BUCKETS = (
 )
 
 
-@dataclass
-class _HistogramState:
-    counts: Dict[float, int] = field(default_factory=dict)
-    sum: float = 0.0
-    total: int = 0
+class Histogram(_CachedExposition):
+    """Histogram with explicit upper-bound buckets.
 
+    Each series is a flat list: one non-cumulative count per bucket, an
+    overflow (+Inf) count, then the sum. observe() bisects into it;
+    cumulative counts are produced at read time.
+    """
 
-class Histogram:
-    """Histogram with explicit upper-bound buckets."""
+    metric_type = MetricType.HISTOGRAM
 
     def __init__(
         self,
@@ -165,75 +308,95 @@ class Histogram:
         self.help_text = help_text
         self.label_names = list(label_names or [])
         self.buckets = tuple(sorted(buckets))
-        self._states: Dict[_LabelValues, _HistogramState] = {}
-        self._lock = threading.Lock()
+        self._width = len(self.buckets) + 1
+        self._line_prefixes: Dict[_LabelValues, List[str]] = {}
+        self._shards = _ThreadShards(lambda a, b: [x + y for x, y in zip(a, b)])
+        self._init_cache()
 
     def observe(self, value: float, *, labels: Optional[Dict[str, str]] = None) -> None:
-        with self._lock:
-            key = _label_key(labels)
-            state = self._states.setdefault(key, _HistogramState())
-            state.sum += value
-            state.total += 1
-            for upper in self.buckets:
-                if value <= upper:
-                    state.counts[upper] = state.counts.get(upper, 0) + 1
+        series = self._shards.mine()
+        key = _label_key(labels)
+        state = series.get(key)
+        if state is None:
+            state = series[key] = [0] * self._width + [0.0]
+        state[bisect_left(self.buckets, value)] += 1
+        state[-1] += value
+        self._dirty = True
 
     def snapshot(
         self, *, labels: Optional[Dict[str, str]] = None,
     ) -> Dict[float, int]:
-        with self._lock:
-            state = self._states.get(_label_key(labels))
-            return dict(state.counts) if state else {}
+        """Cumulative count per bucket upper bound."""
+        state = self._merged(_label_key(labels))
+        if state is None:
+            return {}
+        return dict(zip(self.buckets, accumulate(state[:len(self.buckets)])))
 
     def total_observations(self, *, labels: Optional[Dict[str, str]] = None) -> int:
-        with self._lock:
-            state = self._states.get(_label_key(labels))
-            return state.total if state else 0
+        state = self._merged(_label_key(labels))
+        return sum(state[:self._width]) if state else 0
 
     def quantile(self, q: float, *, labels: Optional[Dict[str, str]] = None) -> float:
-        """Approximate quantile from cumulative bucket counts.
-
-        observe() stores counts cumulatively (a value of 0.05 increments
-        every bucket whose upper bound >= 0.05). So the quantile is the
-        first bucket whose count exceeds total * q.
+        """Approximate quantile: the first bucket whose cumulative count
+        reaches total * q.
         """
         if not 0.0 < q < 1.0:
             raise ValueError(f"quantile must be in (0, 1), got {q}")
-        with self._lock:
-            state = self._states.get(_label_key(labels))
-            if state is None or state.total == 0:
-                return 0.0
-            target = state.total * q
-            for upper in self.buckets:
-                if state.counts.get(upper, 0) >= target:
-                    return upper
-            return self.buckets[-1] if self.buckets else 0.0
-
-    def emit(self) -> Iterable[str]:
-        yield f"# HELP {self.name} {self.help_text}"
-        yield f"# TYPE {self.name} histogram"
-        with self._lock:
-            items = list(self._states.items())
-        for key, state in items:
-            # observe() stores cumulative counts (one increment per
-            # bucket whose upper bound covers the value), so emit them
-            # directly without re-cumulating.
-            for upper in self.buckets:
-                count = state.counts.get(upper, 0)
-                label_str = _format_labels(key + (("le", str(upper)),))
-                yield f"{self.name}_bucket{label_str} {count}"
-            inf_label = _format_labels(key + (("le", "+Inf"),))
-            yield f"{self.name}_bucket{inf_label} {state.total}"
-            yield f"{self.name}_sum{_format_labels(key)} {state.sum}"
-            yield f"{self.name}_count{_format_labels(key)} {state.total}"
+        state = self._merged(_label_key(labels))
+        total = sum(state[:self._width]) if state else 0
+        if total == 0:
+            return 0.0
+        target = total * q
+        for upper, count in zip(self.buckets, accumulate(state[:len(self.buckets)])):
+            if count >= target:
+                return upper
+        return self.buckets[-1] if self.buckets else 0.0
+
+    def _merged(self, key: _LabelValues) -> Optional[List[float]]:
+        states = [shard[key] for shard in self._shards.copies() if key in shard]
+        if not states:
+            return None
+        return [sum(column) for column in zip(*states)]
+
+    def _series_values(self) -> Iterable[Tuple[_LabelValues, Tuple[float, ...]]]:
+        merged: Dict[_LabelValues, List[float]] = {}
+        for shard in self._shards.copies():
+            for key, state in shard.items():
+                # Copy: the owning thread keeps mutating `state` in place.
+                state = list(state)
+                total = merged.get(key)
+                merged[key] = state if total is None else [a + b for a, b in zip(total, state)]
+        return ((key, tuple(state)) for key, state in merged.items())
+
+    def _render_series(self, key: _LabelValues, state: Tuple[float, ...]) -> str:
+        prefixes = self._line_prefixes.get(key)
+        if prefixes is None:
+            prefixes = self._line_prefixes[key] = self._series_prefixes(key)
+        total = sum(state[:self._width])
+        values = [*accumulate(state[:len(self.buckets)]), total, state[-1], total]
+        return "\n".join([prefix + str(value) for prefix, value in zip(prefixes, values)])
+
+    def _series_prefixes(self, key: _LabelValues) -> List[str]:
+        """`name_bucket{...,le="x"} ` ... `name_count{...} `, rendered once per series."""
+        labels = _format_labels(key)
+        inner = labels[1:-1] + "," if labels else ""
+        prefixes = [
+            f'{self.name}_bucket{{{inner}le="{upper}"}} '
+            for upper in (*map(str, self.buckets), "+Inf")
+        ]
+        prefixes.append(f"{self.name}_sum{labels} ")
+        prefixes.append(f"{self.name}_count{labels} ")
+        return prefixes
 
 
 # -- Summary -----------------------------------------------------------
 
 
-class Summary:
+class Summary(_CachedExposition):
     """Rolling-window summary with sample-based quantiles."""
 
+    metric_type = MetricType.SUMMARY
+
     def __init__(
         self,
         name: str,
@@ -251,6 +414,7 @@ class Summary:
         self._observations: Dict[_LabelValues, Deque[float]] = {}
         self._totals: Dict[_LabelValues, Tuple[int, float]] = {}  # (count, sum)
         self._lock = threading.Lock()
+        self._init_cache()
 
     def observe(self, value: float, *, labels: Optional[Dict[str, str]] = None) -> None:
         with self._lock:
@@ -259,22 +423,25 @@ class Summary:
             window.append(value)
             count, total = self._totals.get(key, (0, 0.0))
             self._totals[key] = (count + 1, total + value)
+        self._dirty = True
 
-    def emit(self) -> Iterable[str]:
-        yield f"# HELP {self.name} {self.help_text}"
-        yield f"# TYPE {self.name} summary"
+    def _series_values(self) -> Iterable[Tuple[_LabelValues, object]]:
         with self._lock:
-            items = list(self._observations.items())
+            items = [(key, tuple(window)) for key, window in self._observations.items()]
             totals = dict(self._totals)
-        for key, window in items:
-            sorted_window = sorted(window)
-            for q in self.quantiles:
-                quantile_value = _percentile(sorted_window, q * 100.0)
-                label_str = _format_labels(key + (("quantile", str(q)),))
-                yield f"{self.name}{label_str} {quantile_value}"
-            count, total = totals.get(key, (0, 0.0))
-            yield f"{self.name}_sum{_format_labels(key)} {total}"
-            yield f"{self.name}_count{_format_labels(key)} {count}"
+        return [(key, (window, totals.get(key, (0, 0.0)))) for key, window in items]
+
+    def _render_series(self, key: _LabelValues, value) -> str:
+        window, (count, total) = value
+        sorted_window = sorted(window)
+        lines = []
+        for q in self.quantiles:
+            quantile_value = _percentile(sorted_window, q * 100.0)
+            label_str = _format_labels(key + (("quantile", str(q)),))
+            lines.append(f"{self.name}{label_str} {quantile_value}")
+        lines.append(f"{self.name}_sum{_format_labels(key)} {total}")
+        lines.append(f"{self.name}_count{_format_labels(key)} {count}")
+        return "\n".join(lines)
 
 
 def _percentile(sorted_values: List[float], percentile: float) -> float:
@@ -343,11 +510,14 @@ class MetricsRegistry:
         ))
 
     def expose(self) -> str:
-        """Render all metrics in Prometheus exposition format."""
-        lines: List[str] = []
-        for metric in self._metrics.values():
-            lines.extend(metric.emit())
-        return "\n".join(lines) + "\n"
+        """Render all metrics in Prometheus exposition format.
+
+        Unchanged metrics (and unchanged series within a changed metric)
+        come from each metric's render cache.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
 
     def names(self) -> List[str]:
         return sorted(self._metrics.keys())
@@ -420,23 +590,30 @@ class SLOSnapshot:
 
 
 class SLOTracker:
-    """Tracks request outcomes + latencies for one service."""
+    """Tracks request outcomes + latencies for one service over the SLO window.
+
+    Outcomes land in `bucket_seconds`-wide buckets (hourly by default, 720
+    for a 30-day SLO), so recording is O(1) and a snapshot costs one pass
+    over the buckets regardless of traffic. p95 is read from a latency
+    sketch (within 1% relative).
+    """
 
-    def __init__(self, slo: SLO):
+    def __init__(self, slo: SLO, *, bucket_seconds: float = 3600.0):
         self.slo = slo
-        self._total = 0
-        self._errors = 0
-        self._latencies: Deque[float] = deque(maxlen=10000)
-
-    def record(self, *, success: bool, latency_ms: Optional[float] = None) -> None:
-        self._total += 1
-        if not success:
-            self._errors += 1
-        if latency_ms is not None:
-            self._latencies.append(latency_ms)
-
-    def snapshot(self) -> SLOSnapshot:
-        if self._total == 0:
+        self._window = RollingWindow(slo.window_days * 86400, bucket_width=bucket_seconds)
+
+    def record(
+        self,
+        *,
+        success: bool,
+        latency_ms: Optional[float] = None,
+        now: Optional[float] = None,
+    ) -> None:
+        self._window.record(time.time() if now is None else now, latency_ms, error=not success)
+
+    def snapshot(self, *, now: Optional[float] = None) -> SLOSnapshot:
+        stats = self._window.snapshot(time.time() if now is None else now)
+        if stats.count == 0:
             return SLOSnapshot(
                 slo=self.slo, observed_availability=1.0,
                 observed_p95_latency_ms=None,
@@ -444,17 +621,15 @@ class SLOTracker:
                 burn_rate=0.0,
                 breached=False,
             )
-        availability = 1.0 - (self._errors / self._total)
+        availability = 1.0 - stats.error_rate
         budget_total = 1.0 - self.slo.target_availability
-        observed_error_rate = self._errors / self._total
+        observed_error_rate = stats.error_rate
         remaining = (
             ((budget_total - observed_error_rate) / budget_total) * 100.0
             if budget_total > 0 else 100.0
         )
         burn_rate = observed_error_rate / budget_total if budget_total > 0 else 0.0
-        observed_p95 = (
-            _percentile(sorted(self._latencies), 95.0) if self._latencies else None
-        )
+        observed_p95 = stats.percentile(95.0) if stats.samples else None
         breached = availability < self.slo.target_availability or (
             self.slo.target_latency_p95_ms is not None
             and observed_p95 is not None
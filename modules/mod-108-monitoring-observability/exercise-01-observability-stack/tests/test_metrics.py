@@ -1,6 +1,7 @@
 """Tests for the metrics exporter, SLO tracker, and structured logger."""
 
 import json
+import threading
 from typing import List
 
 import pytest
@@ -45,6 +46,45 @@ class TestCounter:
         assert any('foo_total{x="a"} 5' in l for l in lines)
 
 
+class TestConcurrentShards:
+    def _run_threads(self, target, n_threads=8):
+        threads = [threading.Thread(target=target) for _ in range(n_threads)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    def test_counter_sums_thread_shards(self):
+        c = Counter("requests", "h", label_names=["route"])
+        self._run_threads(lambda: [c.inc(labels={"route": "/a"}) for _ in range(1000)])
+        assert c.get(labels={"route": "/a"}) == 8000
+
+    def test_histogram_merges_thread_shards(self):
+        h = Histogram("latency", "h", buckets=(0.1, 1.0))
+        self._run_threads(lambda: [h.observe(v) for v in (0.05, 0.5, 5.0) * 100])
+        assert h.total_observations() == 2400
+        assert h.snapshot() == {0.1: 800, 1.0: 1600}
+        assert 'latency_bucket{le="+Inf"} 2400' in list(h.emit())
+
+    def test_exited_threads_are_folded_into_base(self):
+        c = Counter("requests", "h")
+        h = Histogram("latency", "h", buckets=(0.1, 1.0))
+        for _ in range(50):
+            self._run_threads(lambda: (c.inc(), h.observe(0.5)), n_threads=4)
+        assert c.get() == 200
+        assert h.snapshot() == {0.1: 0, 1.0: 200}
+        assert len(c._shards) == 0 and len(h._shards) == 0
+        h.observe(0.05)
+        assert h.total_observations() == 201
+
+    def test_label_order_does_not_split_series(self):
+        c = Counter("requests", "h", label_names=["a", "b"])
+        c.inc(labels={"a": "1", "b": "2"})
+        c.inc(labels={"b": "2", "a": "1"})
+        assert c.get(labels={"a": "1", "b": "2"}) == 2
+        assert len(list(c.emit())) == 3  # HELP, TYPE, one series
+
+
 class TestGauge:
     def test_set_and_get(self):
         g = Gauge("temp", "temperature")
@@ -170,6 +210,16 @@ class TestSLOTracker:
         snap_clean = tracker.snapshot()
         assert snap_clean.error_budget_remaining_percent == pytest.approx(100.0)
 
+    def test_window_drops_outcomes_older_than_slo_window(self):
+        tracker = SLOTracker(SLO(name="x", target_availability=0.99, window_days=1))
+        for _ in range(100):
+            tracker.record(success=False, latency_ms=500.0, now=0.0)
+        for _ in range(100):
+            tracker.record(success=True, latency_ms=20.0, now=90_000.0)
+        snap = tracker.snapshot(now=90_000.0)
+        assert snap.observed_availability == 1.0
+        assert snap.observed_p95_latency_ms == pytest.approx(20.0, rel=0.01)
+
 
 class TestStructuredLogger:
     def test_log_returns_json_with_fields(self):
@@ -189,6 +239,26 @@ class TestStructuredLogger:
         assert len(logger_.records) == 5
 
 
+class TestExpositionCache:
+    def test_unchanged_metrics_reuse_rendered_text(self):
+        r = MetricsRegistry()
+        c = r.counter("requests_total", "h")
+        c.inc()
+        first = r.expose()
+        assert r.expose() == first
+        assert c.render() is c.render()
+
+    def test_observation_invalidates_cache(self):
+        r = MetricsRegistry()
+        h = r.histogram("latency", "h", buckets=(0.1, 1.0))
+        h.observe(0.05)
+        assert "latency_count 1" in r.expose()
+        h.observe(0.5)
+        text = r.expose()
+        assert "latency_count 2" in text
+        assert 'latency_bucket{le="1.0"} 2' in text
+
+
 class TestExpositionFormat:
     def test_label_escaping(self):
         r = MetricsRegistry()
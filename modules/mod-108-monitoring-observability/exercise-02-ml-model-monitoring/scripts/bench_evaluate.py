@@ -0,0 +1,129 @@
+"""
+Benchmark: ModelMonitor.evaluate() throughput vs window size.
+
+    python scripts/bench_evaluate.py
+    python scripts/bench_evaluate.py --windows 5000 100000 --evaluations 200
+
+For each window size the monitor's collector is filled past capacity
+(so eviction is exercised), then evaluate() is called repeatedly.
+`LegacyCollector` reproduces the previous full-window rescans for
+comparison; it is evaluated fewer times at large windows.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.metrics import (  # noqa: E402
+    ClassificationMetrics,
+    ModelMetricsCollector,
+    Prediction,
+    PredictionDistribution,
+    ScoreDistribution,
+    SegmentFairness,
+)
+from src.model_monitor import ModelMonitor, MonitorConfig  # noqa: E402
+
+
+class LegacyCollector(ModelMetricsCollector):
+    """Previous implementation: every snapshot rescans the prediction deque."""
+
+    def classification_metrics(self) -> ClassificationMetrics:
+        return ClassificationMetrics.from_predictions(self._predictions)
+
+    def score_distribution(self) -> ScoreDistribution:
+        return ScoreDistribution.from_predictions(self._predictions)
+
+    def prediction_distribution(self) -> PredictionDistribution:
+        counts: Dict[int, int] = {}
+        for p in self._predictions:
+            counts[p.prediction] = counts.get(p.prediction, 0) + 1
+        total = sum(counts.values())
+        return PredictionDistribution(
+            counts=counts, total=total,
+            positive_rate=round(counts.get(1, 0) / total, 4) if total else 0.0,
+            drift_from_baseline_percent=None,
+        )
+
+    def segment_fairness(self) -> List[SegmentFairness]:
+        by_segment: Dict[str, List[Prediction]] = {}
+        for p in self._predictions:
+            if p.segment is not None:
+                by_segment.setdefault(p.segment, []).append(p)
+        results = [
+            SegmentFairness(
+                segment=segment,
+                accuracy=ClassificationMetrics.from_predictions(preds).accuracy,
+                positive_rate=round(sum(1 for p in preds if p.prediction == 1) / len(preds), 4),
+                sample_count=len(preds),
+            )
+            for segment, preds in by_segment.items()
+        ]
+        results.sort(key=lambda s: -s.sample_count)
+        return results
+
+
+def make_predictions(n: int, seed: int = 0) -> List[Prediction]:
+    rng = random.Random(seed)
+    segments = ["us", "eu", "apac", "latam"]
+    out = []
+    for _ in range(n):
+        score = rng.random()
+        prediction = int(score > 0.5)
+        out.append(Prediction(
+            model="m", model_version="v1",
+            prediction=prediction, score=score,
+            label=prediction if rng.random() < 0.9 else 1 - prediction,
+            latency_ms=rng.lognormvariate(3.5, 0.4),
+            segment=rng.choice(segments),
+        ))
+    return out
+
+
+def run(name: str, collector_cls, window: int, predictions, evaluations: int) -> float:
+    monitor = ModelMonitor(MonitorConfig(window_size=window))
+    monitor.register_deployment("m", "v1")
+    collector = collector_cls(window_size=window)
+    monitor._collectors[("m", "v1")] = collector
+
+    begin = time.perf_counter()
+    for p in predictions:
+        monitor.record(p)
+    record_us = (time.perf_counter() - begin) / len(predictions) * 1e6
+
+    begin = time.perf_counter()
+    for _ in range(evaluations):
+        report = monitor.evaluate("m")
+    per_eval = (time.perf_counter() - begin) / evaluations
+    print(f"  {name:<12} record {record_us:>5.2f} us/pred   evaluate {per_eval * 1000:>10.3f} ms "
+          f"({1 / per_eval:>9,.0f}/s)   acc={report.classification.accuracy} "
+          f"p50={report.score_distribution.p50}")
+    return per_eval
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--windows", type=int, nargs="+", default=[5_000, 100_000, 1_000_000])
+    parser.add_argument("--evaluations", type=int, default=500)
+    parser.add_argument("--skip-legacy", action="store_true")
+    args = parser.parse_args()
+
+    for window in args.windows:
+        predictions = make_predictions(window + window // 4)
+        print(f"window {window:,} ({len(predictions):,} predictions recorded)")
+        incremental = run("incremental", ModelMetricsCollector, window, predictions, args.evaluations)
+        if not args.skip_legacy:
+            legacy_evals = max(3, min(args.evaluations, 500_000 // window))
+            legacy = run("legacy", LegacyCollector, window, predictions, legacy_evals)
+            print(f"  speedup {legacy / incremental:,.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,10 @@ tracking, and per-segment fairness checks. Complements the more
 general drift detector in mod-106/ex-05 with model-serving-time
 metrics: rolling latency, throughput, prediction-class distribution,
 per-segment accuracy.
+
+The collector keeps running window counters (confusion matrix, class
+counts, score histogram, per-segment counters) that are decremented as
+predictions are evicted, so snapshots do not rescan the window.
 """
 
 from __future__ import annotations
@@ -18,6 +22,8 @@ from datetime import datetime, timedelta, timezone
 from enum import Enum
 from typing import Callable, Deque, Dict, Iterable, List, Optional
 
+from .rolling_window import RollingWindow
+
 
 @dataclass(frozen=True)
 class Prediction:
@@ -50,18 +56,13 @@ class ClassificationMetrics:
 
     @classmethod
     def from_predictions(cls, predictions: Iterable[Prediction]) -> "ClassificationMetrics":
-        tp = fp = tn = fn = 0
+        counts = _Counts()
         for p in predictions:
-            if p.label is None:
-                continue
-            if p.label == 1 and p.prediction == 1:
-                tp += 1
-            elif p.label == 0 and p.prediction == 1:
-                fp += 1
-            elif p.label == 1 and p.prediction == 0:
-                fn += 1
-            else:
-                tn += 1
+            counts.add(p, 1)
+        return cls.from_counts(counts.tp, counts.fp, counts.tn, counts.fn)
+
+    @classmethod
+    def from_counts(cls, tp: int, fp: int, tn: int, fn: int) -> "ClassificationMetrics":
         total = tp + fp + tn + fn
         accuracy = (tp + tn) / total if total else 0.0
         precision = tp / (tp + fp) if (tp + fp) else 0.0
@@ -108,6 +109,22 @@ class ScoreDistribution:
             p99=round(_percentile(sorted_scores, 99), 4),
         )
 
+    @classmethod
+    def from_histogram(cls, histogram: "ScoreHistogram") -> "ScoreDistribution":
+        if histogram.count == 0:
+            return cls(0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+        p10, p50, p90, p99 = histogram.percentiles((10, 50, 90, 99))
+        return cls(
+            mean=round(histogram.mean, 4),
+            std_dev=round(histogram.std_dev, 4),
+            min_score=round(histogram.min, 4),
+            max_score=round(histogram.max, 4),
+            p10=round(p10, 4),
+            p50=round(p50, 4),
+            p90=round(p90, 4),
+            p99=round(p99, 4),
+        )
+
 
 @dataclass
 class LatencySnapshot:
@@ -138,52 +155,194 @@ class SegmentFairness:
     sample_count: int
 
 
+# -- Running window counters -------------------------------------------
+
+
+class _Counts:
+    """Confusion matrix + positive-prediction count over a set of predictions."""
+
+    __slots__ = ("tp", "fp", "tn", "fn", "samples", "positives")
+
+    def __init__(self) -> None:
+        self.tp = self.fp = self.tn = self.fn = 0
+        self.samples = 0
+        self.positives = 0
+
+    def add(self, p: Prediction, sign: int) -> None:
+        """Count (sign=1) or un-count (sign=-1) one prediction."""
+        self.samples += sign
+        if p.prediction == 1:
+            self.positives += sign
+        if p.label is None:
+            return
+        if p.label == 1 and p.prediction == 1:
+            self.tp += sign
+        elif p.label == 0 and p.prediction == 1:
+            self.fp += sign
+        elif p.label == 1 and p.prediction == 0:
+            self.fn += sign
+        else:
+            self.tn += sign
+
+    def classification(self) -> ClassificationMetrics:
+        return ClassificationMetrics.from_counts(self.tp, self.fp, self.tn, self.fn)
+
+
+class ScoreHistogram:
+    """Score counts in fixed-width bins, supporting removal.
+
+    Min, max and percentiles are resolved to the bin (within
+    `resolution / 2` of the exact value); mean and std-dev come from
+    running sums and are exact up to float rounding. Snapshot cost
+    depends on the number of occupied bins, not on the sample count.
+    """
+
+    def __init__(self, resolution: float = 1e-4):
+        self.resolution = resolution
+        self.bins: Dict[int, int] = {}
+        self.count = 0
+        self._sum = 0.0
+        self._sum_sq = 0.0
+
+    def add(self, score: float, sign: int = 1) -> None:
+        index = round(score / self.resolution)
+        remaining = self.bins.get(index, 0) + sign
+        if remaining:
+            self.bins[index] = remaining
+        else:
+            del self.bins[index]
+        self.count += sign
+        self._sum += sign * score
+        self._sum_sq += sign * score * score
+
+    @property
+    def mean(self) -> float:
+        return self._sum / self.count if self.count else 0.0
+
+    @property
+    def std_dev(self) -> float:
+        if self.count < 2:
+            return 0.0
+        mean = self.mean
+        return math.sqrt(max(self._sum_sq / self.count - mean * mean, 0.0))
+
+    @property
+    def min(self) -> float:
+        return min(self.bins) * self.resolution if self.bins else 0.0
+
+    @property
+    def max(self) -> float:
+        return max(self.bins) * self.resolution if self.bins else 0.0
+
+    def percentiles(self, percentiles: Iterable[float]) -> List[float]:
+        """Same interpolation as `_percentile` over the binned values."""
+        percentiles = list(percentiles)
+        if self.count == 0:
+            return [0.0 for _ in percentiles]
+        positions = [(self.count - 1) * (p / 100.0) for p in percentiles]
+        # One walk over the sorted bins resolves every rank we need.
+        wanted = sorted({r for k in positions for r in (math.floor(k), math.ceil(k))})
+        values: Dict[int, float] = {}
+        seen = 0
+        bins = self.bins
+        it = iter(wanted)
+        rank = next(it, None)
+        for index in sorted(bins):
+            seen += bins[index]
+            while rank is not None and seen > rank:
+                values[rank] = index * self.resolution
+                rank = next(it, None)
+            if rank is None:
+                break
+        results = []
+        for k in positions:
+            lower, upper = values[math.floor(k)], values[math.ceil(k)]
+            results.append(lower + (upper - lower) * (k - math.floor(k)))
+        return results
+
+
 # -- Window-based metrics collector ------------------------------------
 
 
 class ModelMetricsCollector:
-    """Streams Predictions into rolling-window metrics + fairness probes."""
+    """Streams Predictions into rolling-window metrics + fairness probes.
+
+    Confusion matrix, class counts, score histogram and per-segment
+    counters are updated on `record` and decremented when a prediction
+    leaves the window, so every snapshot is O(classes + segments) (plus
+    occupied score bins) regardless of `window_size`.
+    """
 
     def __init__(
         self,
         *,
         window_size: int = 5000,
         baseline_positive_rate: Optional[float] = None,
+        score_resolution: float = 1e-4,
     ):
         self.window_size = window_size
         self.baseline_positive_rate = baseline_positive_rate
         self._predictions: Deque[Prediction] = deque(maxlen=window_size)
+        self._counts = _Counts()
+        self._class_counts: Dict[int, int] = {}
+        self._scores = ScoreHistogram(score_resolution)
+        self._segments: Dict[str, _Counts] = {}
+        # Latency is bucketed by prediction sequence number, so the snapshot
+        # covers the last ~window_size predictions (to one bucket's width).
+        self._seq = 0
+        self._latency = RollingWindow(window_size, bucket_width=max(1, window_size // 50))
 
     def record(self, prediction: Prediction) -> None:
+        if len(self._predictions) == self.window_size:
+            self._count(self._predictions[0], -1)
         self._predictions.append(prediction)
+        self._count(prediction, 1)
+        if prediction.latency_ms > 0:
+            self._latency.record(self._seq, prediction.latency_ms)
+        self._seq += 1
+
+    def _count(self, p: Prediction, sign: int) -> None:
+        self._counts.add(p, sign)
+        remaining = self._class_counts.get(p.prediction, 0) + sign
+        if remaining:
+            self._class_counts[p.prediction] = remaining
+        else:
+            del self._class_counts[p.prediction]
+        self._scores.add(p.score, sign)
+        if p.segment is not None:
+            segment = self._segments.get(p.segment)
+            if segment is None:
+                segment = self._segments[p.segment] = _Counts()
+            segment.add(p, sign)
+            if segment.samples == 0:
+                del self._segments[p.segment]
 
     def __len__(self) -> int:
         return len(self._predictions)
 
     def latency_snapshot(self) -> LatencySnapshot:
-        latencies = [p.latency_ms for p in self._predictions if p.latency_ms > 0]
-        if not latencies:
+        """O(buckets) latency summary; percentiles are within 1% (relative)."""
+        stats = self._latency.snapshot(self._seq - 1)
+        if stats.samples == 0:
             return LatencySnapshot(0.0, 0.0, 0.0, 0.0, 0)
-        sorted_l = sorted(latencies)
         return LatencySnapshot(
-            p50_ms=round(_percentile(sorted_l, 50), 2),
-            p95_ms=round(_percentile(sorted_l, 95), 2),
-            p99_ms=round(_percentile(sorted_l, 99), 2),
-            avg_ms=round(statistics.mean(latencies), 2),
-            samples=len(latencies),
+            p50_ms=round(stats.percentile(50), 2),
+            p95_ms=round(stats.percentile(95), 2),
+            p99_ms=round(stats.percentile(99), 2),
+            avg_ms=round(stats.mean, 2),
+            samples=stats.samples,
         )
 
     def classification_metrics(self) -> ClassificationMetrics:
-        return ClassificationMetrics.from_predictions(self._predictions)
+        return self._counts.classification()
 
     def score_distribution(self) -> ScoreDistribution:
-        return ScoreDistribution.from_predictions(self._predictions)
+        """Binned score summary; see `ScoreHistogram` for precision."""
+        return ScoreDistribution.from_histogram(self._scores)
 
     def prediction_distribution(self) -> PredictionDistribution:
-        counts: Dict[int, int] = {}
-        for p in self._predictions:
-            counts[p.prediction] = counts.get(p.prediction, 0) + 1
-        total = sum(counts.values())
+        counts = dict(self._class_counts)
+        total = len(self._predictions)
         positive_rate = counts.get(1, 0) / total if total else 0.0
         drift = None
         if self.baseline_positive_rate is not None and self.baseline_positive_rate > 0:
@@ -193,29 +352,23 @@ class ModelMetricsCollector:
                 2,
             )
         return PredictionDistribution(
-            counts=dict(counts),
+            counts=counts,
             total=total,
             positive_rate=round(positive_rate, 4),
             drift_from_baseline_percent=drift,
         )
 
     def segment_fairness(self) -> List[SegmentFairness]:
-        """Compute accuracy + positive rate per segment."""
-        by_segment: Dict[str, List[Prediction]] = {}
-        for p in self._predictions:
-            if p.segment is None:
-                continue
-            by_segment.setdefault(p.segment, []).append(p)
-        results: List[SegmentFairness] = []
-        for segment, preds in by_segment.items():
-            metrics = ClassificationMetrics.from_predictions(preds)
-            positive_count = sum(1 for p in preds if p.prediction == 1)
-            results.append(SegmentFairness(
+        """Accuracy + positive rate per segment, from the running counters."""
+        results = [
+            SegmentFairness(
                 segment=segment,
-                accuracy=metrics.accuracy,
-                positive_rate=round(positive_count / len(preds), 4) if preds else 0.0,
-                sample_count=len(preds),
-            ))
+                accuracy=counts.classification().accuracy,
+                positive_rate=round(counts.positives / counts.samples, 4),
+                sample_count=counts.samples,
+            )
+            for segment, counts in self._segments.items()
+        ]
         results.sort(key=lambda s: -s.sample_count)
         return results
 
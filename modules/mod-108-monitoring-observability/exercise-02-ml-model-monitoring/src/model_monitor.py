@@ -112,6 +112,7 @@ class MonitorConfig:
     rollback_after_unhealthy_windows: int = 3
     require_min_samples: int = 50
     promotion_min_improvement: float = 0.005
+    window_size: int = 5000  # predictions per collector window
 
 
 # -- Monitor ------------------------------------------------------------
@@ -160,9 +161,14 @@ class ModelMonitor:
 
     def record(self, prediction: Prediction) -> None:
         key = (prediction.model, prediction.model_version)
-        collector = self._collectors.setdefault(key, ModelMetricsCollector())
+        collector = self._collectors.get(key)
+        if collector is None:
+            collector = self._collectors[key] = self._new_collector()
         collector.record(prediction)
 
+    def _new_collector(self) -> ModelMetricsCollector:
+        return ModelMetricsCollector(window_size=self.config.window_size)
+
     # -- evaluation ----------------------------------------------------
 
     def evaluate(
@@ -177,7 +183,7 @@ class ModelMonitor:
         key = (model_id, version)
         collector = self._collectors.get(key)
         if collector is None:
-            collector = ModelMetricsCollector()
+            collector = self._new_collector()
             self._collectors[key] = collector
 
         metrics = collector.classification_metrics()
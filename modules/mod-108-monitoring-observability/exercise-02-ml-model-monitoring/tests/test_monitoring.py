@@ -1,11 +1,14 @@
 """Tests for the ML model monitoring system."""
 
+import random
+
 import pytest
 
 from src.metrics import (
     ClassificationMetrics,
     ModelMetricsCollector,
     Prediction,
+    ScoreDistribution,
     detect_bias,
 )
 from src.model_monitor import (
@@ -58,6 +61,16 @@ class TestModelMetricsCollector:
         assert snap.p95_ms >= snap.p50_ms
         assert snap.p99_ms >= snap.p95_ms
 
+    def test_latency_snapshot_tracks_recent_window(self):
+        c = ModelMetricsCollector(window_size=100)
+        for _ in range(100):
+            c.record(_pred(latency_ms=500.0))
+        for _ in range(100):
+            c.record(_pred(latency_ms=20.0))
+        snap = c.latency_snapshot()
+        assert snap.samples == 100
+        assert snap.p99_ms == pytest.approx(20.0, rel=0.01)
+
     def test_window_caps(self):
         c = ModelMetricsCollector(window_size=10)
         for _ in range(50):
@@ -99,6 +112,43 @@ class TestModelMetricsCollector:
         assert segments["eu"].accuracy == 0.0
 
 
+class TestRunningCounters:
+    def _stream(self, n, seed=0):
+        rng = random.Random(seed)
+        for _ in range(n):
+            yield _pred(
+                prediction=rng.randint(0, 1),
+                label=rng.choice([0, 1, None]),
+                score=round(rng.random(), 4),
+                segment=rng.choice(["us", "eu", "apac", None]),
+            )
+
+    def test_matches_full_recompute_after_eviction(self):
+        c = ModelMetricsCollector(window_size=300)
+        for p in self._stream(1000):
+            c.record(p)
+        window = c.predictions()
+        assert c.classification_metrics() == ClassificationMetrics.from_predictions(window)
+        assert c.score_distribution() == ScoreDistribution.from_predictions(window)
+        dist = c.prediction_distribution()
+        assert dist.total == 300
+        assert dist.counts == {
+            cls: sum(1 for p in window if p.prediction == cls) for cls in (0, 1)
+        }
+        for segment in c.segment_fairness():
+            preds = [p for p in window if p.segment == segment.segment]
+            assert segment.sample_count == len(preds)
+            assert segment.accuracy == ClassificationMetrics.from_predictions(preds).accuracy
+
+    def test_evicted_segment_disappears(self):
+        c = ModelMetricsCollector(window_size=10)
+        for _ in range(10):
+            c.record(_pred(segment="old"))
+        for _ in range(10):
+            c.record(_pred(segment="new"))
+        assert [s.segment for s in c.segment_fairness()] == ["new"]
+
+
 class TestBiasDetection:
     def test_disparate_impact_flagged(self):
         c = ModelMetricsCollector()
@@ -1,6 +1,13 @@
 """LLM API gateway package."""
 
-from .cache import CacheEntry, CacheStats, ResponseCache, cache_key
+from .cache import (
+    CacheEntry,
+    CacheStats,
+    ResponseCache,
+    SharedCacheStore,
+    SQLiteSharedStore,
+    cache_key,
+)
 from .main import (
     APIGateway,
     BackendCaller,
@@ -36,6 +43,8 @@ __all__ = [
     "ResponseCache",
     "RoutingDecision",
     "RoutingError",
+    "SQLiteSharedStore",
+    "SharedCacheStore",
     "TokenUsage",
     "cache_key",
     "estimate_token_count",
@@ -8,17 +8,34 @@ temperature is treated as non-cacheable by default.
 
 Includes hit/miss accounting + a periodic eviction sweep for stale
 entries based on a configurable TTL.
+
+Layout for multi-worker gateways:
+
+* L1 can be split into shards (`num_shards`, default 1), each an LRU with
+  its own lock, so lookups on different keys don't serialise on one global
+  lock. Sharding trades exact LRU for that: `max_entries` is divided between
+  shards and each evicts its own least-recently-used entry when full. Each
+  shard keeps a heap ordered by creation time, so `sweep_expired` only
+  touches expired entries.
+* An optional `SharedCacheStore` (L2) is consulted on an L1 miss, which lets
+  several gateway processes share hits. `SQLiteSharedStore` is the local
+  stand-in; a Redis-backed store implements the same two methods.
+* `get_or_compute` coalesces concurrent identical misses, so N callers
+  waiting on the same prompt trigger one backend call.
 """
 
 from __future__ import annotations
 
 import hashlib
+import heapq
+import json
 import logging
+import sqlite3
 import threading
 from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import Dict, Optional
+from typing import Callable, Dict, List, Optional, Protocol, Tuple
 
 
 logger = logging.getLogger(__name__)
@@ -46,6 +63,14 @@ class CacheStats:
     evictions_capacity: int = 0
     evictions_ttl: int = 0
     inserts: int = 0
+    shared_hits: int = 0
+    coalesced: int = 0
+
+    def merge(self, other: "CacheStats") -> "CacheStats":
+        return CacheStats(**{
+            name: getattr(self, name) + getattr(other, name)
+            for name in self.__dataclass_fields__
+        })
 
     @property
     def total_lookups(self) -> int:
@@ -72,8 +97,101 @@ def cache_key(
     return f"llm:{model}:{digest[:32]}"
 
 
+class SharedCacheStore(Protocol):
+    """Second-tier store shared by gateway workers (Redis, SQLite, ...)."""
+
+    def get(self, key: str) -> Optional[str]: ...
+
+    def set(self, key: str, value: str, *, expires_at: datetime) -> None: ...
+
+
+class SQLiteSharedStore:
+    """Local stand-in for a shared tier: one SQLite file shared by workers on a host."""
+
+    def __init__(self, path: str = ":memory:"):
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,),
+            ).fetchone()
+        if row is None or row[1] <= datetime.now(timezone.utc).timestamp():
+            return None
+        return row[0]
+
+    def set(self, key: str, value: str, *, expires_at: datetime) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at.timestamp()),
+            )
+
+    def sweep_expired(self) -> int:
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM responses WHERE expires_at <= ?",
+                (datetime.now(timezone.utc).timestamp(),),
+            )
+        return cursor.rowcount
+
+
+class _Shard:
+    """One LRU partition: entries, creation-time heap, counters, lock."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self.expiry: List[Tuple[datetime, str]] = []   # (created_at, key) min-heap
+        self.lock = threading.Lock()
+        self.stats = CacheStats()
+
+    def insert(self, entry: CacheEntry, *, promoted: bool = False) -> None:
+        if entry.key in self.entries:
+            self.entries.move_to_end(entry.key)
+        elif len(self.entries) >= self.max_entries:
+            self.entries.popitem(last=False)
+            self.stats.evictions_capacity += 1
+        self.entries[entry.key] = entry
+        heapq.heappush(self.expiry, (entry.created_at, entry.key))
+        # Replaced/evicted keys leave stale heap items; rebuild when they dominate.
+        if len(self.expiry) > 2 * len(self.entries) + 64:
+            self.expiry = [(e.created_at, k) for k, e in self.entries.items()]
+            heapq.heapify(self.expiry)
+        if promoted:
+            self.stats.shared_hits += 1
+        else:
+            self.stats.inserts += 1
+
+    def sweep(self, cutoff: datetime) -> int:
+        removed = 0
+        while self.expiry and self.expiry[0][0] < cutoff:
+            created_at, key = heapq.heappop(self.expiry)
+            entry = self.entries.get(key)
+            if entry is not None and entry.created_at == created_at:
+                del self.entries[key]
+                removed += 1
+        self.stats.evictions_ttl += removed
+        return removed
+
+
+class _Flight:
+    """One in-progress backend call that identical misses wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response: Optional[str] = None
+        self.error: Optional[BaseException] = None
+
+
 class ResponseCache:
-    """Thread-safe LRU response cache with TTL + cacheability rules."""
+    """Thread-safe sharded LRU response cache with TTL, shared tier + coalescing."""
 
     def __init__(
         self,
@@ -81,13 +199,38 @@ class ResponseCache:
         max_entries: int = 1000,
         ttl_seconds: int = 3600,
         max_cacheable_temperature: float = 0.001,
+        num_shards: int = 1,
+        shared_store: Optional[SharedCacheStore] = None,
+        coalesce: bool = False,
     ):
+        """One shard (the default) is an exact global LRU of `max_entries`.
+        With `num_shards > 1` each shard holds `max_entries // num_shards`
+        (+1 for the first `max_entries % num_shards`) and evicts on its own,
+        so the total never exceeds `max_entries` but the entry evicted is the
+        least recently used of its shard, not of the whole cache."""
+        if not 1 <= num_shards <= max_entries:
+            raise ValueError("num_shards must be between 1 and max_entries")
         self.max_entries = max_entries
         self.ttl = timedelta(seconds=ttl_seconds)
         self.max_cacheable_temperature = max_cacheable_temperature
-        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
-        self._lock = threading.RLock()
-        self.stats = CacheStats()
+        per_shard, extra = divmod(max_entries, num_shards)
+        self._shards = [_Shard(per_shard + (i < extra)) for i in range(num_shards)]
+        self.shared_store = shared_store
+        self.coalesce = coalesce
+        self._inflight: Dict[str, _Flight] = {}
+        self._inflight_lock = threading.Lock()
+
+    @property
+    def stats(self) -> CacheStats:
+        total = CacheStats()
+        for shard in self._shards:
+            with shard.lock:
+                total = total.merge(shard.stats)
+        return total
+
+    def _shard(self, key: str) -> _Shard:
+        # Keys end in a hex digest, so its low bits are uniformly distributed.
+        return self._shards[int(key[-8:], 16) % len(self._shards)]
 
     def get(
         self,
@@ -99,30 +242,38 @@ class ResponseCache:
         user_id: Optional[str] = None,
         now: Optional[datetime] = None,
     ) -> Optional[str]:
-        if temperature > self.max_cacheable_temperature:
-            self.stats.misses += 1
-            return None
         now = now or datetime.now(timezone.utc)
         key = cache_key(
             model=model, prompt=prompt, temperature=temperature,
             max_tokens=max_tokens, user_id=user_id,
         )
-        with self._lock:
-            entry = self._entries.get(key)
+        shard = self._shard(key)
+        if temperature > self.max_cacheable_temperature:
+            with shard.lock:
+                shard.stats.misses += 1
+            return None
+        with shard.lock:
+            entry = shard.entries.get(key)
+            if entry is not None:
+                if now - entry.created_at > self.ttl:
+                    # Expired: drop + treat as miss (its heap item is skipped later).
+                    del shard.entries[key]
+                    shard.stats.evictions_ttl += 1
+                else:
+                    shard.entries.move_to_end(key)
+                    entry.last_accessed_at = now
+                    entry.hit_count += 1
+                    shard.stats.hits += 1
+                    return entry.response
+
+        entry = self._get_shared(key, now)
+        with shard.lock:
             if entry is None:
-                self.stats.misses += 1
+                shard.stats.misses += 1
                 return None
-            if now - entry.created_at > self.ttl:
-                # Expired: drop + treat as miss.
-                self._entries.pop(key, None)
-                self.stats.evictions_ttl += 1
-                self.stats.misses += 1
-                return None
-            self._entries.move_to_end(key)
-            entry.last_accessed_at = now
-            entry.hit_count += 1
-            self.stats.hits += 1
-            return entry.response
+            shard.insert(entry, promoted=True)
+            shard.stats.hits += 1
+        return entry.response
 
     def put(
         self,
@@ -148,35 +299,140 @@ class ResponseCache:
             created_at=now, last_accessed_at=now,
             tokens_used=tokens_used,
         )
-        with self._lock:
-            if key in self._entries:
-                self._entries.move_to_end(key)
-                self._entries[key] = entry
-            else:
-                if len(self._entries) >= self.max_entries:
-                    self._entries.popitem(last=False)
-                    self.stats.evictions_capacity += 1
-                self._entries[key] = entry
-            self.stats.inserts += 1
+        shard = self._shard(key)
+        with shard.lock:
+            shard.insert(entry)
+        if self.shared_store is not None:
+            self._put_shared(entry)
         return entry
 
+    def get_or_compute(
+        self,
+        *,
+        model: str,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        compute: Callable[[], Tuple[str, int]],
+        user_id: Optional[str] = None,
+    ) -> Tuple[str, bool]:
+        """Return `(response, from_cache)`, calling `compute() -> (response,
+        tokens_used)` on a miss. With `coalesce=True`, concurrent misses for
+        the same key wait for the first caller's result instead of each
+        calling the backend; a failure is re-raised in every waiter."""
+        request = dict(model=model, prompt=prompt, temperature=temperature,
+                       max_tokens=max_tokens, user_id=user_id)
+        cached = self.get(**request)
+        if cached is not None:
+            return cached, True
+        if not self.coalesce or temperature > self.max_cacheable_temperature:
+            response, tokens_used = compute()
+            self.put(**request, response=response, tokens_used=tokens_used)
+            return response, False
+
+        key = cache_key(**request)
+        with self._inflight_lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            shard = self._shard(key)
+            with shard.lock:
+                shard.stats.coalesced += 1
+            return flight.response, True
+
+        try:
+            # A leader that finished between our get() and taking the flight
+            # has already filled L1; don't call the backend again.
+            cached = self._peek(key)
+            if cached is not None:
+                flight.response = cached
+                return cached, True
+            response, tokens_used = compute()
+            self.put(**request, response=response, tokens_used=tokens_used)
+            flight.response = response
+            return response, False
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+            flight.done.set()
+
     def sweep_expired(self, *, now: Optional[datetime] = None) -> int:
-        """Remove expired entries; returns the count removed."""
+        """Remove expired entries; returns the count removed. Cost is O(expired)."""
         now = now or datetime.now(timezone.utc)
         removed = 0
-        with self._lock:
-            for key in list(self._entries.keys()):
-                entry = self._entries[key]
-                if now - entry.created_at > self.ttl:
-                    self._entries.pop(key)
-                    removed += 1
-                    self.stats.evictions_ttl += 1
+        for shard in self._shards:
+            with shard.lock:
+                removed += shard.sweep(now - self.ttl)
         return removed
 
     def clear(self) -> None:
-        with self._lock:
-            self._entries.clear()
+        for shard in self._shards:
+            with shard.lock:
+                shard.entries.clear()
+                shard.expiry.clear()
 
     def __len__(self) -> int:
-        with self._lock:
-            return len(self._entries)
+        total = 0
+        for shard in self._shards:
+            with shard.lock:
+                total += len(shard.entries)
+        return total
+
+    def _peek(self, key: str) -> Optional[str]:
+        """Unexpired L1 response for `key`, counted as a coalesced hit."""
+        shard = self._shard(key)
+        with shard.lock:
+            entry = shard.entries.get(key)
+            if entry is None or datetime.now(timezone.utc) - entry.created_at > self.ttl:
+                return None
+            shard.entries.move_to_end(key)
+            entry.hit_count += 1
+            shard.stats.coalesced += 1
+            return entry.response
+
+    def _get_shared(self, key: str, now: datetime) -> Optional[CacheEntry]:
+        if self.shared_store is None:
+            return None
+        try:
+            raw = self.shared_store.get(key)
+        except Exception:
+            logger.warning("shared cache read failed for %s", key, exc_info=True)
+            return None
+        if raw is None:
+            return None
+        try:
+            data = json.loads(raw)
+            created_at = datetime.fromisoformat(data["created_at"])
+            if now - created_at > self.ttl:
+                return None
+            entry = CacheEntry(
+                key=key, response=data["response"], model=data["model"],
+                created_at=created_at, last_accessed_at=now,
+                hit_count=1, tokens_used=data["tokens_used"],
+            )
+        except (ValueError, KeyError, TypeError):
+            # Written by an incompatible worker or corrupted: treat as a miss.
+            logger.warning("unreadable shared cache entry for %s", key, exc_info=True)
+            return None
+        return entry
+
+    def _put_shared(self, entry: CacheEntry) -> None:
+        value = json.dumps({
+            "response": entry.response, "model": entry.model,
+            "created_at": entry.created_at.isoformat(),
+            "tokens_used": entry.tokens_used,
+        })
+        try:
+            self.shared_store.set(entry.key, value, expires_at=entry.created_at + self.ttl)
+        except Exception:
+            # The shared tier is an optimisation; never fail a request over it.
+            logger.warning("shared cache write failed for %s", entry.key, exc_info=True)
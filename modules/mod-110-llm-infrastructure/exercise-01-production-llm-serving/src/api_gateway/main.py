@@ -117,45 +117,39 @@ class APIGateway:
         self.usage_by_model: Dict[str, TokenUsage] = {}
 
     def complete(self, request: CompletionRequest) -> CompletionResponse:
-        """End-to-end completion path: cache → route → call → record."""
+        """End-to-end completion path: cache → route → call → record.
+
+        When the cache has `coalesce=True`, concurrent identical misses share
+        one backend call; the waiters are reported as cache hits."""
         self.stats.total_requests += 1
         started = time.perf_counter()
-        cached = self.cache.get(
+        call: Dict[str, object] = {}
+
+        def compute() -> tuple[str, int]:
+            text, call["decision"] = self._call_backend(request)
+            return text, estimate_token_count(request.prompt) + estimate_token_count(text)
+
+        text, cache_hit = self.cache.get_or_compute(
             model=request.model, prompt=request.prompt,
             temperature=request.temperature, max_tokens=request.max_tokens,
-            user_id=request.user_id,
+            user_id=request.user_id, compute=compute,
         )
-        if cached is not None:
+        latency = (time.perf_counter() - started) * 1000.0
+        if cache_hit:
             self.stats.cache_hits += 1
-            latency = (time.perf_counter() - started) * 1000.0
             return CompletionResponse(
                 request_id="cache-hit",
                 model=request.model,
-                text=cached,
+                text=text,
                 prompt_tokens=estimate_token_count(request.prompt),
-                completion_tokens=estimate_token_count(cached),
+                completion_tokens=estimate_token_count(text),
                 backend_id="cache",
                 cache_hit=True,
                 latency_ms=round(latency, 2),
                 timestamp=self.clock(),
             )
-        self.stats.cache_misses += 1
-
-        try:
-            decision = self.router.route(model=request.model, user_id=request.user_id)
-        except RoutingError:
-            self.stats.routing_errors += 1
-            raise
-
-        backend_id = decision.backend.backend_id
-        try:
-            text = self.caller.invoke(decision, request)
-            self.router.report_success(backend_id)
-        except Exception as exc:
-            self.router.report_failure(backend_id)
-            self.stats.backend_errors += 1
-            raise
 
+        decision: RoutingDecision = call["decision"]
         prompt_tokens = estimate_token_count(request.prompt)
         completion_tokens = estimate_token_count(text)
         usage = self.usage_by_model.setdefault(
@@ -165,22 +159,34 @@ class APIGateway:
         usage.completion_tokens += completion_tokens
         usage.requests += 1
 
-        self.cache.put(
-            model=request.model, prompt=request.prompt,
-            temperature=request.temperature, max_tokens=request.max_tokens,
-            response=text, tokens_used=prompt_tokens + completion_tokens,
-            user_id=request.user_id,
-        )
-
-        latency = (time.perf_counter() - started) * 1000.0
         return CompletionResponse(
             request_id=decision.request_id,
             model=request.model,
             text=text,
             prompt_tokens=prompt_tokens,
             completion_tokens=completion_tokens,
-            backend_id=backend_id,
+            backend_id=decision.backend.backend_id,
             cache_hit=False,
             latency_ms=round(latency, 2),
             timestamp=self.clock(),
         )
+
+    def _call_backend(self, request: CompletionRequest) -> tuple[str, RoutingDecision]:
+        """Cache miss path: route, invoke, report health back to the router."""
+        self.stats.cache_misses += 1
+
+        try:
+            decision = self.router.route(model=request.model, user_id=request.user_id)
+        except RoutingError:
+            self.stats.routing_errors += 1
+            raise
+
+        backend_id = decision.backend.backend_id
+        try:
+            text = self.caller.invoke(decision, request)
+            self.router.report_success(backend_id)
+        except Exception:
+            self.router.report_failure(backend_id)
+            self.stats.backend_errors += 1
+            raise
+        return text, decision
@@ -1,5 +1,6 @@
 """Tests for the LLM API gateway (cache + router + orchestrator)."""
 
+import threading
 from datetime import datetime, timedelta, timezone
 
 import pytest
@@ -14,6 +15,7 @@ from src.api_gateway import (
     RateLimitConfig,
     ResponseCache,
     RoutingError,
+    SQLiteSharedStore,
     cache_key,
     estimate_token_count,
 )
@@ -99,6 +101,87 @@ class TestResponseCache:
         cache.get(model="m", prompt="other", temperature=0.0, max_tokens=10)
         assert cache.stats.hit_rate_percent == 50.0
 
+    def test_sweep_only_removes_expired_across_shards(self):
+        cache = ResponseCache(max_entries=4096, ttl_seconds=10, num_shards=8)
+        now = datetime.now(timezone.utc)
+        for i in range(100):
+            age = 60 if i % 4 == 0 else 0
+            cache.put(model="m", prompt=f"p{i}", temperature=0.0, max_tokens=10,
+                      response="r", now=now - timedelta(seconds=age))
+        # Re-put refreshes the entry; its old heap item must not evict it.
+        cache.put(model="m", prompt="p0", temperature=0.0, max_tokens=10, response="r", now=now)
+        assert cache.sweep_expired(now=now) == 24
+        assert len(cache) == 76
+        assert cache.sweep_expired(now=now) == 0
+
+    def test_shared_store_serves_other_workers(self):
+        store = SQLiteSharedStore()
+        worker_a = ResponseCache(shared_store=store)
+        worker_b = ResponseCache(shared_store=store)
+        worker_a.put(model="m", prompt="p", temperature=0.0, max_tokens=10, response="shared")
+        assert worker_b.get(model="m", prompt="p", temperature=0.0, max_tokens=10) == "shared"
+        assert worker_b.stats.shared_hits == 1
+        # Promoted into worker B's L1.
+        assert len(worker_b) == 1
+
+    def test_coalesces_concurrent_identical_misses(self):
+        cache = ResponseCache(coalesce=True)
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            started.set()
+            release.wait(timeout=5)
+            return "answer", 3
+
+        results = []
+
+        def request():
+            results.append(cache.get_or_compute(
+                model="m", prompt="p", temperature=0.0, max_tokens=10, compute=compute,
+            ))
+
+        threads = [threading.Thread(target=request) for _ in range(8)]
+        for t in threads:
+            t.start()
+        assert started.wait(timeout=5)
+        release.set()
+        for t in threads:
+            t.join()
+        assert len(calls) == 1
+        assert sorted(results) == [("answer", False)] + [("answer", True)] * 7
+
+    def test_leader_rechecks_cache_before_computing(self):
+        cache = ResponseCache(coalesce=True)
+        cache.put(model="m", prompt="p", temperature=0.0, max_tokens=10, response="done")
+        # As if the previous leader filled L1 just after this caller's get() missed.
+        cache.get = lambda **request: None
+
+        def compute():
+            raise AssertionError("backend called for a cached response")
+
+        assert cache.get_or_compute(
+            model="m", prompt="p", temperature=0.0, max_tokens=10, compute=compute,
+        ) == ("done", True)
+
+    def test_shards_split_max_entries_exactly(self):
+        cache = ResponseCache(max_entries=10, num_shards=4)
+        for i in range(200):
+            cache.put(model="m", prompt=f"p{i}", temperature=0.0, max_tokens=10, response="r")
+        assert len(cache) <= 10
+        with pytest.raises(ValueError):
+            ResponseCache(max_entries=2, num_shards=4)
+
+    def test_unreadable_shared_entry_is_a_miss(self):
+        store = SQLiteSharedStore()
+        cache = ResponseCache(shared_store=store)
+        key = cache_key(model="m", prompt="p", temperature=0.0, max_tokens=10)
+        store.set(key, "{not json", expires_at=datetime.now(timezone.utc) + timedelta(hours=1))
+        assert cache.get(model="m", prompt="p", temperature=0.0, max_tokens=10) is None
+        assert cache.stats.misses == 1
+
 
 class TestLLMRouter:
     def test_requires_backends(self):
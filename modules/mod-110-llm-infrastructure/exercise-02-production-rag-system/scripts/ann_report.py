@@ -0,0 +1,103 @@
+"""
+IVF recall@k vs latency report.
+
+Ground truth is the exact (brute-force) top-k per query; recall is
+measured by running the existing `benchmark_retrieval` harness over a
+dense-only HybridRetriever backed by the IVF store at each nprobe.
+
+Usage (from the exercise root):
+    python scripts/ann_report.py --chunks 50000 --n-lists 256 --nprobe 1 4 8 16 32
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.ann_index import IVFVectorStore  # noqa: E402
+from src.embeddings import Chunk, HashingEmbedder  # noqa: E402
+from src.matrix_store import MatrixVectorStore  # noqa: E402
+from src.retriever import (  # noqa: E402
+    BenchmarkCase,
+    HybridRetrievalConfig,
+    HybridRetriever,
+    benchmark_retrieval,
+)
+
+
+def _synthetic_texts(n: int, rng: random.Random) -> list:
+    topics = [[f"t{t}w{i}" for i in range(50)] for t in range(64)]
+    shared = [f"common{i}" for i in range(2000)]
+    texts = []
+    for _ in range(n):
+        topic = rng.choice(topics)
+        texts.append(" ".join(rng.choices(topic, k=16) + rng.choices(shared, k=8)))
+    return texts
+
+
+def _latency_ms(store, query_vecs, k, **kwargs) -> tuple:
+    lats = []
+    for q in query_vecs:
+        t0 = time.perf_counter()
+        store.search(q, k=k, **kwargs)
+        lats.append((time.perf_counter() - t0) * 1000)
+    lats.sort()
+    return lats[len(lats) // 2], lats[int(len(lats) * 0.95)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks", type=int, default=20_000)
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--n-lists", type=int, default=128)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    embedder = HashingEmbedder(dimension=args.dim)
+    texts = _synthetic_texts(args.chunks, rng)
+    chunks = [
+        Chunk(chunk_id=f"c{i}", doc_id=f"d{i}", text=t, start_offset=0, end_offset=len(t),
+              embedding=v)
+        for i, (t, v) in enumerate(zip(texts, embedder.embed_batch(texts)))
+    ]
+    queries = _synthetic_texts(args.queries, rng)
+    query_vecs = embedder.embed_batch(queries)
+
+    exact = MatrixVectorStore()
+    exact.upsert(chunks)
+    cases = [
+        BenchmarkCase(query=q, relevant_chunk_ids=[h.chunk.chunk_id for h in exact.search(v, k=args.k)])
+        for q, v in zip(queries, query_vecs)
+    ]
+
+    ivf = IVFVectorStore(n_lists=args.n_lists, min_train_size=0)
+    ivf.upsert(chunks)
+    t0 = time.perf_counter()
+    ivf.train()
+    print(f"chunks={args.chunks} dim={args.dim} n_lists={args.n_lists} "
+          f"train={time.perf_counter() - t0:.2f}s")
+
+    # Dense-only retriever: no BM25 corpus, no rerank, pool == k.
+    config = HybridRetrievalConfig(dense_weight=1.0, keyword_weight=0.0, rerank_weight=0.0,
+                                   candidate_pool_size=args.k, enable_rerank=False)
+    print(f"{'index':<16} {'recall@' + str(args.k):>10} {'p50 ms':>9} {'p95 ms':>9}")
+    p50, p95 = _latency_ms(exact, query_vecs, args.k)
+    print(f"{'brute-force':<16} {1.0:>10.3f} {p50:>9.2f} {p95:>9.2f}")
+    for nprobe in args.nprobe:
+        ivf.nprobe = nprobe
+        report = benchmark_retrieval(HybridRetriever(ivf, embedder, [], config), cases, k=args.k)
+        p50, p95 = _latency_ms(ivf, query_vecs, args.k)
+        print(f"{'ivf nprobe=' + str(nprobe):<16} {report.average_recall_at_k:>10.3f} "
+              f"{p50:>9.2f} {p95:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Vector store throughput: brute-force InMemoryVectorStore vs MatrixVectorStore.
+
+Usage (from the exercise root):
+    python scripts/bench_vector_store.py --chunks 10000 50000 --dim 384
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.embeddings import Chunk  # noqa: E402
+from src.matrix_store import MatrixVectorStore  # noqa: E402
+from src.vector_store import InMemoryVectorStore  # noqa: E402
+
+
+def _random_chunks(n: int, dim: int, rng: random.Random) -> list:
+    return [
+        Chunk(
+            chunk_id=f"c{i}", doc_id=f"d{i // 4}", text="", start_offset=0, end_offset=0,
+            embedding=[rng.gauss(0, 1) for _ in range(dim)],
+            metadata={"team": ("ml", "data", "support")[i % 3]},
+        )
+        for i in range(n)
+    ]
+
+
+def _qps(fn, queries) -> float:
+    t0 = time.perf_counter()
+    fn(queries)
+    return len(queries) / (time.perf_counter() - t0)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks", type=int, nargs="+", default=[10_000, 50_000])
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=64)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--brute-force-max", type=int, default=50_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    queries = [[rng.gauss(0, 1) for _ in range(args.dim)] for _ in range(args.queries)]
+    ml = {"team": "ml"}
+    print(f"{'chunks':>9} {'store':<22} {'qps':>10} {'qps (where)':>12}")
+    for n in args.chunks:
+        chunks = _random_chunks(n, args.dim, rng)
+        matrix = MatrixVectorStore()
+        matrix.upsert(chunks)
+        # (name, run(queries, where), queries): the brute-force store gets fewer queries.
+        runs = [
+            ("matrix", lambda qs, w: [matrix.search(q, k=args.k, where=w) for q in qs], queries),
+            ("matrix (batched)", lambda qs, w: matrix.search_batch(qs, k=args.k, where=w), queries),
+        ]
+        if n <= args.brute_force_max:
+            brute = InMemoryVectorStore()
+            brute.upsert(chunks)
+            runs.insert(0, ("in-memory (brute)",
+                            lambda qs, w: [brute.search(q, k=args.k, where=w) for q in qs],
+                            queries[:4]))
+        for name, run, qs in runs:
+            plain = _qps(lambda batch: run(batch, None), qs)
+            filtered = _qps(lambda batch: run(batch, ml), qs)
+            print(f"{n:>9} {name:<22} {plain:>10.1f} {filtered:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+"""
+IVF Approximate-Nearest-Neighbour Vector Store
+
+Inverted-file (IVF) index on top of MatrixVectorStore: a spherical
+k-means coarse quantizer partitions the (pre-normalised) embeddings
+into `n_lists` cells; a query scores only the rows in its `nprobe`
+closest cells. `nprobe` is the recall/latency knob — `nprobe ==
+n_lists` degenerates to exact search.
+
+IVF rather than HNSW because every step (training, assignment,
+probing, scoring) is a dense NumPy operation, and tombstone deletes
+from the base store need no graph repair.
+
+Until `min_train_size` chunks are stored the index answers exactly;
+the quantizer is (re)trained automatically on first search after
+that, and again whenever the store grows `retrain_growth`-fold.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+from dataclasses import asdict
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .embeddings import Chunk
+from .matrix_store import MatrixVectorStore
+from .vector_store import SearchHit
+
+
+logger = logging.getLogger(__name__)
+
+
+class IVFVectorStore(MatrixVectorStore):
+    """VectorStore with IVF approximate search, persistence and tunable nprobe."""
+
+    def __init__(
+        self,
+        *,
+        n_lists: int = 256,
+        nprobe: int = 8,
+        min_train_size: int = 4096,
+        retrain_growth: float = 4.0,
+        kmeans_iterations: int = 10,
+        seed: int = 0,
+        initial_capacity: int = 1024,
+        compact_min_rows: int = 1024,
+    ) -> None:
+        if n_lists < 1 or nprobe < 1:
+            raise ValueError("n_lists and nprobe must be >= 1")
+        self.n_lists = n_lists
+        self.nprobe = nprobe
+        self.min_train_size = min_train_size
+        self.retrain_growth = retrain_growth
+        self.kmeans_iterations = kmeans_iterations
+        self.seed = seed
+        super().__init__(initial_capacity=initial_capacity, compact_min_rows=compact_min_rows)
+
+    # -- training -----------------------------------------------------------
+
+    @property
+    def is_trained(self) -> bool:
+        return self._centroids is not None
+
+    def train(self) -> None:
+        """Fit the coarse quantizer on the live rows and rebuild the inverted lists."""
+        with self._lock:
+            live = np.flatnonzero(self._alive[:self._size])
+            if len(live) == 0:
+                return
+            vectors = self._matrix[live]
+            n_lists = min(self.n_lists, len(live))
+            rng = np.random.default_rng(self.seed)
+            centroids = vectors[rng.choice(len(live), n_lists, replace=False)].copy()
+            for _ in range(self.kmeans_iterations):
+                labels = self._nearest(vectors, centroids, 1)[:, 0]
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, labels, vectors)
+                counts = np.bincount(labels, minlength=n_lists)
+                empty = counts == 0
+                if empty.any():  # reseed empty cells from random points
+                    sums[empty] = vectors[rng.choice(len(live), int(empty.sum()))]
+                centroids = self._normalize(sums)
+            self._centroids = centroids
+            self._assign[:] = -1
+            self._assign[live] = self._nearest(vectors, centroids, 1)[:, 0]
+            self._trained_on = len(live)
+            self._rebuild_lists()
+            logger.info("trained IVF quantizer: %d lists over %d rows", n_lists, len(live))
+
+    # -- VectorStore overrides ----------------------------------------------
+
+    def upsert(self, chunks: List[Chunk]) -> int:
+        with self._lock:
+            upserted = super().upsert(chunks)
+            if self.is_trained and upserted:
+                # unique: a chunk_id repeated in the batch occupies one row.
+                rows = np.unique(np.fromiter(
+                    (self._row_of[c.chunk_id] for c in chunks), dtype=np.int64,
+                ))
+                labels = self._nearest(self._matrix[rows], self._centroids, 1)[:, 0]
+                # A re-upserted row may linger in its old list; queries then filter on _assign.
+                self._stale_lists |= bool(np.any(self._assign[rows] >= 0))
+                self._assign[rows] = labels
+                for label in np.unique(labels):
+                    self._lists[label] = np.concatenate(
+                        [self._lists[label], rows[labels == label]],
+                    )
+            return upserted
+
+    def compact(self) -> None:
+        with self._lock:
+            live = np.flatnonzero(self._alive[:self._size])
+            assign = self._assign[live]
+            super().compact()
+            self._assign = np.full(self._capacity, -1, dtype=np.int32)
+            self._assign[:len(live)] = assign
+            if self.is_trained:
+                self._rebuild_lists()
+
+    def search_batch(
+        self,
+        query_embeddings: Sequence[List[float]],
+        *,
+        k: int = 5,
+        where: Optional[Dict[str, str]] = None,
+        nprobe: Optional[int] = None,
+    ) -> List[List[SearchHit]]:
+        if not query_embeddings:
+            return []
+        with self._lock:
+            live = len(self._row_of)
+            if live >= self.min_train_size and (
+                not self.is_trained or live >= self.retrain_growth * self._trained_on
+            ):
+                self.train()
+            nprobe = min(nprobe or self.nprobe, len(self._lists))
+            if not self.is_trained or nprobe >= len(self._lists):
+                return super().search_batch(query_embeddings, k=k, where=where)
+            mask = self._mask(where)
+            if mask is None or k <= 0:
+                return [[] for _ in query_embeddings]
+            queries = np.asarray(query_embeddings, dtype=np.float32)
+            if queries.ndim != 2 or queries.shape[1] != self._dim:
+                raise ValueError(f"query dimension must be {self._dim}")
+            queries = self._normalize(queries)
+            probes = self._nearest(queries, self._centroids, nprobe)
+            results: List[List[SearchHit]] = []
+            for query, cells in zip(queries, probes):
+                rows = np.concatenate([self._lists[c] for c in cells])
+                if self._stale_lists:
+                    rows = np.unique(rows[np.isin(self._assign[rows], cells)])
+                rows = rows[mask[rows]]
+                if len(rows) == 0:
+                    results.append([])
+                    continue
+                scores = self._matrix[rows] @ query
+                top = min(k, len(rows))
+                best = np.argpartition(-scores, top - 1)[:top]
+                best = best[np.argsort(-scores[best], kind="stable")]
+                results.append([
+                    SearchHit(chunk=self._chunks[rows[i]], score=float(scores[i]))
+                    for i in best
+                ])
+            return results
+
+    def search(
+        self,
+        query_embedding: List[float],
+        *,
+        k: int = 5,
+        where: Optional[Dict[str, str]] = None,
+        nprobe: Optional[int] = None,
+    ) -> List[SearchHit]:
+        return self.search_batch([query_embedding], k=k, where=where, nprobe=nprobe)[0]
+
+    # -- persistence --------------------------------------------------------
+
+    def save(self, path: str) -> None:
+        """Write the index to `path/` (arrays as .npz, chunks as JSONL).
+
+        Each save goes to a fresh version directory under `path/`; the
+        `CURRENT` file naming it is replaced last, so a crash leaves
+        `load` reading either the previous index or the new one.
+        """
+        with self._lock:
+            os.makedirs(path, exist_ok=True)
+            config = {
+                "n_lists": self.n_lists, "nprobe": self.nprobe,
+                "min_train_size": self.min_train_size,
+                "retrain_growth": self.retrain_growth,
+                "kmeans_iterations": self.kmeans_iterations, "seed": self.seed,
+                "compact_min_rows": self._compact_min_rows,
+                "trained_on": self._trained_on,
+            }
+            arrays = {
+                "matrix": self._matrix[:self._size] if self._matrix is not None
+                else np.zeros((0, 0), dtype=np.float32),
+                "alive": self._alive[:self._size],
+                "assign": self._assign[:self._size],
+            }
+            if self.is_trained:
+                arrays["centroids"] = self._centroids
+            version = tempfile.mkdtemp(prefix="v-", dir=path)
+            np.savez(os.path.join(version, "index.npz"), **arrays)
+            with open(os.path.join(version, "chunks.jsonl"), "w") as f:
+                for chunk in self._chunks:
+                    f.write(json.dumps(asdict(chunk) if chunk is not None else None) + "\n")
+            with open(os.path.join(version, "config.json"), "w") as f:
+                json.dump(config, f)
+            pointer = os.path.join(path, "CURRENT.tmp")
+            with open(pointer, "w") as f:
+                f.write(os.path.basename(version))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(pointer, os.path.join(path, "CURRENT"))
+            # Older versions (and any left by an interrupted save) are now unreferenced.
+            for name in os.listdir(path):
+                if name.startswith("v-") and name != os.path.basename(version):
+                    shutil.rmtree(os.path.join(path, name), ignore_errors=True)
+
+    @classmethod
+    def load(cls, path: str) -> "IVFVectorStore":
+        """Load the version named by `path/CURRENT` (written by `save`)."""
+        with open(os.path.join(path, "CURRENT")) as f:
+            path = os.path.join(path, f.read().strip())
+        with open(os.path.join(path, "config.json")) as f:
+            config = json.load(f)
+        trained_on = config.pop("trained_on")
+        with np.load(os.path.join(path, "index.npz")) as npz:
+            data = dict(npz)
+        size = len(data["alive"])
+        store = cls(initial_capacity=max(1, size), **config)
+        with open(os.path.join(path, "chunks.jsonl")) as f:
+            chunks = [json.loads(line) for line in f]
+        with store._lock:
+            if size:
+                store._dim = data["matrix"].shape[1]
+                store._matrix = np.zeros((store._capacity, store._dim), dtype=np.float32)
+                store._matrix[:size] = data["matrix"]
+            store._alive[:size] = data["alive"]
+            store._assign[:size] = data["assign"]
+            store._size = size
+            store._chunks = [Chunk(**c) if c is not None else None for c in chunks]
+            for row, chunk in enumerate(store._chunks):
+                if chunk is None:
+                    continue
+                store._row_of[chunk.chunk_id] = row
+                store._doc_rows.setdefault(chunk.doc_id, set()).add(row)
+                for key, value in chunk.metadata.items():
+                    store._bitmap(key, value)[row] = True
+            if "centroids" in data:
+                store._centroids = data["centroids"]
+                store._trained_on = trained_on
+                store._rebuild_lists()
+        return store
+
+    # -- internals ----------------------------------------------------------
+
+    def _reset(self) -> None:
+        super()._reset()
+        self._assign = np.full(self._capacity, -1, dtype=np.int32)
+        self._centroids: Optional[np.ndarray] = None
+        self._trained_on = 0
+        self._lists: List[np.ndarray] = []
+        self._stale_lists = False
+
+    def _grow(self, capacity: int) -> None:
+        assign = np.full(capacity, -1, dtype=np.int32)
+        assign[:self._capacity] = self._assign
+        self._assign = assign
+        super()._grow(capacity)
+
+    def _rebuild_lists(self) -> None:
+        labels = self._assign[:self._size]
+        rows = np.flatnonzero((labels >= 0) & self._alive[:self._size])
+        order = rows[np.argsort(labels[rows], kind="stable")]
+        bounds = np.searchsorted(labels[order], np.arange(len(self._centroids) + 1))
+        self._lists = [order[bounds[i]:bounds[i + 1]] for i in range(len(self._centroids))]
+        self._stale_lists = False
+
+    @staticmethod
+    def _nearest(vectors: np.ndarray, centroids: np.ndarray, n: int,
+                 block: int = 8192) -> np.ndarray:
+        """Indices of the `n` most similar centroids per vector (blocked to bound memory)."""
+        out = np.empty((len(vectors), n), dtype=np.int64)
+        for start in range(0, len(vectors), block):
+            sims = vectors[start:start + block] @ centroids.T
+            if n == 1:
+                out[start:start + block, 0] = sims.argmax(axis=1)
+            else:
+                part = np.argpartition(-sims, n - 1, axis=1)[:, :n]
+                out[start:start + block] = part
+        return out
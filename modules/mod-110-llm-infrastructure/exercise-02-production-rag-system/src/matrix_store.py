@@ -0,0 +1,234 @@
+"""
+Matrix Vector Store
+
+NumPy-backed VectorStore: embeddings live in one contiguous,
+pre-normalised float32 matrix, so a query is a single matrix-vector
+product followed by an `argpartition` top-k instead of a Python loop
+over every chunk.
+
+Metadata filters (`where`) are answered from per-key value -> row
+bitmaps that are AND-ed together before scoring. Deleted rows are
+tombstoned and reclaimed by `compact()` (run automatically once
+tombstones outnumber live rows).
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .embeddings import Chunk
+from .vector_store import SearchHit
+
+
+logger = logging.getLogger(__name__)
+
+
+class MatrixVectorStore:
+    """Thread-safe vectorised store; drop-in replacement for InMemoryVectorStore."""
+
+    def __init__(self, *, initial_capacity: int = 1024, compact_min_rows: int = 1024) -> None:
+        self._initial_capacity = max(1, initial_capacity)
+        self._compact_min_rows = compact_min_rows
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._capacity = self._initial_capacity
+        self._dim: Optional[int] = None
+        self._matrix: Optional[np.ndarray] = None
+        self._alive = np.zeros(self._capacity, dtype=bool)
+        self._size = 0  # rows handed out, live or tombstoned
+        self._chunks: List[Optional[Chunk]] = []
+        self._row_of: Dict[str, int] = {}
+        self._doc_rows: Dict[str, set] = {}
+        self._bitmaps: Dict[str, Dict[str, np.ndarray]] = {}
+
+    # -- writes -------------------------------------------------------------
+
+    def upsert(self, chunks: List[Chunk]) -> int:
+        with self._lock:
+            for chunk in chunks:
+                if not chunk.embedding:
+                    raise ValueError(
+                        f"Chunk {chunk.chunk_id} has no embedding; embed_chunks "
+                        "must be called before upsert."
+                    )
+            if not chunks:
+                return 0
+            vectors = self._normalize(np.asarray(
+                [c.embedding for c in chunks], dtype=np.float32,
+            ))
+            if self._dim is None:
+                self._dim = vectors.shape[1]
+                self._matrix = np.zeros((self._capacity, self._dim), dtype=np.float32)
+            elif vectors.shape[1] != self._dim:
+                raise ValueError(
+                    f"embedding dimension {vectors.shape[1]} != store dimension {self._dim}"
+                )
+            for chunk, vector in zip(chunks, vectors):
+                row = self._row_of.get(chunk.chunk_id)
+                if row is None:
+                    row = self._append_row()
+                    self._row_of[chunk.chunk_id] = row
+                else:
+                    self._unindex(row)
+                self._matrix[row] = vector
+                self._alive[row] = True
+                self._chunks[row] = chunk
+                self._doc_rows.setdefault(chunk.doc_id, set()).add(row)
+                for key, value in chunk.metadata.items():
+                    self._bitmap(key, value)[row] = True
+            return len(chunks)
+
+    def delete_document(self, doc_id: str) -> int:
+        with self._lock:
+            rows = self._doc_rows.pop(doc_id, set())
+            for row in rows:
+                chunk = self._chunks[row]
+                self._unindex(row, keep_doc=True)
+                self._row_of.pop(chunk.chunk_id, None)
+                self._chunks[row] = None
+                self._alive[row] = False
+            dead = self._size - len(self._row_of)
+            if dead >= self._compact_min_rows and dead > len(self._row_of):
+                self.compact()
+            return len(rows)
+
+    def compact(self) -> None:
+        """Drop tombstoned rows and renumber the survivors."""
+        with self._lock:
+            live = np.flatnonzero(self._alive[:self._size])
+            chunks = [self._chunks[r] for r in live]
+            capacity = max(self._compact_min_rows, 2 * len(live), 1)
+            matrix = None
+            if self._matrix is not None:
+                matrix = np.zeros((capacity, self._dim), dtype=np.float32)
+                matrix[:len(live)] = self._matrix[live]
+            self._matrix = matrix
+            self._capacity = capacity
+            self._alive = np.zeros(capacity, dtype=bool)
+            self._alive[:len(live)] = True
+            self._size = len(live)
+            self._chunks = chunks
+            self._row_of = {c.chunk_id: i for i, c in enumerate(chunks)}
+            self._doc_rows = {}
+            self._bitmaps = {}
+            for row, chunk in enumerate(chunks):
+                self._doc_rows.setdefault(chunk.doc_id, set()).add(row)
+                for key, value in chunk.metadata.items():
+                    self._bitmap(key, value)[row] = True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reset()
+
+    # -- reads --------------------------------------------------------------
+
+    def search(
+        self,
+        query_embedding: List[float],
+        *,
+        k: int = 5,
+        where: Optional[Dict[str, str]] = None,
+    ) -> List[SearchHit]:
+        return self.search_batch([query_embedding], k=k, where=where)[0]
+
+    def search_batch(
+        self,
+        query_embeddings: Sequence[List[float]],
+        *,
+        k: int = 5,
+        where: Optional[Dict[str, str]] = None,
+    ) -> List[List[SearchHit]]:
+        """Score many queries with one matrix-matrix product."""
+        if not query_embeddings:
+            return []
+        with self._lock:
+            mask = self._mask(where)
+            n_candidates = int(mask.sum()) if mask is not None else 0
+            if n_candidates == 0 or k <= 0:
+                return [[] for _ in query_embeddings]
+            queries = np.asarray(query_embeddings, dtype=np.float32)
+            if queries.ndim != 2 or queries.shape[1] != self._dim:
+                raise ValueError(f"query dimension must be {self._dim}")
+            queries = self._normalize(queries)
+            scores = queries @ self._matrix[:self._size].T
+            scores[:, ~mask] = -np.inf
+            top = min(k, n_candidates)
+            idx = np.argpartition(-scores, top - 1, axis=1)[:, :top]
+            results: List[List[SearchHit]] = []
+            for q_scores, q_idx in zip(scores, idx):
+                q_idx = q_idx[np.argsort(-q_scores[q_idx], kind="stable")][:top]
+                results.append([
+                    SearchHit(chunk=self._chunks[r], score=float(q_scores[r]))
+                    for r in q_idx
+                ])
+            return results
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._row_of)
+
+    # -- internals ----------------------------------------------------------
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0  # zero vectors stay zero -> cosine 0
+        return vectors / norms
+
+    def _append_row(self) -> int:
+        if self._size == self._capacity:
+            self._grow(self._capacity * 2)
+        row = self._size
+        self._size += 1
+        self._chunks.append(None)
+        return row
+
+    def _grow(self, capacity: int) -> None:
+        matrix = np.zeros((capacity, self._dim), dtype=np.float32)
+        matrix[:self._size] = self._matrix[:self._size]
+        self._matrix = matrix
+        self._alive = np.resize(self._alive, capacity)
+        self._alive[self._size:] = False
+        for values in self._bitmaps.values():
+            for value, bits in values.items():
+                grown = np.zeros(capacity, dtype=bool)
+                grown[:self._capacity] = bits
+                values[value] = grown
+        self._capacity = capacity
+
+    def _bitmap(self, key: str, value: str) -> np.ndarray:
+        values = self._bitmaps.setdefault(key, {})
+        bits = values.get(value)
+        if bits is None:
+            bits = values[value] = np.zeros(self._capacity, dtype=bool)
+        return bits
+
+    def _unindex(self, row: int, *, keep_doc: bool = False) -> None:
+        chunk = self._chunks[row]
+        if chunk is None:
+            return
+        for key, value in chunk.metadata.items():
+            self._bitmaps[key][value][row] = False
+        if not keep_doc:
+            rows = self._doc_rows.get(chunk.doc_id)
+            if rows is not None:
+                rows.discard(row)
+                if not rows:
+                    del self._doc_rows[chunk.doc_id]
+
+    def _mask(self, where: Optional[Dict[str, str]]) -> Optional[np.ndarray]:
+        if self._size == 0:
+            return None
+        mask = self._alive[:self._size].copy()
+        for key, value in (where or {}).items():
+            bits = self._bitmaps.get(key, {}).get(value)
+            if bits is None:
+                return None
+            mask &= bits[:self._size]
+        return mask
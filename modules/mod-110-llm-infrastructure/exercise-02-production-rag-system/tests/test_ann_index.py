@@ -0,0 +1,110 @@
+"""Tests for the IVF approximate-nearest-neighbour vector store."""
+
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.ann_index import IVFVectorStore
+from src.embeddings import Chunk
+from src.matrix_store import MatrixVectorStore
+
+
+def _clustered_chunks(n=2000, dim=32, clusters=16, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    chunks = []
+    for i in range(n):
+        vec = centers[i % clusters] + 0.3 * rng.normal(size=dim)
+        chunks.append(Chunk(
+            chunk_id=f"c{i}", doc_id=f"d{i // 2}", text=f"chunk {i}",
+            start_offset=0, end_offset=1, embedding=vec.tolist(),
+            metadata={"shard": str((i // clusters) % 4)},
+        ))
+    return chunks
+
+
+def _recall(store, exact, queries, k=10, **kwargs):
+    found = 0
+    for q in queries:
+        truth = {h.chunk.chunk_id for h in exact.search(q, k=k)}
+        found += len(truth & {h.chunk.chunk_id for h in store.search(q, k=k, **kwargs)})
+    return found / (k * len(queries))
+
+
+@pytest.fixture
+def stores():
+    chunks = _clustered_chunks()
+    exact = MatrixVectorStore()
+    exact.upsert(chunks)
+    ivf = IVFVectorStore(n_lists=16, nprobe=4, min_train_size=500)
+    ivf.upsert(chunks)
+    queries = [c.embedding for c in chunks[:40]]
+    return ivf, exact, queries
+
+
+class TestIVFVectorStore:
+    def test_exact_before_training(self):
+        ivf = IVFVectorStore(min_train_size=10_000)
+        ivf.upsert(_clustered_chunks(n=100))
+        assert not ivf.is_trained
+        assert ivf.search(_clustered_chunks(n=1)[0].embedding, k=3)
+
+    def test_auto_trains_and_recall_is_high(self, stores):
+        ivf, exact, queries = stores
+        assert _recall(ivf, exact, queries) > 0.9
+        assert ivf.is_trained
+
+    def test_full_probe_is_exact(self, stores):
+        ivf, exact, queries = stores
+        assert _recall(ivf, exact, queries, nprobe=16) == 1.0
+
+    def test_where_filter_and_delete(self, stores):
+        ivf, _, queries = stores
+        hits = ivf.search(queries[0], k=5, where={"shard": "1"})
+        assert hits and all(h.chunk.metadata["shard"] == "1" for h in hits)
+        removed = ivf.delete_document(hits[0].chunk.doc_id)
+        assert removed == 2
+        assert hits[0].chunk.chunk_id not in {
+            h.chunk.chunk_id for h in ivf.search(queries[0], k=50, nprobe=16)
+        }
+
+    def test_upsert_after_training_is_searchable(self, stores):
+        ivf, _, queries = stores
+        ivf.search(queries[0], k=1)
+        extra = Chunk(chunk_id="new", doc_id="new", text="x", start_offset=0,
+                      end_offset=1, embedding=queries[3])
+        ivf.upsert([extra])
+        assert "new" in {h.chunk.chunk_id for h in ivf.search(queries[3], k=3)}
+
+    def test_save_and_load_roundtrip(self, stores, tmp_path):
+        ivf, _, queries = stores
+        ivf.search(queries[0], k=1)
+        ivf.delete_document("d0")
+        ivf.save(str(tmp_path / "idx"))
+        loaded = IVFVectorStore.load(str(tmp_path / "idx"))
+        assert loaded.is_trained
+        assert loaded.count() == ivf.count()
+        for q in queries[:5]:
+            assert [h.chunk.chunk_id for h in loaded.search(q, k=5)] == [
+                h.chunk.chunk_id for h in ivf.search(q, k=5)
+            ]
+
+    def test_save_replaces_previous_version(self, stores, tmp_path):
+        ivf, _, queries = stores
+        path = str(tmp_path / "idx")
+        ivf.save(path)
+        ivf.delete_document("d1")
+        ivf.save(path)
+        assert len([n for n in os.listdir(path) if n.startswith("v-")]) == 1
+        assert IVFVectorStore.load(path).count() == ivf.count()
+
+    def test_duplicate_ids_in_one_batch_give_one_hit(self, stores):
+        ivf, _, queries = stores
+        ivf.search(queries[0], k=1)
+        dup = Chunk(chunk_id="dup", doc_id="dup", text="x", start_offset=0,
+                    end_offset=1, embedding=queries[5])
+        ivf.upsert([dup, dup])
+        ids = [h.chunk.chunk_id for h in ivf.search(queries[5], k=10)]
+        assert ids.count("dup") == 1
@@ -0,0 +1,82 @@
+"""Tests for the NumPy matrix-backed vector store."""
+
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from src.embeddings import ChunkingConfig, Document, HashingEmbedder, chunk_document, embed_chunks
+from src.matrix_store import MatrixVectorStore
+from src.vector_store import InMemoryVectorStore
+
+
+def _chunks(embedder, doc_id, text, meta=None):
+    doc = Document(doc_id=doc_id, text=text, metadata=meta or {})
+    return embed_chunks(chunk_document(doc, ChunkingConfig(chunk_size=200)), embedder)
+
+
+def _corpus(embedder, n=60):
+    rng = random.Random(7)
+    words = "fraud model xgboost billing finance pipeline parquet s3 gpu kafka".split()
+    chunks = []
+    for i in range(n):
+        text = " ".join(rng.choices(words, k=8))
+        chunks += _chunks(embedder, f"d{i}", text, {"team": ("ml", "data")[i % 2]})
+    return chunks
+
+
+class TestMatrixVectorStore:
+    def test_matches_brute_force_ranking(self):
+        embedder = HashingEmbedder(dimension=64)
+        chunks = _corpus(embedder)
+        reference, store = InMemoryVectorStore(), MatrixVectorStore(initial_capacity=4)
+        reference.upsert(chunks)
+        store.upsert(chunks)
+        q = embedder.embed("fraud xgboost model")
+        expected = reference.search(q, k=10)
+        got = store.search(q, k=10)
+        assert [round(h.score, 5) for h in got] == [round(h.score, 5) for h in expected]
+
+    def test_where_filter_uses_bitmaps(self):
+        embedder = HashingEmbedder(dimension=64)
+        store = MatrixVectorStore()
+        store.upsert(_corpus(embedder))
+        hits = store.search(embedder.embed("gpu"), k=50, where={"team": "ml"})
+        assert hits and all(h.chunk.metadata["team"] == "ml" for h in hits)
+        assert store.search(embedder.embed("gpu"), k=5, where={"team": "nope"}) == []
+
+    def test_delete_tombstones_and_compacts(self):
+        embedder = HashingEmbedder(dimension=64)
+        store = MatrixVectorStore(initial_capacity=2, compact_min_rows=4)
+        store.upsert(_corpus(embedder, n=20))
+        for i in range(15):
+            assert store.delete_document(f"d{i}") == 1
+        assert store.count() == 5
+        hits = store.search(embedder.embed("fraud"), k=20)
+        assert {h.chunk.doc_id for h in hits} == {f"d{i}" for i in range(15, 20)}
+
+    def test_upsert_replaces_metadata(self):
+        embedder = HashingEmbedder(dimension=64)
+        store = MatrixVectorStore()
+        store.upsert(_chunks(embedder, "d", "fraud model", {"team": "ml"}))
+        store.upsert(_chunks(embedder, "d", "fraud model", {"team": "data"}))
+        assert store.count() == 1
+        assert store.search(embedder.embed("fraud"), k=5, where={"team": "ml"}) == []
+
+    def test_search_batch(self):
+        embedder = HashingEmbedder(dimension=64)
+        store = MatrixVectorStore()
+        store.upsert(_corpus(embedder))
+        queries = [embedder.embed("fraud"), embedder.embed("kafka parquet")]
+        batched = store.search_batch(queries, k=3)
+        assert [[h.chunk.chunk_id for h in r] for r in batched] == [
+            [h.chunk.chunk_id for h in store.search(q, k=3)] for q in queries
+        ]
+
+    def test_dimension_mismatch_rejected(self):
+        embedder = HashingEmbedder(dimension=64)
+        store = MatrixVectorStore()
+        store.upsert(_chunks(embedder, "d", "fraud model"))
+        with pytest.raises(ValueError):
+            store.upsert(_chunks(HashingEmbedder(dimension=32), "e", "gpu"))
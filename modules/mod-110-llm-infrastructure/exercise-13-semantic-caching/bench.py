@@ -1,53 +1,98 @@
-"""Measure cache hit rate + cost savings on a synthetic workload."""
+"""Measure cache hit rate, false-hit rate, per-tier latency + cost savings on a synthetic workload.
+
+    python bench.py                  # L1 + Qdrant (localhost:6333)
+    python bench.py --local-only     # L1 only, no Qdrant needed
+    python bench.py --capacity 2     # tiny L1 to exercise eviction / L2 fall-through
+
+A second "replica" with an empty L1 replays the workload against the same
+Qdrant collection to show L2 serving what another process cached.
+"""
 from __future__ import annotations
 
+import argparse
 import random
 import time
 
+import numpy as np
+
 from cache import SemanticCache
 
 
-# Synthetic: 100 distinct intents, each phrased ~15 different ways
+# Synthetic: distinct intents, each phrased several different ways
 INTENTS = [
     ["how do I reset my password", "reset password help", "I forgot my password",
       "can you help me change my password", "lost password reset link"],
     ["what's the weather", "tell me the weather", "weather today", "current weather",
       "is it raining"],
+    ["cancel my subscription", "how do I unsubscribe", "stop my monthly plan",
+      "end my membership", "I want to cancel my account plan"],
+    ["where is my order", "track my package", "has my order shipped",
+      "order status", "when will my delivery arrive"],
     # ... (full workload would have hundreds)
 ]
 
 
-def main():
-    c = SemanticCache()
-    hits = 0
-    misses = 0
+def run(cache: SemanticCache, requests, label: str):
     cost_per_miss = 0.002
     cost_per_hit = 0.0001         # embedding lookup is ~20× cheaper
     total_cost = 0.0
+    false_hits = 0
+    latency = {"local": [], "remote": [], "miss": []}
 
-    requests = []
-    for intent_group in INTENTS:
-        for _ in range(20):       # 20 calls per intent
-            requests.append(random.choice(intent_group))
-
-    random.shuffle(requests)
-
-    for q in requests:
-        hit = c.get(q)
+    for intent, q in requests:
+        start = time.perf_counter()
+        hit = cache.get(q)
+        elapsed = (time.perf_counter() - start) * 1000
         if hit:
-            hits += 1
+            latency[hit.tier].append(elapsed)
             total_cost += cost_per_hit
+            false_hits += not hit.response.startswith(f"<intent {intent}>")
         else:
-            misses += 1
+            latency["miss"].append(elapsed)
             total_cost += cost_per_miss
-            response = f"<llm response to: {q}>"
-            c.put(q, response)
+            cache.put(q, f"<intent {intent}> <llm response to: {q}>")
 
-    print(f"Total requests: {hits + misses}")
-    print(f"Hit rate: {hits / (hits + misses) * 100:.1f}%")
+    n = len(requests)
+    hits = n - len(latency["miss"])
+    print(f"== {label}")
+    print(f"Total requests: {n}")
+    print(f"Hit rate: {hits / n * 100:.1f}%  "
+          f"(L1 {len(latency['local']) / n * 100:.1f}%, L2 {len(latency['remote']) / n * 100:.1f}%)")
+    print(f"False-hit rate: {false_hits / hits * 100 if hits else 0:.1f}% of hits")
+    for tier, values in latency.items():
+        if values:
+            print(f"  {tier:<6} lookup p50 {np.percentile(values, 50):7.2f}ms  "
+                  f"p95 {np.percentile(values, 95):7.2f}ms  (n={len(values)})")
     print(f"Total cost: ${total_cost:.2f}")
-    print(f"Vs no cache: ${(hits + misses) * cost_per_miss:.2f}")
-    print(f"Savings: {(1 - total_cost / ((hits + misses) * cost_per_miss)) * 100:.1f}%")
+    print(f"Vs no cache: ${n * cost_per_miss:.2f}")
+    print(f"Savings: {(1 - total_cost / (n * cost_per_miss)) * 100:.1f}%")
+    print(f"Cache stats: {cache.get_stats()}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--local-only", action="store_true")
+    parser.add_argument("--capacity", type=int, default=10_000)
+    parser.add_argument("--eviction", choices=["lru", "lfu"], default="lru")
+    args = parser.parse_args()
+
+    url = None if args.local_only else "http://localhost:6333"
+    collection = f"llm-cache-bench-{int(time.time())}"
+
+    requests = []
+    for intent, intent_group in enumerate(INTENTS):
+        for _ in range(20):       # 20 calls per intent
+            requests.append((intent, random.choice(intent_group)))
+
+    random.shuffle(requests)
+
+    c = SemanticCache(url, collection, local_capacity=args.capacity, eviction=args.eviction)
+    run(c, requests, "replica 1 (cold L1, cold L2)")
+    if url is not None:
+        replica = SemanticCache(url, collection, local_capacity=args.capacity,
+                                eviction=args.eviction)
+        run(replica, requests, "replica 2 (cold L1, warm L2)")
+        c.client.delete_collection(collection)
 
 
 if __name__ == "__main__":
@@ -1,17 +1,36 @@
-"""Embedding-based semantic cache."""
+"""Embedding-based semantic cache.
+
+Two tiers:
+  L1  in-process matrix of recent prompt embeddings (one matmul per lookup,
+      no I/O), bounded by `capacity` with LRU or LFU eviction
+  L2  Qdrant collection shared by every replica; L2 hits are promoted to L1
+
+Entries carry a TTL and live in a namespace (e.g. "tenant/model") so one
+tenant's or model's answers are never served to another.
+"""
 from __future__ import annotations
 
 import hashlib
+import heapq
+import threading
 import time
-from dataclasses import dataclass
+from collections import OrderedDict
+from dataclasses import dataclass, field
 
+import numpy as np
 from qdrant_client import QdrantClient
-from qdrant_client.http.models import Distance, PointStruct, VectorParams
+from qdrant_client.http.models import (
+    Distance, FieldCondition, Filter, FilterSelector, MatchValue, PointStruct, Range,
+    VectorParams,
+)
 from sentence_transformers import SentenceTransformer
 
 
 DIM = 384
+ENCODER_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
 SIMILARITY_THRESHOLD = 0.92      # cosine; tune per workload
+DEFAULT_TTL = 24 * 3600          # see RESULTS.md tuning notes
+NO_EXPIRY = 4102444800.0         # 2100-01-01; Qdrant payloads can't hold inf
 
 
 @dataclass
@@ -19,43 +38,258 @@ class CacheHit:
     response: str
     score: float
     age_seconds: float
+    tier: str = "remote"
+
+
+@dataclass
+class TierStats:
+    hits: int = 0
+    lookups: int = 0
+    seconds: float = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "hits": self.hits, "lookups": self.lookups,
+            "hit_rate": self.hits / self.lookups if self.lookups else 0.0,
+            "avg_ms": self.seconds / self.lookups * 1000 if self.lookups else 0.0,
+        }
+
+
+@dataclass
+class _Entry:
+    namespace: str
+    prompt: str
+    response: str
+    ts: float
+    expires_at: float
+    hits: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class LocalTier:
+    """Bounded in-process vector index. Rows are reused in place on eviction.
+
+    Free rows sit on a stack and the eviction victim comes from an
+    OrderedDict in use order (LRU) or a lazily invalidated heap of
+    (hits, last_used, row) (LFU), so put never scans the capacity.
+    """
+
+    def __init__(self, capacity: int = 10_000, policy: str = "lru", dim: int = DIM):
+        if policy not in ("lru", "lfu"):
+            raise ValueError("policy must be 'lru' or 'lfu'")
+        self.capacity = capacity
+        self.policy = policy
+        self.matrix = np.zeros((capacity, dim), dtype=np.float32)
+        self.entries: list[_Entry | None] = [None] * capacity
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.expires = np.zeros(capacity)
+        self.ns_rows: dict[str, np.ndarray] = {}   # namespace -> row bitmap
+        self.row_of: dict[tuple[str, str], int] = {}
+        self._free_rows = list(range(capacity - 1, -1, -1))   # pop() hands out row 0 first
+        self._lru: OrderedDict[int, None] = OrderedDict()     # live rows, least recent first
+        self._lfu: list[tuple[int, float, int]] = []          # stale tuples skipped on pop
+        self.evictions = 0
+        self.expirations = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self.capacity - len(self._free_rows)
+
+    def search(self, namespace: str, emb: np.ndarray, now: float,
+               threshold: float) -> tuple[_Entry, float] | None:
+        with self._lock:
+            rows = self.ns_rows.get(namespace)
+            if rows is None:
+                return None
+            expired = np.flatnonzero(rows & self.alive & (self.expires <= now))
+            for row in expired:
+                self._free(row)
+            self.expirations += len(expired)
+            candidates = np.flatnonzero(rows & self.alive)
+            if len(candidates) == 0:
+                return None
+            scores = self.matrix[candidates] @ emb
+            best = int(scores.argmax())
+            if scores[best] < threshold:
+                return None
+            entry = self.entries[candidates[best]]
+            entry.hits += 1
+            entry.last_used = time.monotonic()
+            self._touch(int(candidates[best]))
+            return entry, float(scores[best])
+
+    def put(self, namespace: str, prompt: str, emb: np.ndarray, response: str,
+            ts: float, expires_at: float) -> None:
+        with self._lock:
+            row = self.row_of.get((namespace, prompt))
+            if row is not None:
+                self._free(row)
+            row = self._free_rows.pop() if self._free_rows else self._evict()
+            self.matrix[row] = emb
+            self.entries[row] = _Entry(namespace, prompt, response, ts, expires_at)
+            self.alive[row] = True
+            self.expires[row] = expires_at
+            if namespace not in self.ns_rows:
+                self.ns_rows[namespace] = np.zeros(self.capacity, dtype=bool)
+            self.ns_rows[namespace][row] = True
+            self.row_of[(namespace, prompt)] = row
+            self._touch(row)
+
+    def clear(self, namespace: str | None = None) -> None:
+        with self._lock:
+            for row in np.flatnonzero(self.alive):
+                if namespace is None or self.entries[row].namespace == namespace:
+                    self._free(row)
+
+    def _touch(self, row: int) -> None:
+        if self.policy == "lfu":
+            entry = self.entries[row]
+            heapq.heappush(self._lfu, (entry.hits, entry.last_used, row))
+            if len(self._lfu) > 4 * self.capacity:   # drop the stale tuples
+                self._lfu = [(e.hits, e.last_used, r) for r, e in enumerate(self.entries) if e is not None]
+                heapq.heapify(self._lfu)
+        else:
+            self._lru[row] = None
+            self._lru.move_to_end(row)
+
+    def _evict(self) -> int:
+        if self.policy == "lfu":    # fewest hits, oldest use breaks ties
+            while True:
+                hits, last_used, victim = heapq.heappop(self._lfu)
+                entry = self.entries[victim]
+                if entry is not None and entry.hits == hits and entry.last_used == last_used:
+                    break
+        else:
+            victim = next(iter(self._lru))
+        self._free(victim)
+        self._free_rows.pop()
+        self.evictions += 1
+        return victim
+
+    def _free(self, row: int) -> None:
+        entry = self.entries[row]
+        if entry is None:
+            return
+        self.alive[row] = False
+        self.entries[row] = None
+        self.ns_rows[entry.namespace][row] = False
+        self.row_of.pop((entry.namespace, entry.prompt), None)
+        self._lru.pop(row, None)
+        self._free_rows.append(row)
 
 
 class SemanticCache:
-    def __init__(self, qdrant_url: str = "http://localhost:6333",
-                 collection: str = "llm-cache"):
-        self.client = QdrantClient(url=qdrant_url)
-        self.encoder = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
-        try:
-            self.client.get_collection(collection)
-        except Exception:
-            self.client.create_collection(
-                collection,
-                vectors_config=VectorParams(size=DIM, distance=Distance.COSINE),
-            )
+    def __init__(self, qdrant_url: str | None = "http://localhost:6333",
+                 collection: str = "llm-cache", *, local_capacity: int = 10_000,
+                 eviction: str = "lru", ttl: float | None = DEFAULT_TTL,
+                 threshold: float = SIMILARITY_THRESHOLD, registry=None):
+        """`qdrant_url=None` runs with the local tier only.
+
+        Pass exercise-14's `model_registry.registry` as `registry` to share the
+        encoder and Qdrant client with retrieval instead of loading new ones.
+        """
+        self.encoder = (registry.encoder(ENCODER_MODEL) if registry is not None
+                        else SentenceTransformer(ENCODER_MODEL))
+        self.client = None
+        if qdrant_url is not None:
+            self.client = (registry.qdrant(qdrant_url) if registry is not None
+                           else QdrantClient(url=qdrant_url))
+            try:
+                self.client.get_collection(collection)
+            except Exception:
+                self.client.create_collection(
+                    collection,
+                    vectors_config=VectorParams(size=DIM, distance=Distance.COSINE),
+                )
         self.collection = collection
+        self.local = LocalTier(local_capacity, eviction)
+        self.ttl = ttl
+        self.threshold = threshold
+        self.stats = {"local": TierStats(), "remote": TierStats()}
+
+    def _embed(self, prompt: str) -> np.ndarray:
+        emb = np.asarray(self.encoder.encode(prompt), dtype=np.float32)
+        return emb / (np.linalg.norm(emb) or 1.0)
+
+    def get(self, prompt: str, namespace: str = "default") -> CacheHit | None:
+        emb = self._embed(prompt)
+        now = time.time()
 
-    def get(self, prompt: str) -> CacheHit | None:
-        emb = self.encoder.encode(prompt).tolist()
-        results = self.client.search(self.collection, query_vector=emb, limit=1)
-        if not results:
+        start = time.perf_counter()
+        found = self.local.search(namespace, emb, now, self.threshold)
+        self._record("local", start, found is not None)
+        if found is not None:
+            entry, score = found
+            return CacheHit(entry.response, score, now - entry.ts, tier="local")
+
+        if self.client is None:
             return None
-        top = results[0]
-        if top.score < SIMILARITY_THRESHOLD:
+        start = time.perf_counter()
+        results = self.client.search(
+            self.collection, query_vector=emb.tolist(), limit=1, with_vectors=True,
+            query_filter=Filter(must=[
+                FieldCondition(key="namespace", match=MatchValue(value=namespace)),
+                FieldCondition(key="expires_at", range=Range(gt=now)),
+            ]),
+        )
+        hit = bool(results) and results[0].score >= self.threshold
+        self._record("remote", start, hit)
+        if not hit:
             return None
+        top = results[0]
+        self.local.put(namespace, top.payload["prompt"],
+                       np.asarray(top.vector, dtype=np.float32), top.payload["response"],
+                       top.payload["ts"], top.payload["expires_at"])
         return CacheHit(
             response=top.payload["response"],
             score=top.score,
-            age_seconds=time.time() - top.payload["ts"],
+            age_seconds=now - top.payload["ts"],
         )
 
-    def put(self, prompt: str, response: str):
-        emb = self.encoder.encode(prompt).tolist()
-        point_id = int(hashlib.md5(prompt.encode()).hexdigest()[:15], 16)
+    def put(self, prompt: str, response: str, namespace: str = "default",
+            ttl: float | None = None):
+        """`ttl` overrides the cache default; pass 0 to skip caching (e.g. "what's the date")."""
+        ttl = self.ttl if ttl is None else ttl
+        if ttl == 0:
+            return
+        emb = self._embed(prompt)
+        now = time.time()
+        expires_at = now + ttl if ttl else NO_EXPIRY
+        self.local.put(namespace, prompt, emb, response, now, expires_at)
+        if self.client is None:
+            return
+        key = f"{namespace}\x00{prompt}".encode()
+        point_id = int(hashlib.md5(key).hexdigest()[:15], 16)
         self.client.upsert(
             self.collection,
             points=[PointStruct(
-                id=point_id, vector=emb,
-                payload={"prompt": prompt, "response": response, "ts": time.time()},
+                id=point_id, vector=emb.tolist(),
+                payload={"namespace": namespace, "prompt": prompt, "response": response,
+                         "ts": now, "expires_at": expires_at},
             )],
         )
+
+    def purge_expired(self) -> None:
+        """Delete expired points from Qdrant (run periodically; reads already skip them)."""
+        if self.client is not None:
+            self.client.delete(self.collection, points_selector=FilterSelector(
+                filter=Filter(must=[FieldCondition(key="expires_at", range=Range(lte=time.time()))]),
+            ))
+
+    def get_stats(self) -> dict:
+        local, remote = self.stats["local"], self.stats["remote"]
+        total = local.lookups
+        return {
+            "local": local.as_dict(),
+            "remote": remote.as_dict(),
+            "hit_rate": (local.hits + remote.hits) / total if total else 0.0,
+            "local_entries": len(self.local),
+            "evictions": self.local.evictions,
+            "expirations": self.local.expirations,
+        }
+
+    def _record(self, tier: str, start: float, hit: bool) -> None:
+        stats = self.stats[tier]
+        stats.lookups += 1
+        stats.hits += hit
+        stats.seconds += time.perf_counter() - start
@@ -0,0 +1,121 @@
+"""LocalTier: bounded L1 index, eviction order and row reuse."""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+pytest.importorskip("qdrant_client")
+pytest.importorskip("sentence_transformers")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from cache import DIM as ENCODER_DIM, LocalTier, SemanticCache  # noqa: E402
+
+DIM = 8
+FOREVER = float("inf")
+
+
+def _vec(i: int) -> np.ndarray:
+    v = np.zeros(DIM, dtype=np.float32)
+    v[i % DIM] = 1.0
+    return v
+
+
+def _put(tier: LocalTier, i: int, namespace: str = "ns", expires_at: float = FOREVER) -> None:
+    tier.put(namespace, f"p{i}", _vec(i), f"r{i}", 0.0, expires_at)
+
+
+def _find(tier: LocalTier, i: int, namespace: str = "ns", now: float = 0.0) -> str | None:
+    found = tier.search(namespace, _vec(i), now, 0.99)
+    return found[0].response if found else None
+
+
+def test_lru_evicts_least_recently_used():
+    tier = LocalTier(3, "lru", dim=DIM)
+    for i in range(3):
+        _put(tier, i)
+    assert _find(tier, 0) == "r0"
+    _put(tier, 3)
+    assert len(tier) == 3 and tier.evictions == 1
+    assert _find(tier, 1) is None
+    assert [_find(tier, i) for i in (0, 2, 3)] == ["r0", "r2", "r3"]
+
+
+def test_lfu_evicts_fewest_hits():
+    tier = LocalTier(3, "lfu", dim=DIM)
+    for i in range(3):
+        _put(tier, i)
+    for i in (0, 0, 2):
+        _find(tier, i)
+    _put(tier, 3)
+    assert _find(tier, 1) is None
+    _put(tier, 4)     # 3 has no hits yet
+    assert _find(tier, 3) is None
+    assert [_find(tier, i) for i in (0, 2, 4)] == ["r0", "r2", "r4"]
+
+
+def test_lfu_heap_stays_bounded():
+    tier = LocalTier(2, "lfu", dim=DIM)
+    _put(tier, 0)
+    _put(tier, 1)
+    for _ in range(100):
+        _find(tier, 0)
+    assert len(tier._lfu) <= 4 * tier.capacity + 1
+    _put(tier, 2)
+    assert _find(tier, 1) is None and _find(tier, 0) == "r0"
+
+
+def test_replacing_a_prompt_keeps_one_row():
+    tier = LocalTier(2, dim=DIM)
+    _put(tier, 0)
+    tier.put("ns", "p0", _vec(0), "updated", 0.0, FOREVER)
+    assert len(tier) == 1 and tier.evictions == 0
+    assert _find(tier, 0) == "updated"
+
+
+def test_expired_and_cleared_rows_are_reused_without_eviction():
+    tier = LocalTier(4, dim=DIM)
+    for i in range(4):
+        _put(tier, i, expires_at=10.0 if i < 2 else FOREVER)
+    assert _find(tier, 0, now=20.0) is None
+    assert tier.expirations == 2 and len(tier) == 2
+    _put(tier, 4)
+    _put(tier, 5, namespace="other")
+    tier.clear("ns")
+    assert len(tier) == 1
+    for i in range(6, 9):
+        _put(tier, i)
+    assert tier.evictions == 0 and len(tier) == 4
+    assert _find(tier, 5, namespace="other") == "r5"
+
+
+def test_namespaces_are_isolated():
+    tier = LocalTier(4, dim=DIM)
+    _put(tier, 0, namespace="a")
+    assert _find(tier, 0, namespace="b") is None
+    assert _find(tier, 0, namespace="a") == "r0"
+
+
+class _HashEncoder:
+    def encode(self, text: str) -> np.ndarray:
+        return np.random.default_rng(sum(text.encode())).normal(size=ENCODER_DIM)
+
+
+class _Registry:
+    def __init__(self) -> None:
+        self.requests: list[str] = []
+
+    def encoder(self, name: str) -> _HashEncoder:
+        self.requests.append(name)
+        return _HashEncoder()
+
+
+def test_semantic_cache_takes_encoder_from_given_registry():
+    registry = _Registry()
+    cache = SemanticCache(None, registry=registry)
+    assert len(registry.requests) == 1
+    cache.put("what is a pod?", "the smallest deployable unit")
+    hit = cache.get("what is a pod?")
+    assert hit is not None and hit.tier == "local"
+    assert cache.get("what is a pod?", namespace="other") is None
@@ -0,0 +1,84 @@
+"""BM25 query latency: per-query rank_bm25 rebuild vs. persistent mmapped index.
+
+    python bench_bm25.py --sizes 10000 100000 1000000 --queries 50
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from bm25_index import BM25Index
+from retrieve import bm25_search_naive
+
+
+def make_corpus(path: Path, n_docs: int, vocab_size: int = 50_000, seed: int = 0) -> list[str]:
+    """Zipf-ish synthetic corpus; returns the vocabulary for query sampling."""
+    rng = random.Random(seed)
+    vocab = [f"t{i}" for i in range(vocab_size)]
+    weights = [1 / (i + 1) for i in range(vocab_size)]
+    with open(path, "w") as f:
+        for i in range(n_docs):
+            words = rng.choices(vocab, weights=weights, k=rng.randint(20, 120))
+            f.write(f"doc{i}\t{' '.join(words)}\n")
+    return vocab
+
+
+def percentiles(lats: list[float]) -> tuple[float, float]:
+    lats = sorted(lats)
+    return lats[len(lats) // 2] * 1000, lats[int(len(lats) * 0.95)] * 1000
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    p.add_argument("--queries", type=int, default=50)
+    p.add_argument("--naive-max", type=int, default=100_000,
+                   help="skip the rank_bm25 baseline above this corpus size (it re-parses per query)")
+    args = p.parse_args()
+
+    work = Path(tempfile.mkdtemp(prefix="bm25-bench-"))
+    try:
+        print(f"{'docs':>10} {'path':<8} {'build s':>8} {'p50 ms':>9} {'p95 ms':>9}")
+        for n in args.sizes:
+            corpus = work / f"corpus-{n}.tsv"
+            vocab = make_corpus(corpus, n)
+            rng = random.Random(n)
+            queries = [" ".join(rng.choices(vocab[:5000], k=rng.randint(2, 5)))
+                       for _ in range(args.queries)]
+
+            t0 = time.perf_counter()
+            BM25Index.from_tsv(str(corpus)).close()
+            build = time.perf_counter() - t0
+            with BM25Index(f"{corpus}.bm25") as index:        # "process start": open + mmap
+                lats = []
+                for q in queries:
+                    t0 = time.perf_counter()
+                    index.search(q, k=30)
+                    lats.append(time.perf_counter() - t0)
+            p50, p95 = percentiles(lats)
+            print(f"{n:>10} {'index':<8} {build:>8.1f} {p50:>9.2f} {p95:>9.2f}")
+
+            if n > args.naive_max:
+                print(f"{n:>10} {'naive':<8} {'-':>8} {'skipped':>9} {'':>9}")
+                continue
+            try:
+                lats = []
+                for q in queries[:10]:
+                    t0 = time.perf_counter()
+                    bm25_search_naive(q, str(corpus), k=30)
+                    lats.append(time.perf_counter() - t0)
+            except ImportError:
+                print(f"{n:>10} {'naive':<8} {'-':>8} {'no rank_bm25':>9}")
+                continue
+            p50, p95 = percentiles(lats)
+            print(f"{n:>10} {'naive':<8} {'-':>8} {p50:>9.2f} {p95:>9.2f}")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+"""Persistent BM25 inverted index: build once, mmap at startup, update incrementally.
+
+On-disk layout (one directory per index):
+
+    meta.json       N, total doc length, k1/b, term lexicon {term: [offset, df]}
+    postings.bin    uint32 pairs (doc_no, tf), grouped by term, one run per term
+    doclens.bin     uint32 token count per doc_no
+    ids.txt         newline-separated doc ids, in doc_no order
+    docs.bin        concatenated UTF-8 document texts
+    docs.off        uint64 start offset of each text in docs.bin, plus a final end offset
+
+The base segment is immutable and memory-mapped. `add`/`delete` go to an in-memory
+delta (postings dict + tombstones) that queries merge on the fly; `save` compacts
+base + delta into a fresh segment and swaps it in atomically.
+"""
+from __future__ import annotations
+
+import heapq
+import json
+import math
+import mmap
+import os
+import shutil
+from array import array
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from documents import Doc
+
+
+FORMAT_VERSION = 1
+
+
+def tokenize(text: str) -> list[str]:
+    # Same whitespace tokenization as the rank_bm25 path (bm25_search_naive).
+    return text.split()
+
+
+def _map(path: Path, typecode: str):
+    """Read-only mmap cast to a typed memoryview (empty files can't be mmapped)."""
+    if path.stat().st_size == 0:
+        return None, memoryview(array(typecode))
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return mm, memoryview(mm).cast(typecode)
+
+
+class BM25Index:
+    """Okapi BM25 over a memory-mapped base segment plus an in-memory delta."""
+
+    def __init__(self, path: str | os.PathLike, k1: float = 1.5, b: float = 0.75,
+                 epsilon: float = 0.25, *, create: bool = False):
+        self.path = Path(path)
+        self.k1 = k1
+        self.b = b
+        self.epsilon = epsilon
+        self._mmaps: list[mmap.mmap] = []
+        self._reset_base()
+        self._reset_delta()
+        if not create and (self.path / "meta.json").exists():
+            self._open()
+
+    # ---- lifecycle ----------------------------------------------------------
+
+    @classmethod
+    def build(cls, path: str | os.PathLike, docs, k1: float = 1.5, b: float = 0.75,
+              epsilon: float = 0.25) -> BM25Index:
+        """Build a fresh index from an iterable of (doc_id, text) and open it."""
+        idx = cls(path, k1, b, epsilon, create=True)
+        for doc_id, text in docs:
+            idx.add(doc_id, text)
+        idx.save()
+        return idx
+
+    @classmethod
+    def from_tsv(cls, corpus_path: str, index_path: str | os.PathLike | None = None) -> BM25Index:
+        """Open the index next to `corpus_path`, (re)building it if the corpus is newer."""
+        index_path = Path(index_path or f"{corpus_path}.bm25")
+        meta = index_path / "meta.json"
+        if meta.exists() and meta.stat().st_mtime >= os.stat(corpus_path).st_mtime:
+            return cls(index_path)
+        return cls.build(index_path, _read_tsv(corpus_path))
+
+    def close(self) -> None:
+        self._release()
+        self._reset_base()
+
+    def __enter__(self) -> BM25Index:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ---- mutation -----------------------------------------------------------
+
+    def add(self, doc_id: str, text: str) -> None:
+        """Add (or replace) a document. Visible to queries immediately."""
+        if doc_id in self._doc_no:
+            self.delete(doc_id)
+        doc_no = self._next_doc_no
+        self._next_doc_no += 1
+        tf = Counter(tokenize(text))
+        length = sum(tf.values())
+        for term, count in tf.items():
+            self._delta_postings[term].append((doc_no, count))
+            self._df[term] = self._df.get(term, 0) + 1
+        self._delta_docs[doc_no] = (doc_id, text, length)
+        self._doc_no[doc_id] = doc_no
+        self._n_docs += 1
+        self._total_len += length
+        self._avg_idf = None
+
+    def delete(self, doc_id: str) -> bool:
+        """Tombstone a document; its postings are dropped at the next `save`."""
+        doc_no = self._doc_no.pop(doc_id, None)
+        if doc_no is None:
+            return False
+        _, text, length = self._load_doc(doc_no)
+        for term in set(tokenize(text)):
+            self._df[term] -= 1
+        self._deleted.add(doc_no)
+        self._n_docs -= 1
+        self._total_len -= length
+        self._avg_idf = None
+        return True
+
+    def save(self) -> None:
+        """Compact base + delta into a new segment, written to a temp dir then swapped in."""
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+
+        live = sorted(no for no in self._all_doc_nos() if no not in self._deleted)
+        renumber = {old: new for new, old in enumerate(live)}
+
+        ids = []
+        doclens = array("I")
+        offsets = array("Q", [0])
+        with open(tmp / "docs.bin", "wb") as f:
+            for old in live:
+                doc_id, text, length = self._load_doc(old)
+                data = text.encode()
+                f.write(data)
+                ids.append(doc_id)
+                doclens.append(length)
+                offsets.append(offsets[-1] + len(data))
+
+        lexicon: dict[str, list[int]] = {}
+        with open(tmp / "postings.bin", "wb") as f:
+            offset = 0
+            for term in sorted(self._df):
+                run = array("I")
+                for doc_no, tf in self._postings(term):
+                    new = renumber.get(doc_no)
+                    if new is not None:
+                        run.extend((new, tf))
+                if run:
+                    run.tofile(f)
+                    lexicon[term] = [offset, len(run) // 2]
+                    offset += len(run)
+
+        with open(tmp / "doclens.bin", "wb") as f:
+            doclens.tofile(f)
+        with open(tmp / "docs.off", "wb") as f:
+            offsets.tofile(f)
+        (tmp / "ids.txt").write_text("\n".join(ids))
+        with open(tmp / "meta.json", "w") as f:
+            json.dump({"version": FORMAT_VERSION, "n_docs": len(live),
+                       "total_len": sum(doclens), "k1": self.k1, "b": self.b,
+                       "epsilon": self.epsilon, "lexicon": lexicon}, f)
+
+        self._release()
+        old = self.path.with_name(self.path.name + ".old")
+        shutil.rmtree(old, ignore_errors=True)
+        if self.path.exists():
+            os.replace(self.path, old)
+        os.replace(tmp, self.path)
+        shutil.rmtree(old, ignore_errors=True)
+
+        self._reset_base()
+        self._reset_delta()
+        self._open()
+
+    # ---- query --------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._n_docs
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._doc_no
+
+    def idf(self, term: str) -> float:
+        # rank_bm25's Okapi IDF, so scores match bm25_search_naive: a term in more
+        # than half the docs would go negative and is floored at epsilon * the
+        # average IDF of the vocabulary instead.
+        df = self._df.get(term, 0)
+        if not df:
+            return 0.0
+        idf = math.log(self._n_docs - df + 0.5) - math.log(df + 0.5)
+        return idf if idf >= 0 else self.epsilon * self._average_idf()
+
+    def search(self, query: str, k: int = 30) -> list[Doc]:
+        """Top-k by BM25, touching only the postings of the query terms."""
+        if not self._n_docs:
+            return []
+        avgdl = self._total_len / self._n_docs
+        k1, b = self.k1, self.b
+        norm_a, norm_b = k1 * (1 - b), k1 * b / avgdl
+        scores: dict[int, float] = defaultdict(float)
+        for term, qtf in Counter(tokenize(query)).items():
+            if not self._df.get(term):
+                continue
+            w = self.idf(term) * qtf * (k1 + 1)
+            for doc_no, tf in self._postings(term):
+                if doc_no in self._deleted:
+                    continue
+                dl = self._length(doc_no)
+                scores[doc_no] += w * tf / (tf + norm_a + norm_b * dl)
+        top = heapq.nlargest(k, scores.items(), key=lambda kv: kv[1])
+        out = []
+        for doc_no, score in top:
+            doc_id, text, _ = self._load_doc(doc_no)
+            out.append(Doc(id=doc_id, text=text, score=score))
+        return out
+
+    # ---- internals ----------------------------------------------------------
+
+    def _reset_base(self) -> None:
+        self._lexicon: dict[str, list[int]] = {}
+        self._postings_mv = memoryview(array("I"))
+        self._doclens = memoryview(array("I"))
+        self._offsets = memoryview(array("Q"))
+        self._docs_mv = memoryview(b"")
+        self._base_n = 0
+        self._ids: list[str] = []
+        self._df: dict[str, int] = {}
+        self._doc_no: dict[str, int] = {}
+        self._n_docs = 0
+        self._total_len = 0
+        self._avg_idf: float | None = None
+
+    def _reset_delta(self) -> None:
+        self._delta_postings: dict[str, list[tuple[int, int]]] = defaultdict(list)
+        self._delta_docs: dict[int, tuple[str, str, int]] = {}
+        self._deleted: set[int] = set()
+        self._next_doc_no = self._base_n
+
+    def _open(self) -> None:
+        meta = json.loads((self.path / "meta.json").read_text())
+        if meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"unsupported index version {meta.get('version')} at {self.path}")
+        self.k1, self.b = meta["k1"], meta["b"]
+        self.epsilon = meta.get("epsilon", self.epsilon)
+        self._lexicon = meta["lexicon"]
+        self._df = {t: df for t, (_, df) in self._lexicon.items()}
+        self._base_n = self._n_docs = meta["n_docs"]
+        self._total_len = meta["total_len"]
+        self._next_doc_no = self._base_n
+        for attr, name, typecode in (("_postings_mv", "postings.bin", "I"),
+                                     ("_doclens", "doclens.bin", "I"),
+                                     ("_offsets", "docs.off", "Q"),
+                                     ("_docs_mv", "docs.bin", "B")):
+            mm, mv = _map(self.path / name, typecode)
+            if mm is not None:
+                self._mmaps.append(mm)
+            setattr(self, attr, mv)
+        # doc ids stay in RAM: needed to resolve delete/replace and to label hits.
+        self._ids = (self.path / "ids.txt").read_text().split("\n") if self._base_n else []
+        self._doc_no = {doc_id: no for no, doc_id in enumerate(self._ids)}
+
+    def _release(self) -> None:
+        for mv in (self._postings_mv, self._doclens, self._offsets, self._docs_mv):
+            mv.release()
+        for mm in self._mmaps:
+            mm.close()
+        self._mmaps = []
+
+    def _average_idf(self) -> float:
+        # O(vocabulary), so computed only when a common term needs it and
+        # cached until the next add/delete.
+        if self._avg_idf is None:
+            n = self._n_docs
+            idfs = [math.log(n - df + 0.5) - math.log(df + 0.5) for df in self._df.values() if df]
+            self._avg_idf = sum(idfs) / len(idfs) if idfs else 0.0
+        return self._avg_idf
+
+    def _all_doc_nos(self):
+        yield from range(self._base_n)
+        yield from self._delta_docs
+
+    def _postings(self, term: str):
+        entry = self._lexicon.get(term)
+        if entry is not None:
+            start, count = entry
+            run = self._postings_mv[start:start + 2 * count]
+            yield from zip(run[0::2], run[1::2])
+        yield from self._delta_postings.get(term, ())
+
+    def _length(self, doc_no: int) -> int:
+        if doc_no < self._base_n:
+            return self._doclens[doc_no]
+        return self._delta_docs[doc_no][2]
+
+    def _load_doc(self, doc_no: int) -> tuple[str, str, int]:
+        if doc_no >= self._base_n:
+            return self._delta_docs[doc_no]
+        text = bytes(self._docs_mv[self._offsets[doc_no]:self._offsets[doc_no + 1]]).decode()
+        return self._ids[doc_no], text, self._doclens[doc_no]
+
+
+def _read_tsv(corpus_path: str):
+    with open(corpus_path) as f:
+        for line in f:
+            if "\t" in line:
+                doc_id, text = line.strip().split("\t", 1)
+                yield doc_id, text
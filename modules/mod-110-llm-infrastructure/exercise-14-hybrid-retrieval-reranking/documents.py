@@ -0,0 +1,11 @@
+"""Types shared by the retrieval, index and reranking modules."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass
+class Doc:
+    id: str
+    text: str
+    score: float
@@ -4,6 +4,7 @@ from __future__ import annotations
 import json
 import math
 
+from model_registry import registry
 from retrieve import dense_search, hybrid_search
 from rerank import rerank
 
@@ -22,6 +23,7 @@ def ndcg_at_k(retrieved: list, relevant: set[str], k: int = 5) -> float:
 
 
 def main():
+    registry.warmup()               # keep model load out of the first query's latency
     cases = [json.loads(line) for line in open("golden_eval.jsonl")]
     dense_metrics = []
     hybrid_metrics = []
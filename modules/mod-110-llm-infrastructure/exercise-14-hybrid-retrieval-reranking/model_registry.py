@@ -0,0 +1,181 @@
+"""Process-wide registry of encoders, cross-encoders and vector-DB clients.
+
+Every consumer (dense retrieval, reranking, semantic cache) asks the registry
+instead of constructing its own model, so each set of weights is loaded once
+per process, on first use or at start-up via `warmup`.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+try:
+    from prometheus_client import Gauge
+except ImportError:          # metrics are optional; stats() always works
+    Gauge = None
+
+
+_log = logging.getLogger(__name__)
+
+ENCODER = "encoder"
+CROSS_ENCODER = "cross_encoder"
+QDRANT = "qdrant"
+
+DEFAULT_ENCODER = "sentence-transformers/all-MiniLM-L6-v2"
+DEFAULT_CROSS_ENCODER = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+DEFAULT_QDRANT_URL = "http://localhost:6333"
+
+if Gauge is not None:
+    LOAD_SECONDS = Gauge("model_registry_load_seconds", "Time to load a registry entry",
+                         ["kind", "name"])
+    RESIDENT_BYTES = Gauge("model_registry_resident_bytes",
+                           "Approximate resident memory of a registry entry", ["kind", "name"])
+else:
+    LOAD_SECONDS = RESIDENT_BYTES = None
+
+
+def _load_encoder(name: str):
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(name)
+
+
+def _load_cross_encoder(name: str):
+    from sentence_transformers import CrossEncoder
+    return CrossEncoder(name)
+
+
+def _load_qdrant(url: str):
+    from qdrant_client import QdrantClient
+    return QdrantClient(url=url)
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+def _resident_bytes(obj: Any, rss_delta: int) -> int:
+    """Parameter bytes for torch-backed models; RSS growth during load otherwise."""
+    module = getattr(obj, "model", obj)       # CrossEncoder wraps the torch module
+    params = getattr(module, "parameters", None)
+    if callable(params):
+        try:
+            return sum(p.numel() * p.element_size() for p in params())
+        except Exception:
+            pass
+    return max(rss_delta, 0)
+
+
+@dataclass
+class _Entry:
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    value: Any = None
+    loaded: bool = False
+    load_seconds: float = 0.0
+    resident_bytes: int = 0
+    hits: int = 0
+    error: str | None = None     # last failed load, cleared by a successful one
+
+
+class ModelRegistry:
+    """Lazily-initialised, thread-safe cache of heavyweight objects keyed by (kind, name).
+
+    Loads of different keys proceed in parallel; concurrent requests for the same
+    key block on that key's lock and share the single loaded instance.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[str, str], _Entry] = {}
+        self._factories: dict[str, Callable[[str], Any]] = {
+            ENCODER: _load_encoder,
+            CROSS_ENCODER: _load_cross_encoder,
+            QDRANT: _load_qdrant,
+        }
+
+    def register_factory(self, kind: str, factory: Callable[[str], Any]) -> None:
+        """Override how a kind is constructed (e.g. a fake encoder in tests)."""
+        self._factories[kind] = factory
+
+    def get(self, kind: str, name: str) -> Any:
+        with self._lock:
+            entry = self._entries.setdefault((kind, name), _Entry())
+        if not entry.loaded:
+            with entry.lock:
+                if not entry.loaded:
+                    self._load(kind, name, entry)
+        with self._lock:
+            entry.hits += 1
+        return entry.value
+
+    def encoder(self, name: str = DEFAULT_ENCODER):
+        return self.get(ENCODER, name)
+
+    def cross_encoder(self, name: str = DEFAULT_CROSS_ENCODER):
+        return self.get(CROSS_ENCODER, name)
+
+    def qdrant(self, url: str = DEFAULT_QDRANT_URL):
+        return self.get(QDRANT, url)
+
+    def warmup(self, specs: list[tuple[str, str]] | None = None) -> dict[tuple[str, str], Exception]:
+        """Load entries up front, in parallel (call at process start so the first query isn't slow).
+
+        Returns {spec: exception} for the loads that failed; each failure is
+        also logged and shown in `stats()`, and the next `get` retries it.
+        """
+        specs = specs or [(ENCODER, DEFAULT_ENCODER), (CROSS_ENCODER, DEFAULT_CROSS_ENCODER)]
+        failures: dict[tuple[str, str], Exception] = {}
+        with ThreadPoolExecutor(max_workers=max(len(specs), 1)) as pool:
+            futures = [(spec, pool.submit(self.get, *spec)) for spec in specs]
+            for spec, fut in futures:
+                exc = fut.exception()
+                if exc is not None:
+                    _log.error("warmup of %s %s failed", *spec, exc_info=exc)
+                    failures[spec] = exc
+        return failures
+
+    def evict(self, kind: str, name: str) -> bool:
+        with self._lock:
+            return self._entries.pop((kind, name), None) is not None
+
+    def stats(self) -> dict[str, dict]:
+        with self._lock:
+            items = list(self._entries.items())
+        return {
+            f"{kind}:{name}": {"loaded": e.loaded, "load_seconds": e.load_seconds,
+                               "resident_bytes": e.resident_bytes, "hits": e.hits,
+                               "error": e.error}
+            for (kind, name), e in items
+        }
+
+    def _load(self, kind: str, name: str, entry: _Entry) -> None:
+        factory = self._factories.get(kind)
+        if factory is None:
+            raise KeyError(f"no factory registered for kind {kind!r}")
+        rss0 = _rss_bytes()
+        t0 = time.perf_counter()
+        try:
+            entry.value = factory(name)
+        except Exception as exc:
+            entry.error = f"{type(exc).__name__}: {exc}"
+            raise
+        entry.error = None
+        entry.load_seconds = time.perf_counter() - t0
+        entry.resident_bytes = _resident_bytes(entry.value, _rss_bytes() - rss0)
+        entry.loaded = True
+        _log.info("loaded %s %s in %.2fs (~%d MiB)", kind, name, entry.load_seconds,
+                  entry.resident_bytes >> 20)
+        if LOAD_SECONDS is not None:
+            LOAD_SECONDS.labels(kind=kind, name=name).set(entry.load_seconds)
+            RESIDENT_BYTES.labels(kind=kind, name=name).set(entry.resident_bytes)
+
+
+registry = ModelRegistry()
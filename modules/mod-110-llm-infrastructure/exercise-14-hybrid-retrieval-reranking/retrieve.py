@@ -2,14 +2,10 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from dataclasses import dataclass
 
-
-@dataclass
-class Doc:
-    id: str
-    text: str
-    score: float
+from bm25_index import BM25Index
+from documents import Doc
+from model_registry import registry
 
 
 def rrf_fuse(rankings: list[list[Doc]], k: int = 60) -> list[Doc]:
@@ -24,8 +20,19 @@ def rrf_fuse(rankings: list[list[Doc]], k: int = 60) -> list[Doc]:
     return out
 
 
+_bm25_indexes: dict = {}
+
+
 def bm25_search(query: str, corpus_path: str, k: int = 30) -> list[Doc]:
-    """BM25 via rank_bm25 lib."""
+    """BM25 over a persistent inverted index, built once per corpus and mmapped."""
+    index = _bm25_indexes.get(corpus_path)
+    if index is None:
+        index = _bm25_indexes[corpus_path] = BM25Index.from_tsv(corpus_path)
+    return index.search(query, k=k)
+
+
+def bm25_search_naive(query: str, corpus_path: str, k: int = 30) -> list[Doc]:
+    """BM25 via rank_bm25 lib, rebuilt from the TSV on every call (benchmark baseline)."""
     from rank_bm25 import BM25Okapi
     docs = [line.strip().split("\t", 1) for line in open(corpus_path) if "\t" in line]
     tokenized = [d[1].split() for d in docs]
@@ -37,10 +44,8 @@ def bm25_search(query: str, corpus_path: str, k: int = 30) -> list[Doc]:
 
 def dense_search(query: str, qdrant_url: str = "http://localhost:6333",
                   collection: str = "docs", k: int = 30) -> list[Doc]:
-    from qdrant_client import QdrantClient
-    from sentence_transformers import SentenceTransformer
-    enc = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
-    c = QdrantClient(url=qdrant_url)
+    enc = registry.encoder()
+    c = registry.qdrant(qdrant_url)
     emb = enc.encode(query).tolist()
     hits = c.search(collection, query_vector=emb, limit=k)
     return [Doc(id=str(h.id), text=h.payload["text"], score=h.score) for h in hits]
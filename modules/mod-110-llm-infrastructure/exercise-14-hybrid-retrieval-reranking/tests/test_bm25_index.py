@@ -0,0 +1,110 @@
+"""BM25Index: score parity with the rank_bm25 path and on-disk round trips."""
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from bm25_index import BM25Index  # noqa: E402
+
+QUERIES = ["common t1", "t2 t3 t3", "t40 rare", "common", "missing"]
+
+
+def _docs(n=60, seed=0):
+    rng = random.Random(seed)
+    vocab = [f"t{i}" for i in range(50)]
+    docs = []
+    for i in range(n):
+        words = rng.choices(vocab, k=rng.randint(3, 15))
+        if i % 3:
+            words.append("common")      # in 2/3 of the docs: negative Okapi IDF
+        if i == 7:
+            words.append("rare")
+        docs.append((f"d{i}", " ".join(words)))
+    return docs
+
+
+def _write_tsv(path, docs):
+    path.write_text("".join(f"{doc_id}\t{text}\n" for doc_id, text in docs))
+
+
+def _scores(docs, query):
+    """Reference scores from rank_bm25, the in-memory path the index replaces."""
+    rank_bm25 = pytest.importorskip("rank_bm25")
+    bm25 = rank_bm25.BM25Okapi([text.split() for _, text in docs])
+    return dict(zip((doc_id for doc_id, _ in docs), bm25.get_scores(query.split())))
+
+
+def _assert_parity(index, docs):
+    for query in QUERIES:
+        expected = _scores(docs, query)
+        got = {d.id: d.score for d in index.search(query, k=len(docs))}
+        assert got == pytest.approx({k: v for k, v in expected.items() if k in got})
+        assert {k for k, v in expected.items() if v} <= set(got)
+
+
+def test_scores_match_rank_bm25(tmp_path):
+    docs = _docs()
+    with BM25Index.build(tmp_path / "idx", docs) as index:
+        _assert_parity(index, docs)
+
+
+def test_scores_match_after_add_and_delete(tmp_path):
+    docs = _docs()
+    with BM25Index.build(tmp_path / "idx", docs[:40]) as index:
+        for doc_id, text in docs[40:]:
+            index.add(doc_id, text)
+        index.delete("d3")
+        index.add("d5", "rare rare common")
+        live = [(i, t) for i, t in docs if i not in ("d3", "d5")] + [("d5", "rare rare common")]
+        _assert_parity(index, live)
+        index.save()
+        _assert_parity(index, live)
+
+
+def test_naive_path_agrees(tmp_path):
+    pytest.importorskip("rank_bm25")
+    from retrieve import bm25_search, bm25_search_naive
+
+    corpus = tmp_path / "corpus.tsv"
+    _write_tsv(corpus, _docs())
+    for query in QUERIES[:3]:
+        naive = {d.id: d.score for d in bm25_search_naive(query, str(corpus), k=5)}
+        indexed = {d.id: d.score for d in bm25_search(query, str(corpus), k=5)}
+        assert indexed == pytest.approx(naive)
+
+
+def test_round_trip_through_disk(tmp_path):
+    docs = _docs()
+    path = tmp_path / "idx"
+    with BM25Index.build(path, docs) as index:
+        index.add("extra", "rare words here")
+        index.delete("d0")
+        index.save()
+        before = [(d.id, d.text, d.score) for d in index.search("rare t1", k=10)]
+
+    with BM25Index(path) as reopened:
+        assert len(reopened) == len(docs)
+        assert "extra" in reopened and "d0" not in reopened
+        after = [(d.id, d.text, d.score) for d in reopened.search("rare t1", k=10)]
+    assert after == before
+    assert not path.with_name("idx.tmp").exists()
+
+
+def test_from_tsv_rebuilds_only_when_the_corpus_changes(tmp_path):
+    corpus = tmp_path / "corpus.tsv"
+    _write_tsv(corpus, _docs(10))
+    with BM25Index.from_tsv(str(corpus)) as index:
+        assert len(index) == 10
+    stamp = (tmp_path / "corpus.tsv.bm25" / "meta.json").stat().st_mtime_ns
+    with BM25Index.from_tsv(str(corpus)) as index:
+        assert len(index) == 10
+    assert (tmp_path / "corpus.tsv.bm25" / "meta.json").stat().st_mtime_ns == stamp
+
+    _write_tsv(corpus, _docs(12))
+    later = stamp / 1e9 + 5
+    os.utime(corpus, (later, later))
+    with BM25Index.from_tsv(str(corpus)) as index:
+        assert len(index) == 12
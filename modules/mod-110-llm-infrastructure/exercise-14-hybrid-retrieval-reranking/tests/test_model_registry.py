@@ -0,0 +1,94 @@
+"""ModelRegistry: one load per key, accurate hit counts, surfaced warmup failures."""
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from model_registry import ModelRegistry  # noqa: E402
+
+
+def _registry(factory) -> ModelRegistry:
+    reg = ModelRegistry()
+    reg.register_factory("fake", factory)
+    return reg
+
+
+def test_concurrent_gets_share_one_load():
+    loads = []
+
+    def factory(name):
+        loads.append(name)
+        time.sleep(0.05)
+        return object()
+
+    reg = _registry(factory)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(reg.get("fake", "m")))
+               for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert loads == ["m"]
+    assert len({id(r) for r in results}) == 1
+    assert reg.stats()["fake:m"]["hits"] == 8
+
+
+def test_hits_are_counted_exactly_under_contention():
+    reg = _registry(lambda name: name)
+    reg.get("fake", "m")
+
+    def hammer():
+        for _ in range(2000):
+            reg.get("fake", "m")
+
+    threads = [threading.Thread(target=hammer) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert reg.stats()["fake:m"]["hits"] == 1 + 4 * 2000
+
+
+def test_warmup_returns_and_records_failures(caplog):
+    def factory(name):
+        if name == "broken":
+            raise OSError("weights not found")
+        return name
+
+    reg = _registry(factory)
+    failures = reg.warmup([("fake", "ok"), ("fake", "broken")])
+    assert list(failures) == [("fake", "broken")]
+    assert isinstance(failures["fake", "broken"], OSError)
+    assert "warmup of fake broken failed" in caplog.text
+    stats = reg.stats()
+    assert stats["fake:ok"]["loaded"] and stats["fake:ok"]["error"] is None
+    assert not stats["fake:broken"]["loaded"]
+    assert stats["fake:broken"]["error"] == "OSError: weights not found"
+
+
+def test_failed_load_is_retried_on_next_get():
+    attempts = []
+
+    def factory(name):
+        attempts.append(name)
+        if len(attempts) == 1:
+            raise RuntimeError("transient")
+        return name
+
+    reg = _registry(factory)
+    assert reg.warmup([("fake", "m")])
+    assert reg.get("fake", "m") == "m"
+    assert reg.stats()["fake:m"]["error"] is None
+    assert len(attempts) == 2
+
+
+def test_evict_forces_reload():
+    loads = []
+    reg = _registry(lambda name: loads.append(name) or name)
+    reg.get("fake", "m")
+    assert reg.evict("fake", "m")
+    reg.get("fake", "m")
+    assert loads == ["m", "m"]
@@ -2,5 +2,12 @@
 
 from .drift_detector import DriftDetector
 from .metrics_collector import MetricsCollector
+from .sketches import CategoryCounts, FeatureSketches, QuantileSketch
 
-__all__ = ['DriftDetector', 'MetricsCollector']
+__all__ = [
+    'DriftDetector',
+    'MetricsCollector',
+    'FeatureSketches',
+    'QuantileSketch',
+    'CategoryCounts',
+]
@@ -2,18 +2,30 @@
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Optional, Tuple, Union
 from scipy import stats
 from sklearn.metrics import jensen_shannon_distance
 
 from ..common.config import config
 from ..common.logger import get_logger
+from .sketches import (
+    CategoryCounts,
+    FeatureSketches,
+    QuantileSketch,
+    histogram_from_sketch,
+    ks_from_sketches,
+)
 
 logger = get_logger(__name__)
 
 
 class DriftDetector:
-    """Detects data drift and model drift."""
+    """Detects data drift and model drift.
+
+    Reference and current data can be raw DataFrames or ``FeatureSketches``
+    (streaming mode). When either side is sketched, the other is sketched
+    too and scores are computed from the sketches.
+    """
 
     def __init__(self, threshold: float = None):
         """
@@ -25,6 +37,7 @@ class DriftDetector:
         self.threshold = threshold or config.DRIFT_THRESHOLD
         self.reference_data = None
         self.reference_predictions = None
+        self.reference_sketch: Optional[FeatureSketches] = None
 
     def set_reference_data(
         self,
@@ -40,26 +53,60 @@ class DriftDetector:
         """
         self.reference_data = data
         self.reference_predictions = predictions
+        self.reference_sketch = None
         logger.info(f"Set reference data with {len(data)} samples")
 
+    def set_reference_sketch(self, sketch: FeatureSketches):
+        """
+        Set a sketched reference for streaming drift detection.
+
+        Args:
+            sketch: Reference feature (and optionally prediction) sketches
+        """
+        self.reference_sketch = sketch
+        self.reference_data = None
+        self.reference_predictions = None
+        logger.info(
+            f"Set reference sketch with {sketch.num_rows} samples "
+            f"({sketch.memory_bytes() / 1024:.1f} KiB)"
+        )
+
+    def _reference_as_sketch(
+        self,
+        k: int = 200,
+        max_categories: int = 1000
+    ) -> FeatureSketches:
+        """Reference sketches, built from raw reference data on first use."""
+        if self.reference_sketch is None:
+            if self.reference_data is None:
+                raise ValueError("Reference data not set. Call set_reference_data first.")
+            self.reference_sketch = FeatureSketches.from_data(
+                self.reference_data, self.reference_predictions,
+                k=k, max_categories=max_categories
+            )
+        return self.reference_sketch
+
     def detect_feature_drift(
         self,
-        current_data: pd.DataFrame,
+        current_data: Union[pd.DataFrame, FeatureSketches],
         method: str = 'ks'
     ) -> Dict[str, Any]:
         """
         Detect drift in feature distributions.
 
         Args:
-            current_data: Current feature data
+            current_data: Current feature data or sketches of it
             method: Drift detection method ('ks' or 'js')
 
         Returns:
             Dictionary with drift detection results
         """
-        if self.reference_data is None:
+        if self.reference_data is None and self.reference_sketch is None:
             raise ValueError("Reference data not set. Call set_reference_data first.")
 
+        if isinstance(current_data, FeatureSketches) or self.reference_data is None:
+            return self._detect_feature_drift_sketched(current_data, method)
+
         logger.info(f"Detecting feature drift using {method} method")
 
         drift_results = {}
@@ -97,6 +144,85 @@ class DriftDetector:
                     f"Drift detected in feature '{column}': score={drift_score:.4f}"
                 )
 
+        return self._summarize_feature_drift(drift_results, drifted_features)
+
+    def _detect_feature_drift_sketched(
+        self,
+        current_data: Union[pd.DataFrame, FeatureSketches],
+        method: str
+    ) -> Dict[str, Any]:
+        """
+        Feature drift computed from sketches.
+
+        Each score carries an ``error_bound``: for numeric columns the
+        sketched KS statistic is within that distance of the exact one.
+        Categorical count tables are exact (bound 0).
+
+        Args:
+            current_data: Current feature data or sketches of it
+            method: Drift detection method ('ks' or 'js')
+
+        Returns:
+            Dictionary with drift detection results
+        """
+        if method not in ('ks', 'js'):
+            raise ValueError(f"Unknown method: {method}")
+        if isinstance(current_data, FeatureSketches):
+            current = current_data
+        else:
+            current = FeatureSketches.from_data(
+                current_data,
+                k=self.reference_sketch.k,
+                max_categories=self.reference_sketch.max_categories
+            )
+        reference = self._reference_as_sketch(current.k, current.max_categories)
+
+        logger.info(f"Detecting feature drift from sketches using {method} method")
+
+        drift_results = {}
+        drifted_features = []
+
+        for column, ref_sketch in reference.columns.items():
+            if column not in current:
+                logger.warning(f"Column {column} not found in current data")
+                continue
+            cur_sketch = current[column]
+
+            if isinstance(ref_sketch, CategoryCounts):
+                drift_score = self._categorical_drift_from_counts(
+                    ref_sketch, cur_sketch, method
+                )
+                error_bound = 0.0
+            elif method == 'ks':
+                drift_score = ks_from_sketches(ref_sketch, cur_sketch)
+                error_bound = ref_sketch.rank_error + cur_sketch.rank_error
+            else:
+                drift_score = self._jensen_shannon_from_sketches(ref_sketch, cur_sketch)
+                error_bound = None
+
+            is_drifted = drift_score > self.threshold
+
+            drift_results[column] = {
+                'drift_score': drift_score,
+                'is_drifted': is_drifted,
+                'method': method,
+                'error_bound': error_bound
+            }
+
+            if is_drifted:
+                drifted_features.append(column)
+                logger.warning(
+                    f"Drift detected in feature '{column}': score={drift_score:.4f}"
+                )
+
+        return self._summarize_feature_drift(drift_results, drifted_features)
+
+    def _summarize_feature_drift(
+        self,
+        drift_results: Dict[str, Any],
+        drifted_features: list
+    ) -> Dict[str, Any]:
+        """Build the feature-drift summary shared by the raw and sketched paths."""
         overall_drift = len(drifted_features) > 0
 
         summary = {
@@ -104,7 +230,9 @@ class DriftDetector:
             'num_drifted_features': len(drifted_features),
             'drifted_features': drifted_features,
             'total_features': len(drift_results),
-            'drift_percentage': (len(drifted_features) / len(drift_results)) * 100,
+            'drift_percentage': (
+                (len(drifted_features) / len(drift_results)) * 100 if drift_results else 0.0
+            ),
             'feature_drift_scores': drift_results
         }
 
@@ -117,17 +245,20 @@ class DriftDetector:
 
     def detect_prediction_drift(
         self,
-        current_predictions: np.ndarray
+        current_predictions: Union[np.ndarray, QuantileSketch]
     ) -> Dict[str, Any]:
         """
         Detect drift in prediction distributions.
 
         Args:
-            current_predictions: Current model predictions
+            current_predictions: Current model predictions or a sketch of them
 
         Returns:
             Dictionary with drift detection results
         """
+        if isinstance(current_predictions, QuantileSketch) or self.reference_data is None:
+            return self._detect_prediction_drift_sketched(current_predictions)
+
         if self.reference_predictions is None:
             raise ValueError(
                 "Reference predictions not set. Call set_reference_data first."
@@ -179,6 +310,117 @@ class DriftDetector:
 
         return result
 
+    def _detect_prediction_drift_sketched(
+        self,
+        current_predictions: Union[np.ndarray, QuantileSketch]
+    ) -> Dict[str, Any]:
+        """
+        Prediction drift computed from quantile sketches.
+
+        Args:
+            current_predictions: Current model predictions or a sketch of them
+
+        Returns:
+            Dictionary with drift detection results
+        """
+        if isinstance(current_predictions, QuantileSketch):
+            current = current_predictions
+        else:
+            current = QuantileSketch(self._reference_as_sketch().k)
+            current.update(current_predictions)
+        reference = self._reference_as_sketch(current.k).predictions
+        if reference is None:
+            raise ValueError(
+                "Reference predictions not set. Call set_reference_sketch with "
+                "sketched predictions first."
+            )
+
+        logger.info("Detecting prediction drift from sketches")
+
+        classes = np.union1d(reference.retained(), current.retained())
+        if len(classes) <= 2:
+            # Class labels survive compaction exactly, so the class shares do too.
+            ref_dist = np.diff(np.r_[0.0, reference.cdf(classes)])
+            curr_dist = np.diff(np.r_[0.0, current.cdf(classes)])
+            drift_score = jensen_shannon_distance(ref_dist, curr_dist)
+            error_bound = 0.0
+        else:
+            drift_score = ks_from_sketches(reference, current)
+            error_bound = reference.rank_error + current.rank_error
+
+        is_drifted = drift_score > self.threshold
+
+        result = {
+            'drift_score': float(drift_score),
+            'is_drifted': is_drifted,
+            'threshold': self.threshold,
+            'error_bound': error_bound,
+            'reference_mean': reference.mean,
+            'current_mean': current.mean,
+            'reference_std': reference.std,
+            'current_std': current.std
+        }
+
+        if is_drifted:
+            logger.warning(f"Prediction drift detected: score={drift_score:.4f}")
+        else:
+            logger.info("No prediction drift detected")
+
+        return result
+
+    def _categorical_drift_from_counts(
+        self,
+        reference: CategoryCounts,
+        current: CategoryCounts,
+        method: str
+    ) -> float:
+        """
+        Categorical drift score from count tables.
+
+        Args:
+            reference: Reference counts
+            current: Current counts
+            method: 'ks' (max frequency difference) or 'js'
+
+        Returns:
+            Drift score (0-1)
+        """
+        if reference.count == 0 or current.count == 0:
+            return 0.0
+        ref_freq = reference.frequencies()
+        curr_freq = current.frequencies()
+        categories = sorted(set(ref_freq) | set(curr_freq))
+        fill = 0 if method == 'ks' else 1e-10
+        ref_dist = np.array([ref_freq.get(c, fill) for c in categories])
+        curr_dist = np.array([curr_freq.get(c, fill) for c in categories])
+        if method == 'ks':
+            return float(np.max(np.abs(ref_dist - curr_dist)))
+        return jensen_shannon_distance(ref_dist, curr_dist)
+
+    def _jensen_shannon_from_sketches(
+        self,
+        reference: QuantileSketch,
+        current: QuantileSketch
+    ) -> float:
+        """
+        Jensen-Shannon divergence over 30 equal-width bins read off the sketches.
+
+        Args:
+            reference: Reference distribution sketch
+            current: Current distribution sketch
+
+        Returns:
+            JS divergence (0-1)
+        """
+        if reference.count == 0 or current.count == 0:
+            return 0.0
+        bins = np.linspace(
+            min(reference.min, current.min), max(reference.max, current.max), 30
+        )
+        ref_hist = histogram_from_sketch(reference, bins) + 1e-10
+        curr_hist = histogram_from_sketch(current, bins) + 1e-10
+        return jensen_shannon_distance(ref_hist, curr_hist)
+
     def _kolmogorov_smirnov_test(
         self,
         reference: pd.Series,
@@ -273,21 +515,28 @@ class DriftDetector:
 
     def monitor_drift(
         self,
-        current_data: pd.DataFrame,
-        current_predictions: np.ndarray = None
+        current_data: Union[pd.DataFrame, FeatureSketches],
+        current_predictions: Union[np.ndarray, QuantileSketch] = None
     ) -> Dict[str, Any]:
         """
         Monitor both feature and prediction drift.
 
+        Pass ``FeatureSketches`` (e.g. merged from every serving replica) as
+        ``current_data`` for streaming mode; its prediction sketch is used
+        when ``current_predictions`` is omitted.
+
         Args:
-            current_data: Current feature data
-            current_predictions: Current predictions (optional)
+            current_data: Current feature data or sketches of it
+            current_predictions: Current predictions or a sketch of them (optional)
 
         Returns:
-            Combined drift detection results
+            Combined drift detection results, including a ``memory`` footprint
         """
         logger.info("Running comprehensive drift monitoring")
 
+        if current_predictions is None and isinstance(current_data, FeatureSketches):
+            current_predictions = current_data.predictions
+
         results = {
             'timestamp': pd.Timestamp.now().isoformat(),
             'feature_drift': self.detect_feature_drift(current_data),
@@ -305,6 +554,12 @@ class DriftDetector:
         )
 
         results['overall_drift_detected'] = feature_drift or prediction_drift
+        results['memory'] = self._memory_footprint(current_data, current_predictions)
+        memory = results['memory']
+        logger.info(
+            f"Drift monitoring ({memory['mode']} mode) held "
+            f"{(memory['reference_bytes'] + memory['current_bytes']) / 1024:.1f} KiB"
+        )
 
         if results['overall_drift_detected']:
             logger.warning("DRIFT ALERT: Data or model drift detected!")
@@ -312,3 +567,54 @@ class DriftDetector:
             logger.info("No drift detected")
 
         return results
+
+    def _memory_footprint(
+        self,
+        current_data: Union[pd.DataFrame, FeatureSketches],
+        current_predictions: Union[np.ndarray, QuantileSketch, None]
+    ) -> Dict[str, Any]:
+        """
+        Bytes held for the reference and current windows.
+
+        In sketch mode ``raw_equivalent_bytes`` is what the same samples
+        would take as raw 8-byte values, i.e. the list-based path.
+        """
+        if isinstance(current_data, FeatureSketches) or self.reference_data is None:
+            if isinstance(current_data, FeatureSketches):
+                current_bytes = current_data.memory_bytes()
+                current_raw = current_data.raw_equivalent_bytes()
+            else:
+                current_bytes = int(current_data.memory_usage(deep=True).sum())
+                current_raw = current_bytes
+            if isinstance(current_predictions, QuantileSketch) and (
+                not isinstance(current_data, FeatureSketches)
+                or current_predictions is not current_data.predictions
+            ):
+                current_bytes += current_predictions.memory_bytes()
+                current_raw += current_predictions.count * 8
+            sketch_bytes = self.reference_sketch.memory_bytes() + current_bytes
+            raw_bytes = self.reference_sketch.raw_equivalent_bytes() + current_raw
+            return {
+                'mode': 'sketch',
+                'reference_bytes': self.reference_sketch.memory_bytes(),
+                'current_bytes': current_bytes,
+                'raw_equivalent_bytes': raw_bytes,
+                'reduction_factor': raw_bytes / sketch_bytes if sketch_bytes else 0.0
+            }
+
+        reference_bytes = int(self.reference_data.memory_usage(deep=True).sum())
+        current_bytes = int(current_data.memory_usage(deep=True).sum())
+        for predictions in (self.reference_predictions, current_predictions):
+            if predictions is not None:
+                nbytes = np.asarray(predictions).nbytes
+                if predictions is self.reference_predictions:
+                    reference_bytes += nbytes
+                else:
+                    current_bytes += nbytes
+        return {
+            'mode': 'list',
+            'reference_bytes': reference_bytes,
+            'current_bytes': current_bytes,
+            'raw_equivalent_bytes': reference_bytes + current_bytes,
+            'reduction_factor': 1.0
+        }
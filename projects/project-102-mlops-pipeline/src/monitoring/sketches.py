@@ -0,0 +1,494 @@
+"""Mergeable fixed-memory sketches for streaming drift monitoring.
+
+Serving replicas feed each batch of features (and predictions) into a
+``FeatureSketches`` object instead of keeping raw samples. Sketches from
+many replicas are merged and handed to ``DriftDetector.monitor_drift``,
+which computes drift scores from them with a bounded error.
+
+- Numeric columns use a KLL quantile sketch: memory grows with
+  ``O(k log(n / k))`` and CDF estimates are within ``rank_error`` of the
+  exact empirical CDF (with high probability).
+- Categorical columns use exact count tables, capped at
+  ``max_categories`` (overflow is folded into ``OTHER_CATEGORY``).
+"""
+
+import json
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Union
+
+import numpy as np
+
+from ..common.logger import get_logger
+
+logger = get_logger(__name__)
+
+OTHER_CATEGORY = '__other__'
+
+
+class QuantileSketch:
+    """KLL quantile sketch over a stream of floats."""
+
+    _MIN_WIDTH = 8
+    _SHRINK = 2 / 3
+
+    def __init__(self, k: int = 200, seed: Optional[int] = None):
+        """
+        Initialize quantile sketch.
+
+        Args:
+            k: Accuracy parameter; rank error is roughly 1.65% at k=200
+            seed: Seed for the compaction coin flips
+        """
+        if k < self._MIN_WIDTH:
+            raise ValueError(f"k must be >= {self._MIN_WIDTH}")
+        self.k = k
+        self.count = 0
+        self.sum = 0.0
+        self.sum_sq = 0.0
+        self.min = float('inf')
+        self.max = float('-inf')
+        self._levels: List[np.ndarray] = [np.empty(0)]
+        self._compacted = False
+        self._rng = np.random.default_rng(seed)
+        self._sorted = None
+
+    @property
+    def rank_error(self) -> float:
+        """Bound on |estimated CDF - exact CDF| (0 until the first compaction)."""
+        if not self._compacted:
+            return 0.0
+        # Empirical all-ranks bound for KLL at 99% confidence.
+        return 2.446 / self.k ** 0.9433
+
+    @property
+    def mean(self) -> float:
+        """Exact mean of the values seen (NaN when empty)."""
+        return self.sum / self.count if self.count else float('nan')
+
+    @property
+    def std(self) -> float:
+        """Exact population standard deviation of the values seen (NaN when empty)."""
+        if not self.count:
+            return float('nan')
+        return float(np.sqrt(max(self.sum_sq / self.count - self.mean ** 2, 0.0)))
+
+    def update(self, values: Iterable[float]):
+        """
+        Add a batch of values; NaNs are ignored.
+
+        Args:
+            values: Array-like of numbers
+        """
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        self.count += len(values)
+        self.sum += float(values.sum())
+        self.sum_sq += float(np.dot(values, values))
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self._levels[0] = np.concatenate([self._levels[0], values])
+        self._compress()
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        """
+        Merge another sketch into this one.
+
+        Args:
+            other: Sketch built with the same k
+
+        Returns:
+            self
+        """
+        if other.k != self.k:
+            raise ValueError(f"Cannot merge sketches with k={self.k} and k={other.k}")
+        while len(self._levels) < len(other._levels):
+            self._levels.append(np.empty(0))
+        for h, level in enumerate(other._levels):
+            self._levels[h] = np.concatenate([self._levels[h], level])
+        self.count += other.count
+        self.sum += other.sum
+        self.sum_sq += other.sum_sq
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compacted = self._compacted or other._compacted
+        self._compress()
+        return self
+
+    def cdf(self, points: Iterable[float]) -> np.ndarray:
+        """
+        Estimate the fraction of values <= each point.
+
+        Args:
+            points: Array-like of query points
+
+        Returns:
+            Array of CDF estimates in [0, 1]
+        """
+        points = np.asarray(points, dtype=float)
+        if self.count == 0:
+            return np.zeros(points.shape)
+        values, cum_weights = self._sorted_view()
+        idx = np.searchsorted(values, points, side='right')
+        ranks = np.where(idx > 0, cum_weights[np.maximum(idx - 1, 0)], 0)
+        return ranks / self.count
+
+    def quantiles(self, qs: Iterable[float]) -> np.ndarray:
+        """
+        Estimate quantiles.
+
+        Args:
+            qs: Array-like of fractions in [0, 1]
+
+        Returns:
+            Array of estimated quantile values
+        """
+        qs = np.asarray(qs, dtype=float)
+        if self.count == 0:
+            return np.full(qs.shape, np.nan)
+        values, cum_weights = self._sorted_view()
+        idx = np.searchsorted(cum_weights, qs * self.count, side='left')
+        return values[np.minimum(idx, len(values) - 1)]
+
+    def retained(self) -> np.ndarray:
+        """Distinct values currently held by the sketch, ascending."""
+        if self.count == 0:
+            return np.empty(0)
+        return np.unique(self._sorted_view()[0])
+
+    def memory_bytes(self) -> int:
+        """Bytes held by retained items."""
+        return sum(level.nbytes for level in self._levels)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable state, for shipping sketches between processes."""
+        return {
+            'k': self.k,
+            'count': self.count,
+            'sum': self.sum,
+            'sum_sq': self.sum_sq,
+            'min': self.min if self.count else None,
+            'max': self.max if self.count else None,
+            'compacted': self._compacted,
+            'levels': [level.tolist() for level in self._levels],
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> 'QuantileSketch':
+        """Rebuild a sketch from ``to_dict`` output."""
+        sketch = cls(k=state['k'])
+        sketch.count = state['count']
+        sketch.sum, sketch.sum_sq = state['sum'], state['sum_sq']
+        if sketch.count:
+            sketch.min, sketch.max = state['min'], state['max']
+        sketch._compacted = state['compacted']
+        sketch._levels = [np.asarray(level, dtype=float) for level in state['levels']]
+        return sketch
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - 1 - level
+        return max(self._MIN_WIDTH, int(self.k * self._SHRINK ** depth))
+
+    def _compress(self):
+        self._sorted = None
+        while sum(len(level) for level in self._levels) > sum(
+            self._capacity(h) for h in range(len(self._levels))
+        ):
+            h = next(
+                h for h, level in enumerate(self._levels)
+                if len(level) >= self._capacity(h)
+            )
+            if h == len(self._levels) - 1:
+                self._levels.append(np.empty(0))
+            level = np.sort(self._levels[h])
+            # An odd item out stays behind; the rest halve into the next level,
+            # each survivor carrying twice the weight.
+            keep = len(level) % 2
+            promoted = level[keep + self._rng.integers(2)::2]
+            self._levels[h] = level[:keep]
+            self._levels[h + 1] = np.concatenate([self._levels[h + 1], promoted])
+            self._compacted = True
+
+    def _sorted_view(self):
+        if self._sorted is None:
+            values = np.concatenate(self._levels)
+            weights = np.concatenate([
+                np.full(len(level), 2 ** h, dtype=np.int64)
+                for h, level in enumerate(self._levels)
+            ])
+            order = np.argsort(values, kind='stable')
+            self._sorted = (values[order], np.cumsum(weights[order]))
+        return self._sorted
+
+
+class CategoryCounts:
+    """Count table for a categorical stream, capped at ``max_categories``."""
+
+    def __init__(self, max_categories: int = 1000):
+        """
+        Initialize count table.
+
+        Args:
+            max_categories: Distinct categories tracked before folding into OTHER_CATEGORY
+        """
+        self.max_categories = max_categories
+        self.counts: Dict[str, int] = {}
+        self.count = 0
+
+    def update(self, values: Iterable[Any]):
+        """
+        Add a batch of values; None and NaN are ignored.
+
+        Args:
+            values: Iterable of category labels
+        """
+        values = [str(v) for v in values if v is not None and v == v]
+        if not values:
+            return
+        labels, counts = np.unique(np.asarray(values), return_counts=True)
+        self._add(zip(labels.tolist(), counts.tolist()))
+
+    def merge(self, other: 'CategoryCounts') -> 'CategoryCounts':
+        """
+        Merge another count table into this one.
+
+        Args:
+            other: Count table to merge
+
+        Returns:
+            self
+        """
+        self._add(other.counts.items())
+        return self
+
+    def frequencies(self) -> Dict[str, float]:
+        """Relative frequency per category."""
+        if self.count == 0:
+            return {}
+        return {label: n / self.count for label, n in self.counts.items()}
+
+    def memory_bytes(self) -> int:
+        """Approximate bytes held by the table (labels + counters)."""
+        return sum(len(label) + 8 for label in self.counts)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable state."""
+        return {'max_categories': self.max_categories, 'counts': dict(self.counts)}
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> 'CategoryCounts':
+        """Rebuild a table from ``to_dict`` output."""
+        table = cls(max_categories=state['max_categories'])
+        table._add(state['counts'].items())
+        return table
+
+    def _add(self, items):
+        for label, n in items:
+            if label not in self.counts and len(self.counts) >= self.max_categories:
+                label = OTHER_CATEGORY
+            self.counts[label] = self.counts.get(label, 0) + n
+            self.count += n
+
+
+ColumnSketch = Union[QuantileSketch, CategoryCounts]
+
+
+class FeatureSketches:
+    """Per-column sketches for a feature stream, plus an optional prediction sketch."""
+
+    def __init__(self, k: int = 200, max_categories: int = 1000):
+        """
+        Initialize feature sketches.
+
+        Args:
+            k: Accuracy parameter for numeric columns
+            max_categories: Count-table cap for categorical columns
+        """
+        self.k = k
+        self.max_categories = max_categories
+        self.columns: Dict[str, ColumnSketch] = {}
+        self.predictions: Optional[QuantileSketch] = None
+        self.num_rows = 0
+
+    @classmethod
+    def from_data(
+        cls,
+        data: Mapping[str, Any],
+        predictions: Optional[Iterable[float]] = None,
+        **kwargs
+    ) -> 'FeatureSketches':
+        """
+        Sketch a whole dataset in one go.
+
+        Args:
+            data: DataFrame or mapping of column name to values
+            predictions: Model predictions (optional)
+            **kwargs: Passed to the constructor
+
+        Returns:
+            Populated FeatureSketches
+        """
+        sketches = cls(**kwargs)
+        sketches.update(data, predictions)
+        return sketches
+
+    @classmethod
+    def merge_all(cls, parts: Iterable['FeatureSketches']) -> 'FeatureSketches':
+        """
+        Merge sketches from several replicas into a new object.
+
+        Args:
+            parts: Sketches built with the same parameters
+
+        Returns:
+            Merged FeatureSketches
+        """
+        parts = list(parts)
+        if not parts:
+            raise ValueError("Nothing to merge")
+        merged = cls(k=parts[0].k, max_categories=parts[0].max_categories)
+        for part in parts:
+            merged.merge(part)
+        return merged
+
+    def update(
+        self,
+        data: Mapping[str, Any],
+        predictions: Optional[Iterable[float]] = None
+    ):
+        """
+        Ingest a batch of rows.
+
+        A column's sketch type is fixed by the first batch it appears in:
+        numeric/boolean dtypes get a quantile sketch, anything else a count table.
+
+        Args:
+            data: DataFrame or mapping of column name to values
+            predictions: Model predictions for the same rows (optional)
+        """
+        num_rows = 0
+        for column, values in data.items():
+            values = np.asarray(values)
+            num_rows = max(num_rows, len(values))
+            sketch = self.columns.get(column)
+            if sketch is None:
+                sketch = (
+                    QuantileSketch(self.k) if values.dtype.kind in 'biuf'
+                    else CategoryCounts(self.max_categories)
+                )
+                self.columns[column] = sketch
+            sketch.update(values)
+        self.num_rows += num_rows
+
+        if predictions is not None:
+            if self.predictions is None:
+                self.predictions = QuantileSketch(self.k)
+            self.predictions.update(predictions)
+
+    def merge(self, other: 'FeatureSketches') -> 'FeatureSketches':
+        """
+        Merge another replica's sketches into this one.
+
+        Args:
+            other: Sketches to merge
+
+        Returns:
+            self
+        """
+        for column, sketch in other.columns.items():
+            if column not in self.columns:
+                self.columns[column] = type(sketch).from_dict(sketch.to_dict())
+            elif type(self.columns[column]) is not type(sketch):
+                raise ValueError(f"Column '{column}' sketched as different types")
+            else:
+                self.columns[column].merge(sketch)
+        if other.predictions is not None:
+            if self.predictions is None:
+                self.predictions = QuantileSketch(self.k)
+            self.predictions.merge(other.predictions)
+        self.num_rows += other.num_rows
+        return self
+
+    def __contains__(self, column: str) -> bool:
+        return column in self.columns
+
+    def __getitem__(self, column: str) -> ColumnSketch:
+        return self.columns[column]
+
+    def memory_bytes(self) -> int:
+        """Bytes held by all column and prediction sketches."""
+        total = sum(sketch.memory_bytes() for sketch in self.columns.values())
+        if self.predictions is not None:
+            total += self.predictions.memory_bytes()
+        return total
+
+    def raw_equivalent_bytes(self) -> int:
+        """Bytes the same rows would take as raw 8-byte values."""
+        total = sum(sketch.count for sketch in self.columns.values())
+        if self.predictions is not None:
+            total += self.predictions.count
+        return total * 8
+
+    def to_json(self) -> str:
+        """Serialize for shipping from a serving replica to the monitor."""
+        return json.dumps({
+            'k': self.k,
+            'max_categories': self.max_categories,
+            'num_rows': self.num_rows,
+            'columns': {
+                column: {
+                    'type': 'quantile' if isinstance(sketch, QuantileSketch) else 'counts',
+                    'state': sketch.to_dict(),
+                }
+                for column, sketch in self.columns.items()
+            },
+            'predictions': self.predictions.to_dict() if self.predictions else None,
+        })
+
+    @classmethod
+    def from_json(cls, payload: str) -> 'FeatureSketches':
+        """Rebuild sketches from ``to_json`` output."""
+        state = json.loads(payload)
+        sketches = cls(k=state['k'], max_categories=state['max_categories'])
+        sketches.num_rows = state['num_rows']
+        for column, entry in state['columns'].items():
+            sketch_cls = QuantileSketch if entry['type'] == 'quantile' else CategoryCounts
+            sketches.columns[column] = sketch_cls.from_dict(entry['state'])
+        if state['predictions'] is not None:
+            sketches.predictions = QuantileSketch.from_dict(state['predictions'])
+        return sketches
+
+
+def ks_from_sketches(reference: QuantileSketch, current: QuantileSketch) -> float:
+    """
+    KS statistic estimated from two quantile sketches.
+
+    The estimate is within ``reference.rank_error + current.rank_error`` of
+    the exact two-sample statistic.
+
+    Args:
+        reference: Reference distribution sketch
+        current: Current distribution sketch
+
+    Returns:
+        KS statistic (0-1)
+    """
+    if reference.count == 0 or current.count == 0:
+        return 0.0
+    points = np.union1d(reference.retained(), current.retained())
+    return float(np.max(np.abs(reference.cdf(points) - current.cdf(points))))
+
+
+def histogram_from_sketch(sketch: QuantileSketch, edges: np.ndarray) -> np.ndarray:
+    """
+    Estimated share of values per bin (last bin right-inclusive).
+
+    Args:
+        sketch: Quantile sketch
+        edges: Monotonic bin edges
+
+    Returns:
+        Array of len(edges) - 1 bin shares
+    """
+    inner = sketch.cdf(edges[1:-1])
+    return np.diff(np.r_[0.0, inner, 1.0])
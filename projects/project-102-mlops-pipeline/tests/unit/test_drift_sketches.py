@@ -0,0 +1,156 @@
+"""Unit tests for streaming drift sketches."""
+
+import pytest
+import numpy as np
+import pandas as pd
+
+import sys
+sys.path.insert(0, '/opt/airflow')
+
+from src.monitoring.drift_detector import DriftDetector
+from src.monitoring.sketches import (
+    CategoryCounts,
+    FeatureSketches,
+    QuantileSketch,
+    ks_from_sketches,
+)
+
+
+def exact_ks(a, b):
+    """Exact two-sample KS statistic."""
+    a, b = np.sort(a), np.sort(b)
+    points = np.r_[a, b]
+    return np.max(np.abs(
+        np.searchsorted(a, points, side='right') / len(a)
+        - np.searchsorted(b, points, side='right') / len(b)
+    ))
+
+
+class TestQuantileSketch:
+    """Test QuantileSketch class."""
+
+    def test_exact_below_capacity(self):
+        """Test small streams are kept exactly."""
+        sketch = QuantileSketch(k=200)
+        sketch.update([3.0, 1.0, 2.0, np.nan])
+
+        assert sketch.count == 3
+        assert sketch.rank_error == 0.0
+        np.testing.assert_allclose(sketch.cdf([0.5, 1.0, 2.5, 3.0]), [0, 1 / 3, 2 / 3, 1])
+
+    def test_memory_stays_bounded(self):
+        """Test memory does not grow with the stream."""
+        rng = np.random.default_rng(0)
+        sketch = QuantileSketch(k=200, seed=0)
+        for _ in range(100):
+            sketch.update(rng.normal(size=10_000))
+
+        assert sketch.count == 1_000_000
+        assert sketch.memory_bytes() < 20_000
+
+    def test_ks_within_error_bound(self):
+        """Test sketched KS stays within the advertised bound."""
+        rng = np.random.default_rng(1)
+        a = rng.normal(0.0, 1.0, 200_000)
+        b = rng.normal(0.1, 1.0, 200_000)
+        sa, sb = QuantileSketch(seed=0), QuantileSketch(seed=1)
+        sa.update(a)
+        sb.update(b)
+
+        bound = sa.rank_error + sb.rank_error
+        assert abs(ks_from_sketches(sa, sb) - exact_ks(a, b)) <= bound
+
+    def test_merge_matches_single_stream(self):
+        """Test merged replica sketches approximate the combined stream."""
+        rng = np.random.default_rng(2)
+        parts = [rng.uniform(0, 1, 50_000) for _ in range(4)]
+        merged = QuantileSketch(seed=0)
+        for part in parts:
+            replica = QuantileSketch(seed=1)
+            replica.update(part)
+            merged.merge(QuantileSketch.from_dict(replica.to_dict()))
+
+        assert merged.count == 200_000
+        assert abs(merged.quantiles([0.5])[0] - 0.5) <= merged.rank_error
+
+    def test_moments_survive_merge_and_serialization(self):
+        """Test mean and std are exact after merging replica sketches."""
+        rng = np.random.default_rng(4)
+        parts = [rng.normal(2.0, 3.0, 20_000) for _ in range(3)]
+        merged = QuantileSketch(seed=0)
+        for part in parts:
+            replica = QuantileSketch(seed=1)
+            replica.update(part)
+            merged.merge(QuantileSketch.from_dict(replica.to_dict()))
+
+        values = np.concatenate(parts)
+        assert merged.mean == pytest.approx(np.mean(values))
+        assert merged.std == pytest.approx(np.std(values))
+
+    def test_merge_rejects_different_k(self):
+        """Test sketches with different k cannot be merged."""
+        with pytest.raises(ValueError):
+            QuantileSketch(k=100).merge(QuantileSketch(k=200))
+
+
+class TestCategoryCounts:
+    """Test CategoryCounts class."""
+
+    def test_overflow_folds_into_other(self):
+        """Test categories beyond the cap are counted together."""
+        counts = CategoryCounts(max_categories=2)
+        counts.update(['a', 'b', 'c', 'd', None])
+
+        assert counts.count == 4
+        assert counts.counts == {'a': 1, 'b': 1, '__other__': 2}
+
+
+class TestStreamingDrift:
+    """Test DriftDetector in sketch mode."""
+
+    def test_monitor_drift_from_merged_replicas(self):
+        """Test drift is detected from merged replica sketches."""
+        rng = np.random.default_rng(3)
+        reference = FeatureSketches.from_data(
+            {'amount': rng.normal(0, 1, 50_000),
+             'plan': rng.choice(['basic', 'pro'], 50_000, p=[0.7, 0.3])},
+            predictions=rng.random(50_000)
+        )
+        replicas = [
+            FeatureSketches.from_data(
+                {'amount': rng.normal(1.0, 1, 10_000),
+                 'plan': rng.choice(['basic', 'pro'], 10_000, p=[0.7, 0.3])},
+                predictions=rng.random(10_000)
+            )
+            for _ in range(3)
+        ]
+        current = FeatureSketches.merge_all(
+            FeatureSketches.from_json(r.to_json()) for r in replicas
+        )
+
+        detector = DriftDetector(threshold=0.1)
+        detector.set_reference_sketch(reference)
+        results = detector.monitor_drift(current)
+
+        assert results['feature_drift']['drifted_features'] == ['amount']
+        assert not results['prediction_drift']['is_drifted']
+        assert results['memory']['mode'] == 'sketch'
+        assert results['memory']['reduction_factor'] > 10
+
+    def test_prediction_drift_keys_match_raw_mode(self):
+        """Test sketch mode reports the same prediction statistics as raw mode."""
+        rng = np.random.default_rng(5)
+        features = {'amount': rng.normal(0, 1, 5_000)}
+        reference, current = rng.random(5_000), rng.random(2_000)
+
+        raw = DriftDetector(threshold=0.1)
+        raw.set_reference_data(pd.DataFrame(features), predictions=reference)
+        sketched = DriftDetector(threshold=0.1)
+        sketched.set_reference_sketch(FeatureSketches.from_data(features, predictions=reference))
+
+        exact = raw.detect_prediction_drift(current)
+        approx = sketched.detect_prediction_drift(current)
+
+        assert set(exact) <= set(approx)
+        for key in ('reference_mean', 'current_mean', 'reference_std', 'current_std'):
+            assert approx[key] == pytest.approx(exact[key])
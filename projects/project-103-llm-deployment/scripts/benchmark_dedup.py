@@ -0,0 +1,95 @@
+"""
+Near-duplicate detection benchmark: pairwise loop vs blocked matmul vs MinHash/LSH
+
+Usage:
+    python scripts/benchmark_dedup.py --docs 100000
+    python scripts/benchmark_dedup.py --docs 5000 --pairwise-max 5000
+
+Embeddings are synthetic (clustered random vectors) so only dedup cost is
+measured; the pairwise baseline is the previous implementation and is only
+run up to --pairwise-max documents (it is quadratic in Python calls).
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.ingestion import Document, DocumentDeduplicator  # noqa: E402
+
+
+def cosine(a, b):
+    """EmbeddingModel.similarity"""
+    return float(np.dot(a / np.linalg.norm(a), b / np.linalg.norm(b)))
+
+
+def pairwise_keep(embeddings, threshold):
+    """The previous deduplicate_fuzzy loop"""
+    unique = [0]
+    for i in range(1, len(embeddings)):
+        if all(cosine(embeddings[i], embeddings[j]) < threshold for j in unique):
+            unique.append(i)
+    return unique
+
+
+def make_corpus(n: int, duplicate_ratio: float, dim: int, seed: int = 0):
+    rnd = random.Random(seed)
+    rng = np.random.default_rng(seed)
+    words = [f"word{i}" for i in range(20000)]
+    texts, embeddings = [], np.empty((n, dim), dtype=np.float32)
+    for i in range(n):
+        if texts and rnd.random() < duplicate_ratio:
+            j = rnd.randrange(len(texts))
+            tokens = texts[j].split()
+            tokens[rnd.randrange(len(tokens))] = "edited"
+            texts.append(" ".join(tokens))
+            embeddings[i] = embeddings[j] + 0.01 * rng.standard_normal(dim)
+        else:
+            texts.append(" ".join(rnd.choices(words, k=rnd.randint(100, 400))))
+            embeddings[i] = rng.standard_normal(dim)
+    return texts, embeddings
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    kept = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} kept {kept:>8} in {elapsed:>8.2f}s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.2)
+    parser.add_argument("--pairwise-max", type=int, default=2_000)
+    args = parser.parse_args()
+
+    texts, embeddings = make_corpus(args.docs, args.duplicate_ratio, args.dim)
+    documents = [Document(text=t, doc_id=str(i)) for i, t in enumerate(texts)]
+    dedup = DocumentDeduplicator(similarity_threshold=0.95, jaccard_threshold=0.8)
+    print(f"{args.docs} documents, {args.duplicate_ratio:.0%} near-duplicates\n")
+
+    n = min(args.pairwise_max, args.docs)
+    if n:
+        elapsed = timed(
+            f"pairwise loop ({n} docs)",
+            lambda: len(pairwise_keep(embeddings[:n], 0.95)),
+        )
+        print(f"{'':<32} extrapolated to {args.docs}: "
+              f"{elapsed * (args.docs / n) ** 2 / 3600:.1f}h")
+        blocked = np.flatnonzero(dedup.embedding_keep_mask(embeddings[:n])).tolist()
+        assert blocked == pairwise_keep(embeddings[:n], 0.95), "blocked != pairwise"
+
+    timed("blocked matmul (embeddings)", lambda: int(dedup.embedding_keep_mask(embeddings).sum()))
+    timed("MinHash + LSH (shingles)", lambda: int(dedup.minhash_keep_mask(documents).sum()))
+
+
+if __name__ == "__main__":
+    main()
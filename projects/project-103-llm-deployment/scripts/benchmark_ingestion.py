@@ -0,0 +1,121 @@
+"""
+Ingestion throughput benchmark: per-document encoding vs batched + cached
+
+Usage:
+    python scripts/benchmark_ingestion.py --docs 10000
+    python scripts/benchmark_ingestion.py --docs 2000 --model all-MiniLM-L6-v2
+
+Without --model a simulated encoder is used (fixed per-call overhead plus a
+per-text cost), which isolates the effect of batching from model speed.
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.rag import EmbeddingCache, RAGConfig, RAGPipeline, TextChunker  # noqa: E402
+from src.rag.retriever import VectorRetriever  # noqa: E402
+
+
+class SimulatedEncoder:
+    """Stand-in for EmbeddingModel with GPU-like cost: overhead per call + per text"""
+
+    model_name = "simulated"
+
+    def __init__(self, dim: int = 384, call_overhead_s: float = 0.004, per_text_s: float = 0.0001):
+        self.embedding_dim = dim
+        self.call_overhead_s = call_overhead_s
+        self.per_text_s = per_text_s
+        self.calls = 0
+
+    def encode(self, texts, show_progress=False, normalize=True):
+        self.calls += 1
+        time.sleep(self.call_overhead_s + self.per_text_s * len(texts))
+        rng = np.random.default_rng(abs(hash(texts[0])) % (2**32))
+        return rng.standard_normal((len(texts), self.embedding_dim)).astype(np.float32)
+
+
+class NullRetriever(VectorRetriever):
+    """Accepts writes and discards them, so only ingestion cost is measured"""
+
+    def __init__(self):
+        self.count = 0
+
+    def add_texts(self, texts, embeddings, metadatas=None, ids=None):
+        self.count += len(texts)
+
+
+def legacy_add_documents(pipeline: RAGPipeline, documents) -> int:
+    """The previous ingestion loop: one encoder call per document, list -> np.array"""
+    chunker = TextChunker(pipeline.config.chunk_size, pipeline.config.chunk_overlap)
+    texts, embeddings, metadatas, ids = [], [], [], []
+    for doc in documents:
+        chunks = chunker.chunk_text(doc["text"], doc["id"], {"doc_id": doc["id"]})
+        vectors = pipeline.embedding_model.encode([c.text for c in chunks])
+        for i, chunk in enumerate(chunks):
+            texts.append(chunk.text)
+            embeddings.append(vectors[i])
+            metadatas.append(chunk.metadata)
+            ids.append(f"{doc['id']}_chunk_{chunk.chunk_id}")
+    pipeline.retriever.add_texts(texts, np.array(embeddings), metadatas, ids)
+    return len(texts)
+
+
+def make_documents(n: int, duplicate_ratio: float, seed: int = 0):
+    rng = random.Random(seed)
+    words = [f"word{i}" for i in range(5000)]
+    boilerplate = "This document is confidential. Do not distribute outside the company. " * 3
+    docs = []
+    for i in range(n):
+        body = " ".join(rng.choices(words, k=rng.randint(80, 400)))
+        if rng.random() < duplicate_ratio and docs:
+            body = rng.choice(docs)["text"]  # re-published / mirrored document
+        docs.append({"id": f"doc{i}", "text": f"{boilerplate}\n\n{body}"})
+    return docs
+
+
+def run(label, fn, documents):
+    start = time.perf_counter()
+    chunks = fn(documents)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {chunks:>9} chunks {elapsed:>8.2f}s {chunks / elapsed:>10.0f} chunks/s")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=10_000)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.1)
+    parser.add_argument("--model", default=None, help="EMBEDDING_MODELS key; simulated if unset")
+    args = parser.parse_args()
+
+    if args.model:
+        from src.rag import get_embedding_model
+        encoder = get_embedding_model(args.model)
+    else:
+        encoder = SimulatedEncoder()
+
+    documents = make_documents(args.docs, args.duplicate_ratio)
+    config = RAGConfig(chunk_size=512, chunk_overlap=50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = EmbeddingCache(str(Path(tmp) / "cache.sqlite"))
+        legacy = RAGPipeline(encoder, NullRetriever(), config)
+        batched = RAGPipeline(encoder, NullRetriever(), config)
+        cached = RAGPipeline(encoder, NullRetriever(), config, embedding_cache=cache)
+
+        run("per-document (before)", lambda d: legacy_add_documents(legacy, d), documents)
+        run("batched, no cache", batched.add_documents, documents)
+        run("batched, cold cache", cached.add_documents, documents)
+        run("batched, warm cache", cached.add_documents, documents)
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Generation load test: throughput and latency at increasing concurrency
+
+Usage:
+    # In-process LLMServer (transformers backend, CPU-friendly "mock" = gpt2)
+    python scripts/load_test.py --config mock --concurrency 1 8 32
+
+    # Against a running API
+    python scripts/load_test.py --url http://localhost:8000 --concurrency 1 8 32
+
+While the clients run, a prober measures how long a trivial request takes
+(an event-loop tick in-process, GET /health over HTTP) to show whether
+generation is blocking the server.
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+PROMPTS = [
+    "Explain what a load balancer does.",
+    "Write a haiku about GPUs.",
+    "What is retrieval-augmented generation?",
+    "Summarize the benefits of request batching.",
+]
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p / 100 * len(values)))]
+
+
+class InProcessTarget:
+    """Calls LLMServer.generate directly"""
+
+    def __init__(self, config_name: str, max_tokens: int):
+        from src.llm import LLMServer, GenerationRequest, get_config
+
+        self.request_cls = GenerationRequest
+        self.server = LLMServer(get_config(config_name))
+        self.max_tokens = max_tokens
+
+    async def start(self):
+        await self.server.initialize()
+
+    async def generate(self, prompt: str):
+        response = await self.server.generate(
+            self.request_cls(prompt=prompt, max_tokens=self.max_tokens, temperature=0.7)
+        )
+        return response.completion_tokens
+
+    async def probe(self):
+        await asyncio.sleep(0)
+
+    async def close(self):
+        await self.server.shutdown()
+
+
+class HTTPTarget:
+    """Calls POST /generate and probes GET /health on a running API"""
+
+    def __init__(self, url: str, max_tokens: int):
+        import httpx
+
+        self.client = httpx.AsyncClient(base_url=url, timeout=600)
+        self.max_tokens = max_tokens
+
+    async def start(self):
+        (await self.client.get("/health")).raise_for_status()
+
+    async def generate(self, prompt: str):
+        response = await self.client.post(
+            "/generate",
+            json={"prompt": prompt, "max_tokens": self.max_tokens, "temperature": 0.7},
+        )
+        response.raise_for_status()
+        return response.json()["completion_tokens"]
+
+    async def probe(self):
+        (await self.client.get("/health")).raise_for_status()
+
+    async def close(self):
+        await self.client.aclose()
+
+
+async def run_level(target, concurrency: int, requests_per_client: int):
+    latencies, tokens, probes = [], [], []
+    done = asyncio.Event()
+
+    async def client(i):
+        for j in range(requests_per_client):
+            start = time.perf_counter()
+            tokens.append(await target.generate(PROMPTS[(i + j) % len(PROMPTS)]))
+            latencies.append(time.perf_counter() - start)
+
+    async def prober():
+        while not done.is_set():
+            start = time.perf_counter()
+            await target.probe()
+            probes.append(time.perf_counter() - start)
+            await asyncio.sleep(0.05)
+
+    probe_task = asyncio.create_task(prober())
+    start = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await probe_task
+
+    print(
+        f"{concurrency:>11} {len(latencies) / elapsed:>9.2f} {sum(tokens) / elapsed:>9.1f} "
+        f"{statistics.median(latencies) * 1000:>9.0f} {percentile(latencies, 95) * 1000:>9.0f} "
+        f"{percentile(probes, 95) * 1000:>12.1f} {max(probes) * 1000:>12.1f}"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default=None, help="API base URL; in-process if unset")
+    parser.add_argument("--config", default="mock", help="Model config for in-process mode")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests-per-client", type=int, default=4)
+    parser.add_argument("--max-tokens", type=int, default=32)
+    args = parser.parse_args()
+
+    if args.url:
+        target = HTTPTarget(args.url, args.max_tokens)
+    else:
+        target = InProcessTarget(args.config, args.max_tokens)
+    await target.start()
+
+    print(f"{'concurrency':>11} {'req/s':>9} {'tok/s':>9} {'p50 ms':>9} {'p95 ms':>9} "
+          f"{'probe p95 ms':>12} {'probe max ms':>12}")
+    try:
+        for concurrency in args.concurrency:
+            await run_level(target, concurrency, args.requests_per_client)
+    finally:
+        await target.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
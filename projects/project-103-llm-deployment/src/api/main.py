@@ -8,9 +8,14 @@ Provides endpoints for:
 - Health checks and metrics
 """
 
+import asyncio
 import logging
 import os
+import threading
+import time
+import uuid
 from contextlib import asynccontextmanager
+from pathlib import Path
 from typing import Optional
 
 from fastapi import FastAPI, HTTPException, Request
@@ -25,6 +30,7 @@ from ..rag import (
     EmbeddingModel,
     ChromaDBRetriever,
 )
+from ..ingestion import DirectoryLoader, IncrementalIngestor, IngestionManifest, IngestProgress
 from ..monitoring import get_metrics_collector, RequestTimer, CostTracker, CostConfig
 from .models import (
     GenerateRequest,
@@ -33,6 +39,8 @@ from .models import (
     RAGGenerateResponse,
     IngestRequest,
     IngestResponse,
+    DirectoryIngestRequest,
+    IngestJobStatus,
     HealthResponse,
     ModelInfo,
     CostBreakdown,
@@ -52,13 +60,22 @@ llm_server: Optional[LLMServer] = None
 rag_pipeline: Optional[RAGPipeline] = None
 metrics_collector = None
 cost_tracker = None
+ingest_manifest: Optional[IngestionManifest] = None
+ingest_jobs: dict = {}
+# Finished jobs stay pollable for this long; beyond the cap the oldest go first
+INGEST_JOB_TTL_SECONDS = float(os.getenv("INGEST_JOB_TTL_SECONDS", "3600"))
+MAX_INGEST_JOBS = int(os.getenv("MAX_INGEST_JOBS", "100"))
+# Directory ingestion only reads from under this root
+INGEST_ROOT = os.getenv("INGEST_ROOT", "./data")
+# One directory job writes the manifest at a time
+ingest_lock = threading.Lock()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown events"""
     # Startup
-    global llm_server, rag_pipeline, metrics_collector, cost_tracker
+    global llm_server, rag_pipeline, metrics_collector, cost_tracker, ingest_manifest
 
     logger.info("Starting LLM deployment platform...")
 
@@ -97,6 +114,9 @@ async def lifespan(app: FastAPI):
             chunk_overlap=int(os.getenv("RAG_CHUNK_OVERLAP", "50")),
         )
         rag_pipeline = RAGPipeline(embedding_model, retriever, rag_config)
+        ingest_manifest = IngestionManifest(
+            os.getenv("INGEST_MANIFEST_PATH", "./ingest_manifest.json")
+        )
 
         # Initialize monitoring
         logger.info("Initializing monitoring...")
@@ -119,6 +139,8 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down LLM deployment platform...")
+    if llm_server:
+        await llm_server.shutdown()
     if cost_tracker:
         cost_tracker.save()
 
@@ -154,6 +176,8 @@ async def root():
             "generate": "/generate",
             "rag_generate": "/rag-generate",
             "ingest": "/ingest",
+            "ingest_directory": "/ingest/directory",
+            "ingest_jobs": "/ingest/jobs/{job_id}",
             "health": "/health",
             "ready": "/ready",
             "metrics": "/metrics",
@@ -362,7 +386,9 @@ async def ingest_documents(request: IngestRequest):
         raise HTTPException(status_code=503, detail="RAG pipeline not initialized")
 
     try:
-        chunks_added = rag_pipeline.add_documents(
+        # Embedding is CPU/GPU bound; keep the event loop free for other requests
+        chunks_added = await asyncio.to_thread(
+            rag_pipeline.add_documents,
             documents=request.documents,
             text_key=request.text_key,
             id_key=request.id_key,
@@ -377,6 +403,78 @@ async def ingest_documents(request: IngestRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _run_directory_job(request: DirectoryIngestRequest, progress: IngestProgress):
+    try:
+        loader = DirectoryLoader(glob_pattern=request.glob_pattern, max_workers=request.max_workers)
+        ingestor = IncrementalIngestor(rag_pipeline, ingest_manifest, loader=loader)
+        with ingest_lock:
+            ingestor.run(request.path, progress)
+    except Exception as e:
+        # The ingestor records its own failures; anything earlier is recorded here.
+        if progress.status != "failed":
+            progress.status = "failed"
+            progress.error = str(e)
+            progress.finished_at = time.time()
+        logger.exception(f"Ingestion job for {request.path} failed")
+
+
+def _resolve_ingest_path(path: str) -> str:
+    """Resolve symlinks and require the directory to sit under INGEST_ROOT"""
+    root = os.path.realpath(INGEST_ROOT)
+    resolved = os.path.realpath(path)
+    if os.path.commonpath([root, resolved]) != root:
+        raise HTTPException(status_code=403, detail=f"Path is outside the ingest root: {path}")
+    return resolved
+
+
+def _prune_ingest_jobs(now: float) -> None:
+    """Drop finished jobs past their TTL, then the oldest finished ones over the cap"""
+    finished = sorted(
+        (progress.finished_at or 0.0, job_id)
+        for job_id, (progress, task) in ingest_jobs.items()
+        if task.done()
+    )
+    excess = len(ingest_jobs) - MAX_INGEST_JOBS
+    for finished_at, job_id in finished:
+        if finished_at > now - INGEST_JOB_TTL_SECONDS and excess <= 0:
+            break
+        del ingest_jobs[job_id]
+        excess -= 1
+
+
+@app.post("/ingest/directory", response_model=IngestJobStatus, status_code=202, tags=["rag"])
+async def ingest_directory(request: DirectoryIngestRequest):
+    """Start an incremental ingestion job for a server-side directory"""
+    if rag_pipeline is None or ingest_manifest is None:
+        raise HTTPException(status_code=503, detail="RAG pipeline not initialized")
+    path = _resolve_ingest_path(request.path)
+    if not os.path.isdir(path):
+        raise HTTPException(status_code=400, detail=f"Not a directory: {request.path}")
+    if Path(request.glob_pattern).is_absolute() or ".." in Path(request.glob_pattern).parts:
+        raise HTTPException(status_code=400, detail="glob_pattern must stay inside the directory")
+
+    _prune_ingest_jobs(time.time())
+    request = DirectoryIngestRequest(
+        path=path, glob_pattern=request.glob_pattern, max_workers=request.max_workers
+    )
+    job_id = uuid.uuid4().hex
+    progress = IngestProgress(directory=path)
+    task = asyncio.create_task(asyncio.to_thread(_run_directory_job, request, progress))
+    ingest_jobs[job_id] = (progress, task)
+
+    return IngestJobStatus(job_id=job_id, **progress.to_dict())
+
+
+@app.get("/ingest/jobs/{job_id}", response_model=IngestJobStatus, tags=["rag"])
+async def get_ingest_job(job_id: str):
+    """Get progress of a directory ingestion job"""
+    if job_id not in ingest_jobs:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+
+    progress, _ = ingest_jobs[job_id]
+    return IngestJobStatus(job_id=job_id, **progress.to_dict())
+
+
 @app.get("/metrics", tags=["monitoring"])
 async def metrics():
     """Prometheus metrics endpoint"""
@@ -84,6 +84,34 @@ class IngestResponse(BaseModel):
     documents_processed: int = Field(..., description="Number of documents processed")
 
 
+class DirectoryIngestRequest(BaseModel):
+    """Request to ingest a server-side directory"""
+
+    path: str = Field(..., description="Directory to ingest")
+    glob_pattern: str = Field("**/*", description="Glob pattern for files")
+    max_workers: Optional[int] = Field(
+        None, ge=0, description="Parser processes (None = CPU count, 0 = in-process)"
+    )
+
+
+class IngestJobStatus(BaseModel):
+    """Progress of a directory ingestion job"""
+
+    job_id: str = Field(..., description="Job ID")
+    directory: str = Field("", description="Directory being ingested")
+    status: str = Field(..., description="pending, running, completed or failed")
+    files_total: int = Field(0, description="Files discovered")
+    files_processed: int = Field(0, description="Files parsed and indexed")
+    files_skipped: int = Field(0, description="Unchanged files skipped")
+    files_failed: int = Field(0, description="Files that failed to load")
+    files_removed: int = Field(0, description="Deleted files removed from the index")
+    documents_ingested: int = Field(0, description="Documents indexed")
+    chunks_added: int = Field(0, description="Chunks added")
+    error: Optional[str] = Field(None, description="Error message if failed")
+    started_at: Optional[float] = Field(None, description="Start time (epoch seconds)")
+    finished_at: Optional[float] = Field(None, description="End time (epoch seconds)")
+
+
 class HealthResponse(BaseModel):
     """Health check response"""
 
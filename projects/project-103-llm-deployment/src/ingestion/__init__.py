@@ -10,8 +10,15 @@ from .loader import (
     CSVLoader,
     JSONLoader,
     DirectoryLoader,
+    FileLoadResult,
     get_loader,
 )
+from .incremental import (
+    IngestionManifest,
+    ManifestEntry,
+    IngestProgress,
+    IncrementalIngestor,
+)
 from .processor import (
     DocumentProcessor,
     TextNormalizer,
@@ -28,7 +35,12 @@ __all__ = [
     "CSVLoader",
     "JSONLoader",
     "DirectoryLoader",
+    "FileLoadResult",
     "get_loader",
+    "IngestionManifest",
+    "ManifestEntry",
+    "IngestProgress",
+    "IncrementalIngestor",
     "DocumentProcessor",
     "TextNormalizer",
     "DocumentDeduplicator",
@@ -0,0 +1,271 @@
+"""
+Incremental directory ingestion
+
+Keeps a manifest of (path, mtime, size, content hash, doc IDs) for every
+ingested file so that re-running ingestion over a directory only parses
+and re-embeds files that changed, and removes the chunks of files that
+were deleted.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .loader import DirectoryLoader, Document, FileLoadResult
+from .processor import DocumentProcessor
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ManifestEntry:
+    """What was ingested from one file"""
+
+    path: str
+    mtime: float
+    size: int
+    content_hash: str
+    doc_ids: List[str] = field(default_factory=list)
+
+
+class IngestionManifest:
+    """
+    JSON-backed record of ingested files
+    """
+
+    def __init__(self, manifest_path: str = "./ingest_manifest.json"):
+        """
+        Initialize manifest
+
+        Args:
+            manifest_path: File the manifest is persisted to
+        """
+        self.manifest_path = Path(manifest_path)
+        self.entries: Dict[str, ManifestEntry] = {}
+        self._lock = threading.Lock()
+
+        if self.manifest_path.exists():
+            with open(self.manifest_path, "r") as f:
+                data = json.load(f)
+            self.entries = {
+                path: ManifestEntry(**entry) for path, entry in data.get("files", {}).items()
+            }
+            logger.info(f"Loaded manifest with {len(self.entries)} files")
+
+    def get(self, path: str) -> Optional[ManifestEntry]:
+        """Get the entry for a file, if it was ingested before"""
+        return self.entries.get(path)
+
+    def update(self, entry: ManifestEntry) -> None:
+        """Record (or replace) a file's entry"""
+        with self._lock:
+            self.entries[entry.path] = entry
+
+    def remove(self, path: str) -> Optional[ManifestEntry]:
+        """Forget a file"""
+        with self._lock:
+            return self.entries.pop(path, None)
+
+    def paths_under(self, directory: str) -> List[str]:
+        """Paths of recorded files inside a directory"""
+        prefix = directory.rstrip(os.sep) + os.sep
+        return [path for path in self.entries if path.startswith(prefix)]
+
+    def save(self) -> None:
+        """Persist atomically (write temp file, then rename)"""
+        with self._lock:
+            data = {"files": {path: asdict(e) for path, e in self.entries.items()}}
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix(self.manifest_path.suffix + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.manifest_path)
+
+
+@dataclass
+class IngestProgress:
+    """Progress of one directory ingestion run"""
+
+    directory: str = ""
+    status: str = "pending"  # pending, running, completed, failed
+    files_total: int = 0
+    files_processed: int = 0
+    files_skipped: int = 0
+    files_failed: int = 0
+    files_removed: int = 0
+    documents_ingested: int = 0
+    chunks_added: int = 0
+    error: Optional[str] = None
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary"""
+        return asdict(self)
+
+
+class IncrementalIngestor:
+    """
+    Stream a directory into a RAG pipeline, re-indexing only what changed
+    """
+
+    def __init__(
+        self,
+        pipeline,
+        manifest: IngestionManifest,
+        loader: Optional[DirectoryLoader] = None,
+        processor: Optional[DocumentProcessor] = None,
+        batch_size: int = 64,
+    ):
+        """
+        Initialize ingestor
+
+        Args:
+            pipeline: RAGPipeline (needs add_documents and delete_documents)
+            manifest: Manifest of previously ingested files
+            loader: Directory loader (parses on a process pool)
+            processor: Optional cleaner applied to each document
+            batch_size: Documents per add_documents call
+        """
+        self.pipeline = pipeline
+        self.manifest = manifest
+        self.loader = loader or DirectoryLoader()
+        self.processor = processor
+        self.batch_size = batch_size
+
+    def run(
+        self, directory: str, progress: Optional[IngestProgress] = None
+    ) -> IngestProgress:
+        """
+        Ingest a directory incrementally
+
+        Args:
+            directory: Directory to ingest
+            progress: Progress object to update in place (for polling callers)
+
+        Returns:
+            Final progress
+        """
+        progress = progress or IngestProgress()
+        root = Path(directory).resolve()
+        progress.directory = str(root)
+        progress.status = "running"
+        progress.started_at = time.time()
+
+        try:
+            self._run(root, progress)
+            progress.status = "completed"
+        except Exception as e:
+            logger.error(f"Directory ingestion failed: {e}")
+            progress.status = "failed"
+            progress.error = str(e)
+            raise
+        finally:
+            progress.finished_at = time.time()
+            self.manifest.save()
+
+        logger.info(f"Directory ingestion finished: {progress.to_dict()}")
+        return progress
+
+    def _run(self, root: Path, progress: IngestProgress) -> None:
+        files = self.loader.discover(str(root))
+        progress.files_total = len(files)
+
+        # Files that disappeared since the last run
+        current = {str(p) for p in files}
+        for path in self.manifest.paths_under(str(root)):
+            if path not in current:
+                entry = self.manifest.remove(path)
+                self.pipeline.delete_documents(entry.doc_ids)
+                progress.files_removed += 1
+
+        # Cheap stat check first; only hash files whose mtime or size moved
+        to_load = []
+        known_hashes: Dict[str, str] = {}
+        for file_path in files:
+            entry = self.manifest.get(str(file_path))
+            try:
+                stat = file_path.stat()
+            except OSError:
+                # Gone since discovery; the loader records it as a failed file
+                to_load.append(file_path)
+                continue
+            if entry and entry.mtime == stat.st_mtime and entry.size == stat.st_size:
+                progress.files_skipped += 1
+                continue
+            if entry:
+                known_hashes[str(file_path)] = entry.content_hash
+            to_load.append(file_path)
+
+        batch: List[Document] = []
+        batch_entries: List[ManifestEntry] = []
+        for result in self.loader.iter_files(to_load, known_hashes=known_hashes):
+            if result.error:
+                logger.error(f"Failed to load {result.path}: {result.error}")
+                progress.files_failed += 1
+                continue
+
+            previous = self.manifest.get(result.path)
+            if result.unchanged:
+                # Touched but identical: refresh stat info, keep the indexed chunks
+                self.manifest.update(self._entry(result, previous.doc_ids))
+                progress.files_skipped += 1
+                continue
+
+            if previous:
+                self.pipeline.delete_documents(previous.doc_ids)
+
+            documents = self._process(result.documents, root)
+            batch.extend(documents)
+            batch_entries.append(self._entry(result, [d.doc_id for d in documents]))
+            progress.files_processed += 1
+
+            if len(batch) >= self.batch_size:
+                self._flush(batch, batch_entries, progress)
+                batch, batch_entries = [], []
+
+        self._flush(batch, batch_entries, progress)
+
+    def _process(self, documents: List[Document], root: Path) -> List[Document]:
+        # Loaders key documents by file stem; prefix the relative path so that
+        # a/x.txt and b/x.txt don't collide when one of them is re-indexed.
+        for doc in documents:
+            source = Path(doc.metadata.get("source", ""))
+            if source.is_absolute() and root in source.parents:
+                doc.doc_id = f"{source.relative_to(root)}::{doc.doc_id}"
+        if self.processor is None:
+            return documents
+        processed = (self.processor.process(d) for d in documents)
+        return [d for d in processed if d is not None]
+
+    def _flush(
+        self,
+        documents: List[Document],
+        entries: List[ManifestEntry],
+        progress: IngestProgress,
+    ) -> None:
+        """Write a batch, then record its files so a crash only redoes this batch"""
+        if documents:
+            progress.chunks_added += self.pipeline.add_documents(
+                [{**d.metadata, "id": d.doc_id, "text": d.text} for d in documents]
+            )
+            progress.documents_ingested += len(documents)
+        for entry in entries:
+            self.manifest.update(entry)
+        if entries:
+            self.manifest.save()
+
+    @staticmethod
+    def _entry(result: FileLoadResult, doc_ids: List[str]) -> ManifestEntry:
+        return ManifestEntry(
+            path=result.path,
+            mtime=result.mtime,
+            size=result.size,
+            content_hash=result.content_hash,
+            doc_ids=doc_ids,
+        )
@@ -4,8 +4,14 @@ Document loaders for various file formats
 Supports: PDF, TXT, MD, HTML, DOCX, CSV, JSON
 """
 
+import hashlib
+import itertools
 import logging
-from typing import List, Dict, Any, Optional
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Iterator, Optional
 from pathlib import Path
 import mimetypes
 
@@ -79,6 +85,20 @@ class PDFLoader(DocumentLoader):
             logger.warning("pypdf not available. Install with: pip install pypdf")
             self.pypdf = None
 
+    def __getstate__(self):
+        # Modules don't pickle; re-import in the worker process instead
+        state = self.__dict__.copy()
+        state["pypdf"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        try:
+            import pypdf
+            self.pypdf = pypdf
+        except ImportError:
+            self.pypdf = None
+
     def load(self, file_path: str) -> List[Document]:
         """Load PDF file"""
         if self.pypdf is None:
@@ -291,6 +311,46 @@ class JSONLoader(DocumentLoader):
         return documents
 
 
+@dataclass
+class FileLoadResult:
+    """Outcome of loading one file during a directory scan"""
+
+    path: str
+    mtime: float
+    size: int
+    content_hash: str = ""
+    documents: List[Document] = field(default_factory=list)
+    unchanged: bool = False  # content hash matched the caller's known hash
+    error: Optional[str] = None
+
+
+def hash_file(file_path: str, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's bytes, read in chunks"""
+    h = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _load_file(
+    loader: DocumentLoader, file_path: str, known_hash: Optional[str] = None
+) -> FileLoadResult:
+    """Hash and parse one file (runs inside a worker process)"""
+    result = FileLoadResult(path=file_path, mtime=0.0, size=0)
+    try:
+        stat = Path(file_path).stat()
+        result.mtime, result.size = stat.st_mtime, stat.st_size
+        result.content_hash = hash_file(file_path)
+        if known_hash is not None and result.content_hash == known_hash:
+            result.unchanged = True
+            return result
+        result.documents = loader.load(file_path)
+    except Exception as e:
+        result.error = str(e)
+    return result
+
+
 class DirectoryLoader(DocumentLoader):
     """Load all documents from a directory"""
 
@@ -299,6 +359,7 @@ class DirectoryLoader(DocumentLoader):
         glob_pattern: str = "**/*",
         exclude_patterns: Optional[List[str]] = None,
         loader_map: Optional[Dict[str, DocumentLoader]] = None,
+        max_workers: Optional[int] = None,
     ):
         """
         Initialize directory loader
@@ -307,9 +368,11 @@ class DirectoryLoader(DocumentLoader):
             glob_pattern: Glob pattern for file matching
             exclude_patterns: Patterns to exclude
             loader_map: Map of file extensions to loaders
+            max_workers: Parser processes for iter_files (None = CPU count, 0 = in-process)
         """
         self.glob_pattern = glob_pattern
         self.exclude_patterns = exclude_patterns or []
+        self.max_workers = max_workers
 
         # Default loader map
         self.loader_map = loader_map or {
@@ -322,19 +385,15 @@ class DirectoryLoader(DocumentLoader):
             ".json": JSONLoader(),
         }
 
-    def load(self, directory_path: str) -> List[Document]:
-        """Load all documents from directory"""
+    def discover(self, directory_path: str) -> List[Path]:
+        """List loadable files under a directory (excluded and unknown types skipped)"""
         path = Path(directory_path)
 
         if not path.is_dir():
             raise ValueError(f"Not a directory: {directory_path}")
 
-        documents = []
-        file_paths = list(path.glob(self.glob_pattern))
-
-        logger.info(f"Found {len(file_paths)} files in {directory_path}")
-
-        for file_path in file_paths:
+        files = []
+        for file_path in path.glob(self.glob_pattern):
             # Skip directories
             if file_path.is_dir():
                 continue
@@ -343,21 +402,79 @@ class DirectoryLoader(DocumentLoader):
             if any(pattern in str(file_path) for pattern in self.exclude_patterns):
                 continue
 
-            # Get appropriate loader
-            extension = file_path.suffix.lower()
-            loader = self.loader_map.get(extension)
-
-            if loader is None:
-                logger.debug(f"No loader for {extension}, skipping {file_path}")
+            if file_path.suffix.lower() not in self.loader_map:
+                logger.debug(f"No loader for {file_path.suffix}, skipping {file_path}")
                 continue
 
-            try:
-                docs = loader.load(str(file_path))
-                documents.extend(docs)
-                logger.debug(f"Loaded {len(docs)} documents from {file_path}")
-            except Exception as e:
-                logger.error(f"Failed to load {file_path}: {e}")
+            files.append(file_path)
+
+        logger.info(f"Found {len(files)} loadable files in {directory_path}")
+        return files
+
+    def iter_files(
+        self,
+        file_paths: List[Path],
+        known_hashes: Optional[Dict[str, str]] = None,
+        max_workers: Optional[int] = None,
+    ) -> Iterator[FileLoadResult]:
+        """
+        Parse files on a process pool, yielding results as they complete
 
+        Args:
+            file_paths: Files to load (see discover)
+            known_hashes: path -> content hash; matching files are hashed but not parsed
+            max_workers: Override the loader's max_workers
+
+        Yields:
+            One FileLoadResult per file, in completion order
+        """
+        known_hashes = known_hashes or {}
+        max_workers = self.max_workers if max_workers is None else max_workers
+        jobs = [
+            (self.loader_map[p.suffix.lower()], str(p), known_hashes.get(str(p)))
+            for p in file_paths
+        ]
+
+        if max_workers == 0:
+            for job in jobs:
+                yield _load_file(*job)
+            return
+
+        workers = max_workers or os.cpu_count() or 1
+        # Spawn, not fork: callers run this from a worker thread of a process
+        # that may already hold torch and other threads' locks.
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            # Keep a bounded number of files in flight so results stream out
+            # steadily and memory doesn't hold every parsed document at once.
+            jobs_iter = iter(jobs)
+            pending = {
+                pool.submit(_load_file, *job)
+                for job in itertools.islice(jobs_iter, 4 * workers)
+            }
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+                    next_job = next(jobs_iter, None)
+                    if next_job is not None:
+                        pending.add(pool.submit(_load_file, *next_job))
+
+    def iter_load(
+        self, directory_path: str, max_workers: Optional[int] = None
+    ) -> Iterator[Document]:
+        """Stream documents from a directory as files finish parsing"""
+        for result in self.iter_files(self.discover(directory_path), max_workers=max_workers):
+            if result.error:
+                logger.error(f"Failed to load {result.path}: {result.error}")
+                continue
+            logger.debug(f"Loaded {len(result.documents)} documents from {result.path}")
+            yield from result.documents
+
+    def load(self, directory_path: str) -> List[Document]:
+        """Load all documents from directory (in-process, discovery order)"""
+        documents = list(self.iter_load(directory_path, max_workers=0))
         logger.info(f"Loaded {len(documents)} documents total")
         return documents
 
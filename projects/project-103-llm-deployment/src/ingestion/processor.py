@@ -6,7 +6,11 @@ Text extraction, cleaning, and normalization
 
 import logging
 import re
-from typing import List, Optional
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
 from .loader import Document
 
 logger = logging.getLogger(__name__)
@@ -260,19 +264,72 @@ class TextNormalizer:
         return text
 
 
+# MinHash uses the universal hash family (a * x + b) mod p over 32-bit shingle hashes
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def _lsh_params(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """
+    Choose (bands, rows) for LSH so the S-curve's steep point (1/b)^(1/r)
+    sits just below the Jaccard threshold (favouring recall over precision;
+    candidates are verified against the signatures afterwards)
+    """
+    best = (num_perm, 1)
+    best_error = float("inf")
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        midpoint = (1.0 / bands) ** (1.0 / rows)
+        error = abs(midpoint - (threshold - 0.1))
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
 class DocumentDeduplicator:
     """
     Remove duplicate documents
+
+    Near-duplicates can be detected two ways, both greedy in input order
+    (a document is dropped if it matches any earlier kept document):
+
+    - "embedding": cosine similarity of embeddings, computed block by block
+      with matrix multiplies instead of one Python call per pair
+    - "minhash": Jaccard similarity of word shingles, estimated with MinHash
+      signatures and LSH banding so only candidate pairs are compared
     """
 
-    def __init__(self, similarity_threshold: float = 0.95):
+    def __init__(
+        self,
+        similarity_threshold: float = 0.95,
+        jaccard_threshold: float = 0.8,
+        num_perm: int = 128,
+        shingle_size: int = 5,
+        block_size: int = 1024,
+        seed: int = 1,
+    ):
         """
         Initialize deduplicator
 
         Args:
-            similarity_threshold: Threshold for considering documents duplicates
+            similarity_threshold: Cosine threshold for embedding duplicates
+            jaccard_threshold: Shingle Jaccard threshold for MinHash duplicates
+            num_perm: Number of MinHash permutations (signature length)
+            shingle_size: Words per shingle
+            block_size: Rows per matrix multiply in embedding mode
+            seed: Seed for the MinHash permutations
         """
         self.similarity_threshold = similarity_threshold
+        self.jaccard_threshold = jaccard_threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.block_size = block_size
+
+        rng = np.random.RandomState(seed)
+        self._perm_a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._perm_b = rng.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+        self.bands, self.rows = _lsh_params(jaccard_threshold, num_perm)
 
     def deduplicate(self, documents: List[Document]) -> List[Document]:
         """
@@ -308,7 +365,10 @@ class DocumentDeduplicator:
         return unique_docs
 
     def deduplicate_fuzzy(
-        self, documents: List[Document], embedding_model=None
+        self,
+        documents: List[Document],
+        embedding_model=None,
+        method: Optional[str] = None,
     ) -> List[Document]:
         """
         Remove duplicates using fuzzy matching
@@ -316,40 +376,156 @@ class DocumentDeduplicator:
         Args:
             documents: List of documents
             embedding_model: Embedding model for similarity
+            method: "embedding" or "minhash" (default: embedding if a model
+                is given, otherwise exact matching)
 
         Returns:
             Deduplicated list
         """
-        if not documents or embedding_model is None:
+        if method is None:
+            method = "embedding" if embedding_model is not None else "exact"
+
+        if not documents or method == "exact":
             return self.deduplicate(documents)
 
-        # Generate embeddings
-        texts = [doc.text for doc in documents]
-        embeddings = embedding_model.encode(texts)
+        if method == "minhash":
+            keep = self.minhash_keep_mask(documents)
+        elif method == "embedding":
+            if embedding_model is None:
+                raise ValueError("method='embedding' requires an embedding_model")
+            embeddings = embedding_model.encode([doc.text for doc in documents])
+            keep = self.embedding_keep_mask(embeddings)
+        else:
+            raise ValueError(f"Unknown deduplication method: {method}")
 
-        # Find duplicates using cosine similarity
-        unique_indices = [0]  # Always keep first document
+        unique_docs = [doc for doc, kept in zip(documents, keep) if kept]
 
-        for i in range(1, len(documents)):
-            is_duplicate = False
+        logger.info(
+            f"Fuzzy deduplication ({method}): "
+            f"{len(unique_docs)}/{len(documents)} unique documents"
+        )
 
-            for j in unique_indices:
-                similarity = embedding_model.similarity(embeddings[i], embeddings[j])
+        return unique_docs
 
-                if similarity >= self.similarity_threshold:
-                    is_duplicate = True
-                    logger.debug(
-                        f"Document {i} is duplicate of {j} (similarity: {similarity:.3f})"
-                    )
-                    break
+    def embedding_keep_mask(self, embeddings: np.ndarray) -> np.ndarray:
+        """
+        Greedy cosine dedup over embeddings
 
-            if not is_duplicate:
-                unique_indices.append(i)
+        Each block of rows is scored against all kept rows with one matrix
+        multiply; only rows that survive are then resolved against each other
+        in order, so decisions match the pairwise loop exactly.
 
-        unique_docs = [documents[i] for i in unique_indices]
+        Args:
+            embeddings: Array of shape (num_documents, dim)
 
-        logger.info(
-            f"Fuzzy deduplication: {len(unique_docs)}/{len(documents)} unique documents"
-        )
+        Returns:
+            Boolean array, True for documents to keep
+        """
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        n = len(vectors)
+        keep = np.zeros(n, dtype=bool)
+        if n == 0:
+            return keep
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        vectors = vectors / norms
+
+        kept = np.empty_like(vectors)  # kept rows, packed
+        n_kept = 0
+        threshold = self.similarity_threshold
+
+        for start in range(0, n, self.block_size):
+            block = vectors[start : start + self.block_size]
+
+            # Against everything kept in earlier blocks
+            if n_kept:
+                candidate = (block @ kept[:n_kept].T).max(axis=1) < threshold
+            else:
+                candidate = np.ones(len(block), dtype=bool)
 
-        return unique_docs
+            # Within the block, in order
+            rows = np.flatnonzero(candidate)
+            if len(rows):
+                sims = block[rows] @ block[rows].T
+                block_keep = np.zeros(len(rows), dtype=bool)
+                for i in range(len(rows)):
+                    if not (sims[i, :i][block_keep[:i]] >= threshold).any():
+                        block_keep[i] = True
+                rows = rows[block_keep]
+
+            keep[start + rows] = True
+            kept[n_kept : n_kept + len(rows)] = block[rows]
+            n_kept += len(rows)
+
+        return keep
+
+    def minhash_signatures(self, texts: List[str]) -> np.ndarray:
+        """
+        Compute MinHash signatures of word shingles
+
+        Args:
+            texts: Texts to sign
+
+        Returns:
+            uint64 array of shape (len(texts), num_perm)
+        """
+        vocab: Dict[str, int] = {}
+        signatures = np.empty((len(texts), self.num_perm), dtype=np.uint64)
+        k = self.shingle_size
+
+        for i, text in enumerate(texts):
+            tokens = np.fromiter(
+                (vocab.setdefault(w, len(vocab)) for w in _TOKEN_PATTERN.findall(text.lower())),
+                dtype=np.uint64,
+            )
+            if len(tokens) == 0:
+                signatures[i] = _MAX_HASH
+                continue
+
+            # Polynomial hash of each k-token window, mixed down to 32 bits
+            width = min(k, len(tokens))
+            shingles = np.zeros(len(tokens) - width + 1, dtype=np.uint64)
+            for j in range(width):
+                shingles = shingles * np.uint64(1_000_003) + tokens[j : len(tokens) - width + 1 + j]
+            shingles = np.unique(((shingles * np.uint64(0x9E3779B97F4A7C15)) >> np.uint64(32)))
+
+            hashed = (np.outer(self._perm_a, shingles) + self._perm_b[:, None]) % _MERSENNE_PRIME
+            signatures[i] = (hashed & _MAX_HASH).min(axis=1)
+
+        return signatures
+
+    def minhash_keep_mask(self, documents: List[Document]) -> np.ndarray:
+        """
+        Greedy Jaccard dedup with MinHash + LSH
+
+        Args:
+            documents: List of documents
+
+        Returns:
+            Boolean array, True for documents to keep
+        """
+        signatures = self.minhash_signatures([doc.text for doc in documents])
+        keep = np.zeros(len(documents), dtype=bool)
+        buckets: List[Dict[bytes, List[int]]] = [defaultdict(list) for _ in range(self.bands)]
+
+        for i, signature in enumerate(signatures):
+            keys = [
+                signature[b * self.rows : (b + 1) * self.rows].tobytes()
+                for b in range(self.bands)
+            ]
+
+            # Kept documents sharing at least one band are candidates
+            candidates = {j for band, key in zip(buckets, keys) for j in band.get(key, ())}
+            if candidates:
+                candidates = np.fromiter(candidates, dtype=np.int64)
+                jaccard = (signatures[candidates] == signature).mean(axis=1)
+                if (jaccard >= self.jaccard_threshold).any():
+                    logger.debug(f"Document {i} is a near-duplicate (MinHash)")
+                    continue
+
+            keep[i] = True
+            for band, key in zip(buckets, keys):
+                band[key].append(i)
+
+        return keep
@@ -1,12 +1,14 @@
 """LLM serving module"""
 
 from .server import LLMServer, GenerationRequest, GenerationResponse
+from .batcher import RequestBatcher
 from .model_config import ModelConfig, get_config, PREDEFINED_CONFIGS
 
 __all__ = [
     "LLMServer",
     "GenerationRequest",
     "GenerationResponse",
+    "RequestBatcher",
     "ModelConfig",
     "get_config",
     "PREDEFINED_CONFIGS",
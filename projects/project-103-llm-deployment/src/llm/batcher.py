@@ -0,0 +1,186 @@
+"""
+Request batching for the transformers backend
+
+Concurrent generate() calls are put on an asyncio queue; a single worker
+collects requests for a short window, groups those with identical sampling
+settings, and runs each group as one padded batch on a dedicated generation
+thread. The event loop only awaits futures, so /health and /metrics stay
+responsive while the model is busy.
+"""
+
+import asyncio
+import functools
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingRequest:
+    request: Any
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class RequestBatcher:
+    """
+    Group concurrent requests into batches for a synchronous batch function
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 8,
+        max_wait_ms: float = 10.0,
+        group_key: Optional[Callable[[Any], Tuple]] = None,
+    ):
+        """
+        Initialize batcher
+
+        Args:
+            batch_fn: Runs a list of requests, returns one result per request
+                (called on the generation thread)
+            max_batch_size: Most requests per batch_fn call
+            max_wait_ms: How long to wait for more requests after the first
+            group_key: Requests are only batched with others of the same key
+        """
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.group_key = group_key or (lambda request: ())
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        # Requests taken off the queue whose batch hasn't finished yet
+        self._inflight: List[_PendingRequest] = []
+        self._closed = False
+        # One thread: the model is not safe to call concurrently
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="generation")
+
+        self.batches_run = 0
+        self.requests_run = 0
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    def start(self) -> None:
+        """Start the worker on the running event loop"""
+        if self._closed:
+            raise RuntimeError("RequestBatcher has been stopped")
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stop the worker
+
+        Every request still waiting, queued or mid-batch, fails with
+        RuntimeError. The batcher can't be restarted afterwards.
+        """
+        self._closed = True
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        stopped = RuntimeError("RequestBatcher stopped before the request ran")
+        pending = self._inflight
+        self._inflight = []
+        while self._queue is not None and not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for item in pending:
+            if not item.future.done():
+                item.future.set_exception(stopped)
+        self._executor.shutdown(wait=False)
+
+    def run_exclusive(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> asyncio.Future:
+        """
+        Run fn on the generation thread, between batches
+
+        For model calls that can't go through batch_fn (e.g. streaming),
+        so they never run concurrently with a batch.
+
+        Returns:
+            Future resolving to fn's return value
+        """
+        if self._closed:
+            raise RuntimeError("RequestBatcher has been stopped")
+        return asyncio.get_running_loop().run_in_executor(
+            self._executor, functools.partial(fn, *args, **kwargs)
+        )
+
+    async def submit(self, request: Any) -> Any:
+        """
+        Queue a request and wait for its result
+
+        Args:
+            request: Request passed (with others) to batch_fn
+
+        Returns:
+            The result batch_fn produced for this request
+        """
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(_PendingRequest(request, future))
+        return await future
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batching statistics"""
+        return {
+            "batches": self.batches_run,
+            "requests": self.requests_run,
+            "avg_batch_size": self.requests_run / self.batches_run if self.batches_run else 0.0,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+        }
+
+    async def _collect(self) -> List[_PendingRequest]:
+        """Block for one request, then gather more until the window or batch fills"""
+        # Collected straight into _inflight so stop() can fail them
+        pending = self._inflight = [await self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait_ms / 1000
+        while len(pending) < self.max_batch_size:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                pending.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return pending
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = await self._collect()
+
+            groups: Dict[Tuple, List[_PendingRequest]] = {}
+            for item in pending:
+                if not item.future.cancelled():
+                    groups.setdefault(self.group_key(item.request), []).append(item)
+
+            for group in groups.values():
+                requests = [item.request for item in group]
+                try:
+                    results = await loop.run_in_executor(self._executor, self.batch_fn, requests)
+                except Exception as e:
+                    logger.error(f"Batch of {len(group)} requests failed: {e}")
+                    for item in group:
+                        if not item.future.done():
+                            item.future.set_exception(e)
+                    continue
+
+                self.batches_run += 1
+                self.requests_run += len(group)
+                for item, result in zip(group, results):
+                    if not item.future.done():
+                        item.future.set_result(result)
+            self._inflight = []
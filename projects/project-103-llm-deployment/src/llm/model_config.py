@@ -29,6 +29,10 @@ class ModelConfig:
     use_vllm: bool = True
     tensor_parallel_size: int = 1  # Number of GPUs for tensor parallelism
 
+    # Transformers backend batching
+    max_batch_size: int = 8  # Requests per padded generate() call
+    batch_wait_ms: float = 10.0  # Collection window after the first queued request
+
     # Safety and trust
     trust_remote_code: bool = False
 
@@ -145,6 +149,9 @@ class ModelConfig:
         if self.max_model_len < 256:
             raise ValueError(f"max_model_len too small: {self.max_model_len}")
 
+        if self.max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be >= 1, got {self.max_batch_size}")
+
         if self.tensor_parallel_size < 1:
             raise ValueError(
                 f"tensor_parallel_size must be >= 1, got {self.tensor_parallel_size}"
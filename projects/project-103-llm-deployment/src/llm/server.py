@@ -27,8 +27,8 @@ from transformers import (
     AutoTokenizer,
     TextIteratorStreamer,
 )
-from threading import Thread
 
+from .batcher import RequestBatcher
 from .model_config import ModelConfig
 
 logger = logging.getLogger(__name__)
@@ -69,6 +69,7 @@ class LLMServer:
         self.model = None
         self.tokenizer = None
         self.engine = None
+        self.batcher: Optional[RequestBatcher] = None
         self.use_vllm = VLLM_AVAILABLE and config.use_vllm
 
         logger.info(f"Initializing LLM server with model: {config.model_name}")
@@ -119,6 +120,10 @@ class LLMServer:
             self.config.model_name,
             cache_dir=self.config.cache_dir,
         )
+        # Left padding so every row of a batch ends at the generation boundary
+        self.tokenizer.padding_side = "left"
+        if self.tokenizer.pad_token is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
 
         # Determine dtype
         dtype = torch.float16 if self.config.dtype == "float16" else torch.float32
@@ -136,8 +141,20 @@ class LLMServer:
         else:
             logger.warning("No GPU available, using CPU (will be slow)")
 
+        self.batcher = RequestBatcher(
+            self._generate_batch_transformers,
+            max_batch_size=self.config.max_batch_size,
+            max_wait_ms=self.config.batch_wait_ms,
+            group_key=self._sampling_key,
+        )
+
         logger.info("Transformers model initialized")
 
+    async def shutdown(self):
+        """Stop the generation worker"""
+        if self.batcher is not None:
+            await self.batcher.stop()
+
     async def generate(
         self, request: GenerationRequest
     ) -> Union[GenerationResponse, AsyncGenerator[str, None]]:
@@ -207,44 +224,81 @@ class LLMServer:
     async def _generate_transformers(
         self, request: GenerationRequest
     ) -> GenerationResponse:
-        """Generate using transformers (fallback)"""
-        # Tokenize
+        """Generate using transformers (fallback), batched with concurrent requests"""
+        return await self.batcher.submit(request)
+
+    @staticmethod
+    def _sampling_key(request: GenerationRequest) -> tuple:
+        """Requests can share a generate() call only if they sample the same way"""
+        return (
+            request.max_tokens,
+            request.temperature,
+            request.top_p,
+            request.top_k,
+            request.repetition_penalty,
+        )
+
+    def _generate_batch_transformers(
+        self, requests: List[GenerationRequest]
+    ) -> List[GenerationResponse]:
+        """
+        Run one padded generate() call for requests with the same sampling settings
+
+        Runs on the batcher's generation thread, never on the event loop.
+
+        Args:
+            requests: Requests to generate for
+
+        Returns:
+            One response per request, in order
+        """
+        first = requests[0]
         inputs = self.tokenizer(
-            request.prompt, return_tensors="pt", padding=True, truncation=True
+            [r.prompt for r in requests], return_tensors="pt", padding=True, truncation=True
         )
 
         if torch.cuda.is_available():
             inputs = {k: v.cuda() for k, v in inputs.items()}
 
-        prompt_tokens = inputs["input_ids"].shape[1]
+        input_length = inputs["input_ids"].shape[1]
+        do_sample = first.temperature > 0
 
         # Generate
         with torch.no_grad():
             outputs = self.model.generate(
                 **inputs,
-                max_new_tokens=request.max_tokens,
-                temperature=request.temperature,
-                top_p=request.top_p,
-                top_k=request.top_k,
-                repetition_penalty=request.repetition_penalty,
-                do_sample=True,
-                pad_token_id=self.tokenizer.eos_token_id,
+                max_new_tokens=max(r.max_tokens for r in requests),
+                temperature=first.temperature if do_sample else None,
+                top_p=first.top_p if do_sample else None,
+                top_k=first.top_k if do_sample else None,
+                repetition_penalty=first.repetition_penalty,
+                do_sample=do_sample,
+                pad_token_id=self.tokenizer.pad_token_id,
             )
 
-        # Decode
-        completion_text = self.tokenizer.decode(
-            outputs[0][prompt_tokens:], skip_special_tokens=True
-        )
-        completion_tokens = outputs.shape[1] - prompt_tokens
+        responses = []
+        eos_token_id = self.tokenizer.eos_token_id
+        for i, request in enumerate(requests):
+            completion_ids = outputs[i][input_length:].tolist()[: request.max_tokens]
+            finish_reason = "length"
+            if eos_token_id in completion_ids:
+                completion_ids = completion_ids[: completion_ids.index(eos_token_id)]
+                finish_reason = "stop"
+
+            prompt_tokens = int(inputs["attention_mask"][i].sum())
+            completion_tokens = len(completion_ids)
+            responses.append(
+                GenerationResponse(
+                    text=self.tokenizer.decode(completion_ids, skip_special_tokens=True),
+                    prompt_tokens=prompt_tokens,
+                    completion_tokens=completion_tokens,
+                    total_tokens=prompt_tokens + completion_tokens,
+                    finish_reason=finish_reason,
+                    model=self.config.model_name,
+                )
+            )
 
-        return GenerationResponse(
-            text=completion_text,
-            prompt_tokens=prompt_tokens,
-            completion_tokens=completion_tokens,
-            total_tokens=prompt_tokens + completion_tokens,
-            finish_reason="stop",
-            model=self.config.model_name,
-        )
+        return responses
 
     async def _generate_stream(
         self, request: GenerationRequest
@@ -313,16 +367,24 @@ class LLMServer:
             pad_token_id=self.tokenizer.eos_token_id,
         )
 
-        # Run generation in background thread
-        thread = Thread(target=self.model.generate, kwargs=generation_kwargs)
-        thread.start()
-
-        # Stream results
-        for text in streamer:
-            yield text
-            await asyncio.sleep(0)  # Allow other tasks to run
+        # Generate on the batcher's thread so it never overlaps a batch
+        generation = self.batcher.run_exclusive(self.model.generate, **generation_kwargs)
+        # If generate() fails the streamer is never closed; close it so reads end
+        generation.add_done_callback(
+            lambda f: streamer.end() if f.cancelled() or f.exception() else None
+        )
 
-        thread.join()
+        # Stream results; reads block, so they run off the event loop
+        loop = asyncio.get_running_loop()
+        finished = object()
+        try:
+            while True:
+                text = await loop.run_in_executor(None, next, streamer, finished)
+                if text is finished:
+                    break
+                yield text
+        finally:
+            await generation
 
     def get_model_info(self) -> Dict[str, any]:
         """Get model information"""
@@ -332,6 +394,7 @@ class LLMServer:
             "quantization": self.config.quantization,
             "max_model_len": self.config.max_model_len,
             "backend": "vllm" if self.use_vllm else "transformers",
+            "batching": self.batcher.get_stats() if self.batcher else None,
             "gpu_available": torch.cuda.is_available(),
             "gpu_name": (
                 torch.cuda.get_device_name() if torch.cuda.is_available() else None
@@ -9,6 +9,7 @@ from .retriever import (
     RetrievalResult,
     create_retriever,
 )
+from .embedding_cache import EmbeddingCache, content_hash
 from .pipeline import RAGPipeline, RAGConfig, RAGResponse
 
 __all__ = [
@@ -23,6 +24,8 @@ __all__ = [
     "PineconeRetriever",
     "RetrievalResult",
     "create_retriever",
+    "EmbeddingCache",
+    "content_hash",
     "RAGPipeline",
     "RAGConfig",
     "RAGResponse",
@@ -0,0 +1,179 @@
+"""
+Content-addressed embedding cache for RAG ingestion
+
+Embeddings are keyed by a hash of (model name, normalize flag, chunk text)
+and persisted in SQLite, so re-ingesting unchanged chunks skips the encoder.
+The cache is size-bounded: once it holds more than `max_entries` vectors the
+least recently used ones are evicted. The row count is read once on open and
+then kept in memory, so one process should own the file while it writes.
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# SQLite caps host parameters per statement; stay well below the limit.
+_SQL_BATCH = 500
+
+
+def content_hash(text: str, model_name: str, normalize: bool = True) -> str:
+    """Stable cache key for one chunk text under one embedding model."""
+    h = hashlib.sha256()
+    h.update(model_name.encode())
+    h.update(b"\x00n" if normalize else b"\x00r")
+    h.update(text.encode())
+    return h.hexdigest()
+
+
+class EmbeddingCache:
+    """
+    On-disk, LRU-bounded cache of float32 embedding vectors
+    """
+
+    def __init__(
+        self,
+        path: str = "./embedding_cache.sqlite",
+        max_entries: int = 1_000_000,
+    ):
+        """
+        Initialize embedding cache
+
+        Args:
+            path: SQLite file (":memory:" for a process-local cache)
+            max_entries: Evict least recently used vectors beyond this many
+        """
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " key TEXT PRIMARY KEY, dim INTEGER NOT NULL,"
+            " vector BLOB NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_last_used ON embeddings(last_used)"
+        )
+        self._conn.commit()
+        self._count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Look up many keys at once
+
+        Args:
+            keys: Content hashes
+
+        Returns:
+            Mapping of the keys that were found to their vectors
+        """
+        found: Dict[str, np.ndarray] = {}
+        now = time.time()
+        with self._lock:
+            for batch in _batches(keys, _SQL_BATCH):
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, dim, vector FROM embeddings WHERE key IN ({placeholders})",
+                    batch,
+                ).fetchall()
+                for key, dim, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32, count=dim)
+                if rows:
+                    self._conn.executemany(
+                        "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                        [(now, key) for key, _, _ in rows],
+                    )
+            self._conn.commit()
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, keys: List[str], vectors: np.ndarray) -> None:
+        """
+        Store vectors for keys (one row of `vectors` per key), then evict if over budget
+
+        Args:
+            keys: Content hashes
+            vectors: Array of shape (len(keys), dim)
+        """
+        if not keys:
+            return
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        now = time.time()
+        rows = [
+            (key, vectors.shape[1], vectors[i].tobytes(), now)
+            for i, key in enumerate(keys)
+        ]
+        with self._lock:
+            unique = list(dict.fromkeys(keys))
+            existing = 0
+            for batch in _batches(unique, _SQL_BATCH):
+                placeholders = ",".join("?" * len(batch))
+                existing += self._conn.execute(
+                    f"SELECT COUNT(*) FROM embeddings WHERE key IN ({placeholders})", batch
+                ).fetchone()[0]
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, dim, vector, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._count += len(unique) - existing
+            self._evict_locked()
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def clear(self) -> None:
+        """Remove every cached vector"""
+        with self._lock:
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
+            self._count = 0
+
+    def close(self) -> None:
+        """Close the underlying connection"""
+        with self._lock:
+            self._conn.close()
+
+    def get_stats(self) -> dict:
+        """Get cache statistics"""
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "entries": len(self),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _evict_locked(self) -> None:
+        excess = self._count - self.max_entries
+        if excess > 0:
+            self._count -= self._conn.execute(
+                "DELETE FROM embeddings WHERE key IN ("
+                " SELECT key FROM embeddings ORDER BY last_used LIMIT ?)",
+                (excess,),
+            ).rowcount
+            logger.debug(f"Evicted {excess} embeddings from cache")
+
+
+def _batches(items: List[str], size: int) -> Iterable[List[str]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
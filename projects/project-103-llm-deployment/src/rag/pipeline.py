@@ -8,7 +8,10 @@ import logging
 from typing import List, Optional, Dict, Any
 from dataclasses import dataclass
 
+import numpy as np
+
 from .embeddings import EmbeddingModel
+from .embedding_cache import EmbeddingCache, content_hash
 from .retriever import VectorRetriever, RetrievalResult
 from .chunking import TextChunker, Chunk
 
@@ -25,6 +28,8 @@ class RAGConfig:
     min_similarity_score: float = 0.5  # Minimum similarity threshold
     max_context_length: int = 2048  # Maximum context length in tokens
     rerank: bool = False  # Enable reranking (if available)
+    embedding_batch_size: int = 256  # Texts per encoder call during ingestion
+    ingest_batch_size: int = 1000  # Chunks per vector-store write
 
 
 @dataclass
@@ -48,6 +53,7 @@ class RAGPipeline:
         embedding_model: EmbeddingModel,
         retriever: VectorRetriever,
         config: Optional[RAGConfig] = None,
+        embedding_cache: Optional[EmbeddingCache] = None,
     ):
         """
         Initialize RAG pipeline
@@ -56,10 +62,12 @@ class RAGPipeline:
             embedding_model: Model for generating embeddings
             retriever: Vector retriever
             config: Pipeline configuration
+            embedding_cache: Optional content-hash keyed embedding cache
         """
         self.embedding_model = embedding_model
         self.retriever = retriever
         self.config = config or RAGConfig()
+        self.embedding_cache = embedding_cache
 
         logger.info("RAG pipeline initialized")
 
@@ -73,6 +81,11 @@ class RAGPipeline:
         """
         Add documents to the vector store
 
+        All documents are chunked first; identical chunk texts are embedded
+        once, cached embeddings are reused, and only the misses go to the
+        encoder in `embedding_batch_size` batches. Chunks are then streamed
+        into the retriever in `ingest_batch_size` batches.
+
         Args:
             documents: List of documents (dicts with text and metadata)
             text_key: Key for text content
@@ -89,15 +102,16 @@ class RAGPipeline:
             chunk_overlap=self.config.chunk_overlap,
         )
 
-        all_chunks = []
-        all_embeddings = []
-        all_metadatas = []
-        all_ids = []
+        # 1. Chunk everything, mapping each chunk to a unique-text slot
+        all_ids: List[str] = []
+        all_metadatas: List[dict] = []
+        slot_of_chunk: List[int] = []
+        slot_of_text: Dict[str, int] = {}
+        unique_texts: List[str] = []
 
-        # Process each document
         for doc in documents:
             text = doc.get(text_key, "")
-            doc_id = doc.get(id_key, f"doc_{len(all_chunks)}")
+            doc_id = doc.get(id_key, f"doc_{len(all_ids)}")
 
             if not text:
                 continue
@@ -108,37 +122,83 @@ class RAGPipeline:
             }
             metadata["doc_id"] = doc_id
 
-            # Chunk document
-            chunks = chunker.chunk_text(text, doc_id, metadata)
-
-            # Generate embeddings for chunks
-            chunk_texts = [chunk.text for chunk in chunks]
-            if chunk_texts:
-                embeddings = self.embedding_model.encode(
-                    chunk_texts, show_progress=show_progress
-                )
+            for chunk in chunker.chunk_text(text, doc_id, metadata):
+                slot = slot_of_text.get(chunk.text)
+                if slot is None:
+                    slot = slot_of_text[chunk.text] = len(unique_texts)
+                    unique_texts.append(chunk.text)
+                slot_of_chunk.append(slot)
+                all_metadatas.append(chunk.metadata)
+                all_ids.append(f"{doc_id}_chunk_{chunk.chunk_id}")
+
+        if not all_ids:
+            logger.info(f"Added 0 chunks from {len(documents)} documents")
+            return 0
+
+        # 2. Embed unique texts: cache hits first, misses in fixed-size batches
+        embeddings = self._embed_unique(unique_texts, show_progress=show_progress)
+
+        # 3. Stream into the vector store
+        slots = np.asarray(slot_of_chunk)
+        texts = [unique_texts[slot] for slot in slot_of_chunk]
+        batch = self.config.ingest_batch_size
+        for start in range(0, len(all_ids), batch):
+            end = start + batch
+            self.retriever.add_texts(
+                texts=texts[start:end],
+                embeddings=embeddings[slots[start:end]],
+                metadatas=all_metadatas[start:end],
+                ids=all_ids[start:end],
+            )
 
-                # Store chunks
-                for i, chunk in enumerate(chunks):
-                    all_chunks.append(chunk.text)
-                    all_embeddings.append(embeddings[i])
-                    all_metadatas.append(chunk.metadata)
-                    all_ids.append(f"{doc_id}_chunk_{chunk.chunk_id}")
+        logger.info(
+            f"Added {len(all_ids)} chunks ({len(unique_texts)} unique) "
+            f"from {len(documents)} documents"
+        )
+        return len(all_ids)
+
+    def _embed_unique(self, texts: List[str], show_progress: bool = False) -> np.ndarray:
+        """Embed deduplicated texts into a preallocated (len(texts), dim) matrix"""
+        dim = self.embedding_model.embedding_dim
+        out = np.empty((len(texts), dim), dtype=np.float32)
+        missing = list(range(len(texts)))
+
+        keys: List[str] = []
+        if self.embedding_cache is not None:
+            model_name = self.embedding_model.model_name
+            keys = [content_hash(t, model_name) for t in texts]
+            cached = self.embedding_cache.get_many(keys)
+            missing = []
+            for i, key in enumerate(keys):
+                vector = cached.get(key)
+                if vector is None:
+                    missing.append(i)
+                else:
+                    out[i] = vector
+            logger.debug(f"Embedding cache: {len(cached)} hits, {len(missing)} misses")
+
+        batch = self.config.embedding_batch_size
+        for start in range(0, len(missing), batch):
+            idx = missing[start : start + batch]
+            vectors = self.embedding_model.encode(
+                [texts[i] for i in idx], show_progress=show_progress
+            )
+            out[idx] = vectors
+            if self.embedding_cache is not None:
+                self.embedding_cache.put_many([keys[i] for i in idx], out[idx])
 
-        # Add to vector store
-        if all_chunks:
-            import numpy as np
+        return out
 
-            embeddings_array = np.array(all_embeddings)
-            self.retriever.add_texts(
-                texts=all_chunks,
-                embeddings=embeddings_array,
-                metadatas=all_metadatas,
-                ids=all_ids,
-            )
+    def delete_documents(self, doc_ids: List[str]) -> None:
+        """
+        Remove all chunks of the given documents from the vector store
 
-        logger.info(f"Added {len(all_chunks)} chunks from {len(documents)} documents")
-        return len(all_chunks)
+        Args:
+            doc_ids: Document IDs as passed to add_documents
+        """
+        if doc_ids:
+            self.retriever.delete_documents(doc_ids)
+            logger.info(f"Deleted chunks of {len(doc_ids)} documents")
 
     def retrieve(
         self, query: str, top_k: Optional[int] = None
@@ -322,5 +382,10 @@ Answer:"""
                 "chunk_overlap": self.config.chunk_overlap,
                 "min_similarity_score": self.config.min_similarity_score,
                 "max_context_length": self.config.max_context_length,
+                "embedding_batch_size": self.config.embedding_batch_size,
+                "ingest_batch_size": self.config.ingest_batch_size,
             },
+            "embedding_cache": (
+                self.embedding_cache.get_stats() if self.embedding_cache else None
+            ),
         }
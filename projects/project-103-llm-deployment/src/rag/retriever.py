@@ -60,6 +60,10 @@ class VectorRetriever:
         """Search for similar texts"""
         raise NotImplementedError
 
+    def delete_documents(self, doc_ids: List[str]):
+        """Delete every chunk whose metadata doc_id is in doc_ids"""
+        raise NotImplementedError
+
     def delete_collection(self):
         """Delete the collection"""
         raise NotImplementedError
@@ -182,6 +186,18 @@ class ChromaDBRetriever(VectorRetriever):
         logger.debug(f"Retrieved {len(retrieval_results)} results")
         return retrieval_results
 
+    def delete_documents(self, doc_ids: List[str]):
+        """
+        Delete all chunks belonging to the given documents
+
+        Args:
+            doc_ids: Source document IDs (matched against chunk metadata)
+        """
+        if not doc_ids:
+            return
+        self.collection.delete(where={"doc_id": {"$in": list(doc_ids)}})
+        logger.info(f"Deleted chunks of {len(doc_ids)} documents from ChromaDB")
+
     def delete_collection(self):
         """Delete the collection"""
         try:
@@ -334,6 +350,20 @@ class PineconeRetriever(VectorRetriever):
         logger.debug(f"Retrieved {len(retrieval_results)} results")
         return retrieval_results
 
+    def delete_documents(self, doc_ids: List[str]):
+        """
+        Delete all vectors belonging to the given documents
+
+        Args:
+            doc_ids: Source document IDs (matched against vector metadata)
+        """
+        if not doc_ids:
+            return
+        self.index.delete(
+            filter={"doc_id": {"$in": list(doc_ids)}}, namespace=self.namespace
+        )
+        logger.info(f"Deleted vectors of {len(doc_ids)} documents from Pinecone")
+
     def delete_collection(self):
         """Delete the index"""
         try:
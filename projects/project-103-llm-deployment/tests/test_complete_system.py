@@ -11,6 +11,7 @@ Tests:
 
 import pytest
 import asyncio
+import importlib
 from fastapi.testclient import TestClient
 import numpy as np
 
@@ -63,6 +64,87 @@ class TestLLMServing:
         assert "dtype" in info
 
 
+class TestRequestBatcher:
+    """Test grouping of concurrent generation requests"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_a_batch(self):
+        """Requests arriving within the window run in one batch_fn call"""
+        import time
+        from src.llm import RequestBatcher
+
+        batches = []
+
+        def batch_fn(requests):
+            batches.append(list(requests))
+            time.sleep(0.05)  # blocking work happens off the event loop
+            return [r.upper() for r in requests]
+
+        batcher = RequestBatcher(batch_fn, max_batch_size=8, max_wait_ms=20)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        tick_task = asyncio.create_task(ticker())
+        results = await asyncio.gather(*(batcher.submit(f"r{i}") for i in range(10)))
+        tick_task.cancel()
+        await batcher.stop()
+
+        assert results == [f"R{i}" for i in range(10)]
+        assert [len(b) for b in batches] == [8, 2]
+        assert ticks >= 10  # event loop kept running during generation
+
+    @pytest.mark.asyncio
+    async def test_incompatible_requests_are_not_mixed(self):
+        """Requests with different group keys go to separate calls; errors reach callers"""
+        from src.llm import RequestBatcher
+
+        def batch_fn(requests):
+            if any(r[0] == "bad" for r in requests):
+                raise RuntimeError("boom")
+            return [r[1] for r in requests]
+
+        batcher = RequestBatcher(batch_fn, max_wait_ms=20, group_key=lambda r: r[0])
+        results = await asyncio.gather(
+            batcher.submit(("a", 1)),
+            batcher.submit(("bad", 2)),
+            batcher.submit(("a", 3)),
+            return_exceptions=True,
+        )
+        await batcher.stop()
+
+        assert results[0] == 1 and results[2] == 3
+        assert isinstance(results[1], RuntimeError)
+        assert batcher.get_stats()["batches"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stop_fails_inflight_and_queued_requests(self):
+        """stop() resolves every waiting caller and the batcher can't be reused"""
+        import threading
+        from src.llm import RequestBatcher
+
+        release = threading.Event()
+
+        def batch_fn(requests):
+            release.wait(5)
+            return requests
+
+        batcher = RequestBatcher(batch_fn, max_batch_size=1, max_wait_ms=1)
+        calls = [asyncio.create_task(batcher.submit(i)) for i in range(3)]
+        await asyncio.sleep(0.05)  # first request is now mid-batch
+        await batcher.stop()
+        release.set()
+
+        results = await asyncio.wait_for(asyncio.gather(*calls, return_exceptions=True), 1)
+        assert all(isinstance(r, RuntimeError) for r in results)
+        with pytest.raises(RuntimeError):
+            await batcher.submit(4)
+
+
 # Test RAG Components
 class TestRAGSystem:
     """Test RAG system components"""
@@ -175,6 +257,221 @@ class TestRAGSystem:
         assert "Deep learning" in context
 
 
+# Test batched, cached ingestion
+class CountingEncoder:
+    """Deterministic stand-in for EmbeddingModel that counts encoded texts"""
+
+    model_name = "counting-encoder"
+    embedding_dim = 8
+
+    def __init__(self):
+        self.calls = 0
+        self.texts_encoded = 0
+
+    def encode(self, texts, show_progress=False, normalize=True):
+        self.calls += 1
+        self.texts_encoded += len(texts)
+        return np.array(
+            [[float(len(t) % (i + 2)) for i in range(self.embedding_dim)] for t in texts],
+            dtype=np.float32,
+        )
+
+
+class RecordingRetriever:
+    """Collects add_texts batches instead of writing to a vector DB"""
+
+    def __init__(self):
+        self.batches = []
+
+    def add_texts(self, texts, embeddings, metadatas=None, ids=None):
+        self.batches.append((list(texts), np.array(embeddings), list(metadatas), list(ids)))
+
+
+class TestBatchedIngestion:
+    """Test chunk dedup, embedding cache and batched vector-store writes"""
+
+    def _pipeline(self, cache=None, **config):
+        from src.rag import RAGPipeline, RAGConfig
+
+        encoder = CountingEncoder()
+        retriever = RecordingRetriever()
+        pipeline = RAGPipeline(
+            encoder, retriever, RAGConfig(chunk_size=256, chunk_overlap=20, **config),
+            embedding_cache=cache,
+        )
+        return pipeline, encoder, retriever
+
+    def test_identical_chunks_encoded_once(self, sample_documents):
+        """Duplicate documents share one embedding but keep their own ids"""
+        docs = sample_documents + [dict(sample_documents[0], id="doc1-copy")]
+        pipeline, encoder, retriever = self._pipeline(embedding_batch_size=2)
+
+        added = pipeline.add_documents(docs)
+
+        assert added == 4
+        assert encoder.texts_encoded == 3
+        assert encoder.calls == 2  # 3 unique texts in batches of 2
+        ids = [i for batch in retriever.batches for i in batch[3]]
+        assert "doc1-copy_chunk_0" in ids and "doc1_chunk_0" in ids
+
+    def test_vector_store_writes_are_batched(self, sample_documents):
+        """Chunks are streamed to the retriever in ingest_batch_size batches"""
+        pipeline, _, retriever = self._pipeline(ingest_batch_size=2)
+
+        pipeline.add_documents(sample_documents)
+
+        assert [len(b[0]) for b in retriever.batches] == [2, 1]
+        assert all(b[1].shape == (len(b[0]), 8) for b in retriever.batches)
+
+    def test_warm_cache_skips_encoder(self, sample_documents, temp_dir):
+        """Re-ingesting unchanged documents hits the on-disk cache"""
+        from src.rag import EmbeddingCache
+        from pathlib import Path
+
+        cache = EmbeddingCache(str(Path(temp_dir) / "emb.sqlite"))
+        pipeline, encoder, retriever = self._pipeline(cache=cache)
+        pipeline.add_documents(sample_documents)
+        first = retriever.batches[0][1]
+
+        encoder.texts_encoded = 0
+        retriever.batches.clear()
+        pipeline.add_documents(sample_documents)
+
+        assert encoder.texts_encoded == 0
+        assert np.allclose(retriever.batches[0][1], first)
+        assert cache.get_stats()["hits"] == 3
+
+    def test_cache_evicts_least_recently_used(self):
+        """Cache stays within max_entries"""
+        from src.rag import EmbeddingCache
+
+        cache = EmbeddingCache(":memory:", max_entries=2)
+        cache.put_many(["a", "b"], np.ones((2, 4)))
+        cache.get_many(["a"])
+        cache.put_many(["c"], np.zeros((1, 4)))
+
+        assert len(cache) == 2
+        assert set(cache.get_many(["a", "b", "c"])) == {"a", "c"}
+
+    def test_cache_counts_replaced_keys_once(self, temp_dir):
+        """Re-putting cached keys does not inflate the row count"""
+        from src.rag import EmbeddingCache
+        from pathlib import Path
+
+        path = str(Path(temp_dir) / "emb.sqlite")
+        cache = EmbeddingCache(path, max_entries=3)
+        cache.put_many(["a", "b", "a"], np.ones((3, 4)))
+        cache.put_many(["b", "c"], np.ones((2, 4)))
+        assert len(cache) == 3
+        cache.put_many(["d", "e"], np.ones((2, 4)))
+        assert len(cache) == 3
+        cache.close()
+
+        assert len(EmbeddingCache(path, max_entries=3)) == 3
+
+
+class RecordingPipeline:
+    """Records add_documents / delete_documents calls from the ingestor"""
+
+    def __init__(self):
+        self.added = []
+        self.deleted = []
+
+    def add_documents(self, documents):
+        self.added.extend(d["id"] for d in documents)
+        return len(documents)
+
+    def delete_documents(self, doc_ids):
+        self.deleted.extend(doc_ids)
+
+
+class TestIncrementalIngestion:
+    """Test manifest-driven directory re-indexing"""
+
+    def _run(self, directory, manifest_path):
+        from src.ingestion import DirectoryLoader, IncrementalIngestor, IngestionManifest
+
+        pipeline = RecordingPipeline()
+        ingestor = IncrementalIngestor(
+            pipeline,
+            IngestionManifest(manifest_path),
+            loader=DirectoryLoader(max_workers=0),
+            batch_size=2,
+        )
+        return pipeline, ingestor.run(directory)
+
+    def test_only_changed_files_are_reindexed(self, temp_dir):
+        """Unchanged files are skipped, edited files replaced, deleted files removed"""
+        import os
+        from pathlib import Path
+
+        docs_dir = Path(temp_dir) / "docs"
+        (docs_dir / "sub").mkdir(parents=True)
+        for name in ("a.txt", "b.txt", "sub/a.txt"):
+            (docs_dir / name).write_text(f"contents of {name}")
+        manifest = str(Path(temp_dir) / "manifest.json")
+
+        pipeline, progress = self._run(docs_dir, manifest)
+        assert progress.status == "completed"
+        assert progress.files_processed == 3
+        assert sorted(pipeline.added) == ["a.txt::a", "b.txt::b", "sub/a.txt::a"]
+
+        (docs_dir / "b.txt").write_text("edited")
+        (docs_dir / "sub" / "a.txt").unlink()
+        # Same bytes, new mtime: hashed but not re-embedded
+        os.utime(docs_dir / "a.txt", (1, 1))
+
+        pipeline, progress = self._run(docs_dir, manifest)
+        assert pipeline.added == ["b.txt::b"]
+        assert sorted(pipeline.deleted) == ["b.txt::b", "sub/a.txt::a"]
+        assert (progress.files_processed, progress.files_skipped, progress.files_removed) == (1, 1, 1)
+
+        pipeline, progress = self._run(docs_dir, manifest)
+        assert pipeline.added == [] and pipeline.deleted == []
+        assert progress.files_skipped == 2
+
+    def test_file_deleted_after_discovery_is_a_file_failure(self, temp_dir):
+        """A file that vanishes mid-run fails on its own instead of failing the job"""
+        from pathlib import Path
+        from src.ingestion import DirectoryLoader, IncrementalIngestor, IngestionManifest
+
+        docs_dir = Path(temp_dir) / "docs"
+        docs_dir.mkdir()
+        for name in ("a.txt", "b.txt"):
+            (docs_dir / name).write_text(f"contents of {name}")
+
+        class VanishingLoader(DirectoryLoader):
+            def discover(self, directory_path):
+                files = super().discover(directory_path)
+                (docs_dir / "b.txt").unlink()
+                return files
+
+        pipeline = RecordingPipeline()
+        progress = IncrementalIngestor(
+            pipeline,
+            IngestionManifest(str(Path(temp_dir) / "manifest.json")),
+            loader=VanishingLoader(max_workers=0),
+        ).run(docs_dir)
+
+        assert progress.status == "completed"
+        assert (progress.files_processed, progress.files_failed) == (1, 1)
+        assert pipeline.added == ["a.txt::a"]
+
+    def test_process_pool_matches_inline(self, temp_dir):
+        """Parallel parsing yields the same documents as in-process loading"""
+        from src.ingestion import DirectoryLoader
+        from pathlib import Path
+
+        for i in range(6):
+            (Path(temp_dir) / f"doc{i}.md").write_text(f"# Doc {i}\n\nbody {i}")
+
+        inline = DirectoryLoader().load(temp_dir)
+        pooled = list(DirectoryLoader(max_workers=2).iter_load(temp_dir))
+
+        assert sorted(d.doc_id for d in pooled) == sorted(d.doc_id for d in inline)
+        assert len(pooled) == 6
+
+
 # Test Document Ingestion
 class TestDocumentIngestion:
     """Test document ingestion components"""
@@ -244,6 +541,46 @@ class TestDocumentIngestion:
         assert unique_docs[0].text == "Hello world"
         assert unique_docs[1].text == "Goodbye world"
 
+    def test_blocked_embedding_dedup_matches_pairwise(self):
+        """Blocked matmul dedup keeps exactly what the pairwise loop keeps"""
+        from src.ingestion import DocumentDeduplicator
+
+        rng = np.random.default_rng(0)
+        centers = rng.standard_normal((20, 16))
+        embeddings = centers[rng.integers(0, 20, 300)] + 0.15 * rng.standard_normal((300, 16))
+        deduplicator = DocumentDeduplicator(similarity_threshold=0.97, block_size=32)
+
+        unit = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+        expected = []
+        for i in range(len(unit)):
+            if all(unit[i] @ unit[j] < 0.97 for j in expected):
+                expected.append(i)
+
+        keep = deduplicator.embedding_keep_mask(embeddings)
+
+        assert np.flatnonzero(keep).tolist() == expected
+        assert 20 <= len(expected) < 300
+
+    def test_minhash_dedup_drops_near_duplicates(self):
+        """MinHash/LSH drops lightly edited copies and keeps distinct documents"""
+        from src.ingestion import DocumentDeduplicator, Document
+        import random
+
+        rnd = random.Random(0)
+        words = [f"w{i}" for i in range(2000)]
+        originals = [" ".join(rnd.choices(words, k=200)) for _ in range(30)]
+        docs = [Document(text=t, doc_id=f"orig{i}") for i, t in enumerate(originals)]
+        for i, text in enumerate(originals[:10]):
+            tokens = text.split()
+            tokens[100] = "edited"  # one-word change
+            docs.append(Document(text=" ".join(tokens), doc_id=f"copy{i}"))
+
+        unique_docs = DocumentDeduplicator(jaccard_threshold=0.8).deduplicate_fuzzy(
+            docs, method="minhash"
+        )
+
+        assert [d.doc_id for d in unique_docs] == [f"orig{i}" for i in range(30)]
+
 
 # Test Monitoring
 class TestMonitoring:
@@ -375,6 +712,77 @@ class TestAPI:
         assert request.query == "What is AI?"
         assert 1 <= request.top_k_retrieval <= 20
 
+    def test_directory_job_records_setup_failure(self, monkeypatch, temp_dir):
+        """A job that fails before the ingestor runs is marked failed, not dropped"""
+        api_main = importlib.import_module("src.api.main")
+        from src.api.models import DirectoryIngestRequest
+        from src.ingestion import IngestProgress
+
+        def broken(*args, **kwargs):
+            raise RuntimeError("manifest unavailable")
+
+        monkeypatch.setattr(api_main, "IncrementalIngestor", broken)
+        progress = IngestProgress(directory=temp_dir)
+        api_main._run_directory_job(DirectoryIngestRequest(path=temp_dir), progress)
+
+        assert progress.status == "failed"
+        assert progress.error == "manifest unavailable"
+        assert progress.finished_at is not None
+
+    def test_finished_ingest_jobs_are_pruned(self, monkeypatch):
+        """Finished jobs expire after the TTL and beyond the cap; running jobs stay"""
+        api_main = importlib.import_module("src.api.main")
+        from src.ingestion import IngestProgress
+
+        class Task:
+            def __init__(self, done):
+                self._done = done
+
+            def done(self):
+                return self._done
+
+        jobs = {
+            "old": (IngestProgress(status="completed", finished_at=0.0), Task(True)),
+            "recent-1": (IngestProgress(status="failed", finished_at=990.0), Task(True)),
+            "recent-2": (IngestProgress(status="completed", finished_at=995.0), Task(True)),
+            "running": (IngestProgress(status="running"), Task(False)),
+        }
+        monkeypatch.setattr(api_main, "ingest_jobs", jobs)
+        monkeypatch.setattr(api_main, "INGEST_JOB_TTL_SECONDS", 100.0)
+        monkeypatch.setattr(api_main, "MAX_INGEST_JOBS", 2)
+
+        api_main._prune_ingest_jobs(now=1000.0)
+
+        assert set(jobs) == {"recent-2", "running"}
+
+    def test_directory_ingest_is_confined_to_ingest_root(self, monkeypatch, temp_dir):
+        """Paths outside INGEST_ROOT, directly or through a symlink, are refused"""
+        import os
+        from pathlib import Path
+        from fastapi import HTTPException
+        api_main = importlib.import_module("src.api.main")
+        from src.api.models import DirectoryIngestRequest
+
+        root = Path(temp_dir) / "root"
+        outside = Path(temp_dir) / "outside"
+        root.mkdir()
+        outside.mkdir()
+        os.symlink(outside, root / "link")
+        monkeypatch.setattr(api_main, "INGEST_ROOT", str(root))
+        monkeypatch.setattr(api_main, "rag_pipeline", object())
+        monkeypatch.setattr(api_main, "ingest_manifest", object())
+
+        for path in (str(outside), str(root / "link"), str(root / ".." / "outside"), "/etc"):
+            with pytest.raises(HTTPException) as excinfo:
+                asyncio.run(api_main.ingest_directory(DirectoryIngestRequest(path=path)))
+            assert excinfo.value.status_code == 403
+
+        with pytest.raises(HTTPException) as excinfo:
+            asyncio.run(api_main.ingest_directory(
+                DirectoryIngestRequest(path=str(root), glob_pattern="../outside/*")
+            ))
+        assert excinfo.value.status_code == 400
+
 
 # Integration Tests
 class TestIntegration: